@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Script de génération de données synthétiques et de mesure de montée en charge.
+Génère des jeux de données cohérents pour toutes les tables et mesure chaque
+étape de transformation sur des tailles croissantes.
+"""
+
+import os
+import sys
+import argparse
+from typing import List
+
+# Ajouter le répertoire racine au chemin Python
+sys.path.append(os.path.abspath('.'))
+
+from src.benchmark.synthetic_data import SYNTHETIC_TABLES, write_dataset
+from src.benchmark.run_benchmark import run_benchmark
+from src.tables.registry import TABLE_REGISTRY
+
+
+def parse_sizes(value: str) -> List[int]:
+    """
+    Convertit une liste de tailles séparées par des virgules (ex: 1000,10k,1M).
+
+    Args:
+        value: Tailles saisies en ligne de commande
+
+    Returns:
+        Liste des tailles
+    """
+    multipliers = {"k": 1000, "m": 1000000}
+    sizes = []
+    for item in value.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        multiplier = multipliers.get(item[-1], 1)
+        number = item[:-1] if item[-1] in multipliers else item
+        try:
+            size = int(float(number) * multiplier)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Taille invalide: {item}")
+        if size < 1:
+            raise argparse.ArgumentTypeError(f"Taille invalide: {item}")
+        sizes.append(size)
+    return sizes
+
+
+def main():
+    """Fonction principale d'exécution."""
+    parser = argparse.ArgumentParser(description="Données synthétiques et mesure de montée en charge")
+    parser.add_argument("--sizes", type=parse_sizes, default=[1000, 10000, 100000],
+                        help="Tailles des jeux, en nombre de stocks (ex: 1k,10k,100k,1M)")
+    parser.add_argument("--table", type=str, default="all",
+                        help=f"Table à mesurer ({', '.join(TABLE_REGISTRY)}, all)")
+    parser.add_argument("--output-dir", type=str, default="data/benchmark",
+                        help="Répertoire des jeux générés et des résultats")
+    parser.add_argument("--patches-dir", type=str, default="data/patches",
+                        help="Répertoire des correctifs appliqués pendant la mesure")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Graine du générateur aléatoire")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Mesure le mode par lots de N lignes")
+    parser.add_argument("--generate-only", action="store_true",
+                        help="Génère les fichiers sans lancer les traitements")
+    args = parser.parse_args()
+
+    if args.table != "all" and args.table not in TABLE_REGISTRY and not (args.generate_only and args.table in SYNTHETIC_TABLES):
+        parser.error(f"Table '{args.table}' non reconnue")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size doit être un entier strictement positif")
+
+    tables = None if args.table == "all" else [args.table]
+
+    if args.generate_only:
+        for size in args.sizes:
+            raw_dir = os.path.join(args.output_dir, str(size), "raw")
+            paths = write_dataset(size, raw_dir, args.seed, tables)
+            print(f"Jeu de {size} stocks généré dans {raw_dir} ({len(paths)} fichiers)")
+        return
+
+    run_benchmark(args.sizes, tables, args.output_dir, args.patches_dir, args.seed, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
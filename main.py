@@ -9,6 +9,8 @@ import os
 import sys
 import argparse
 import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict
 import glob
@@ -17,13 +19,11 @@ import re
 # Ajouter le répertoire racine au chemin Python
 sys.path.append(os.path.abspath('.'))
 
-from src.tables.companies.clean_companies import clean_companies_data
-from src.tables.organizations.clean_organizations import clean_organizations_data
-from src.tables.logistic_address.clean_logistic_address import clean_logistic_address_data
-from src.tables.transports.clean_transports import clean_transports_data
-from src.tables.stock_import.clean_stock_import import clean_stock_import_data
-from src.tables.stocks.clean_stocks import clean_stocks_data
+from src.tables.registry import TABLE_DEPENDENCIES, TABLE_REGISTRY, load_table_pipeline, order_tables
 from src.utils.logging_manager import setup_logger
+from src.utils.referential_integrity import latest_clean_output, run_integrity_check
+from src.utils.step_metrics import format_metrics_table
+from src.utils.table_runner import run_table_pipeline
 
 
 def create_directory_structure():
@@ -33,6 +33,8 @@ def create_directory_structure():
         "data/clean",
         "data/archive",
         "data/patches",
+        "data/reference",
+        "data/cache",
         "data/error_report",
         "logs"
     ]
@@ -123,8 +125,10 @@ def process_table(
     patches_dir: str = "data/patches",
     error_report_dir: str = "data/error_report",
     log_dir: str = "logs",
-    archive: bool = True
-) -> Tuple[bool, Optional[str], Optional[str]]:
+    archive: bool = True,
+    chunk_size: Optional[int] = None,
+    check_inputs: bool = False
+) -> Tuple[bool, Optional[str], Optional[str], Dict]:
     """
     Traite une table spécifique.
     
@@ -136,12 +140,15 @@ def process_table(
         error_report_dir: Répertoire des rapports d'erreurs
         log_dir: Répertoire des logs
         archive: Indique si les fichiers précédents doivent être archivés
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        check_inputs: Contrôle que chaque étape laisse son entrée intacte (débogage du mode sans copie)
         
     Returns:
         Tuple contenant:
         - Succès de l'opération
         - Chemin du rapport d'erreurs (si généré)
         - Chemin du fichier de sortie
+        - Mesures du traitement par étape (vide si le traitement n'a pas abouti)
     """
     # Configuration du logger
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -160,27 +167,22 @@ def process_table(
     print(f"  Fichier d'entrée: {input_file}")
     print(f"  Fichier de sortie: {output_file}")
     
-    # Sélection de la fonction de nettoyage appropriée
+    # Sélection du pipeline de la table (module importé à la demande)
     success = False
     error_report = None
+    metrics = {}
     
     try:
-        if table_name.lower() == "companies":
-            success, error_report = clean_companies_data(input_file, output_file, patches_dir, error_report_dir, log_dir)
-        elif table_name.lower() == "organizations":
-            success, error_report = clean_organizations_data(input_file, output_file, patches_dir, error_report_dir, log_dir)
-        elif table_name.lower() == "logistic_address":
-            success, error_report = clean_logistic_address_data(input_file, output_file, patches_dir, error_report_dir, log_dir)
-        elif table_name.lower() == "transports":
-            success, error_report = clean_transports_data(input_file, output_file, patches_dir, error_report_dir, log_dir)
-        elif table_name.lower() == "stock_import":
-            success, error_report = clean_stock_import_data(input_file, output_file, patches_dir, error_report_dir, log_dir)
-        elif table_name.lower() == "stocks":
-            success, error_report = clean_stocks_data(input_file, output_file, patches_dir, error_report_dir, log_dir)
-        else:
+        if table_name.lower() not in TABLE_REGISTRY:
             logger.error(f"Table non reconnue: {table_name}")
             print(f"Table non reconnue: {table_name}")
-            return False, None, None
+            return False, None, None, metrics
+        
+        pipeline = load_table_pipeline(table_name.lower())
+        success, error_report = run_table_pipeline(
+            pipeline, input_file, output_file, patches_dir, error_report_dir, log_dir, chunk_size, metrics,
+            check_inputs
+        )
             
         logger.info(f"Traitement {'réussi' if success else 'échoué'}")
         if error_report:
@@ -197,7 +199,126 @@ def process_table(
         print(f"Erreur: {str(e)}")
         success = False
         
-    return success, error_report, output_file
+    return success, error_report, output_file, metrics
+
+
+def process_table_inputs(
+    table_name: str,
+    input_files: List[str],
+    archive: bool = True,
+    chunk_size: Optional[int] = None,
+    check_inputs: bool = False
+) -> List[Dict]:
+    """
+    Traite successivement tous les fichiers d'entrée d'une table.
+    
+    Exécutée telle quelle dans un processus de travail en mode parallèle :
+    le logger et l'archivage de la table restent propres à ce processus.
+    
+    Args:
+        table_name: Nom de la table à traiter
+        input_files: Chemins des fichiers d'entrée de la table
+        archive: Indique si les fichiers précédents doivent être archivés
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        check_inputs: Contrôle que chaque étape laisse son entrée intacte (débogage du mode sans copie)
+        
+    Returns:
+        Liste des résultats (un dictionnaire par fichier d'entrée)
+    """
+    results = []
+    
+    for input_file in input_files:
+        success, error_report, output_file, metrics = process_table(
+            table_name,
+            input_file,
+            archive=archive,
+            chunk_size=chunk_size,
+            check_inputs=check_inputs
+        )
+        results.append({
+            "table": table_name,
+            "input_file": input_file,
+            "output_file": output_file,
+            "success": success,
+            "error_report": error_report,
+            "metrics": metrics
+        })
+    
+    return results
+
+
+def run_tables_in_parallel(
+    table_inputs: Dict[str, List[str]],
+    jobs: int,
+    logger,
+    archive: bool = True,
+    chunk_size: Optional[int] = None,
+    check_inputs: bool = False
+) -> List[Dict]:
+    """
+    Exécute les tables dans un pool de processus en respectant TABLE_DEPENDENCIES.
+    
+    Une table est soumise dès que toutes ses dépendances sélectionnées sont
+    terminées, de sorte que la durée totale tend vers celle de la chaîne de
+    dépendances la plus longue plutôt que vers la somme des tables.
+    
+    Args:
+        table_inputs: Dictionnaire table -> fichiers d'entrée, dans l'ordre de traitement
+        jobs: Nombre maximal de processus simultanés
+        logger: Logger principal
+        archive: Indique si les fichiers précédents doivent être archivés
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        check_inputs: Contrôle que chaque étape laisse son entrée intacte (débogage du mode sans copie)
+        
+    Returns:
+        Liste des résultats, dans l'ordre de table_inputs
+    """
+    selected = set(table_inputs)
+    pending = list(table_inputs)
+    finished = {}
+    failed = set()
+    running = {}
+    
+    # Contexte "spawn" : chaque processus repart d'un interpréteur vierge
+    # (aucun handler de logging hérité du processus principal)
+    context = multiprocessing.get_context("spawn")
+    
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+        while pending or running:
+            for table in list(pending):
+                dependencies = [dep for dep in TABLE_DEPENDENCIES.get(table, []) if dep in selected]
+                if not all(dep in finished for dep in dependencies):
+                    continue
+                failed_dependencies = [dep for dep in dependencies if dep in failed]
+                if failed_dependencies:
+                    logger.warning(f"Table {table} lancée malgré l'échec de: {', '.join(failed_dependencies)}")
+                logger.info(f"Lancement de la table {table}")
+                future = executor.submit(
+                    process_table_inputs, table, table_inputs[table], archive, chunk_size, check_inputs
+                )
+                running[future] = table
+                pending.remove(table)
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table = running.pop(future)
+                try:
+                    finished[table] = future.result()
+                except Exception as e:
+                    logger.error(f"Erreur lors du traitement parallèle de {table}: {str(e)}")
+                    finished[table] = [{
+                        "table": table,
+                        "input_file": input_file,
+                        "output_file": None,
+                        "success": False,
+                        "error_report": None,
+                        "metrics": {}
+                    } for input_file in table_inputs[table]]
+                if not all(result["success"] for result in finished[table]):
+                    failed.add(table)
+                logger.info(f"Table {table} terminée")
+    
+    return [result for table in table_inputs for result in finished[table]]
 
 
 def main():
@@ -205,13 +326,22 @@ def main():
     # Configuration du parser d'arguments
     parser = argparse.ArgumentParser(description="Transformation des données de tables")
     parser.add_argument("--table", type=str, default="all", 
-                        help="Table à transformer (companies, organizations, logistic_address, transports, stock_import, stocks, all)")
+                        help=f"Table à transformer ({', '.join(TABLE_REGISTRY)}, all)")
     parser.add_argument("--input", type=str, default=None,
                         help="Fichier d'entrée spécifique (chemin complet)")
     parser.add_argument("--no-archive", action="store_true",
                         help="Désactive l'archivage automatique des anciens fichiers")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Nombre de tables traitées en parallèle (processus séparés, 1 = séquentiel)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Traite chaque table par lots de N lignes écrits au fur et à mesure (mémoire bornée)")
+    parser.add_argument("--check-step-inputs", action="store_true",
+                        help="Vérifie que chaque étape laisse son DataFrame d'entrée intact (débogage, lent)")
     args = parser.parse_args()
     
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size doit être un entier strictement positif")
+    
     # Configuration du logger principal
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = os.path.join("logs", f"transformation_{timestamp}.log")
@@ -223,7 +353,7 @@ def main():
     create_directory_structure()
     
     # Tables disponibles
-    available_tables = ["companies", "organizations", "logistic_address", "transports", "stock_import", "stocks"]
+    available_tables = list(TABLE_REGISTRY)
     
     # Déterminer les tables à traiter
     tables_to_process = [args.table.lower()] if args.table.lower() != "all" else available_tables
@@ -235,10 +365,11 @@ def main():
         print(f"Tables disponibles: {', '.join(available_tables)} ou 'all'")
         return
     
-    # Résultats globaux
-    results = []
+    # Ordonner les tables selon leurs dépendances
+    tables_to_process = order_tables(tables_to_process, TABLE_DEPENDENCIES)
     
-    # Traitement pour chaque table
+    # Fichiers d'entrée par table
+    table_inputs = {}
     for table in tables_to_process:
         if args.input:
             # Utiliser le fichier spécifié par l'utilisateur
@@ -254,28 +385,37 @@ def main():
             # Transformer les chemins relatifs en chemins absolus
             input_files = [os.path.join("data/raw", f) for f in input_files_relative]
         
-        # Traiter chaque fichier d'entrée
+        existing_files = []
         for input_file in input_files:
             if not os.path.exists(input_file):
                 logger.warning(f"Fichier non trouvé: {input_file}")
                 print(f"Fichier non trouvé: {input_file}")
                 continue
-            
-            # Traiter la table avec ou sans archivage selon l'option
-            success, error_report, output_file = process_table(
-                table, 
-                input_file, 
-                archive=not args.no_archive
-            )
-            
-            # Enregistrer le résultat
-            results.append({
-                "table": table,
-                "input_file": input_file,
-                "output_file": output_file,
-                "success": success,
-                "error_report": error_report
-            })
+            existing_files.append(input_file)
+        
+        if existing_files:
+            table_inputs[table] = existing_files
+    
+    # Traitement des tables, en parallèle ou séquentiellement selon l'option
+    if args.jobs > 1 and len(table_inputs) > 1:
+        logger.info(f"Traitement parallèle de {len(table_inputs)} tables ({args.jobs} processus)")
+        results = run_tables_in_parallel(
+            table_inputs, args.jobs, logger, archive=not args.no_archive, chunk_size=args.chunk_size,
+            check_inputs=args.check_step_inputs
+        )
+    else:
+        results = []
+        for table, input_files in table_inputs.items():
+            results.extend(process_table_inputs(
+                table, input_files, archive=not args.no_archive, chunk_size=args.chunk_size,
+                check_inputs=args.check_step_inputs
+            ))
+    
+    # Contrôle de l'intégrité référentielle: sorties de cette exécution, à défaut dernières sorties disponibles
+    outputs = {table: latest_clean_output(table) for table in TABLE_REGISTRY}
+    outputs.update({result["table"]: result["output_file"] for result in results if result["success"]})
+    outputs = {table: output for table, output in outputs.items() if output}
+    integrity_report = run_integrity_check(outputs, TABLE_REGISTRY, "data/error_report", logger) if results else None
     
     # Affichage récapitulatif
     print("\n" + "="*80)
@@ -291,8 +431,17 @@ def main():
         print(f"  Statut: {status}")
         if result["error_report"]:
             print(f"  Rapport d'erreurs: {os.path.basename(result['error_report'])}")
+        if result["metrics"]:
+            metrics = result["metrics"]
+            if metrics.get("metrics_file"):
+                print(f"  Mesures: {os.path.basename(metrics['metrics_file'])}")
+            for line in format_metrics_table(metrics):
+                print(line)
         print("-"*40)
     
+    if integrity_report:
+        print(f"Rapport d'intégrité référentielle: {os.path.basename(integrity_report)}")
+    
     logger.info("Fin du processus de transformation")
 
 
@@ -0,0 +1,218 @@
+"""
+Module de mesure de la montée en charge des traitements.
+Génère des jeux synthétiques de tailles croissantes, exécute le pipeline de
+chaque table sur chacun d'eux et restitue, par étape, le temps en fonction
+du nombre de lignes ainsi que l'exposant de croissance estimé.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.benchmark.synthetic_data import write_dataset
+from src.tables.registry import TABLE_DEPENDENCIES, TABLE_REGISTRY, load_table_pipeline, order_tables
+from src.utils.table_runner import run_table_pipeline
+
+
+def run_size(
+    size: int,
+    tables: List[str],
+    output_dir: str,
+    patches_dir: str,
+    seed: int = 0,
+    chunk_size: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Génère un jeu de la taille demandée et exécute le pipeline de chaque table.
+
+    Args:
+        size: Nombre de stocks du jeu synthétique
+        tables: Tables à traiter (déclarées dans TABLE_REGISTRY)
+        output_dir: Répertoire de travail de cette taille (raw, clean, error_report, logs)
+        patches_dir: Répertoire des correctifs
+        seed: Graine du générateur aléatoire
+        chunk_size: Nombre de lignes par lot (None pour traiter les tables en une fois)
+
+    Returns:
+        Liste des mesures par table (une entrée par table traitée)
+    """
+    raw_paths = write_dataset(size, os.path.join(output_dir, "raw"), seed, tables)
+    results = []
+
+    for table in tables:
+        metrics = {}
+        # Sortie horodatée, comme dans main.py: les tables qui résolvent leurs
+        # références (positioning, deliveries) y lisent la dernière sortie de chaque table
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        success, _ = run_table_pipeline(
+            load_table_pipeline(table),
+            raw_paths[table],
+            os.path.join(output_dir, "clean", f"{table}_{timestamp}.json"),
+            patches_dir,
+            os.path.join(output_dir, "error_report"),
+            os.path.join(output_dir, "logs"),
+            chunk_size,
+            metrics
+        )
+        metrics.update({"size": size, "success": success})
+        results.append(metrics)
+
+    return results
+
+
+def scaling_exponent(rows: List[int], times: List[float]) -> Optional[float]:
+    """
+    Estime l'exposant k de temps ~ lignes^k (régression en échelle log-log).
+
+    Args:
+        rows: Nombre de lignes de chaque mesure
+        times: Temps écoulé correspondant
+
+    Returns:
+        L'exposant estimé, None si moins de deux mesures exploitables
+    """
+    points = [(r, t) for r, t in zip(rows, times) if r > 0 and t > 0]
+    if len({r for r, _ in points}) < 2:
+        return None
+    slope, _ = np.polyfit(np.log([r for r, _ in points]), np.log([t for _, t in points]), 1)
+    return round(float(slope), 2)
+
+
+def scaling_curves(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Regroupe les mesures par table et par étape sur l'ensemble des tailles.
+
+    Args:
+        results: Mesures renvoyées par run_size pour chaque taille
+
+    Returns:
+        Une courbe par (table, étape): lignes et temps par taille, exposant estimé
+    """
+    curves: Dict[Any, Dict[str, Any]] = {}
+
+    for metrics in results:
+        if not metrics.get("steps"):
+            continue
+        points = [(step["step"], step["rows_in"], step["wall_time_s"]) for step in metrics["steps"]]
+        points += [
+            (f"[{phase}]", metrics["rows"], duration)
+            for phase, duration in metrics.get("phases_wall_time_s", {}).items()
+        ]
+        points.append(("[total]", metrics["rows"], metrics["wall_time_s"]))
+
+        for position, (step, rows, wall_time) in enumerate(points):
+            curve = curves.setdefault((metrics["table"], step), {
+                "table": metrics["table"],
+                "step": step,
+                "position": position,
+                "sizes": [],
+                "rows": [],
+                "wall_time_s": []
+            })
+            curve["sizes"].append(metrics["size"])
+            curve["rows"].append(rows)
+            curve["wall_time_s"].append(wall_time)
+
+    for curve in curves.values():
+        curve["exponent"] = scaling_exponent(curve["rows"], curve["wall_time_s"])
+
+    return sorted(curves.values(), key=lambda curve: (curve["table"], curve["position"]))
+
+
+def format_curves(curves: List[Dict[str, Any]], sizes: List[int], width: int = 45) -> List[str]:
+    """
+    Met en forme les courbes pour l'affichage console (temps en secondes par taille).
+
+    Args:
+        curves: Courbes renvoyées par scaling_curves
+        sizes: Tailles mesurées, dans l'ordre des colonnes
+        width: Largeur de la colonne des noms d'étapes
+
+    Returns:
+        Lignes du tableau
+    """
+    lines = []
+    current_table = None
+
+    for curve in curves:
+        if curve["table"] != current_table:
+            current_table = curve["table"]
+            lines.append("")
+            lines.append(f"Table: {current_table}")
+            lines.append(
+                f"  {'Étape':<{width}} " + " ".join(f"{size:>10}" for size in sizes) + f" {'Exposant':>9}"
+            )
+        times = dict(zip(curve["sizes"], curve["wall_time_s"]))
+        name = curve["step"] if len(curve["step"]) <= width else curve["step"][:width - 1] + "…"
+        cells = " ".join(f"{times[size]:>10.3f}" if size in times else f"{'-':>10}" for size in sizes)
+        exponent = f"{curve['exponent']:.2f}" if curve["exponent"] is not None else "-"
+        lines.append(f"  {name:<{width}} {cells} {exponent:>9}")
+
+    return lines
+
+
+def run_benchmark(
+    sizes: List[int],
+    tables: Optional[List[str]] = None,
+    output_dir: str = "data/benchmark",
+    patches_dir: str = "data/patches",
+    seed: int = 0,
+    chunk_size: Optional[int] = None
+) -> str:
+    """
+    Mesure chaque table sur des jeux synthétiques de tailles croissantes.
+
+    Les mesures brutes (JSON) et les courbes par étape (CSV) sont écrites
+    dans output_dir/benchmark_<timestamp>.*.
+
+    Args:
+        sizes: Tailles des jeux (nombre de stocks)
+        tables: Tables à mesurer (None pour toutes les tables du registre)
+        output_dir: Répertoire de travail et de résultats
+        patches_dir: Répertoire des correctifs
+        seed: Graine du générateur aléatoire
+        chunk_size: Nombre de lignes par lot (None pour traiter les tables en une fois)
+
+    Returns:
+        Chemin du fichier JSON des résultats
+    """
+    # Chaque table après celles dont elle lit les sorties (ex: logistic_address après positioning)
+    tables = order_tables(tables or list(TABLE_REGISTRY), TABLE_DEPENDENCIES)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    results = []
+
+    for size in sorted(sizes):
+        print(f"\nJeu synthétique de {size} stocks")
+        results.extend(run_size(
+            size, tables, os.path.join(output_dir, str(size)), patches_dir, seed, chunk_size
+        ))
+
+    curves = scaling_curves(results)
+
+    os.makedirs(output_dir, exist_ok=True)
+    results_path = os.path.join(output_dir, f"benchmark_{timestamp}.json")
+    with open(results_path, 'w', encoding='utf-8') as file:
+        json.dump({"sizes": sorted(sizes), "seed": seed, "chunk_size": chunk_size,
+                   "results": results, "curves": curves}, file, ensure_ascii=False, indent=2)
+
+    curves_path = os.path.join(output_dir, f"benchmark_{timestamp}.csv")
+    with open(curves_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file, delimiter=';')
+        writer.writerow(["table", "step", "size", "rows", "wall_time_s", "exponent"])
+        for curve in curves:
+            for size, rows, wall_time in zip(curve["sizes"], curve["rows"], curve["wall_time_s"]):
+                writer.writerow([curve["table"], curve["step"], size, rows, wall_time, curve["exponent"]])
+
+    print("\n" + "=" * 80)
+    print("MONTÉE EN CHARGE PAR ÉTAPE (temps écoulé en secondes par taille de jeu)")
+    print("=" * 80)
+    for line in format_curves(curves, sorted(sizes)):
+        print(line)
+    print(f"\nRésultats: {results_path}")
+    print(f"Courbes: {curves_path}")
+
+    return results_path
@@ -0,0 +1,598 @@
+"""
+Module de génération de jeux de données synthétiques.
+Produit, pour une taille donnée, des fichiers d'entrée cohérents entre eux
+(clés étrangères, identifiants d'imports de stock) pour toutes les tables,
+en reprenant les champs déclarés dans chaque input_structure.py et les
+défauts observés dans les données réelles.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.tables.companies.input_structure import INPUT_SCHEMA as COMPANIES_SCHEMA
+from src.tables.organizations.input_structure import INPUT_SCHEMA as ORGANIZATIONS_SCHEMA
+from src.tables.logistic_address.input_structure import INPUT_SCHEMA as LOGISTIC_ADDRESS_SCHEMA
+from src.tables.transports.input_structure import INPUT_SCHEMA as TRANSPORTS_SCHEMA
+from src.tables.stock_import.input_structure import INPUT_SCHEMA as STOCK_IMPORT_SCHEMA
+from src.tables.stocks.input_structure import INPUT_SCHEMA as STOCKS_SCHEMA
+from src.tables.positioning.input_structure import INPUT_SCHEMA as POSITIONING_SCHEMA
+from src.tables.deliveries.input_structure import INPUT_SCHEMA as DELIVERIES_SCHEMA
+from src.utils.json_stream import write_json_array
+
+
+# Tables générées, dans l'ordre d'écriture
+SYNTHETIC_TABLES = [
+    "companies",
+    "organizations",
+    "stocks",
+    "stock_import",
+    "logistic_address",
+    "transports",
+    "positioning",
+    "deliveries",
+]
+
+# Nombre de lignes de chaque table pour une taille de jeu n (proportions des données réelles)
+TABLE_RATIOS = {
+    "companies": 0.65,
+    "organizations": 0.3,
+    "stocks": 1.0,
+    "logistic_address": 0.9,
+    "transports_per_stock_import": 1 / 45,
+}
+
+# Taux d'apparition des défauts
+DEFECT_RATES = {
+    "missing_value": 0.06,
+    "postal_code_4_digits": 0.03,
+    "postal_code_spaced": 0.02,
+    "siren_truncated": 0.015,
+    "siret_missing": 0.05,
+    "address_in_street": 0.55,
+    "address_with_city": 0.15,
+    "commission_as_percent": 0.1,
+    "commission_as_string": 0.03,
+    "commentary_zero": 0.25,
+    "duplicated_stock_import": 0.05,
+}
+
+STREET_TYPES = ["RUE", "AVENUE", "AV", "BOULEVARD", "BD", "CHEMIN", "CHE", "IMPASSE", "ALLEE", "ROUTE", "PLACE", "QUAI"]
+STREET_NAMES = [
+    "DE LA REPUBLIQUE", "PASTEUR", "VICTOR HUGO", "DU GENERAL DE GAULLE", "JEAN JAURES",
+    "DES ENTREPRISES", "DE LA GARE", "DU MOULIN", "DES ACACIAS", "LOUISE MICHEL",
+    "FERNAND PELLOUTIER", "DE L'INDUSTRIE", "DU PONT HENNUYER", "MAX JACOB", "D'ALSACE",
+    "DES ÉCOLES", "SAINT-EXUPÉRY", "DE LA FORÊT", "NATIONALE", "DES ARTISANS",
+]
+ADDRESS_PREFIXES = ["ZI LA BEYNE", "ZA DES FAMARDS", "ZI VAXENAIRE", "PARC D'ACTIVITÉS", "LIEU-DIT LA PILLAUDIERE"]
+CITIES = [
+    ("75011", "PARIS"), ("69003", "LYON"), ("13002", "MARSEILLE"), ("59118", "WAMBRECHIES"),
+    ("46000", "CAHORS"), ("74500", "LUGRIN"), ("45140", "INGRÉ"), ("76130", "MONT-SAINT-AIGNAN"),
+    ("69140", "RILLIEUX-LA-PAPE"), ("59410", "ANZIN"), ("33000", "BORDEAUX"), ("31000", "TOULOUSE"),
+    ("67000", "STRASBOURG"), ("44000", "NANTES"), ("06000", "NICE"), ("01150", "LAGNIEU"),
+    ("02830", "SAINT-MICHEL"), ("07700", "BOURG-SAINT-ANDÉOL"), ("78470", "SAINT-RÉMY-LÈS-CHEVREUSE"),
+    ("59157", "BEAUVOIS-EN-CAMBRÉSIS"),
+]
+STATES = ["Île-de-France", "Auvergne-Rhône-Alpes", "Hauts-de-France", "Occitanie", "Grand Est", "Nouvelle-Aquitaine"]
+LEGAL_FORMS = [
+    "SAS, société par actions simplifiée",
+    "SASU, société par actions simplifiée unipersonnelle",
+    "SARL, société à responsabilité limitée",
+    "EURL, entreprise unipersonnelle à responsabilité limitée",
+    "SA à conseil d'administration (s.a.i.)",
+]
+NAME_PARTS = ["HOME", "BATI", "LOGI", "TRANS", "MEDI", "AGRI", "TECH", "DISTRI", "FRANCE", "NORD", "SUD", "EST"]
+ORGANIZATION_WORDS = ["ASSOCIATION", "SECOURS", "SOLIDARITÉ", "AIDE", "RESTOS", "ENTRAIDE", "CARITATIVE", "BANQUE ALIMENTAIRE"]
+TRANSPORTERS = ["CHRONOPOST", "TMF OPERATING", "GEODIS", "DB SCHENKER", "KUEHNE + NAGEL", "DHL FREIGHT", "HEPPNER", "XPO LOGISTICS"]
+TRANSPORT_BY = ["OFFERT", "FACTURATION", "CLIENT"]
+COMMENTARIES = ["-", "OP TERMINÉE", "X", "REMISE EXCEPTIONNELLE POUR LA PREMIÈRE OPÉRATION", "STOCK À RÉCUPÉRER SUR QUAI"]
+
+
+def _luhn_complete(digits: str) -> str:
+    """Ajoute à une suite de chiffres le chiffre de contrôle de Luhn."""
+    total = 0
+    for position, char in enumerate(reversed(digits + "0")):
+        value = int(char)
+        if position % 2 == 1:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return digits + str((10 - total % 10) % 10)
+
+
+def _schema_fields(schema: Dict[str, Any]) -> List[str]:
+    """Champs déclarés par le schéma d'entrée d'une table, dans l'ordre."""
+    return list(schema["items"]["properties"])
+
+
+def _nullable_fields(schema: Dict[str, Any]) -> List[str]:
+    """Champs du schéma qui acceptent la valeur null."""
+    nullable = []
+    for field, definition in schema["items"]["properties"].items():
+        types = definition.get("type")
+        if isinstance(types, list) and "null" in types:
+            nullable.append(field)
+    return nullable
+
+
+def _ordered(record: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Réordonne un enregistrement selon les champs du schéma (champs supplémentaires en fin)."""
+    ordered = {field: record[field] for field in fields if field in record}
+    for field, value in record.items():
+        if field not in ordered:
+            ordered[field] = value
+    return ordered
+
+
+def _with_missing_values(
+    rng: np.random.Generator,
+    record: Dict[str, Any],
+    nullable_fields: List[str],
+    rate: float
+) -> Dict[str, Any]:
+    """Met à null une partie des champs optionnels d'un enregistrement."""
+    for field in nullable_fields:
+        if field in record and rng.random() < rate:
+            record[field] = None
+    return record
+
+
+def _street(rng: np.random.Generator) -> str:
+    """Génère un libellé de voie (type + nom)."""
+    return f"{STREET_TYPES[rng.integers(len(STREET_TYPES))]} {STREET_NAMES[rng.integers(len(STREET_NAMES))]}"
+
+
+def _messy_postal_code(rng: np.random.Generator, postal_code: str) -> str:
+    """Reproduit les défauts de code postal: zéro initial perdu ou chiffres espacés."""
+    draw = rng.random()
+    if draw < DEFECT_RATES["postal_code_4_digits"]:
+        return postal_code.lstrip("0") or postal_code
+    if draw < DEFECT_RATES["postal_code_4_digits"] + DEFECT_RATES["postal_code_spaced"]:
+        return f"{postal_code[:2]} {postal_code[2:]}"
+    return postal_code
+
+
+def _operation_code(rng: np.random.Generator, index: int) -> str:
+    """Génère un code d'opération au format des st_io (AAAAMMJJ-NNN-NNN)."""
+    year = 2023 + int(rng.integers(3))
+    month = 1 + int(rng.integers(12))
+    day = 1 + int(rng.integers(28))
+    # Suffixe tiré de l'index: codes uniques jusqu'à un million de stocks
+    return f"{year}{month:02d}{day:02d}-{index // 1000 % 1000:03d}-{index % 1000:03d}"
+
+
+def generate_companies(rng: np.random.Generator, count: int) -> List[Dict[str, Any]]:
+    """
+    Génère les entreprises: identifiants SIREN/SIRET/TVA valides, sauf défauts injectés.
+
+    Args:
+        rng: Générateur aléatoire
+        count: Nombre d'entreprises
+
+    Returns:
+        Liste des enregistrements companies
+    """
+    fields = _schema_fields(COMPANIES_SCHEMA)
+    nullable = [field for field in _nullable_fields(COMPANIES_SCHEMA) if field not in ("co_siren",)]
+    records = []
+
+    for co_id in range(count):
+        siren = _luhn_complete(f"{int(rng.integers(10 ** 7, 10 ** 8)):08d}")
+        siret = _luhn_complete(siren + f"{int(rng.integers(1, 10 ** 4)):04d}")
+        vat_key = (12 + 3 * (int(siren) % 97)) % 97
+        postal_code, city = CITIES[rng.integers(len(CITIES))]
+
+        address = f"{int(rng.integers(1, 300))} {_street(rng)}"
+        if rng.random() < 0.1:
+            # Complément d'adresse collé dans l'adresse du siège
+            address = f"{ADDRESS_PREFIXES[rng.integers(len(ADDRESS_PREFIXES))]} ; {address}"
+
+        record = {
+            "co_id": co_id,
+            "co_business_name": f"{NAME_PARTS[rng.integers(len(NAME_PARTS))]}{NAME_PARTS[rng.integers(len(NAME_PARTS))]} {co_id}",
+            "co_siren": siren,
+            "co_siret": siret,
+            "co_vat": f"FR{vat_key:02d}{siren}",
+            "co_code_ent": f"{int(rng.integers(10 ** 5, 10 ** 6))}",
+            "co_head_office_address": address,
+            "co_head_office_city": city,
+            "co_head_office_postal_code": _messy_postal_code(rng, postal_code),
+            "co_legal_form": LEGAL_FORMS[rng.integers(len(LEGAL_FORMS))],
+            "fk_us": int(rng.integers(3)),
+        }
+
+        if rng.random() < DEFECT_RATES["siren_truncated"]:
+            record["co_siren"] = siren[1:]
+        if rng.random() < DEFECT_RATES["siret_missing"]:
+            record["co_siret"] = None
+
+        records.append(_ordered(_with_missing_values(rng, record, nullable, DEFECT_RATES["missing_value"]), fields))
+
+    return records
+
+
+def generate_organizations(rng: np.random.Generator, count: int) -> List[Dict[str, Any]]:
+    """
+    Génère les organisations (RNA au format W + 9 chiffres, sauf défauts injectés).
+
+    Args:
+        rng: Générateur aléatoire
+        count: Nombre d'organisations
+
+    Returns:
+        Liste des enregistrements organizations
+    """
+    fields = _schema_fields(ORGANIZATIONS_SCHEMA)
+    nullable = _nullable_fields(ORGANIZATIONS_SCHEMA)
+    records = []
+
+    for or_id in range(count):
+        postal_code, city = CITIES[rng.integers(len(CITIES))]
+        rna = f"W{int(rng.integers(10 ** 8, 10 ** 9)):09d}"
+        if rng.random() < DEFECT_RATES["siren_truncated"]:
+            rna = rna[:-1]
+
+        record = {
+            "or_id": or_id,
+            "or_denomination": f"{ORGANIZATION_WORDS[rng.integers(len(ORGANIZATION_WORDS))]} {city.title()} {or_id}",
+            "or_rna": rna,
+            "or_house_number": str(int(rng.integers(1, 200))) if rng.random() < 0.6 else None,
+            "or_street": _street(rng),
+            "or_additional_address": "" if rng.random() < 0.7 else ADDRESS_PREFIXES[rng.integers(len(ADDRESS_PREFIXES))],
+            "or_postal_code": _messy_postal_code(rng, postal_code),
+            "or_city": city,
+            # Identifiant d'adresse fourni sous forme de chaîne dans les exports
+            "or_id_address": str(int(rng.integers(10 ** 5, 10 ** 6))),
+            "or_state": STATES[rng.integers(len(STATES))],
+        }
+
+        records.append(_ordered(_with_missing_values(rng, record, nullable, DEFECT_RATES["missing_value"]), fields))
+
+    return records
+
+
+def generate_stocks_and_imports(
+    rng: np.random.Generator,
+    stock_count: int,
+    company_count: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Génère les stocks et leurs imports: chaque stock référence 1 à 5 imports,
+    chaque import référence son stock (fk_st) et l'entreprise du stock (fk_co).
+
+    Args:
+        rng: Générateur aléatoire
+        stock_count: Nombre de stocks
+        company_count: Nombre d'entreprises référençables
+
+    Returns:
+        Dictionnaire {"stocks": [...], "stock_import": [...]}
+    """
+    stock_fields = _schema_fields(STOCKS_SCHEMA)
+    import_fields = _schema_fields(STOCK_IMPORT_SCHEMA)
+    stocks = []
+    imports = []
+    # Répartition observée: 92 % des stocks ont un seul import
+    import_counts = rng.choice([1, 2, 3, 4, 5], size=stock_count, p=[0.92, 0.045, 0.018, 0.01, 0.007])
+
+    for st_id in range(stock_count):
+        st_io = _operation_code(rng, st_id)
+        fk_co = int(rng.integers(company_count)) if company_count else None
+        stock_import_ids = []
+
+        for position in range(int(import_counts[st_id])):
+            si_id = len(imports)
+            stock_import_ids.append(si_id)
+            delivery = f"{st_io[:4]}-{st_io[4:6]}-{int(rng.integers(1, 29)):02d}"
+            imports.append(_ordered({
+                "id_ope": st_io,
+                "si_id": si_id,
+                "si_io": f"{st_io}-{position + 1}",
+                "si_date_removal": delivery if rng.random() < 0.6 else None,
+                "si_date_delivery": delivery,
+                "si_total_price": round(float(rng.uniform(100, 250000)), 2),
+                "fk_st": st_id,
+                "fk_co": fk_co,
+            }, import_fields))
+
+        if rng.random() < DEFECT_RATES["duplicated_stock_import"]:
+            stock_import_ids.append(stock_import_ids[0])
+
+        commission_percent: Any = round(float(rng.choice([0.05, 0.1, 0.12, 0.15, 0.18, 0.2])), 4)
+        draw = rng.random()
+        if draw < DEFECT_RATES["commission_as_percent"]:
+            # Pourcentage saisi en valeur entière (20 au lieu de 0.2)
+            commission_percent = round(commission_percent * 100, 2)
+        elif draw < DEFECT_RATES["commission_as_percent"] + DEFECT_RATES["commission_as_string"]:
+            commission_percent = f"{commission_percent * 100:g}%"
+
+        commentary = COMMENTARIES[rng.integers(len(COMMENTARIES))]
+        if rng.random() < DEFECT_RATES["commentary_zero"]:
+            commentary = "0"
+
+        stocks.append(_ordered({
+            "st_id": st_id,
+            "st_io": st_io,
+            "st_commission_%": commission_percent,
+            "st_commission": round(float(rng.uniform(10, 20000)), 4),
+            "st_creation_date": f"{st_io[:4]}-{st_io[4:6]}-{st_io[6:8]}",
+            "st_transportby": TRANSPORT_BY[rng.integers(len(TRANSPORT_BY))] if rng.random() > 0.02 else "-",
+            "st_commentary": commentary if rng.random() > 0.05 else None,
+            "st_is_freetransport": bool(rng.random() < 0.4),
+            "fk_sta": 8,
+            "fk_co": fk_co,
+            "stock_import": stock_import_ids,
+        }, stock_fields))
+
+    return {"stocks": stocks, "stock_import": imports}
+
+
+def generate_logistic_addresses(
+    rng: np.random.Generator,
+    count: int,
+    stock_imports: List[Dict[str, Any]],
+    company_count: int,
+    organization_count: int
+) -> List[Dict[str, Any]]:
+    """
+    Génère les adresses logistiques: adresse complète souvent saisie dans
+    la_street, rattachement à une entreprise ou une organisation et aux
+    imports de stock desservis.
+
+    Args:
+        rng: Générateur aléatoire
+        count: Nombre d'adresses
+        stock_imports: Imports de stock générés (répartis entre les adresses)
+        company_count: Nombre d'entreprises référençables
+        organization_count: Nombre d'organisations référençables
+
+    Returns:
+        Liste des enregistrements logistic_address
+    """
+    fields = _schema_fields(LOGISTIC_ADDRESS_SCHEMA)
+    served = [[] for _ in range(count)]
+    for stock_import in stock_imports:
+        served[int(rng.integers(count))].append(stock_import)
+    records = []
+
+    for la_id in range(count):
+        postal_code, city = CITIES[rng.integers(len(CITIES))]
+        house_number = str(int(rng.integers(1, 300)))
+        street = _street(rng)
+        record = {
+            "la_id": la_id,
+            "la_house_number": house_number,
+            "grp_id_ope_org.1": [stock_import["si_io"] for stock_import in served[la_id]],
+            "la_street": street,
+            "la_additional_address": "",
+            "la_postal_code": postal_code,
+            "la_city": city,
+        }
+
+        draw = rng.random()
+        if draw < DEFECT_RATES["address_in_street"]:
+            # Adresse entière dans la_street, autres champs vides
+            street_value = f"{house_number} {street}"
+            if rng.random() < DEFECT_RATES["address_with_city"] / DEFECT_RATES["address_in_street"]:
+                street_value += f", {postal_code} {city}"
+            elif rng.random() < 0.1:
+                street_value = f"{ADDRESS_PREFIXES[rng.integers(len(ADDRESS_PREFIXES))]}, {street_value}"
+            record.update({
+                "la_house_number": "",
+                "la_street": street_value + (" " if rng.random() < 0.2 else ""),
+                "la_postal_code": "",
+                "la_city": None,
+            })
+        else:
+            record["la_postal_code"] = _messy_postal_code(rng, postal_code)
+
+        owner_is_company = organization_count == 0 or rng.random() < 0.7
+        record.update({
+            "la_truck_access": bool(rng.random() < 0.3),
+            "la_loading_dock": bool(rng.random() < 0.2),
+            "la_forklift": bool(rng.random() < 0.3),
+            "la_pallet": bool(rng.random() < 0.4),
+            "la_fenwick": bool(rng.random() < 0.2),
+            "la_palet_capacity": int(rng.integers(0, 40)),
+            "la_longitude": 0,
+            "la_latitude": 0,
+            "la_isactive": bool(rng.random() < 0.3),
+            "fk_co": int(rng.integers(company_count)) if owner_is_company and company_count else None,
+            "fk_or": None if owner_is_company else int(rng.integers(organization_count)),
+            "stock_import": [stock_import["si_id"] for stock_import in served[la_id]],
+        })
+
+        records.append(_ordered(record, fields))
+
+    return records
+
+
+def generate_transports(
+    rng: np.random.Generator,
+    stock_imports: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Génère les transporteurs et la liste (avec doublons) des imports transportés.
+
+    Args:
+        rng: Générateur aléatoire
+        stock_imports: Imports de stock générés
+
+    Returns:
+        Liste des enregistrements transports
+    """
+    fields = _schema_fields(TRANSPORTS_SCHEMA)
+    count = max(1, int(len(stock_imports) * TABLE_RATIOS["transports_per_stock_import"]))
+    carried = [[] for _ in range(count)]
+    # Quelques transporteurs concentrent la plupart des imports
+    weights = 1 / np.arange(1, count + 1)
+    owners = rng.choice(count, size=len(stock_imports), p=weights / weights.sum())
+    for stock_import, owner in zip(stock_imports, owners):
+        carried[owner].append(stock_import["si_id"])
+        if rng.random() < DEFECT_RATES["duplicated_stock_import"]:
+            carried[owner].append(stock_import["si_id"])
+
+    records = []
+    for tra_id in range(count):
+        name = TRANSPORTERS[tra_id % len(TRANSPORTERS)]
+        if tra_id >= len(TRANSPORTERS):
+            name = f"{name} {tra_id // len(TRANSPORTERS)}"
+        records.append(_ordered({
+            "tra_id": tra_id,
+            "tra_denomination": name,
+            "stock_import": carried[tra_id],
+        }, fields))
+
+    return records
+
+
+def generate_positioning_and_deliveries(
+    rng: np.random.Generator,
+    stock_imports: List[Dict[str, Any]],
+    logistic_addresses: List[Dict[str, Any]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Génère un positionnement et une livraison par import de stock.
+
+    Les champs suivent les schémas d'entrée de positioning et deliveries ;
+    une partie des champs optionnels est mise à null, hormis les codes
+    d'opération (si_io, id_ope_org) qui servent à résoudre fk_si et fk_po.
+
+    Args:
+        rng: Générateur aléatoire
+        stock_imports: Imports de stock générés
+        logistic_addresses: Adresses logistiques générées (fk_la)
+
+    Returns:
+        Dictionnaire {"positioning": [...], "deliveries": [...]}
+    """
+    positioning_fields = _schema_fields(POSITIONING_SCHEMA)
+    positioning_nullable = [
+        field for field in _nullable_fields(POSITIONING_SCHEMA)
+        if field not in POSITIONING_SCHEMA["items"]["required"] and field != "si_io"
+    ]
+    delivery_fields = _schema_fields(DELIVERIES_SCHEMA)
+    delivery_nullable = [
+        field for field in _nullable_fields(DELIVERIES_SCHEMA)
+        if field not in DELIVERIES_SCHEMA["items"]["required"]
+    ]
+    address_by_import = {}
+    for address in logistic_addresses:
+        for si_id in address["stock_import"]:
+            address_by_import[si_id] = address["la_id"]
+
+    positioning = []
+    deliveries = []
+    for po_id, stock_import in enumerate(stock_imports):
+        record = {
+            "po_id": po_id,
+            "si_io": stock_import["si_io"],
+            "po_validated": bool(rng.random() < 0.9),
+            "po_nb_items": int(rng.integers(1, 4)),
+            "po_nb_proposed": int(rng.integers(1, 4)),
+            "fk_st": stock_import["fk_st"],
+            "fk_ca": int(rng.integers(20)),
+            "fk_si": stock_import["si_id"],
+            "fk_la": address_by_import.get(stock_import["si_id"]),
+        }
+        positioning.append(_ordered(
+            _with_missing_values(rng, record, positioning_nullable, DEFECT_RATES["missing_value"]), positioning_fields
+        ))
+        record = {
+            "fk_po": po_id,
+            "id_ope_org": stock_import["si_io"],
+            "prise_en_charge_transport": TRANSPORT_BY[rng.integers(len(TRANSPORT_BY))],
+            "de_date_removal": stock_import["si_date_removal"],
+            "de_date_delivery": stock_import["si_date_delivery"],
+            "de_total_price": round(float(rng.uniform(100, 2000)), 2),
+        }
+        deliveries.append(_ordered(
+            _with_missing_values(rng, record, delivery_nullable, DEFECT_RATES["missing_value"]), delivery_fields
+        ))
+
+    return {"positioning": positioning, "deliveries": deliveries}
+
+
+def generate_dataset(size: int, seed: int = 0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Génère un jeu de données complet et cohérent.
+
+    Args:
+        size: Nombre de stocks (les autres tables suivent TABLE_RATIOS)
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        Dictionnaire table -> liste d'enregistrements
+    """
+    rng = np.random.default_rng(seed)
+    company_count = max(1, int(size * TABLE_RATIOS["companies"]))
+    organization_count = max(1, int(size * TABLE_RATIOS["organizations"]))
+    address_count = max(1, int(size * TABLE_RATIOS["logistic_address"]))
+
+    dataset = {
+        "companies": generate_companies(rng, company_count),
+        "organizations": generate_organizations(rng, organization_count),
+    }
+    dataset.update(generate_stocks_and_imports(rng, size, company_count))
+    dataset["logistic_address"] = generate_logistic_addresses(
+        rng, address_count, dataset["stock_import"], company_count, organization_count
+    )
+    dataset["transports"] = generate_transports(rng, dataset["stock_import"])
+    dataset.update(generate_positioning_and_deliveries(rng, dataset["stock_import"], dataset["logistic_address"]))
+
+    return dataset
+
+
+def write_dataset(
+    size: int,
+    output_dir: str,
+    seed: int = 0,
+    tables: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """
+    Génère un jeu de données et écrit un fichier JSON par table.
+
+    Chaque table est écrite dès qu'elle est générée et libérée dès qu'aucune
+    table restante n'en dépend, afin de limiter la mémoire pour les grandes tailles.
+    Le contenu est identique à generate_dataset(size, seed).
+
+    Args:
+        size: Nombre de stocks (les autres tables suivent TABLE_RATIOS)
+        output_dir: Répertoire de sortie (un fichier <table>.json par table)
+        seed: Graine du générateur aléatoire
+        tables: Tables à écrire (None pour toutes)
+
+    Returns:
+        Dictionnaire table -> chemin du fichier écrit
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    company_count = max(1, int(size * TABLE_RATIOS["companies"]))
+    organization_count = max(1, int(size * TABLE_RATIOS["organizations"]))
+    address_count = max(1, int(size * TABLE_RATIOS["logistic_address"]))
+    paths = {}
+
+    def write(table: str, records: List[Dict[str, Any]]) -> None:
+        if tables is None or table in tables:
+            paths[table] = os.path.join(output_dir, f"{table}.json")
+            write_json_array(paths[table], [records])
+
+    # Même ordre de tirage que generate_dataset
+    write("companies", generate_companies(rng, company_count))
+    write("organizations", generate_organizations(rng, organization_count))
+    stocks_and_imports = generate_stocks_and_imports(rng, size, company_count)
+    write("stocks", stocks_and_imports.pop("stocks"))
+    stock_imports = stocks_and_imports.pop("stock_import")
+    write("stock_import", stock_imports)
+    logistic_addresses = generate_logistic_addresses(
+        rng, address_count, stock_imports, company_count, organization_count
+    )
+    write("logistic_address", logistic_addresses)
+    write("transports", generate_transports(rng, stock_imports))
+    positioning_and_deliveries = generate_positioning_and_deliveries(rng, stock_imports, logistic_addresses)
+    write("positioning", positioning_and_deliveries["positioning"])
+    write("deliveries", positioning_and_deliveries["deliveries"])
+
+    return paths
@@ -8,6 +8,81 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.factorize import map_unique_values
+from src.utils.copy_on_write import step_copy
+
+
+# Liste des champs textuels à traiter
+TEXT_FIELDS = [
+    "co_business_name",
+    "co_head_office_address",
+    "co_head_office_city",
+    "co_legal_form",
+    "co_head_office_additional_address"
+]
+
+# Définition des règles de nettoyage par champ
+CLEANING_RULES = {
+    "co_business_name": {
+        "punctuation_to_remove": r'[.,;:!?"()]',
+        "punctuation_to_keep": r'[-\']',  # Conserver les tirets et apostrophes
+        "exceptions": ["S.A.", "S.A.R.L.", "S.A.S.", "S.C.I.", "E.U.R.L."]
+    },
+    "co_head_office_address": {
+        "punctuation_to_remove": r'[;:!?"()]',
+        "punctuation_to_keep": r'[-\',.]',  # Conserver les tirets, apostrophes, virgules et points
+        "exceptions": []
+    },
+    "co_head_office_city": {
+        "punctuation_to_remove": r'[.,;:!?"()]',
+        "punctuation_to_keep": r'[-\']',
+        "exceptions": ["ST.", "STE."]
+    },
+    "co_legal_form": {
+        "punctuation_to_remove": r'[,;:!?"()]',
+        "punctuation_to_keep": r'[-\'.]',  # Conserver les points pour les abréviations
+        "exceptions": ["S.A.", "S.A.R.L.", "S.A.S.", "S.C.I.", "E.U.R.L."]
+    },
+    "co_head_office_additional_address": {
+        "punctuation_to_remove": r'[;:!?"()]',
+        "punctuation_to_keep": r'[-\',.]',
+        "exceptions": []
+    }
+}
+
+
+def clean_punctuation_string(value: Any, field: str) -> Any:
+    """Nettoie la ponctuation d'une valeur textuelle selon les règles du champ."""
+    if pd.isna(value) or not isinstance(value, str):
+        return value
+        
+    # Récupérer les règles spécifiques au champ
+    rules = CLEANING_RULES.get(field, {
+        "punctuation_to_remove": r'[.,;:!?"()]',
+        "punctuation_to_keep": r'[-\']',
+        "exceptions": []
+    })
+    
+    # Vérifier si la valeur contient des exceptions à préserver
+    for exception in rules["exceptions"]:
+        if exception in value:
+            # Remplacer temporairement l'exception par un marqueur unique
+            placeholder = f"__EXCEPTION_{hash(exception)}__"
+            value = value.replace(exception, placeholder)
+    
+    # Appliquer la règle de suppression de ponctuation
+    value = re.sub(rules["punctuation_to_remove"], '', value)
+    
+    # Restaurer les exceptions
+    for exception in rules["exceptions"]:
+        placeholder = f"__EXCEPTION_{hash(exception)}__"
+        value = value.replace(placeholder, exception)
+    
+    # Normaliser les espaces (à nouveau, car la suppression de ponctuation peut créer des espaces multiples)
+    value = re.sub(r'\s+', ' ', value).strip()
+    
+    return value
+
 
 def clean_punctuation(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -27,92 +102,21 @@ def clean_punctuation(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, An
         - La liste des erreurs ou modifications détectées
     """
     errors = []
-    result_df = df.copy()
-    
-    # Liste des champs textuels à traiter
-    text_fields = [
-        "co_business_name",
-        "co_head_office_address",
-        "co_head_office_city",
-        "co_legal_form",
-        "co_head_office_additional_address"
-    ]
-    
-    # Définition des règles de nettoyage par champ
-    cleaning_rules = {
-        "co_business_name": {
-            "punctuation_to_remove": r'[.,;:!?"()]',
-            "punctuation_to_keep": r'[-\']',  # Conserver les tirets et apostrophes
-            "exceptions": ["S.A.", "S.A.R.L.", "S.A.S.", "S.C.I.", "E.U.R.L."]
-        },
-        "co_head_office_address": {
-            "punctuation_to_remove": r'[;:!?"()]',
-            "punctuation_to_keep": r'[-\',.]',  # Conserver les tirets, apostrophes, virgules et points
-            "exceptions": []
-        },
-        "co_head_office_city": {
-            "punctuation_to_remove": r'[.,;:!?"()]',
-            "punctuation_to_keep": r'[-\']',
-            "exceptions": ["ST.", "STE."]
-        },
-        "co_legal_form": {
-            "punctuation_to_remove": r'[,;:!?"()]',
-            "punctuation_to_keep": r'[-\'.]',  # Conserver les points pour les abréviations
-            "exceptions": ["S.A.", "S.A.R.L.", "S.A.S.", "S.C.I.", "E.U.R.L."]
-        },
-        "co_head_office_additional_address": {
-            "punctuation_to_remove": r'[;:!?"()]',
-            "punctuation_to_keep": r'[-\',.]',
-            "exceptions": []
-        }
-    }
-    
-    # Fonction pour nettoyer la ponctuation dans une chaîne
-    def clean_punctuation_string(value, field):
-        if pd.isna(value) or not isinstance(value, str):
-            return value
-            
-        # Récupérer les règles spécifiques au champ
-        rules = cleaning_rules.get(field, {
-            "punctuation_to_remove": r'[.,;:!?"()]',
-            "punctuation_to_keep": r'[-\']',
-            "exceptions": []
-        })
-        
-        # Vérifier si la valeur contient des exceptions à préserver
-        for exception in rules["exceptions"]:
-            if exception in value:
-                # Remplacer temporairement l'exception par un marqueur unique
-                placeholder = f"__EXCEPTION_{hash(exception)}__"
-                value = value.replace(exception, placeholder)
-        
-        # Appliquer la règle de suppression de ponctuation
-        value = re.sub(rules["punctuation_to_remove"], '', value)
-        
-        # Restaurer les exceptions
-        for exception in rules["exceptions"]:
-            placeholder = f"__EXCEPTION_{hash(exception)}__"
-            value = value.replace(placeholder, exception)
-        
-        # Normaliser les espaces (à nouveau, car la suppression de ponctuation peut créer des espaces multiples)
-        value = re.sub(r'\s+', ' ', value).strip()
-        
-        return value
+    result_df = step_copy(df)
     
     # Appliquer le nettoyage sur chaque champ textuel
-    for field in text_fields:
+    for field in TEXT_FIELDS:
         if field in result_df.columns:
             try:
                 # Sauvegarde des valeurs originales pour comparaison
                 original_values = result_df[field].copy()
                 
-                # Application du nettoyage avec les règles spécifiques au champ
-                result_df[field] = result_df[field].apply(
-                    lambda x: clean_punctuation_string(x, field)
+                # Application du nettoyage avec les règles spécifiques au champ, une fois par valeur distincte
+                result_df[field], modified_mask = map_unique_values(
+                    result_df[field], lambda x: clean_punctuation_string(x, field)
                 )
                 
-                # Détection des lignes modifiées pour logging
-                modified_mask = (original_values != result_df[field]) & (~pd.isna(original_values))
+                # Lignes modifiées pour logging
                 modified_indices = result_df.index[modified_mask].tolist()
                 
                 # Enregistrement des modifications pour suivi
@@ -142,8 +146,8 @@ def clean_punctuation(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, An
     
     # Mise à jour du champ normalisé pour le nom d'entreprise
     if 'co_normalized_business_name' in result_df.columns:
-        result_df['co_normalized_business_name'] = result_df['co_normalized_business_name'].apply(
-            lambda x: clean_punctuation_string(x, "co_business_name")
+        result_df['co_normalized_business_name'], _ = map_unique_values(
+            result_df['co_normalized_business_name'], lambda x: clean_punctuation_string(x, "co_business_name")
         )
     
     return result_df, errors
\ No newline at end of file
@@ -8,6 +8,36 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.factorize import map_unique_values
+from src.utils.copy_on_write import step_copy
+
+
+# Liste des champs textuels à normaliser
+TEXT_FIELDS = [
+    "co_business_name",
+    "co_head_office_address",
+    "co_head_office_city",
+    "co_legal_form",
+    "co_head_office_additional_address"
+]
+
+
+def normalize_string(value: Any) -> Any:
+    """Normalise une valeur textuelle: trim, normalisation des espaces, majuscules."""
+    if pd.isna(value) or not isinstance(value, str):
+        return value
+    
+    # Trim: suppression des espaces en début et fin
+    value = value.strip()
+    
+    # Normalisation des espaces: remplacer les multiples espaces par un seul
+    value = re.sub(r'\s+', ' ', value)
+    
+    # Conversion en majuscules
+    value = value.upper()
+    
+    return value
+
 
 def normalize_text(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -27,45 +57,19 @@ def normalize_text(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
         - La liste des erreurs de normalisation détectées
     """
     errors = []
-    result_df = df.copy()
-    
-    # Liste des champs textuels à normaliser
-    text_fields = [
-        "co_business_name",
-        "co_head_office_address",
-        "co_head_office_city",
-        "co_legal_form",
-        "co_head_office_additional_address"
-    ]
+    result_df = step_copy(df)
     
-    # Fonction de normalisation à appliquer sur chaque champ
-    def normalize_string(value):
-        if pd.isna(value) or not isinstance(value, str):
-            return value
-        
-        # Trim: suppression des espaces en début et fin
-        value = value.strip()
-        
-        # Normalisation des espaces: remplacer les multiples espaces par un seul
-        value = re.sub(r'\s+', ' ', value)
-        
-        # Conversion en majuscules
-        value = value.upper()
-        
-        return value
-
     # Appliquer la normalisation sur chaque champ textuel
-    for field in text_fields:
+    for field in TEXT_FIELDS:
         if field in result_df.columns:
             try:
                 # Sauvegarde des valeurs originales pour comparaison
                 original_values = result_df[field].copy()
                 
-                # Application de la normalisation
-                result_df[field] = result_df[field].apply(normalize_string)
+                # Application de la normalisation, une fois par valeur distincte
+                result_df[field], modified_mask = map_unique_values(result_df[field], normalize_string)
                 
-                # Détection des lignes modifiées pour logging
-                modified_mask = (original_values != result_df[field]) & (~pd.isna(original_values))
+                # Lignes modifiées pour logging
                 modified_indices = result_df.index[modified_mask].tolist()
                 
                 # Enregistrement des modifications pour suivi
@@ -96,7 +100,7 @@ def normalize_text(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
     # Création d'un champ normalisé spécifique pour le nom d'entreprise
     # Ce champ sera utilisé pour les recherches et correspondances
     try:
-        result_df['co_normalized_business_name'] = result_df['co_business_name'].apply(normalize_string)
+        result_df['co_normalized_business_name'], _ = map_unique_values(result_df['co_business_name'], normalize_string)
     except Exception as e:
         errors.append({
             "type": "field_creation_error",
@@ -8,6 +8,7 @@ from typing import Dict, List, Tuple, Any, Optional
 import pandas as pd
 
 from src.tables.companies.output_structure import OUTPUT_SCHEMA
+from src.utils.copy_on_write import step_copy
 
 
 def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
@@ -30,7 +31,7 @@ def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs/informations sur la préparation du modèle
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier la présence des champs obligatoires
     required_fields = ["co_id", "co_business_name", "fk_us"]
@@ -3,13 +3,18 @@ Module de traitement et décomposition des adresses pour les données Companies.
 Extrait le numéro et le nom de rue à partir de l'adresse complète.
 """
 
-import re
 from typing import Dict, List, Tuple, Any, Optional
 
 import pandas as pd
 
+from src.utils.address_parser import parse_addresses, parse_street_number, split_street_number
+from src.utils.copy_on_write import step_copy
 
-def split_address(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+
+def split_address(
+    df: pd.DataFrame,
+    memo_store: Optional[Dict[str, Any]] = None
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
     Analyse et décompose les adresses pour en extraire le numéro et le nom de rue.
     
@@ -21,6 +26,7 @@ def split_address(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]
     
     Args:
         df: DataFrame contenant les données Companies
+        memo_store: Cache persistant des adresses déjà décomposées (optionnel)
         
     Returns:
         Tuple contenant:
@@ -28,7 +34,7 @@ def split_address(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]
         - La liste des erreurs/informations de traitement
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne d'adresse existe
     if 'co_head_office_address' not in result_df.columns:
@@ -45,125 +51,61 @@ def split_address(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]
     if 'co_head_office_street' not in result_df.columns:
         result_df['co_head_office_street'] = None
     
-    # Patterns pour l'extraction d'adresses
-    # Pattern pour les adresses standards avec numéro au début
-    standard_address_pattern = re.compile(
-        r'^(\d+[\s,.-]*)?(BIS|TER|QUATER|A|B|C|D)?[\s,.-]*(.+)$',
-        re.IGNORECASE
-    )
-    
-    # Pattern pour les BP, CS, CEDEX, etc.
-    special_address_pattern = re.compile(
-        r'^(BP|CS|TSA|CEDEX)[\s,.-]*(\d+)[\s,.-]*(.*)$',
-        re.IGNORECASE
-    )
-    
-    def extract_address_components(address: str) -> Tuple[Optional[str], Optional[str]]:
-        """
-        Extrait le numéro et le nom de rue d'une adresse.
-        
-        Règles spécifiques:
-        - Si une lettre suit directement un nombre (ex: "11A"), elle fait partie du numéro
-        - Si une lettre est séparée du nombre par un espace, mais suivie d'un autre espace (ex: "11 A "), 
-        elle fait partie du numéro
-        - Si une lettre est séparée du nombre par un espace et suivie directement d'un texte (ex: "11 Arue"), 
-        elle fait partie du nom de rue
-        
-        Args:
-            address: L'adresse complète
-            
-        Returns:
-            Tuple contenant le numéro de rue et le nom de rue
-        """
-        if not address:
-            return None, None
-            
-        # Vérifier si c'est une adresse spéciale (BP, CEDEX, etc.)
-        special_match = special_address_pattern.match(address)
-        if special_match:
-            prefix, number, rest = special_match.groups()
-            street_number = f"{prefix} {number}".strip()
-            street_name = rest.strip() if rest else None
-            return street_number, street_name
-        
-        # Pattern révisé pour adresses standards - capture les formats comme:
-        # "11A" (numéro+lettre directement accolée)
-        # "11 A" (numéro+espace+lettre+espace)
-        # "11 Arue" (numéro+espace+lettre suivie de texte sans espace)
-        revised_pattern = re.compile(
-            r'^(\d+)(?:([A-Za-z])(?=\s|$)|\s+([A-Za-z])\s+|\s+)(.*)$'
-        )
-        
-        match = revised_pattern.match(address)
-        if match:
-            number, letter_attached, letter_with_spaces, street = match.groups()
-            
-            # Construction du numéro de rue
-            if letter_attached:  # Cas "11A"
-                street_number = f"{number}{letter_attached}"
-            elif letter_with_spaces:  # Cas "11 A "
-                street_number = f"{number}{letter_with_spaces}"
-            else:  # Cas "11" ou "11 Arue"
-                street_number = number
-            
-            # Construction du nom de rue
-            if street:
-                # Si on a eu le cas "11 A ", la lettre est déjà prise en compte dans le numéro
-                if letter_with_spaces:
-                    street_name = street.strip()
-                # Si pas de lettre accolée ni avec espace, utiliser street directement
-                elif not letter_attached:
-                    street_name = street.strip()
-                # Si une lettre accolée (11A), utiliser street directement
-                else:
-                    street_name = street.strip()
-            else:
-                street_name = None
-            
-            return street_number.strip(), street_name
-        
-        # Si le format ne correspond à aucun pattern, tout est considéré comme nom de rue
-        return None, address.strip()
-    
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        address = row['co_head_office_address']
-        co_id = row['co_id']
-        
+    # Décomposition de chaque adresse distincte (analyseur commun, cache persistant)
+    addresses = result_df['co_head_office_address']
+    components = parse_addresses(addresses, parse_street_number, memo_store)
+    parsed_numbers = components["house_number"].to_numpy(dtype=object)
+    parsed_streets = components["street"].to_numpy(dtype=object)
+    addresses = addresses.to_numpy(dtype=object)
+    ids = result_df['co_id'].to_numpy(dtype=object)
+    numbers = result_df['co_head_office_number'].to_numpy(dtype=object, copy=True)
+    streets = result_df['co_head_office_street'].to_numpy(dtype=object, copy=True)
+    indices = result_df.index.tolist()
+    split_rows = 0
+
+    for position, address in enumerate(addresses):
         # Ignorer les valeurs nulles/vides
         if pd.isna(address) or address == '':
             continue
-        
+
         try:
             # Extraction des composants de l'adresse SANS considérer l'adresse complémentaire
-            number, street = extract_address_components(address)
-            
+            if isinstance(address, str):
+                number, street = parsed_numbers[position], parsed_streets[position]
+            else:
+                number, street = split_street_number(address)
+
             # Mise à jour des colonnes - ne pas toucher à co_head_office_additional_address
-            result_df.at[idx, 'co_head_office_number'] = number or ""
-            result_df.at[idx, 'co_head_office_street'] = street
-            
+            numbers[position] = number or ""
+            streets[position] = street
+            split_rows += 1
+
             # Enregistrement de l'information de décomposition
             errors.append({
                 "type": "address_splitting",
                 "severity": "info",
-                "co_id": co_id,
-                "index": idx,
+                "co_id": ids[position],
+                "index": indices[position],
                 "original_address": address,
                 "number": number,
                 "street": street
             })
-            
+
         except Exception as e:
             # Enregistrement de l'erreur en cas d'échec de décomposition
             errors.append({
                 "type": "address_splitting_error",
                 "severity": "error",
-                "co_id": co_id,
-                "index": idx,
+                "co_id": ids[position],
+                "index": indices[position],
                 "original_address": address,
                 "error_message": str(e)
             })
 
+    if split_rows:
+        result_df['co_head_office_number'] = pd.Series(numbers, index=result_df.index, dtype=object)
+        result_df['co_head_office_street'] = pd.Series(streets, index=result_df.index, dtype=object)
+
     # Avant de retourner le DataFrame, garantir que le numéro est toujours une chaîne
     result_df['co_head_office_number'] = result_df['co_head_office_number'].fillna("")
 
@@ -176,7 +118,7 @@ def fix_address_split_issues(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[
     avec l'adresse principale dans le champ co_head_office_street.
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Identifier les entrées où co_head_office_street contient l'adresse complémentaire
     for idx, row in result_df.iterrows():
@@ -5,6 +5,7 @@ Vérifie la cohérence entre SIREN, SIRET et numéro de TVA.
 
 from typing import Dict, List, Tuple, Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -17,6 +18,9 @@ def validate_id_relationships(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict
     - Le numéro de TVA français doit contenir le SIREN
     - Gestion des exceptions pour les entreprises étrangères
     
+    Chaque catégorie d'incohérence est calculée comme un masque sur les
+    colonnes entières ; seules les lignes concernées donnent lieu à une entrée.
+    
     Args:
         df: DataFrame contenant les données Companies
         
@@ -40,89 +44,104 @@ def validate_id_relationships(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict
             })
         return df, errors
     
-    # Traitement de chaque ligne pour vérifier la cohérence des identifiants
-    for idx, row in df.iterrows():
-        co_id = row['co_id']
-        siren = row['co_siren']
-        siret = row['co_siret']
-        vat = row['co_vat']
-        
-        # Ignorer les lignes sans identifiants
-        if pd.isna(siren) and pd.isna(siret) and pd.isna(vat):
-            continue
-        
-        # 1. Vérification de la relation SIREN-SIRET
-        if not pd.isna(siren) and not pd.isna(siret):
-            if len(siret) == 14 and len(siren) == 9:
-                if siret[:9] != siren:
-                    errors.append({
-                        "type": "siren_siret_mismatch",
-                        "severity": "error",
-                        "co_id": co_id,
-                        "index": idx,
-                        "siren": siren,
-                        "siret": siret,
-                        "reason": "Le SIRET doit commencer par le SIREN"
-                    })
-        
-        # 2. Vérification de la relation SIREN-TVA pour les entreprises françaises
-        if not pd.isna(siren) and not pd.isna(vat) and vat.startswith("FR"):
-            if len(vat) == 13 and len(siren) == 9:
-                vat_siren = vat[4:]  # Extraction du SIREN depuis le numéro de TVA
-                if vat_siren != siren:
-                    errors.append({
-                        "type": "siren_vat_mismatch",
-                        "severity": "error",
-                        "co_id": co_id,
-                        "index": idx,
-                        "siren": siren,
-                        "vat": vat,
-                        "vat_siren": vat_siren,
-                        "reason": "Le SIREN intégré dans le numéro de TVA ne correspond pas au SIREN déclaré"
-                    })
-        
-        # 3. Vérification de la présence d'identifiants partiels
-        # Si un SIRET est présent mais pas de SIREN
-        if not pd.isna(siret) and pd.isna(siren):
-            if len(siret) == 14:
-                extracted_siren = siret[:9]
-                errors.append({
-                    "type": "missing_siren_with_siret",
-                    "severity": "warning",
-                    "co_id": co_id,
-                    "index": idx,
-                    "siret": siret,
-                    "extracted_siren": extracted_siren,
-                    "reason": "SIREN manquant alors que le SIRET est présent"
-                })
-        
-        # 4. Vérification pour les entreprises avec TVA française mais sans SIREN
-        if not pd.isna(vat) and pd.isna(siren) and vat.startswith("FR"):
-            if len(vat) == 13:
-                extracted_siren = vat[4:]
-                errors.append({
-                    "type": "missing_siren_with_fr_vat",
-                    "severity": "warning",
-                    "co_id": co_id,
-                    "index": idx,
-                    "vat": vat,
-                    "extracted_siren": extracted_siren,
-                    "reason": "SIREN manquant alors que le numéro de TVA français est présent"
-                })
-        
-        # 5. Détection d'incohérences potentielles pour les entreprises étrangères
-        has_foreign_vat = not pd.isna(vat) and not vat.startswith("FR")
-        has_french_ids = (not pd.isna(siren) or not pd.isna(siret))
-        
-        if has_foreign_vat and has_french_ids:
+    siren = df['co_siren'].astype(object)
+    siret = df['co_siret'].astype(object)
+    vat = df['co_vat'].astype(object)
+
+    has_siren = siren.notna().to_numpy(dtype=bool)
+    has_siret = siret.notna().to_numpy(dtype=bool)
+    has_vat = vat.notna().to_numpy(dtype=bool)
+    french_vat = has_vat & vat.str.startswith("FR", na=False).to_numpy(dtype=bool)
+    siren_len9 = (siren.str.len() == 9).to_numpy(dtype=bool)
+    siret_len14 = (siret.str.len() == 14).to_numpy(dtype=bool)
+    vat_len13 = (vat.str.len() == 13).to_numpy(dtype=bool)
+
+    # Extraction des SIREN contenus dans le SIRET et dans le numéro de TVA
+    siren_values = siren.to_numpy(dtype=object)
+    siret_sirens = siret.str[:9].to_numpy(dtype=object)
+    vat_sirens = vat.str[4:].to_numpy(dtype=object)
+
+    # 1. Relation SIREN-SIRET: le SIRET doit commencer par le SIREN
+    siren_siret_mismatch = has_siren & has_siret & siret_len14 & siren_len9 & (siret_sirens != siren_values)
+
+    # 2. Relation SIREN-TVA pour les entreprises françaises
+    siren_vat_mismatch = has_siren & french_vat & vat_len13 & siren_len9 & (vat_sirens != siren_values)
+
+    # 3. SIRET présent mais pas de SIREN
+    missing_siren_with_siret = has_siret & ~has_siren & siret_len14
+
+    # 4. TVA française mais pas de SIREN
+    missing_siren_with_fr_vat = french_vat & ~has_siren & vat_len13
+
+    # 5. Incohérences potentielles pour les entreprises étrangères
+    inconsistent_nationality = has_vat & ~french_vat & (has_siren | has_siret)
+
+    # Erreurs émises uniquement pour les lignes incohérentes, dans l'ordre des lignes
+    ids = df['co_id'].to_numpy(dtype=object)
+    sirets = siret.to_numpy(dtype=object)
+    vats = vat.to_numpy(dtype=object)
+    indices = df.index.tolist()
+    flagged = (siren_siret_mismatch | siren_vat_mismatch | missing_siren_with_siret
+               | missing_siren_with_fr_vat | inconsistent_nationality)
+
+    for row in np.flatnonzero(flagged):
+        co_id = ids[row]
+        idx = indices[row]
+
+        if siren_siret_mismatch[row]:
+            errors.append({
+                "type": "siren_siret_mismatch",
+                "severity": "error",
+                "co_id": co_id,
+                "index": idx,
+                "siren": siren_values[row],
+                "siret": sirets[row],
+                "reason": "Le SIRET doit commencer par le SIREN"
+            })
+
+        if siren_vat_mismatch[row]:
+            errors.append({
+                "type": "siren_vat_mismatch",
+                "severity": "error",
+                "co_id": co_id,
+                "index": idx,
+                "siren": siren_values[row],
+                "vat": vats[row],
+                "vat_siren": vat_sirens[row],
+                "reason": "Le SIREN intégré dans le numéro de TVA ne correspond pas au SIREN déclaré"
+            })
+
+        if missing_siren_with_siret[row]:
+            errors.append({
+                "type": "missing_siren_with_siret",
+                "severity": "warning",
+                "co_id": co_id,
+                "index": idx,
+                "siret": sirets[row],
+                "extracted_siren": siret_sirens[row],
+                "reason": "SIREN manquant alors que le SIRET est présent"
+            })
+
+        if missing_siren_with_fr_vat[row]:
+            errors.append({
+                "type": "missing_siren_with_fr_vat",
+                "severity": "warning",
+                "co_id": co_id,
+                "index": idx,
+                "vat": vats[row],
+                "extracted_siren": vat_sirens[row],
+                "reason": "SIREN manquant alors que le numéro de TVA français est présent"
+            })
+
+        if inconsistent_nationality[row]:
             errors.append({
                 "type": "inconsistent_nationality",
                 "severity": "warning",
                 "co_id": co_id,
                 "index": idx,
-                "vat": vat,
-                "siren": siren,
-                "siret": siret,
+                "vat": vats[row],
+                "siren": siren_values[row],
+                "siret": sirets[row],
                 "reason": "Numéro de TVA étranger mais identifiants français (SIREN/SIRET) présents"
             })
     
@@ -0,0 +1,88 @@
+"""
+Module de traitement vectorisé des identifiants numériques (SIREN, SIRET).
+Nettoie des colonnes entières d'identifiants et vérifie leur clé de Luhn sur
+une matrice de chiffres, sans boucle Python par ligne.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Chiffre doublé par l'algorithme de Luhn (2 x d, moins 9 au-delà de 9)
+DOUBLED_DIGITS = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.int64)
+
+
+def clean_identifiers(values: np.ndarray, length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Nettoie une colonne d'identifiants.
+
+    Les caractères non numériques sont supprimés et un zéro est ajouté en
+    début d'identifiant s'il ne manque qu'un chiffre. Les valeurs non
+    textuelles sont conservées ; une chaîne sans chiffre devient None.
+
+    Args:
+        values: Valeurs de la colonne (tableau d'objets)
+        length: Nombre de chiffres attendu
+
+    Returns:
+        Tuple contenant:
+        - Les valeurs nettoyées (tableau d'objets)
+        - Le masque des valeurs textuelles
+        - Le nombre de chiffres de chaque valeur textuelle avant ajout du zéro (0 sinon)
+    """
+    text_mask = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    cleaned = values.copy()
+    digit_counts = np.zeros(len(values), dtype=np.int64)
+    if not text_mask.any():
+        return cleaned, text_mask, digit_counts
+
+    digits = pd.Series(values[text_mask], dtype=object).str.replace(r'\D', '', regex=True)
+    counts = digits.str.len().to_numpy(dtype=np.int64)
+    digits = digits.to_numpy(dtype=object, copy=True)
+    padded = counts == length - 1
+    digits[padded] = np.array(['0' + value for value in digits[padded]], dtype=object)
+    digits[counts == 0] = None
+
+    cleaned[text_mask] = digits
+    digit_counts[text_mask] = counts
+    return cleaned, text_mask, digit_counts
+
+
+def digit_matrix(identifiers: np.ndarray, length: int) -> np.ndarray:
+    """
+    Convertit des identifiants de même longueur en matrice de chiffres.
+
+    Args:
+        identifiers: Chaînes composées de length chiffres
+        length: Nombre de chiffres
+
+    Returns:
+        Matrice (identifiants x chiffres) d'entiers
+    """
+    codes = np.array(identifiers, dtype=f'<U{length}').view('<u4').reshape(-1, length)
+    matrix = codes.astype(np.int64) - ord('0')
+
+    # Chiffres non ASCII (reconnus par \d): conversion individuelle, rare
+    non_ascii = (matrix > 9).any(axis=1)
+    for position in np.flatnonzero(non_ascii):
+        matrix[position] = [int(char) for char in identifiers[position]]
+    return matrix
+
+
+def luhn_valid(identifiers: np.ndarray, length: int) -> np.ndarray:
+    """
+    Vérifie la clé de Luhn d'identifiants de même longueur.
+
+    Args:
+        identifiers: Chaînes composées de length chiffres
+        length: Nombre de chiffres
+
+    Returns:
+        Masque des identifiants dont la somme de Luhn est divisible par 10
+    """
+    matrix = digit_matrix(identifiers, length)
+    # Positions doublées: rang impair en comptant depuis la fin
+    doubled = (length - 1 - np.arange(length)) % 2 == 1
+    matrix[:, doubled] = DOUBLED_DIGITS[matrix[:, doubled]]
+    return matrix.sum(axis=1) % 10 == 0
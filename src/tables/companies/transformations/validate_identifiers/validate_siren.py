@@ -3,11 +3,14 @@ Module de validation des numéros SIREN pour les données Companies.
 Vérifie la validité des numéros SIREN selon les règles françaises.
 """
 
-import re
 from typing import Dict, List, Tuple, Any, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.tables.companies.transformations.validate_identifiers.identifier_digits import clean_identifiers, luhn_valid
+from src.utils.copy_on_write import step_copy
+
 
 def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -18,6 +21,9 @@ def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
     - Format: exactement 9 chiffres
     - Algorithme de Luhn pour vérifier la clé de contrôle
     
+    Les contrôles portent sur la colonne entière (matrice de chiffres) ; seules
+    les lignes modifiées ou invalides donnent lieu à une entrée d'erreur.
+    
     Args:
         df: DataFrame contenant les données Companies
         
@@ -27,7 +33,7 @@ def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
         - La liste des erreurs de validation détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne SIREN existe
     if 'co_siren' not in result_df.columns:
@@ -38,75 +44,47 @@ def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
         })
         return result_df, errors
     
-    # Expression régulière pour valider le format SIREN
-    siren_pattern = re.compile(r'^\d{9}$')
-    
-    def clean_siren(siren):
-        if pd.isna(siren) or not isinstance(siren, str):
-            return siren
-        
-        # Suppression des caractères non numériques
-        cleaned = re.sub(r'\D', '', siren)
-        
-        # Si le résultat est une chaîne vide, retourner None
-        if not cleaned:
-            return None
-        
-        # Si le SIREN a 8 chiffres, ajouter un 0 au début
-        if len(cleaned) == 8:
-            cleaned = '0' + cleaned
-                
-        return cleaned
-    
-    def is_valid_luhn(digits: str) -> bool:
-        """
-        Vérifie si une chaîne de chiffres est valide selon l'algorithme de Luhn.
-        
-        L'algorithme de Luhn, également connu sous le nom de formule mod 10, permet de 
-        valider une variété de numéros d'identification, notamment les SIREN.
-        """
-        # Conversion en liste d'entiers et inversion
-        digits = [int(d) for d in digits]
-        digits.reverse()
-        
-        # Application de l'algorithme
-        total = 0
-        for i, digit in enumerate(digits):
-            if i % 2 == 1:  # Positions impaires (en comptant depuis la fin)
-                digit *= 2
-                if digit > 9:
-                    digit -= 9
-            total += digit
-        
-        # Vérification que le total est divisible par 10
-        return total % 10 == 0
-    
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        siren = row['co_siren']
-        co_id = row['co_id']
-        
-        # Ignorer les valeurs nulles/vides
-        if pd.isna(siren) or siren == '':
-            continue
-        
-        # Nettoyage du SIREN
-        original_siren = siren
-        cleaned_siren = clean_siren(siren)
-        
-        # Si le nettoyage a modifié la valeur, enregistrer la modification
-        if cleaned_siren != original_siren:
-            result_df.at[idx, 'co_siren'] = cleaned_siren
-            
+    values = result_df['co_siren'].to_numpy(dtype=object)
+    ids = result_df['co_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+
+    # Valeurs à traiter (les valeurs nulles/vides sont ignorées)
+    present = ~pd.isna(values) & (values != '')
+
+    # Nettoyage de la colonne: suppression des caractères non numériques,
+    # ajout du zéro manquant aux SIREN de 8 chiffres
+    cleaned, text_mask, digit_counts = clean_identifiers(values, 9)
+    changed = present & text_mask & (cleaned != values)
+    if changed.any():
+        column = result_df['co_siren'].copy()
+        column[changed] = cleaned[changed]
+        result_df['co_siren'] = column
+
+    # Contrôles sur la colonne nettoyée: SIREN vide, format (9 chiffres), clé de Luhn
+    empty = changed & pd.isna(cleaned)
+    well_formed = present & text_mask & ~empty
+    well_formed[well_formed] = digit_counts[well_formed] + (digit_counts[well_formed] == 8) == 9
+    malformed = present & ~empty & ~well_formed
+    bad_checksum = np.zeros(len(values), dtype=bool)
+    bad_checksum[well_formed] = ~luhn_valid(cleaned[well_formed], 9)
+
+    # Erreurs émises uniquement pour les lignes modifiées ou invalides
+    for row in np.flatnonzero(changed | malformed | bad_checksum):
+        co_id = ids[row]
+        idx = indices[row]
+        original_siren = values[row]
+        siren = cleaned[row]
+
+        if changed[row]:
             # Vérifier si la correction concerne spécifiquement l'ajout d'un zéro au début (SIREN à 8 chiffres)
-            if len(re.sub(r'\D', '', original_siren)) == 8 and cleaned_siren == '0' + re.sub(r'\D', '', original_siren):
+            if digit_counts[row] == 8:
                 errors.append({
                     "type": "siren_missing_leading_zero",
                     "severity": "warning",  # ou "error" selon votre politique
                     "co_id": co_id,
                     "index": idx,
                     "original": original_siren,
-                    "cleaned": cleaned_siren,
+                    "cleaned": siren,
                     "reason": "SIREN de 8 chiffres corrigé automatiquement avec un zéro en début"
                 })
             else:
@@ -117,14 +95,10 @@ def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
                     "co_id": co_id,
                     "index": idx,
                     "original": original_siren,
-                    "cleaned": cleaned_siren
+                    "cleaned": siren
                 })
-            
-            # Mettre à jour la valeur pour la validation suivante
-            siren = cleaned_siren
-        
-        # Si le SIREN est None après nettoyage, passer à la ligne suivante
-        if siren is None:
+
+        if empty[row]:
             errors.append({
                 "type": "invalid_siren",
                 "severity": "warning",
@@ -133,22 +107,16 @@ def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
                 "original": original_siren,
                 "reason": "SIREN vide après nettoyage"
             })
-            continue
-            
-        # Validation du format
-        if not siren_pattern.match(siren):
+        elif malformed[row]:
             errors.append({
                 "type": "invalid_siren_format",
                 "severity": "error",
                 "co_id": co_id,
                 "index": idx,
                 "value": siren,
-                "reason": f"Le SIREN doit contenir exactement 9 chiffres (trouvé: {len(siren)})"
+                "reason": f"Le SIREN doit contenir exactement 9 chiffres (trouvé: {len(str(siren))})"
             })
-            continue
-        
-        # Validation avec l'algorithme de Luhn
-        if not is_valid_luhn(siren):
+        elif bad_checksum[row]:
             errors.append({
                 "type": "invalid_siren_checksum",
                 "severity": "error",
@@ -157,5 +125,5 @@ def validate_siren(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
                 "value": siren,
                 "reason": "Le SIREN ne respecte pas l'algorithme de Luhn"
             })
-    
+
     return result_df, errors
\ No newline at end of file
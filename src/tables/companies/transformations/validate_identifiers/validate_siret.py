@@ -3,11 +3,14 @@ Module de validation des numéros SIRET pour les données Companies.
 Vérifie la validité des numéros SIRET selon les règles françaises.
 """
 
-import re
 from typing import Dict, List, Tuple, Any, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.tables.companies.transformations.validate_identifiers.identifier_digits import clean_identifiers, luhn_valid
+from src.utils.copy_on_write import step_copy
+
 
 def validate_siret(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -21,6 +24,9 @@ def validate_siret(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
     - Cohérence avec le SIREN correspondant
     - Algorithme de Luhn pour vérifier la clé de contrôle
     
+    Les contrôles portent sur la colonne entière (matrice de chiffres) ; seules
+    les lignes modifiées ou invalides donnent lieu à une entrée d'erreur.
+    
     Args:
         df: DataFrame contenant les données Companies
         
@@ -30,7 +36,7 @@ def validate_siret(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
         - La liste des erreurs de validation détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si les colonnes nécessaires existent
     required_columns = ['co_siret', 'co_siren']
@@ -44,78 +50,58 @@ def validate_siret(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
             if column == 'co_siret':  # Sans SIRET, impossible de continuer
                 return result_df, errors
     
-    # Expression régulière pour valider le format SIRET
-    siret_pattern = re.compile(r'^\d{14}$')
-    
-    
-    def clean_siret(siret):
-        if pd.isna(siret) or not isinstance(siret, str):
-            return siret
-        
-        # Suppression des caractères non numériques
-        cleaned = re.sub(r'\D', '', siret)
-        
-        # Si le résultat est une chaîne vide, retourner None
-        if not cleaned:
-            return None
-        
-        # Si le SIRET a 13 chiffres, ajouter un 0 au début pour en avoir 14
-        if len(cleaned) == 13:
-            cleaned = '0' + cleaned
-                
-        return cleaned
-    
-    def is_valid_luhn(digits: str) -> bool:
-        """
-        Vérifie si une chaîne de chiffres est valide selon l'algorithme de Luhn.
-        """
-        # Conversion en liste d'entiers et inversion
-        digits = [int(d) for d in digits]
-        digits.reverse()
-        
-        # Application de l'algorithme
-        total = 0
-        for i, digit in enumerate(digits):
-            if i % 2 == 1:  # Positions impaires (en comptant depuis la fin)
-                digit *= 2
-                if digit > 9:
-                    digit -= 9
-            total += digit
-        
-        # Vérification que le total est divisible par 10
-        return total % 10 == 0
-    
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        siret = row['co_siret']
-        siren = row['co_siren']
-        co_id = row['co_id']
-        
-        # Ignorer les valeurs nulles/vides
-        if pd.isna(siret) or siret == '':
-            continue
-        
-        # Nettoyage du SIRET
-        original_siret = siret
-        cleaned_siret = clean_siret(siret)
-        
-        # Si le nettoyage a modifié la valeur, enregistrer la modification
-        if cleaned_siret != original_siret:
-            result_df.at[idx, 'co_siret'] = cleaned_siret
+    values = result_df['co_siret'].to_numpy(dtype=object)
+    sirens = result_df['co_siren'].to_numpy(dtype=object) if 'co_siren' in result_df.columns else None
+    ids = result_df['co_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+
+    # Valeurs à traiter (les valeurs nulles/vides sont ignorées)
+    present = ~pd.isna(values) & (values != '')
+
+    # Nettoyage de la colonne: suppression des caractères non numériques,
+    # ajout du zéro manquant aux SIRET de 13 chiffres
+    cleaned, text_mask, digit_counts = clean_identifiers(values, 14)
+    changed = present & text_mask & (cleaned != values)
+    if changed.any():
+        column = result_df['co_siret'].copy()
+        column[changed] = cleaned[changed]
+        result_df['co_siret'] = column
+
+    # Contrôles sur la colonne nettoyée: SIRET vide, format (14 chiffres)
+    empty = changed & pd.isna(cleaned)
+    well_formed = present & text_mask & ~empty
+    well_formed[well_formed] = digit_counts[well_formed] + (digit_counts[well_formed] == 13) == 14
+    malformed = present & ~empty & ~well_formed
+
+    # Cohérence avec le SIREN (9 premiers chiffres) et clé de Luhn des SIRET bien formés
+    siren_mismatch = np.zeros(len(values), dtype=bool)
+    bad_checksum = np.zeros(len(values), dtype=bool)
+    if well_formed.any():
+        prefixes = pd.Series(cleaned[well_formed], dtype=object).str[:9].to_numpy(dtype=object)
+        if sirens is not None:
+            expected = sirens[well_formed]
+            has_siren = ~pd.isna(expected) & expected.astype(bool)
+            siren_mismatch[well_formed] = has_siren & (prefixes != expected)
+        bad_checksum[well_formed] = ~luhn_valid(cleaned[well_formed], 14)
+
+    # Erreurs émises uniquement pour les lignes modifiées ou invalides
+    for row in np.flatnonzero(changed | malformed | siren_mismatch | bad_checksum):
+        co_id = ids[row]
+        idx = indices[row]
+        original_siret = values[row]
+        siret = cleaned[row]
+
+        if changed[row]:
             errors.append({
                 "type": "siret_cleaning",
                 "severity": "info",
                 "co_id": co_id,
                 "index": idx,
                 "original": original_siret,
-                "cleaned": cleaned_siret
+                "cleaned": siret
             })
-            
-            # Mettre à jour la valeur pour la validation suivante
-            siret = cleaned_siret
-        
-        # Si le SIRET est None après nettoyage, passer à la ligne suivante
-        if siret is None:
+
+        if empty[row]:
             errors.append({
                 "type": "invalid_siret",
                 "severity": "warning",
@@ -125,33 +111,30 @@ def validate_siret(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
                 "reason": "SIRET vide après nettoyage"
             })
             continue
-            
-        # Validation du format
-        if not siret_pattern.match(siret):
+
+        if malformed[row]:
             errors.append({
                 "type": "invalid_siret_format",
                 "severity": "error",
                 "co_id": co_id,
                 "index": idx,
                 "value": siret,
-                "reason": f"Le SIRET doit contenir exactement 14 chiffres (trouvé: {len(siret)})"
+                "reason": f"Le SIRET doit contenir exactement 14 chiffres (trouvé: {len(str(siret))})"
             })
             continue
-        
-        # Validation de la cohérence avec le SIREN
-        if not pd.isna(siren) and siren and siret[:9] != siren:
+
+        if siren_mismatch[row]:
             errors.append({
                 "type": "siret_siren_mismatch",
                 "severity": "error",
                 "co_id": co_id,
                 "index": idx,
                 "siret": siret,
-                "siren": siren,
+                "siren": sirens[row],
                 "reason": "Les 9 premiers chiffres du SIRET doivent correspondre au SIREN"
             })
-        
-        # Validation avec l'algorithme de Luhn
-        if not is_valid_luhn(siret):
+
+        if bad_checksum[row]:
             errors.append({
                 "type": "invalid_siret_checksum",
                 "severity": "error",
@@ -160,5 +143,5 @@ def validate_siret(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
                 "value": siret,
                 "reason": "Le SIRET ne respecte pas l'algorithme de Luhn"
             })
-    
+
     return result_df, errors
\ No newline at end of file
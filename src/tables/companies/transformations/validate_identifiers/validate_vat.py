@@ -3,11 +3,14 @@ Module de validation des numéros de TVA pour les données Companies.
 Vérifie la validité des numéros de TVA selon les règles françaises.
 """
 
-import re
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any
 
+import numpy as np
 import pandas as pd
 
+from src.tables.companies.transformations.validate_identifiers.identifier_digits import digit_matrix
+from src.utils.copy_on_write import step_copy
+
 
 def validate_vat(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -19,6 +22,9 @@ def validate_vat(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     - Le numéro SIREN à 9 chiffres
     Format: FRKKXXXXXXXXX (13 caractères)
     
+    Le nettoyage et les contrôles portent sur la colonne entière ; seules les
+    lignes modifiées ou invalides donnent lieu à une entrée d'erreur.
+    
     Args:
         df: DataFrame contenant les données Companies
         
@@ -28,7 +34,7 @@ def validate_vat(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
         - La liste des erreurs de validation détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si les colonnes nécessaires existent
     required_columns = ['co_vat', 'co_siren']
@@ -42,89 +48,54 @@ def validate_vat(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
             if column == 'co_vat':  # Sans TVA, impossible de continuer
                 return result_df, errors
     
-    # Expression régulière pour valider le format de TVA française
-    vat_pattern = re.compile(r'^FR\d{11}$')
-    
-    def clean_vat(vat: Optional[str]) -> Optional[str]:
-        """Nettoie un numéro de TVA en supprimant les caractères non conformes."""
-        if pd.isna(vat) or not isinstance(vat, str):
-            return vat
-        
-        # Suppression des espaces et autres caractères non alphanumériques sauf les lettres du code pays
-        vat = vat.upper().strip()
-        
-        # Extraction du code pays (généralement 2 lettres) et des chiffres
-        match = re.match(r'^([A-Z]{2})?(\d+)$', vat.replace(' ', ''))
-        if match:
-            country_code, numbers = match.groups()
-            
-            # Si pas de code pays détecté mais que les chiffres correspondent à un numéro français
-            if not country_code and len(numbers) == 11:
-                return f"FR{numbers}"
-                
-            # Si le code pays est FR, formater correctement
-            if country_code == "FR":
-                return f"FR{numbers}"
-        
-        # Si aucun motif reconnu, retourner tel quel
-        return vat
-    
-    def validate_fr_vat_checksum(vat: str, siren: str) -> bool:
-        """
-        Valide la clé de contrôle d'un numéro de TVA français.
-        
-        La clé est calculée ainsi: (12 + 3 * (SIREN % 97)) % 97
-        """
-        if not vat.startswith("FR") or len(vat) != 13:
-            return False
-            
-        # Extraction de la clé et du SIREN depuis le numéro de TVA
-        key = int(vat[2:4])
-        vat_siren = vat[4:]
-        
-        # Vérification de la cohérence avec le SIREN fourni
-        if siren and vat_siren != siren:
-            return False
-            
-        # Calcul de la clé attendue
-        try:
-            siren_value = int(vat_siren)
-            expected_key = (12 + 3 * (siren_value % 97)) % 97
-            return key == expected_key
-        except (ValueError, TypeError):
-            return False
-    
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        vat = row['co_vat']
-        siren = row['co_siren']
-        co_id = row['co_id']
-        
-        # Ignorer les valeurs nulles/vides
-        if pd.isna(vat) or vat == '':
-            continue
-        
-        # Nettoyage du numéro de TVA
-        original_vat = vat
-        cleaned_vat = clean_vat(vat)
-        
-        # Si le nettoyage a modifié la valeur, enregistrer la modification
-        if cleaned_vat != original_vat:
-            result_df.at[idx, 'co_vat'] = cleaned_vat
+    values = result_df['co_vat'].to_numpy(dtype=object)
+    sirens = result_df['co_siren'].to_numpy(dtype=object) if 'co_siren' in result_df.columns else None
+    ids = result_df['co_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+
+    # Valeurs à traiter (les valeurs nulles/vides sont ignorées)
+    present = ~pd.isna(values) & (values != '')
+
+    # Nettoyage de la colonne, puis enregistrement des valeurs modifiées
+    cleaned, text_mask = clean_vat_numbers(values)
+    changed = present & text_mask & (cleaned != values)
+    if changed.any():
+        column = result_df['co_vat'].copy()
+        column[changed] = cleaned[changed]
+        result_df['co_vat'] = column
+
+    # Numéros non français (peut-être une entreprise étrangère) et format des TVA françaises
+    vat_text = pd.Series(cleaned, dtype=object)
+    french = present & vat_text.str.startswith("FR", na=False).to_numpy(dtype=bool)
+    non_french = present & ~french
+    well_formed = french & vat_text.str.match(r'^FR\d{11}$', na=False).to_numpy(dtype=bool)
+    malformed = french & ~well_formed
+
+    # Clé de contrôle et cohérence avec le SIREN, pour les TVA françaises bien formées
+    bad_checksum = np.zeros(len(values), dtype=bool)
+    if sirens is not None:
+        checked = well_formed & ~pd.isna(sirens)
+        checked[checked] = sirens[checked].astype(bool)
+        if checked.any():
+            bad_checksum[checked] = ~vat_checksum_valid(cleaned[checked], sirens[checked])
+
+    # Erreurs émises uniquement pour les lignes modifiées ou invalides
+    for row in np.flatnonzero(changed | non_french | malformed | bad_checksum):
+        co_id = ids[row]
+        idx = indices[row]
+        vat = cleaned[row]
+
+        if changed[row]:
             errors.append({
                 "type": "vat_cleaning",
                 "severity": "info",
                 "co_id": co_id,
                 "index": idx,
-                "original": original_vat,
-                "cleaned": cleaned_vat
+                "original": values[row],
+                "cleaned": vat
             })
-            
-            # Mettre à jour la valeur pour la validation suivante
-            vat = cleaned_vat
-        
-        # Si le numéro de TVA ne commence pas par FR, c'est peut-être une entreprise étrangère
-        if not vat.startswith("FR"):
+
+        if non_french[row]:
             errors.append({
                 "type": "non_french_vat",
                 "severity": "info",
@@ -133,10 +104,7 @@ def validate_vat(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
                 "value": vat,
                 "reason": "Numéro de TVA non français"
             })
-            continue
-            
-        # Validation du format pour les TVA françaises
-        if not vat_pattern.match(vat):
+        elif malformed[row]:
             errors.append({
                 "type": "invalid_vat_format",
                 "severity": "error",
@@ -145,19 +113,78 @@ def validate_vat(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
                 "value": vat,
                 "reason": "Le numéro de TVA français doit être au format FRKKXXXXXXXXX"
             })
-            continue
-        
-        # Validation de la clé de contrôle et de la cohérence avec le SIREN
-        if not pd.isna(siren) and siren:
-            if not validate_fr_vat_checksum(vat, siren):
-                errors.append({
-                    "type": "invalid_vat_checksum",
-                    "severity": "error",
-                    "co_id": co_id,
-                    "index": idx,
-                    "vat": vat,
-                    "siren": siren,
-                    "reason": "La clé de contrôle du numéro de TVA est invalide ou ne correspond pas au SIREN"
-                })
+        elif bad_checksum[row]:
+            errors.append({
+                "type": "invalid_vat_checksum",
+                "severity": "error",
+                "co_id": co_id,
+                "index": idx,
+                "vat": vat,
+                "siren": sirens[row],
+                "reason": "La clé de contrôle du numéro de TVA est invalide ou ne correspond pas au SIREN"
+            })
     
-    return result_df, errors
\ No newline at end of file
+    return result_df, errors
+
+
+def clean_vat_numbers(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nettoie une colonne de numéros de TVA.
+
+    Les numéros sont mis en majuscules et débarrassés des espaces de début et
+    de fin. Un numéro composé de 11 chiffres, ou du code pays FR suivi de
+    chiffres, est reformaté en FR + chiffres (espaces supprimés) ; les autres
+    sont conservés tels quels. Les valeurs non textuelles sont conservées.
+
+    Args:
+        values: Valeurs de la colonne (tableau d'objets)
+
+    Returns:
+        Tuple contenant:
+        - Les numéros nettoyés (tableau d'objets)
+        - Le masque des valeurs textuelles
+    """
+    text_mask = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    cleaned = values.copy()
+    if not text_mask.any():
+        return cleaned, text_mask
+
+    vat = pd.Series(values[text_mask], dtype=object).str.upper().str.strip()
+
+    # Extraction du code pays (généralement 2 lettres) et des chiffres
+    parts = vat.str.replace(' ', '', regex=False).str.extract(r'^([A-Z]{2})?(\d+)$')
+    country_code, numbers = parts[0], parts[1]
+    french = numbers.notna() & (
+        (country_code.isna() & (numbers.str.len() == 11)) | (country_code == "FR")
+    )
+
+    vat = vat.to_numpy(dtype=object, copy=True)
+    vat[french.to_numpy(dtype=bool)] = ("FR" + numbers[french]).to_numpy(dtype=object)
+    cleaned[text_mask] = vat
+    return cleaned, text_mask
+
+
+def vat_checksum_valid(vats: np.ndarray, sirens: np.ndarray) -> np.ndarray:
+    """
+    Valide la clé de contrôle de numéros de TVA français bien formés.
+
+    La clé est calculée ainsi: (12 + 3 * (SIREN % 97)) % 97, sur le SIREN
+    extrait du numéro de TVA, qui doit aussi correspondre au SIREN fourni.
+
+    Args:
+        vats: Numéros de TVA au format FRKKXXXXXXXXX
+        sirens: SIREN déclarés (non vides) correspondants
+
+    Returns:
+        Masque des numéros dont la clé et le SIREN sont cohérents
+    """
+    # Extraction de la clé et du SIREN depuis le numéro de TVA
+    digits = digit_matrix(pd.Series(vats, dtype=object).str[2:].to_numpy(dtype=object), 11)
+    keys = digits[:, 0] * 10 + digits[:, 1]
+    vat_sirens = pd.Series(vats, dtype=object).str[4:].to_numpy(dtype=object)
+
+    # Calcul de la clé attendue sur les SIREN en entiers
+    siren_values = digits[:, 2:] @ (10 ** np.arange(8, -1, -1, dtype=np.int64))
+    expected_keys = (12 + 3 * (siren_values % 97)) % 97
+
+    return (vat_sirens == sirens) & (keys == expected_keys)
\ No newline at end of file
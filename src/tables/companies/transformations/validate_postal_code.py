@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple, Any, Optional, Set
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 # Liste des départements français valides (métropole et DOM-TOM)
 VALID_FRENCH_DEPARTMENTS: Set[str] = {
@@ -49,7 +51,7 @@ def validate_postal_code(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs de validation détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne du code postal existe
     if 'co_head_office_postal_code' not in result_df.columns:
@@ -0,0 +1,103 @@
+"""
+Module de contrôle des villes des données Companies par le référentiel des codes postaux.
+Vérifie que la ville du siège correspond à l'une des communes de son code
+postal et corrige les orthographes approchantes.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import step_copy
+from src.utils.postal_reference import (
+    CITY_CORRECTED, CITY_UNMATCHED, POSTAL_CODE_UNKNOWN, correct_cities
+)
+
+
+def validate_postal_reference(
+    df: pd.DataFrame,
+    postal_reference: Dict[str, Any]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Contrôle les couples code postal / ville du siège à l'aide du référentiel La Poste.
+
+    Contrôles et corrections effectués (une fois par couple distinct):
+    - Code postal absent du référentiel
+    - Ville approchante d'une commune du code postal: remplacée par le libellé de référence
+    - Ville sans correspondance parmi les communes du code postal
+
+    Args:
+        df: DataFrame contenant les données Companies
+        postal_reference: Index chargé par open_postal_reference
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les villes corrigées
+        - La liste des corrections et anomalies
+    """
+    errors = []
+    result_df = step_copy(df)
+
+    for column in ('co_head_office_postal_code', 'co_head_office_city'):
+        if column not in result_df.columns:
+            errors.append({
+                "type": "missing_column",
+                "severity": "error",
+                "message": f"La colonne '{column}' est absente du DataFrame"
+            })
+            return result_df, errors
+
+    matches = correct_cities(
+        postal_reference,
+        result_df['co_head_office_postal_code'],
+        result_df['co_head_office_city']
+    )
+    status = matches["status"]
+
+    # Villes corrigées, écrites en une fois
+    original_cities = result_df['co_head_office_city'].to_numpy(dtype=object, copy=True)
+    corrected = status == CITY_CORRECTED
+    if corrected.any():
+        cities = original_cities.copy()
+        cities[corrected] = matches["city"][corrected]
+        result_df['co_head_office_city'] = cities
+
+    # Enregistrement des corrections et anomalies, ligne par ligne dans l'ordre de la table
+    indices = result_df.index.tolist()
+    co_ids = result_df['co_id'].to_numpy(dtype=object)
+    postal_codes = result_df['co_head_office_postal_code'].to_numpy(dtype=object)
+    reported = corrected | (status == CITY_UNMATCHED) | (status == POSTAL_CODE_UNKNOWN)
+    for position in np.flatnonzero(reported):
+        entry = {
+            "co_id": co_ids[position],
+            "index": indices[position],
+            "postal_code": postal_codes[position]
+        }
+        if status[position] == CITY_CORRECTED:
+            errors.append({
+                "type": "city_name_corrected",
+                "severity": "info",
+                **entry,
+                "original": original_cities[position],
+                "corrected": matches["city"][position],
+                "similarity": round(float(matches["score"][position]), 2)
+            })
+        elif status[position] == CITY_UNMATCHED:
+            errors.append({
+                "type": "city_postal_code_mismatch",
+                "severity": "warning",
+                **entry,
+                "value": original_cities[position],
+                "reason": "La ville ne correspond à aucune commune de ce code postal"
+            })
+        else:
+            errors.append({
+                "type": "postal_code_not_in_reference",
+                "severity": "warning",
+                **entry,
+                "value": postal_codes[position],
+                "reason": "Le code postal est absent du référentiel La Poste"
+            })
+
+    return result_df, errors
@@ -0,0 +1,172 @@
+"""
+Module de contrôle des données Companies par le référentiel SIRENE local.
+Vérifie l'existence des SIREN et SIRET dans l'index compilé de l'extrait
+SIRENE et complète les SIRET, TVA et formes juridiques manquants.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import step_copy
+from src.utils.sirene_index import identifier_keys, lookup_sirens, lookup_sirets
+
+
+def _is_missing(values: np.ndarray) -> np.ndarray:
+    # Valeur nulle ou chaîne vide
+    return pd.isna(values) | (values == "")
+
+
+def validate_sirene_reference(
+    df: pd.DataFrame,
+    sirene_index: Dict[str, Any]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Contrôle les identifiants des entreprises à l'aide du référentiel SIRENE.
+
+    Contrôles et complétions effectués (recherches groupées dans l'index):
+    - SIREN ou SIRET bien formé mais absent du référentiel
+    - Code postal du siège différent de celui de l'établissement SIRET
+    - SIRET manquant (ou égal au SIREN): SIRET de référence de l'entreprise
+    - TVA manquante: numéro de TVA intracommunautaire calculé depuis le SIREN
+    - Forme juridique manquante: forme juridique du référentiel
+
+    Les correctifs manuels (apply_patches_siret_manquant) s'appliquent avant
+    cette étape et restent prioritaires.
+
+    Args:
+        df: DataFrame contenant les données Companies
+        sirene_index: Index chargé par open_sirene_index
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame complété
+        - La liste des anomalies et des complétions
+    """
+    errors = []
+    result_df = step_copy(df)
+
+    if 'co_siren' not in result_df.columns:
+        errors.append({
+            "type": "missing_column",
+            "severity": "error",
+            "message": "La colonne 'co_siren' est absente du DataFrame"
+        })
+        return result_df, errors
+
+    n = len(result_df)
+    empty = np.full(n, None, dtype=object)
+    sirens = result_df['co_siren'].to_numpy(dtype=object)
+    sirets = result_df['co_siret'].to_numpy(dtype=object) if 'co_siret' in result_df.columns else empty
+    vats = result_df['co_vat'].to_numpy(dtype=object) if 'co_vat' in result_df.columns else empty
+    legal_forms = result_df['co_legal_form'].to_numpy(dtype=object) if 'co_legal_form' in result_df.columns else empty
+    postal_codes = (result_df['co_head_office_postal_code'].to_numpy(dtype=object)
+                    if 'co_head_office_postal_code' in result_df.columns else empty)
+
+    # Recherches groupées dans l'index
+    siren_keys = identifier_keys(sirens, 9)
+    companies = lookup_sirens(sirene_index, sirens)
+    siret_found, reference_postal_codes = lookup_sirets(sirene_index, sirets)
+
+    # Identifiants bien formés absents du référentiel
+    unknown_siren = (siren_keys >= 0) & ~companies["found"]
+    unknown_siret = (identifier_keys(sirets, 14) >= 0) & ~siret_found
+    postal_code_mismatch = (
+        siret_found & ~pd.isna(reference_postal_codes) & ~_is_missing(postal_codes)
+        & (postal_codes != reference_postal_codes)
+    )
+
+    # Complétion des informations manquantes des entreprises connues
+    found = companies["found"]
+    fill_siret = found & (_is_missing(sirets) | (sirets == sirens)) & ~pd.isna(companies["siret"])
+    fill_vat = found & _is_missing(vats)
+    fill_legal_form = found & _is_missing(legal_forms) & ~pd.isna(companies["legal_form"])
+
+    vat_keys = (12 + 3 * (siren_keys % 97)) % 97
+    new_vats = np.full(n, None, dtype=object)
+    new_vats[fill_vat] = [f"FR{key:02d}{siren}" for key, siren in zip(vat_keys[fill_vat], sirens[fill_vat])]
+
+    for field, mask, values in (
+        ('co_siret', fill_siret, companies["siret"]),
+        ('co_vat', fill_vat, new_vats),
+        ('co_legal_form', fill_legal_form, companies["legal_form"])
+    ):
+        if mask.any():
+            column = (result_df[field].copy() if field in result_df.columns
+                      else pd.Series(None, index=result_df.index, dtype=object))
+            column[mask] = values[mask]
+            result_df[field] = column
+
+    # Entrées du rapport, uniquement pour les lignes concernées
+    ids = result_df['co_id'].to_numpy(dtype=object)
+    names = (result_df['co_business_name'].to_numpy(dtype=object)
+             if 'co_business_name' in result_df.columns else empty)
+    indices = result_df.index.tolist()
+    flagged = unknown_siren | unknown_siret | postal_code_mismatch | fill_siret | fill_vat | fill_legal_form
+
+    for row in np.flatnonzero(flagged):
+        co_id = ids[row]
+        idx = indices[row]
+
+        if unknown_siren[row]:
+            errors.append({
+                "type": "unknown_siren",
+                "severity": "warning",
+                "co_id": co_id,
+                "index": idx,
+                "value": sirens[row],
+                "reason": "SIREN absent du référentiel SIRENE"
+            })
+
+        if unknown_siret[row]:
+            errors.append({
+                "type": "unknown_siret",
+                "severity": "warning",
+                "co_id": co_id,
+                "index": idx,
+                "value": sirets[row],
+                "reason": "SIRET absent du référentiel SIRENE"
+            })
+
+        if postal_code_mismatch[row]:
+            errors.append({
+                "type": "sirene_postal_code_mismatch",
+                "severity": "warning",
+                "co_id": co_id,
+                "index": idx,
+                "siret": sirets[row],
+                "postal_code": postal_codes[row],
+                "reference_postal_code": reference_postal_codes[row],
+                "reason": "Le code postal du siège diffère de celui de l'établissement dans le référentiel SIRENE"
+            })
+
+        changes = {}
+        if fill_siret[row]:
+            changes['siret'] = {'old': sirets[row], 'new': companies["siret"][row]}
+        if fill_vat[row]:
+            changes['vat'] = {'old': vats[row], 'new': new_vats[row]}
+        if fill_legal_form[row]:
+            changes['legal_form'] = {'old': legal_forms[row], 'new': companies["legal_form"][row]}
+        if changes:
+            errors.append({
+                "type": "company_info_completed",
+                "severity": "info",
+                "co_id": co_id,
+                "index": idx,
+                "co_business_name": names[row],
+                "co_siren": sirens[row],
+                "changes": changes
+            })
+
+    # Ajouter un résumé
+    completed = int(fill_siret.sum() + fill_vat.sum() + fill_legal_form.sum())
+    if completed > 0:
+        errors.append({
+            "type": "reference_summary",
+            "severity": "info",
+            "message": f"Complétions SIRENE: {int(fill_siret.sum())} SIRET, {int(fill_vat.sum())} VAT, "
+                       f"{int(fill_legal_form.sum())} formes juridiques"
+        })
+
+    return result_df, errors
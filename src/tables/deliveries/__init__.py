@@ -0,0 +1,7 @@
+"""
+Package de transformation des données deliveries.
+"""
+
+from src.tables.deliveries.clean_deliveries import clean_deliveries_data
+
+__all__ = ['clean_deliveries_data']
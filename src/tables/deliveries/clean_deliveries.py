@@ -0,0 +1,131 @@
+"""
+Module principal pour le traitement des données deliveries.
+Responsable de l'orchestration complète du processus de transformation.
+"""
+
+import logging
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Any
+
+from src.tables.deliveries.transformations.validate_input_structure import validate_input_structure
+from src.tables.deliveries.transformations.validate_transport_charge import validate_transport_charge
+from src.tables.deliveries.transformations.validate_dates import validate_dates
+from src.tables.deliveries.transformations.validate_prices import validate_prices
+from src.tables.deliveries.transformations.resolve_references import resolve_references, REFERENCE_KEYS
+from src.tables.deliveries.transformations.validate_fk_po import validate_fk_po
+from src.tables.deliveries.transformations.prepare_final_model import prepare_final_model
+from src.tables.deliveries.error_reporting.generate_error_report import generate_error_report
+from src.utils.pipeline_steps import pipeline_step, TABLE_SCOPE
+from src.utils.referential_integrity import CLEAN_DIR, open_reference_tables
+from src.utils.table_runner import table_pipeline, run_table_pipeline
+
+
+def build_steps(patches_dir: str, logger: logging.Logger, clean_dir: str = CLEAN_DIR) -> List[Dict[str, Any]]:
+    """
+    Construit la liste ordonnée des étapes de transformation des données deliveries.
+    
+    Les tables référencées (positioning, stock_import) sont lues et indexées
+    une seule fois, avant le traitement ; la résolution des références est
+    ensuite une étape ligne à ligne. La table n'ayant pas d'identifiant
+    propre, chaque livraison est identifiée par son positionnement (fk_po),
+    dont l'unicité est contrôlée par une étape globale qui, en mode par lots,
+    ne lit que fk_po.
+    
+    Args:
+        patches_dir: Répertoire contenant les fichiers de correctifs (non utilisé pour cette table)
+        logger: Logger du traitement
+        clean_dir: Répertoire des sorties nettoyées des tables référencées
+        
+    Returns:
+        Liste des étapes décrites par pipeline_step
+    """
+    references = open_reference_tables(REFERENCE_KEYS, logger, clean_dir)
+    
+    return [
+        pipeline_step("Étape 2: Validation de la prise en charge du transport", validate_transport_charge, "enums",
+                      "Détection de {count} erreurs/modifications de prise en charge du transport", logging.WARNING),
+        pipeline_step("Étape 3: Validation des dates", validate_dates, "dates",
+                      "Détection de {count} erreurs/modifications de dates", logging.WARNING),
+        pipeline_step("Étape 4: Validation des prix", validate_prices, "prices",
+                      "Détection de {count} erreurs/modifications de prix", logging.WARNING),
+        pipeline_step("Étape 5: Résolution des références", partial(resolve_references, references=references),
+                      "references", "Détection de {count} erreurs/résolutions de références", logging.WARNING),
+        pipeline_step("Étape 6: Validation des positionnements fk_po", validate_fk_po, "identifiers",
+                      "Détection de {count} erreurs d'identifiants", logging.WARNING,
+                      scope=TABLE_SCOPE, columns=["fk_po"]),
+        pipeline_step("Étape 7: Préparation du modèle final", prepare_final_model, "general"),
+    ]
+
+
+# Pipeline de la table, exécuté par run_table_pipeline
+PIPELINE = table_pipeline(
+    name="deliveries",
+    # Pas d'identifiant propre: une livraison par positionnement
+    id_column="fk_po",
+    error_categories=[
+        "structure",
+        "enums",
+        "dates",
+        "prices",
+        "references",
+        "identifiers",
+        "general"
+    ],
+    validate_fn=validate_input_structure,
+    build_steps=build_steps,
+    report_fn=generate_error_report,
+    nan_to_none=True,
+    # Étapes conformes au contrat du mode sans copie (src/utils/copy_on_write.py)
+    copy_free=True,
+    resolves_references=True
+)
+
+
+def clean_deliveries_data(
+    input_file_path: str, 
+    output_file_path: str,
+    patches_dir: str = "data/patches",
+    error_report_dir: str = "data/error_report",
+    log_dir: str = "logs",
+    chunk_size: Optional[int] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Fonction principale pour nettoyer et transformer les données deliveries.
+    
+    Args:
+        input_file_path: Chemin vers le fichier JSON d'entrée
+        output_file_path: Chemin vers le fichier JSON de sortie
+        patches_dir: Répertoire contenant les fichiers de correctifs
+        error_report_dir: Répertoire pour les rapports d'erreurs
+        log_dir: Répertoire pour les fichiers de log
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        
+    Returns:
+        Tuple[bool, Optional[str]]: (Succès, Chemin du rapport d'erreurs si généré)
+    """
+    return run_table_pipeline(
+        PIPELINE,
+        input_file_path,
+        output_file_path,
+        patches_dir,
+        error_report_dir,
+        log_dir,
+        chunk_size
+    )
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation
+    success, report_path = clean_deliveries_data(
+        input_file_path="data/raw/deliveries.json",
+        output_file_path="data/clean/deliveries.json"
+    )
+    
+    if success:
+        print("Transformation réussie!")
+        if report_path:
+            print(f"Un rapport d'erreurs a été généré: {report_path}")
+    else:
+        print("Erreur lors de la transformation")
+        if report_path:
+            print(f"Consultez le rapport d'erreurs: {report_path}")
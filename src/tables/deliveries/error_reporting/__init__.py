@@ -0,0 +1,7 @@
+"""
+Modules de génération de rapports d'erreurs pour les données deliveries.
+"""
+
+from src.tables.deliveries.error_reporting.generate_error_report import generate_error_report
+
+__all__ = ['generate_error_report']
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Définition de la structure d'entrée pour les données 'deliveries'.
+Ce module contient le schéma de validation JSON pour les données brutes.
+"""
+
+from typing import Dict, Any, List
+
+# Schéma de validation pour les données d'entrée
+INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "fk_po": {"type": ["integer", "null"]},
+            "id_ope_org": {"type": ["string", "null"]},
+            "prise_en_charge_transport": {"type": ["string", "null"]},
+            "de_date_removal": {"type": ["string", "null"]},
+            "de_date_delivery": {"type": ["string", "null"]},
+            "de_total_price": {"type": ["number", "null"]}
+        },
+        "required": ["fk_po", "id_ope_org"],
+        "additionalProperties": True
+    }
+}
+
+# Définition des champs obligatoires et optionnels
+REQUIRED_FIELDS = ["fk_po", "id_ope_org"]
+OPTIONAL_FIELDS = [
+    "prise_en_charge_transport",
+    "de_date_removal",
+    "de_date_delivery",
+    "de_total_price"
+]
+
+# Structure des types de données attendus pour la validation
+FIELD_TYPES = {
+    "fk_po": int,
+    "id_ope_org": str,
+    "prise_en_charge_transport": str,
+    "de_date_removal": str,
+    "de_date_delivery": str,
+    "de_total_price": float
+}
+
+# Documentation des champs pour référence
+FIELD_DESCRIPTIONS = {
+    "fk_po": "Clé étrangère vers la table positioning (une livraison par positionnement)",
+    "id_ope_org": "Code d'opération d'origine (si_io de l'import de stock)",
+    "prise_en_charge_transport": "Prise en charge du transport (OFFERT, FACTURATION, CLIENT)",
+    "de_date_removal": "Date d'enlèvement",
+    "de_date_delivery": "Date de livraison",
+    "de_total_price": "Prix total de la livraison"
+}
+
+# Répertoire des erreurs communes pour uniformisation des messages
+COMMON_ERRORS = {
+    "missing_required": "Champ obligatoire manquant",
+    "invalid_type": "Type de données incorrect",
+    "duplicate_entries": "Valeurs en double détectées"
+}
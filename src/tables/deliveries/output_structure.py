@@ -0,0 +1,56 @@
+"""
+Définition de la structure de sortie pour les données 'deliveries'.
+Ce module décrit la structure finale attendue après transformation.
+"""
+
+from typing import Dict, Any, List
+
+# Valeurs autorisées pour la prise en charge du transport
+TRANSPORT_CHARGE_VALUES = ["OFFERT", "FACTURATION", "CLIENT"]
+
+# Schéma de validation pour les données de sortie
+OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "fk_po": {"type": "integer"},
+            "id_ope_org": {"type": "string", "maxLength": 255},
+            "prise_en_charge_transport": {"type": ["string", "null"], "enum": TRANSPORT_CHARGE_VALUES + [None]},
+            "de_date_removal": {"type": ["string", "null"], "format": "date"},
+            "de_date_delivery": {"type": ["string", "null"], "format": "date"},
+            "de_total_price": {"type": ["number", "null"], "minimum": 0},
+            "fk_validation_status": {"type": "object"}
+        },
+        "required": [
+            "fk_po",
+            "id_ope_org"
+        ],
+        "additionalProperties": False
+    }
+}
+
+# Champs obligatoires du modèle final
+REQUIRED_OUTPUT_FIELDS = ["fk_po", "id_ope_org"]
+
+# Champs de date au format ISO (YYYY-MM-DD)
+DATE_FIELDS = ["de_date_removal", "de_date_delivery"]
+
+# Champs de prix, arrondis au centime
+PRICE_FIELDS = ["de_total_price"]
+
+# Informations sur les contraintes de longueur des champs
+FIELD_LENGTH_CONSTRAINTS = {
+    "id_ope_org": 255
+}
+
+# Documentation des champs de sortie pour référence
+OUTPUT_FIELD_DESCRIPTIONS = {
+    "fk_po": "Clé étrangère vers la table positioning (vérifiée, complétée depuis id_ope_org)",
+    "id_ope_org": "Code d'opération d'origine (vérifié dans positioning et stock_import)",
+    "prise_en_charge_transport": "Prise en charge du transport (OFFERT, FACTURATION, CLIENT ou null)",
+    "de_date_removal": "Date d'enlèvement (YYYY-MM-DD)",
+    "de_date_delivery": "Date de livraison (YYYY-MM-DD)",
+    "de_total_price": "Prix total de la livraison, positif, arrondi au centime",
+    "fk_validation_status": "Statut détaillé de validation de l'enregistrement"
+}
@@ -0,0 +1,21 @@
+"""
+Modules de transformation pour les données deliveries.
+"""
+
+from src.tables.deliveries.transformations.validate_input_structure import validate_input_structure
+from src.tables.deliveries.transformations.validate_transport_charge import validate_transport_charge
+from src.tables.deliveries.transformations.validate_dates import validate_dates
+from src.tables.deliveries.transformations.validate_prices import validate_prices
+from src.tables.deliveries.transformations.resolve_references import resolve_references
+from src.tables.deliveries.transformations.validate_fk_po import validate_fk_po
+from src.tables.deliveries.transformations.prepare_final_model import prepare_final_model
+
+__all__ = [
+    'validate_input_structure',
+    'validate_transport_charge',
+    'validate_dates',
+    'validate_prices',
+    'resolve_references',
+    'validate_fk_po',
+    'prepare_final_model'
+]
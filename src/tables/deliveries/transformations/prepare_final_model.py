@@ -0,0 +1,102 @@
+"""
+Module de préparation du modèle final pour les données deliveries.
+Finalise le traitement des données et prépare la structure finale selon le modèle attendu.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.tables.deliveries.output_structure import REQUIRED_OUTPUT_FIELDS, FIELD_LENGTH_CONSTRAINTS
+from src.utils.copy_on_write import step_copy
+
+
+def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Prépare la structure finale des données selon le modèle de sortie attendu.
+    
+    Ce module:
+    - Vérifie la présence des champs obligatoires
+    - Tronque les champs selon les contraintes de longueur
+    - Crée le statut de validation pour chaque enregistrement
+    
+    Les contrôles sont évalués par colonne ; seuls les statuts sont
+    assemblés ligne par ligne.
+    
+    Args:
+        df: DataFrame contenant les données deliveries traitées
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec la structure finale
+        - La liste des erreurs/informations sur la préparation du modèle
+    """
+    errors = []
+    result_df = step_copy(df)
+    
+    # Vérifier la présence des champs obligatoires
+    missing_fields = [field for field in REQUIRED_OUTPUT_FIELDS if field not in result_df.columns]
+    for field in missing_fields:
+        errors.append({
+            "type": "missing_required_field",
+            "severity": "error",
+            "field": field,
+            "message": f"Le champ obligatoire '{field}' est absent du DataFrame"
+        })
+    
+    # Vérifier et appliquer les contraintes de longueur
+    for field, max_length in FIELD_LENGTH_CONSTRAINTS.items():
+        if field not in result_df.columns:
+            continue
+        values = result_df[field]
+        lengths = values.where(values.map(type) == str).str.len()
+        too_long = (lengths > max_length).to_numpy()
+        if not too_long.any():
+            continue
+        
+        truncated = values.to_numpy(dtype=object, copy=True)
+        for position in np.flatnonzero(too_long):
+            errors.append({
+                "type": "field_truncated",
+                "severity": "warning",
+                "fk_po": result_df['fk_po'].iat[position],
+                "index": result_df.index[position],
+                "field": field,
+                "original_length": len(truncated[position]),
+                "truncated_to": max_length,
+                "message": f"Champ '{field}' tronqué de {len(truncated[position])} à {max_length} caractères"
+            })
+            truncated[position] = truncated[position][:max_length]
+        result_df[field] = truncated
+    
+    # Créer le champ de statut de validation pour chaque enregistrement
+    try:
+        fields = [field for field in REQUIRED_OUTPUT_FIELDS if field in result_df.columns]
+        valid = {
+            field: (result_df[field].notna() & (result_df[field] != "")).to_numpy()
+            for field in fields
+        }
+        
+        validation_status = []
+        for position in range(len(result_df)):
+            field_status = {field: bool(valid[field][position]) for field in fields}
+            validation_status.append({
+                "is_valid": all(field_status.values()),
+                "field_status": field_status,
+                "error_details": [
+                    {"field": field, "error": "Champ obligatoire manquant ou vide"}
+                    for field, is_valid in field_status.items() if not is_valid
+                ]
+            })
+        
+        result_df['fk_validation_status'] = validation_status
+        
+    except Exception as e:
+        errors.append({
+            "type": "validation_status_creation_error",
+            "severity": "error",
+            "message": f"Erreur lors de la création des statuts de validation: {str(e)}"
+        })
+    
+    return result_df, errors
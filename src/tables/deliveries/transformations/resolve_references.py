@@ -0,0 +1,140 @@
+"""
+Module de résolution des références pour les données deliveries.
+Vérifie le positionnement et l'import de stock de chaque livraison dans les
+tables nettoyées référencées, et complète fk_po à partir de id_ope_org.
+"""
+
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import step_copy
+from src.utils.referential_integrity import lookup_keys
+from src.utils.relation_index import normalize_keys
+
+
+# Colonnes à lire dans chaque table référencée (open_reference_table)
+REFERENCE_KEYS = {
+    "positioning": (["po_id", "si_io"], None),
+    "stock_import": (["si_io"], None)
+}
+
+
+def _reference_error(
+    error_type: str,
+    severity: str,
+    fk_po: Any,
+    index: Any,
+    field: str,
+    value: Any,
+    message: str,
+    **details: Any
+) -> Dict[str, Any]:
+    """Construit une entrée du rapport pour une référence."""
+    return {
+        "type": error_type,
+        "severity": severity,
+        "fk_po": fk_po,
+        "index": index,
+        "field": field,
+        "value": value,
+        **details,
+        "message": message
+    }
+
+
+def resolve_references(
+    df: pd.DataFrame,
+    references: Dict[str, Optional[Dict[str, Any]]]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Résout et vérifie les références des livraisons.
+    
+    Opérations effectuées:
+    - Recherche de id_ope_org dans positioning.si_io: fk_po est complété
+      s'il est absent, signalé s'il désigne un autre positionnement
+    - Vérification de l'existence de fk_po dans positioning.po_id
+    - Vérification de l'existence de id_ope_org dans stock_import.si_io
+    
+    Les clés de chaque table référencée sont indexées une seule fois
+    (open_reference_table) ; chaque colonne est résolue par une recherche
+    vectorisée dans l'index. Une table référencée sans sortie nettoyée
+    (None) n'est pas contrôlée.
+    
+    Args:
+        df: DataFrame contenant les données deliveries
+        references: Tables référencées ouvertes, par nom de table
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec fk_po complété
+        - La liste des erreurs/modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    indices = result_df.index.to_numpy()
+    fk_po = normalize_keys(result_df['fk_po']).to_numpy(dtype=object)
+    id_ope_org = result_df['id_ope_org'].to_numpy(dtype=object) if 'id_ope_org' in result_df.columns \
+        else np.full(len(result_df), None, dtype=object)
+    has_code = pd.notna(id_ope_org)
+    positioning = references.get("positioning")
+    stock_import = references.get("stock_import")
+    
+    if positioning is not None:
+        # Résolution de id_ope_org vers po_id
+        rows = lookup_keys(positioning, "si_io", pd.Series(id_ope_org, dtype=object))
+        found = rows >= 0
+        resolved = np.full(len(rows), None, dtype=object)
+        resolved[found] = positioning["frame"]["po_id"].to_numpy(dtype=object)[rows[found]]
+        
+        missing = pd.isna(fk_po)
+        filled = found & missing
+        mismatched = found & ~missing & (fk_po != resolved)
+        
+        for position in np.flatnonzero(has_code & ~found):
+            errors.append(_reference_error(
+                "unknown_reference", "warning", fk_po[position], indices[position], "id_ope_org", id_ope_org[position],
+                f"id_ope_org '{id_ope_org[position]}' introuvable dans positioning.si_io",
+                target_table="positioning"
+            ))
+        for position in np.flatnonzero(filled):
+            errors.append(_reference_error(
+                "reference_resolved", "info", resolved[position], indices[position], "fk_po", resolved[position],
+                f"fk_po complété depuis id_ope_org '{id_ope_org[position]}'",
+                target_table="positioning"
+            ))
+        for position in np.flatnonzero(mismatched):
+            errors.append(_reference_error(
+                "reference_mismatch", "warning", fk_po[position], indices[position], "fk_po", fk_po[position],
+                f"fk_po={fk_po[position]} ne correspond pas à id_ope_org '{id_ope_org[position]}' (po_id={resolved[position]})",
+                target_table="positioning", expected=resolved[position]
+            ))
+        
+        fk_po = np.where(filled, resolved, fk_po)
+        
+        # Existence du positionnement
+        unknown = pd.notna(fk_po) & (lookup_keys(positioning, "po_id", pd.Series(fk_po, dtype=object)) < 0)
+        for position in np.flatnonzero(unknown):
+            errors.append(_reference_error(
+                "unknown_reference", "warning", fk_po[position], indices[position], "fk_po", fk_po[position],
+                f"fk_po={fk_po[position]} introuvable dans positioning.po_id",
+                target_table="positioning"
+            ))
+    
+    # Existence de l'import de stock
+    if stock_import is not None:
+        unknown = has_code & (lookup_keys(stock_import, "si_io", pd.Series(id_ope_org, dtype=object)) < 0)
+        for position in np.flatnonzero(unknown):
+            errors.append(_reference_error(
+                "unknown_reference", "warning", fk_po[position], indices[position], "id_ope_org", id_ope_org[position],
+                f"id_ope_org '{id_ope_org[position]}' introuvable dans stock_import.si_io",
+                target_table="stock_import"
+            ))
+    
+    # Clés complétées ; une clé manquante fait en outre lire la colonne en
+    # décimaux (7.0): les clés sont alors ramenées à des entiers
+    if result_df['fk_po'].dtype.kind == 'f' or (fk_po != result_df['fk_po'].to_numpy(dtype=object)).any():
+        result_df['fk_po'] = fk_po
+    
+    return result_df, errors
@@ -0,0 +1,98 @@
+"""
+Module de validation des dates pour les données deliveries.
+Vérifie et formate les dates selon les standards ISO.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.tables.deliveries.output_structure import DATE_FIELDS
+from src.utils.copy_on_write import step_copy
+
+
+# Formats de date possibles, essayés dans l'ordre (le premier est le format ISO de sortie)
+DATE_FORMATS = [
+    "%Y-%m-%d",        # 2023-03-01
+    "%d/%m/%Y",        # 01/03/2023
+    "%d-%m-%Y",        # 01-03-2023
+    "%Y/%m/%d",        # 2023/03/01
+    "%m/%d/%Y",        # 03/01/2023
+    "%d.%m.%Y",        # 01.03.2023
+    "%Y.%m.%d"         # 2023.03.01
+]
+
+
+def convert_dates(values: np.ndarray) -> np.ndarray:
+    """
+    Convertit une colonne de dates au format ISO.
+
+    Chaque format est appliqué en une fois aux seules valeurs qu'aucun
+    format précédent n'a su lire.
+
+    Args:
+        values: Valeurs de la colonne (dtype object)
+
+    Returns:
+        Dates au format YYYY-MM-DD (None si la valeur est nulle ou illisible)
+    """
+    converted = np.full(len(values), None, dtype=object)
+    
+    # Objets datetime convertis directement
+    is_datetime = np.fromiter((isinstance(value, datetime) for value in values), dtype=bool, count=len(values))
+    converted[is_datetime] = [value.strftime("%Y-%m-%d") for value in values[is_datetime]]
+    
+    pending = np.flatnonzero(np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values)))
+    for date_format in DATE_FORMATS:
+        if not len(pending):
+            break
+        parsed = pd.to_datetime(pd.Series(values[pending], dtype=object), format=date_format, errors='coerce')
+        read = parsed.notna().to_numpy()
+        converted[pending[read]] = parsed[read].dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+        pending = pending[~read]
+    
+    return converted
+
+
+def validate_dates(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valide et normalise les formats de date dans le DataFrame.
+    
+    Args:
+        df: DataFrame contenant les données deliveries
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les dates validées et normalisées
+        - La liste des erreurs et modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    fk_pos = result_df['fk_po'].to_numpy(dtype=object)
+    indices = result_df.index.to_numpy()
+    
+    for field in DATE_FIELDS:
+        if field not in result_df.columns:
+            continue
+        values = result_df[field].to_numpy(dtype=object)
+        converted = convert_dates(values)
+        
+        # Valeurs modifiées (conversion) ou perdues (format invalide)
+        for position in np.flatnonzero(pd.notna(values) & (converted != values)):
+            is_converted = converted[position] is not None
+            errors.append({
+                "type": "date_format_conversion",
+                "severity": "info" if is_converted else "warning",
+                "fk_po": fk_pos[position],
+                "field": field,
+                "original": values[position],
+                "converted": converted[position],
+                "index": indices[position],
+                "message": "Format de date converti" if is_converted else "Format de date invalide"
+            })
+        
+        result_df[field] = converted
+    
+    return result_df, errors
@@ -0,0 +1,76 @@
+"""
+Module de validation spécifique pour la clé fk_po des livraisons.
+Vérifie que chaque livraison désigne un positionnement distinct.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.utils.ragged import integer_values
+
+
+def validate_fk_po(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valide que les fk_po sont des entiers positifs et uniques.
+    
+    Étape globale en lecture seule : en mode par lots, elle ne reçoit que la
+    colonne fk_po de toute la table.
+    
+    Args:
+        df: DataFrame contenant les données deliveries
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame original (non modifié)
+        - La liste des erreurs détectées
+    """
+    errors = []
+    
+    if 'fk_po' not in df.columns:
+        errors.append({
+            "type": "missing_fk_po",
+            "severity": "error",
+            "message": "Le champ obligatoire 'fk_po' est absent du DataFrame"
+        })
+        return df, errors
+    
+    values = df['fk_po'].to_numpy(dtype=object)
+    indices = df.index.to_numpy()
+    present = pd.notna(values)
+    integral = integer_values(values)
+    
+    # Identifiants absents, non entiers ou négatifs
+    invalid = present & ~integral
+    negative = np.zeros(len(values), dtype=bool)
+    negative[integral] = pd.to_numeric(pd.Series(values[integral], dtype=object)).to_numpy() < 0
+    
+    for position in np.flatnonzero(~present | invalid | negative):
+        value = values[position]
+        if not present[position]:
+            error_type, message = "invalid_fk_po", "fk_po ne peut pas être null"
+        elif invalid[position]:
+            error_type, message = "invalid_fk_po_type", f"fk_po doit être un entier, trouvé: {type(value).__name__}"
+        else:
+            error_type, message = "negative_fk_po", "fk_po ne peut pas être négatif"
+        errors.append({
+            "type": error_type,
+            "severity": "error",
+            "index": indices[position],
+            "fk_po": None if not present[position] else value,
+            "message": message
+        })
+    
+    # Unicité: chaque répétition d'un identifiant déjà vu
+    duplicated = present & pd.Series(values, dtype=object).duplicated().to_numpy()
+    for position in np.flatnonzero(duplicated):
+        errors.append({
+            "type": "duplicate_fk_po",
+            "severity": "error",
+            "index": indices[position],
+            "fk_po": values[position],
+            "message": f"Le positionnement fk_po={values[position]} a plusieurs livraisons"
+        })
+    
+    return df, errors
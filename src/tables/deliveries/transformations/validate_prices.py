@@ -0,0 +1,91 @@
+"""
+Module de validation des prix pour les données deliveries.
+Vérifie que les prix sont des nombres positifs et les arrondit au centime.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.tables.deliveries.output_structure import PRICE_FIELDS
+from src.utils.copy_on_write import step_copy
+from src.utils.ragged import value_types
+
+
+def validate_prices(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valide les champs de prix du DataFrame.
+    
+    Opérations effectuées, colonne par colonne:
+    - Remplacement par None des valeurs non numériques ou négatives
+    - Arrondi au centime des prix décimaux (les prix entiers restent entiers)
+    
+    Args:
+        df: DataFrame contenant les données deliveries
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les prix validés
+        - La liste des erreurs/modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    fk_pos = result_df['fk_po'].to_numpy(dtype=object)
+    indices = result_df.index.to_numpy()
+    
+    for field in PRICE_FIELDS:
+        if field not in result_df.columns:
+            continue
+        values = result_df[field].to_numpy(dtype=object)
+        present = pd.notna(values)
+        is_bool = pd.Series(value_types(values), dtype=object).isin([bool, np.bool_]).to_numpy()
+        numbers = pd.to_numeric(pd.Series(values, dtype=object).where(~is_bool), errors='coerce').to_numpy(dtype=float)
+        numeric = present & np.isfinite(numbers)
+        negative = numeric & (numbers < 0)
+        valid = numeric & ~negative
+        
+        # Prix entiers conservés, prix décimaux arrondis au centime
+        integral = valid & (numbers == np.floor(numbers))
+        decimal = valid & ~integral
+        cleaned = np.full(len(values), None, dtype=object)
+        cleaned[integral] = numbers[integral].astype(np.int64).tolist()
+        cleaned[decimal] = np.round(numbers[decimal], 2).tolist()
+        
+        for position in np.flatnonzero(present & ~numeric):
+            errors.append({
+                "type": "invalid_price",
+                "severity": "warning",
+                "fk_po": fk_pos[position],
+                "index": indices[position],
+                "field": field,
+                "original": values[position],
+                "converted": None,
+                "message": f"Valeur non numérique pour '{field}', remplacée par None"
+            })
+        for position in np.flatnonzero(negative):
+            errors.append({
+                "type": "negative_price",
+                "severity": "warning",
+                "fk_po": fk_pos[position],
+                "index": indices[position],
+                "field": field,
+                "original": values[position],
+                "converted": None,
+                "message": f"Prix négatif pour '{field}', remplacé par None"
+            })
+        for position in np.flatnonzero(decimal & (cleaned != numbers)):
+            errors.append({
+                "type": "price_rounded",
+                "severity": "info",
+                "fk_po": fk_pos[position],
+                "index": indices[position],
+                "field": field,
+                "original": values[position],
+                "converted": cleaned[position],
+                "message": f"Prix '{field}' arrondi au centime"
+            })
+        
+        result_df[field] = cleaned
+    
+    return result_df, errors
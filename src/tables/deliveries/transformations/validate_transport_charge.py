@@ -0,0 +1,77 @@
+"""
+Module de validation de la prise en charge du transport pour les données deliveries.
+Normalise prise_en_charge_transport vers les valeurs autorisées.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.tables.deliveries.output_structure import TRANSPORT_CHARGE_VALUES
+from src.utils.copy_on_write import step_copy
+
+
+def validate_transport_charge(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valide et normalise le champ prise_en_charge_transport.
+    
+    Opérations effectuées:
+    - Normalisation de la casse et des espaces ("offert " -> "OFFERT")
+    - Remplacement par None des valeurs hors de TRANSPORT_CHARGE_VALUES ("0", "-"...)
+    
+    Args:
+        df: DataFrame contenant les données deliveries
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec prise_en_charge_transport normalisé
+        - La liste des erreurs/modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    field = 'prise_en_charge_transport'
+    
+    if field not in result_df.columns:
+        return result_df, errors
+    
+    values = result_df[field].to_numpy(dtype=object)
+    present = pd.notna(values)
+    normalized = pd.Series(values, dtype=object).where(present).astype(str).str.strip().str.upper().to_numpy(dtype=object)
+    allowed = present & pd.Series(normalized, dtype=object).isin(TRANSPORT_CHARGE_VALUES).to_numpy()
+    
+    cleaned = np.full(len(values), None, dtype=object)
+    cleaned[allowed] = normalized[allowed]
+    
+    fk_pos = result_df['fk_po'].to_numpy(dtype=object)
+    indices = result_df.index.to_numpy()
+    
+    # Valeurs autorisées une fois normalisées
+    for position in np.flatnonzero(allowed & (cleaned != values)):
+        errors.append({
+            "type": "value_normalized",
+            "severity": "info",
+            "fk_po": fk_pos[position],
+            "index": indices[position],
+            "field": field,
+            "original": values[position],
+            "converted": cleaned[position],
+            "message": f"Valeur de {field} normalisée"
+        })
+    
+    # Valeurs hors énumération
+    for position in np.flatnonzero(present & ~allowed):
+        errors.append({
+            "type": "invalid_enum_value",
+            "severity": "warning",
+            "fk_po": fk_pos[position],
+            "index": indices[position],
+            "field": field,
+            "original": values[position],
+            "converted": None,
+            "message": f"Valeur invalide pour {field} (attendu: {', '.join(TRANSPORT_CHARGE_VALUES)}), remplacée par None"
+        })
+    
+    result_df[field] = cleaned
+    
+    return result_df, errors
@@ -3,241 +3,251 @@ Module principal pour le traitement des données logistic_address.
 Responsable de l'orchestration complète du processus de transformation.
 """
 
-import json
 import logging
 import os
-from datetime import datetime
+from functools import partial
 from typing import Dict, List, Optional, Tuple, Any, Union
-import numpy as np
 import pandas as pd
 
 from src.tables.logistic_address.transformations.validate_input_structure import validate_input_structure
-from src.tables.logistic_address.transformations.normalize_text import normalize_text
-from src.tables.logistic_address.transformations.normalize_special_chars import normalize_special_chars
-from src.tables.logistic_address.transformations.clean_punctuation import clean_punctuation
+from src.tables.logistic_address.transformations.clean_text import clean_text
 from src.tables.logistic_address.transformations.extract_address_components import extract_address_components
 from src.tables.logistic_address.transformations.validate_data_types import validate_data_types
 from src.tables.logistic_address.transformations.validate_address_fields import validate_address_fields
 from src.tables.logistic_address.transformations.validate_postal_code import validate_postal_code
 from src.tables.logistic_address.transformations.validate_city_names import validate_city_names
+from src.tables.logistic_address.transformations.validate_postal_reference import validate_postal_reference
+from src.tables.logistic_address.transformations.geocode_addresses import (
+    PRECISION_COLUMN, geocode_addresses, detect_proximity_duplicates
+)
+from src.tables.logistic_address.transformations.detect_near_duplicates import NEAR_DUPLICATE_COLUMNS, detect_near_duplicates
+from src.tables.logistic_address.transformations.materialize_relations import (
+    REFERENCE_KEYS, materialize_relations, open_relation_groups
+)
 from src.tables.logistic_address.transformations.add_missing_fields import add_missing_fields
 from src.tables.logistic_address.transformations.patch_data import apply_patches
 from src.tables.logistic_address.transformations.prepare_final_model import prepare_final_model
 from src.tables.logistic_address.error_reporting.generate_error_report import generate_error_report
-from src.utils.logging_manager import setup_logger
+from src.utils.copy_on_write import step_copy
+from src.utils.memo_store import CACHE_DIR, close_memo_store, open_memo_store
+from src.utils.geocoding_index import open_geocoding_index
+from src.utils.patch_engine import table_patch_files, unused_patch_files
+from src.utils.postal_reference import open_postal_reference
+from src.utils.referential_integrity import CLEAN_DIR, open_reference_tables
+from src.utils.sirene_index import REFERENCE_DIR
+from src.utils.pipeline_steps import TABLE_SCOPE, pipeline_step
+from src.utils.table_runner import table_pipeline, run_table_pipeline
 
 
-def clean_logistic_address_data(
-    input_file_path: str, 
-    output_file_path: str,
-    patches_dir: str = "data/patches",
-    error_report_dir: str = "data/error_report",
-    log_dir: str = "logs"
-) -> Tuple[bool, Optional[str]]:
+def convert_foreign_keys(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
-    Fonction principale pour nettoyer et transformer les données logistic_address.
+    Convertit les champs fk_co et fk_or en integer tout en préservant les valeurs nulles.
     
     Args:
-        input_file_path: Chemin vers le fichier JSON d'entrée
-        output_file_path: Chemin vers le fichier JSON de sortie
-        patches_dir: Répertoire contenant les fichiers de correctifs
-        error_report_dir: Répertoire pour les rapports d'erreurs
-        log_dir: Répertoire pour les fichiers de log
+        df: DataFrame contenant les données logistic_address
         
     Returns:
-        Tuple[bool, Optional[str]]: (Succès, Chemin du rapport d'erreurs si généré)
+        Tuple contenant:
+        - Le DataFrame avec les clés étrangères converties
+        - La liste des erreurs de conversion
     """
-    # Configuration du logger
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(log_dir, f"logistic_address_transformation_{timestamp}.log")
-    logger = setup_logger("logistic_address_transformation", log_file)
-    
-    logger.info(f"Démarrage du traitement des données logistic_address: {input_file_path}")
+    errors = []
+    result_df = step_copy(df)
     
-    # Dictionnaire pour collecter les erreurs
-    errors = {
-        "structure": [],
-        "address": [],
-        "data_types": [],
-        "postal_code": [],
-        "city": [],
-        "general": []
-    }
-    
-    # Lecture du fichier d'entrée
     try:
-        with open(input_file_path, 'r', encoding='utf-8') as file:
-            input_data = json.load(file)
-        logger.info(f"Fichier chargé avec succès: {len(input_data)} entrées")
+        # Conversion en integer seulement pour les valeurs non-nulles
+        for field in ['fk_co', 'fk_or']:
+            if field in result_df.columns:
+                mask = result_df[field].notna()
+                result_df.loc[mask, field] = result_df.loc[mask, field].astype(int)
     except Exception as e:
-        logger.error(f"Erreur lors de la lecture du fichier d'entrée: {str(e)}")
-        errors["general"].append({"error": f"Erreur de lecture du fichier: {str(e)}"})
-        return False, None
-    
-    # Étape 1: Validation de la structure d'entrée
-    logger.info("Étape 1: Validation de la structure d'entrée")
-    input_data, structure_errors = validate_input_structure(input_data)
-    if structure_errors:
-        errors["structure"].extend(structure_errors)
-        logger.warning(f"Détection de {len(structure_errors)} erreurs de structure")
-    
-    # Conversion en DataFrame pour faciliter le traitement
-    df = pd.DataFrame(input_data)
-    original_count = len(df)
-    logger.info(f"Conversion en DataFrame: {original_count} lignes")
-    
-    # Étape 2: Normalisation du texte
-    logger.info("Étape 2: Normalisation du texte")
-    df, text_errors = normalize_text(df)
-    if text_errors:
-        errors["general"].extend(text_errors)
+        errors.append({"error": f"Erreur lors de la conversion des champs fk_co et fk_or en integer: {str(e)}"})
     
-    # Étape 3: Normalisation des caractères spéciaux
-    logger.info("Étape 3: Normalisation des caractères spéciaux")
-    df, special_chars_errors = normalize_special_chars(df)
-    if special_chars_errors:
-        errors["general"].extend(special_chars_errors)
-    
-    # Étape 4: Nettoyage de la ponctuation
-    logger.info("Étape 4: Nettoyage de la ponctuation")
-    df, punctuation_errors = clean_punctuation(df)
-    if punctuation_errors:
-        errors["general"].extend(punctuation_errors)
-    
-    # Étape 5: Extraction des composants d'adresse
-    logger.info("Étape 5: Extraction des composants d'adresse")
-    df, address_extraction_errors = extract_address_components(df)
-    if address_extraction_errors:
-        errors["address"].extend(address_extraction_errors)
-        logger.warning(f"Détection de {len(address_extraction_errors)} erreurs/modifications d'extraction d'adresse")
-    
-    # Étape 6: Validation des types de données
-    logger.info("Étape 6: Validation des types de données")
-    df, data_type_errors = validate_data_types(df)
-    if data_type_errors:
-        errors["data_types"].extend(data_type_errors)
-        logger.warning(f"Détection de {len(data_type_errors)} erreurs de types de données")
-    
-    # Étape 7: Validation des champs d'adresse
-    logger.info("Étape 7: Validation des champs d'adresse")
-    df, address_field_errors = validate_address_fields(df)
-    if address_field_errors:
-        errors["address"].extend(address_field_errors)
-        logger.warning(f"Détection de {len(address_field_errors)} erreurs de champs d'adresse")
-    
-    # Étape 8: Validation des codes postaux
-    logger.info("Étape 8: Validation des codes postaux")
-    df, postal_code_errors = validate_postal_code(df)
-    if postal_code_errors:
-        errors["postal_code"].extend(postal_code_errors)
-        logger.warning(f"Détection de {len(postal_code_errors)} erreurs de code postal")
-    
-    # Étape 9: Validation des noms de ville
-    logger.info("Étape 9: Validation des noms de ville")
-    df, city_name_errors = validate_city_names(df)
-    if city_name_errors:
-        errors["city"].extend(city_name_errors)
-        logger.warning(f"Détection de {len(city_name_errors)} erreurs de nom de ville")
-    
-    # Étape 10: Ajout des champs manquants
-    logger.info("Étape 10: Ajout des champs manquants")
-    df, missing_fields_errors = add_missing_fields(df)
-    if missing_fields_errors:
-        errors["general"].extend(missing_fields_errors)
-        logger.info(f"{len(missing_fields_errors)} champs ajoutés ou modifiés")
+    return result_df, errors
+
+
+def build_steps(patches_dir: str, logger: logging.Logger, clean_dir: str = CLEAN_DIR) -> List[Dict[str, Any]]:
+    """
+    Construit la liste ordonnée des étapes de transformation des données logistic_address.
     
-    # Étape 11: Application des correctifs spécifiques
-    logger.info("Étape 11: Application des correctifs spécifiques")
-    patches_file = os.path.join(patches_dir, "logistic_address_patches.json")
-    if os.path.exists(patches_file):
-        df, patch_errors = apply_patches(df, patches_file)
-        if patch_errors:
-            errors["general"].extend(patch_errors)
-            logger.info(f"{len(patch_errors)} correctifs appliqués")
-    else:
-        logger.info(f"Aucun fichier de correctifs trouvé: {patches_file}")
+    Hormis les détections de doublons (étapes globales qui, en mode par lots,
+    ne lisent que leurs colonnes), les étapes sont ligne à ligne et peuvent
+    donc s'exécuter par lots. Les tables stock_import et positioning sont lues
+    et indexées une seule fois, avant le traitement.
     
-    # Étape 12: Préparation du modèle final
-    logger.info("Étape 12: Préparation du modèle final")
-    df, final_errors = prepare_final_model(df)
-    if final_errors:
-        errors["general"].extend(final_errors)
-
-    # Étape 13: Conversion des champs fk_co et fk_or en integer tout en préservant les valeurs nulles
-    logger.info("Étape 13: Conversion des champs fk_co et fk_or en integer")
-    try:
-        # Conversion des colonnes fk_co et fk_or en integer si elles existent
-        if 'fk_co' in df.columns:
-            # Conversion en integer seulement pour les valeurs non-nulles
-            mask = df['fk_co'].notna()
-            df.loc[mask, 'fk_co'] = df.loc[mask, 'fk_co'].astype(int)
-            logger.info("Champ fk_co converti en integer avec succès (valeurs nulles préservées)")
+    Args:
+        patches_dir: Répertoire contenant les fichiers de correctifs
+        logger: Logger du traitement
+        clean_dir: Répertoire des sorties nettoyées des tables référencées
         
-        if 'fk_or' in df.columns:
-            # Conversion en integer seulement pour les valeurs non-nulles
-            mask = df['fk_or'].notna()
-            df.loc[mask, 'fk_or'] = df.loc[mask, 'fk_or'].astype(int)
-            logger.info("Champ fk_or converti en integer avec succès (valeurs nulles préservées)")
+    Returns:
+        Liste des étapes décrites par pipeline_step
+    """
+    # Cache persistant des fonctions pures de décomposition d'adresse
+    try:
+        memo_store = open_memo_store(CACHE_DIR)
     except Exception as e:
-        error_msg = f"Erreur lors de la conversion des champs fk_co et fk_or en integer: {str(e)}"
-        logger.error(error_msg)
-        errors["general"].append({"error": error_msg})
-    
-    # Vérification de la préservation des données
-    final_count = len(df)
-    if final_count != original_count:
-        message = f"ALERTE: Différence de nombre d'entrées - Original: {original_count}, Final: {final_count}"
-        logger.error(message)
-        errors["general"].append({"error": message})
+        memo_store = None
+        logger.error(f"Erreur lors de l'ouverture du cache de mémoïsation: {str(e)}")
 
+    steps = [
+        # Étapes 2 à 4 fusionnées: une seule passe par colonne textuelle
+        pipeline_step("Étapes 2 à 4: Nettoyage du texte (normalisation, caractères spéciaux, ponctuation)",
+                      clean_text, "general"),
+        pipeline_step("Étape 5: Extraction des composants d'adresse",
+                      partial(extract_address_components, memo_store=memo_store), "address",
+                      "Détection de {count} erreurs/modifications d'extraction d'adresse", logging.WARNING,
+                      cleanup=partial(close_memo_store, memo_store)),
+        pipeline_step("Étape 6: Validation des types de données", validate_data_types, "data_types",
+                      "Détection de {count} erreurs de types de données", logging.WARNING),
+        pipeline_step("Étape 7: Validation des champs d'adresse", validate_address_fields, "address",
+                      "Détection de {count} erreurs de champs d'adresse", logging.WARNING),
+        pipeline_step("Étape 8: Validation des codes postaux", validate_postal_code, "postal_code",
+                      "Détection de {count} erreurs de code postal", logging.WARNING),
+        pipeline_step("Étape 9: Validation des noms de ville", validate_city_names, "city",
+                      "Détection de {count} erreurs de nom de ville", logging.WARNING),
+    ]
     
-    # Conversion du DataFrame en liste de dictionnaires
-    output_data = df.to_dict(orient='records')
-
-    # Convertir les NaN en None (qui deviendra null en JSON)
-    for record in output_data:
-        for key, value in record.items():
-            # Vérifiez si c'est un array/Series ou une valeur scalaire avant d'utiliser pd.isna
-            if isinstance(value, (list, pd.Series, np.ndarray)):
-                # Pour les listes et arrays, ne rien faire ou traiter différemment si nécessaire
-                continue
-            elif pd.isna(value):
-                record[key] = None
-                
-    # Suppression du champ la_validation_status pour chaque enregistrement
-    for record in output_data:
-        if 'la_validation_status' in record:
-            del record['la_validation_status']
+    # Contrôle et correction des villes par le référentiel des codes postaux (index compilé une seule fois)
+    try:
+        postal_reference = open_postal_reference(REFERENCE_DIR)
+    except Exception as e:
+        postal_reference = None
+        logger.error(f"Erreur lors de l'ouverture du référentiel des codes postaux: {str(e)}")
+    if postal_reference is not None:
+        meta = postal_reference["meta"]
+        logger.info(f"Référentiel des codes postaux: {meta['source']} ({meta['postal_codes']} codes postaux, "
+                    f"{meta['labels']} libellés)")
+        steps.append(pipeline_step(
+            "Étape 9bis: Contrôle des villes par le référentiel des codes postaux",
+            partial(validate_postal_reference, postal_reference=postal_reference),
+            "city",
+            "Détection de {count} corrections ou anomalies de ville",
+            logging.WARNING
+        ))
+    else:
+        logger.info(f"Aucun fichier des codes postaux trouvé dans {REFERENCE_DIR}")
     
-    # Sauvegarde du fichier de sortie
+    # Géocodage hors ligne par la Base Adresse Nationale locale (index compilé une seule fois)
     try:
-        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-        with open(output_file_path, 'w', encoding='utf-8') as file:
-            json.dump(output_data, file, ensure_ascii=False, indent=2)
-        logger.info(f"Fichier de sortie sauvegardé avec succès: {output_file_path}")
+        geocoding_index = open_geocoding_index(REFERENCE_DIR)
     except Exception as e:
-        logger.error(f"Erreur lors de la sauvegarde du fichier de sortie: {str(e)}")
-        errors["general"].append({"error": f"Erreur de sauvegarde: {str(e)}"})
-        return False, None
+        geocoding_index = None
+        logger.error(f"Erreur lors de l'ouverture de l'index de géocodage: {str(e)}")
+    if geocoding_index is not None:
+        meta = geocoding_index["meta"]
+        logger.info(f"Index de géocodage: {len(meta['sources'])} extraits BAN ({meta['addresses']} adresses, "
+                    f"{meta['streets']} voies, {meta['localities']} communes)")
+        steps += [
+            pipeline_step("Étape 9ter: Géocodage des adresses",
+                          partial(geocode_addresses, geocoding_index=geocoding_index), "geocoding"),
+            pipeline_step("Détection des adresses géographiquement confondues", detect_proximity_duplicates, "geocoding",
+                          "Détection de {count} adresses proches d'autres adresses", logging.WARNING,
+                          scope=TABLE_SCOPE, columns=["la_id", "la_longitude", "la_latitude", PRECISION_COLUMN]),
+        ]
+    else:
+        logger.info(f"Aucun extrait BAN trouvé dans {REFERENCE_DIR}")
+    
+    # Matérialisation des relations (index si_io et regroupement fk_la construits une seule fois)
+    references = open_reference_tables(REFERENCE_KEYS, logger, clean_dir)
+    steps.append(pipeline_step(
+        "Étape 9quater: Matérialisation des relations stock_import et positioning",
+        partial(materialize_relations, stock_import=references["stock_import"],
+                positioning_groups=open_relation_groups(references)),
+        "relations",
+        "Détection de {count} erreurs/modifications de relations",
+        logging.WARNING
+    ))
     
-    # Génération du rapport d'erreurs si nécessaire
-    has_errors = any(error_list for error_list in errors.values())
-    error_report_path = None
+    steps += [
+        pipeline_step("Étape 10: Ajout des champs manquants", add_missing_fields, "general",
+                      "{count} champs ajoutés ou modifiés"),
+    ]
     
-    if has_errors:
-        os.makedirs(error_report_dir, exist_ok=True)
-        error_report_path = os.path.join(
-            error_report_dir, 
-            f"logistic_address_errors_{timestamp}.xlsx"
-        )
-        generate_error_report(errors, error_report_path, input_data)
-        logger.info(f"Rapport d'erreurs généré: {error_report_path}")
+    # Étape 11: Application des correctifs spécifiques
+    patches_files = table_patch_files(patches_dir, "logistic_address", "patches*")
+    if patches_files:
+        steps.append(pipeline_step(
+            "Étape 11: Application des correctifs spécifiques",
+            partial(apply_patches, patches_file_paths=patches_files),
+            "general",
+            "{count} correctifs appliqués"
+        ))
     else:
-        logger.info("Aucune erreur détectée, pas de rapport généré")
+        logger.info(f"Aucun fichier de correctifs trouvé: {os.path.join(patches_dir, 'logistic_address_patches*.json')}")
+    for unused_file in unused_patch_files(patches_dir, "logistic_address", patches_files):
+        logger.info(f"Fichier de correctifs sans règle d'application, ignoré: {unused_file}")
+    
+    steps += [
+        pipeline_step("Étape 11bis: Détection des adresses en quasi-doublon", detect_near_duplicates, "duplicates",
+                      "Détection de {count} adresses en quasi-doublon", logging.WARNING,
+                      scope=TABLE_SCOPE, columns=NEAR_DUPLICATE_COLUMNS),
+        pipeline_step("Étape 12: Préparation du modèle final", prepare_final_model, "general"),
+        pipeline_step("Étape 13: Conversion des champs fk_co et fk_or en integer", convert_foreign_keys, "general",
+                      "Échec de la conversion des champs fk_co et fk_or en integer", logging.ERROR),
+    ]
     
-    logger.info("Traitement des données logistic_address terminé")
+    return steps
+
+
+# Pipeline de la table, exécuté par run_table_pipeline
+PIPELINE = table_pipeline(
+    name="logistic_address",
+    id_column="la_id",
+    error_categories=[
+        "structure",
+        "address",
+        "data_types",
+        "postal_code",
+        "city",
+        "geocoding",
+        "duplicates",
+        "relations",
+        "general"
+    ],
+    validate_fn=validate_input_structure,
+    build_steps=build_steps,
+    report_fn=generate_error_report,
+    nan_to_none=True,
+    # Étapes conformes au contrat du mode sans copie (src/utils/copy_on_write.py)
+    copy_free=True,
+    resolves_references=True,
+    # Précision du géocodage, utilisée par la détection des adresses confondues
+    technical_columns=[PRECISION_COLUMN]
+)
+
+
+def clean_logistic_address_data(
+    input_file_path: str, 
+    output_file_path: str,
+    patches_dir: str = "data/patches",
+    error_report_dir: str = "data/error_report",
+    log_dir: str = "logs",
+    chunk_size: Optional[int] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Fonction principale pour nettoyer et transformer les données logistic_address.
     
-    return True, error_report_path
+    Args:
+        input_file_path: Chemin vers le fichier JSON d'entrée
+        output_file_path: Chemin vers le fichier JSON de sortie
+        patches_dir: Répertoire contenant les fichiers de correctifs
+        error_report_dir: Répertoire pour les rapports d'erreurs
+        log_dir: Répertoire pour les fichiers de log
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        
+    Returns:
+        Tuple[bool, Optional[str]]: (Succès, Chemin du rapport d'erreurs si généré)
+    """
+    return run_table_pipeline(
+        PIPELINE,
+        input_file_path,
+        output_file_path,
+        patches_dir,
+        error_report_dir,
+        log_dir,
+        chunk_size
+    )
 
 
 if __name__ == "__main__":
@@ -31,9 +31,9 @@ OUTPUT_SCHEMA: Dict[str, Any] = {
             "fk_re": {"type": ["integer", "null"]},
             "fk_con": {"type": ["integer", "null"]},
             "fk_cou": {"type": ["integer", "null"], "default": 75},
-            "stock_import": {"type": "array", "items": {"type": "string"}},
+            "stock_import": {"type": "array", "items": {"type": "integer"}},
             "opening_hour": {"type": "array", "items": {}},
-            "positioning": {"type": "array", "items": {}},
+            "positioning": {"type": "array", "items": {"type": "integer"}},
             "la_validation_status": {"type": "object"}
         },
         "required": [
@@ -81,7 +81,7 @@ FIELD_LENGTH_CONSTRAINTS = {
 # Définition des nouveaux champs ajoutés par la transformation
 ADDED_FIELDS = [
     "opening_hour",  # Tableau vide par défaut
-    "positioning",   # Tableau vide par défaut
+    "positioning",   # po_id des positionnements de l'adresse (vide par défaut)
     "la_validation_status"  # Statut de validation avec détails par champ
 ]
 
@@ -123,8 +123,8 @@ OUTPUT_FIELD_DESCRIPTIONS = {
     "fk_re": "Clé étrangère vers la table recycling",
     "fk_con": "Clé étrangère vers la table contacts",
     "fk_cou": "Clé étrangère vers la table countries (defaulted to 75 for France)",
-    "stock_import": "Tableau de chaînes identifiant les imports de stock",
+    "stock_import": "Tableau des si_id des imports de stock (codes d'opération résolus dans stock_import)",
     "opening_hour": "Tableau d'heures d'ouverture (initialisé vide)",
-    "positioning": "Tableau de positionnements (initialisé vide)",
+    "positioning": "Tableau des po_id des positionnements dont fk_la désigne l'adresse",
     "la_validation_status": "Statut détaillé de validation de l'enregistrement"
 }
\ No newline at end of file
@@ -6,11 +6,13 @@ from src.tables.logistic_address.transformations.validate_input_structure import
 from src.tables.logistic_address.transformations.normalize_text import normalize_text
 from src.tables.logistic_address.transformations.normalize_special_chars import normalize_special_chars
 from src.tables.logistic_address.transformations.clean_punctuation import clean_punctuation
+from src.tables.logistic_address.transformations.clean_text import clean_text
 from src.tables.logistic_address.transformations.extract_address_components import extract_address_components
 from src.tables.logistic_address.transformations.validate_data_types import validate_data_types
 from src.tables.logistic_address.transformations.validate_address_fields import validate_address_fields
 from src.tables.logistic_address.transformations.validate_postal_code import validate_postal_code
 from src.tables.logistic_address.transformations.validate_city_names import validate_city_names
+from src.tables.logistic_address.transformations.materialize_relations import materialize_relations
 from src.tables.logistic_address.transformations.add_missing_fields import add_missing_fields
 from src.tables.logistic_address.transformations.patch_data import apply_patches
 from src.tables.logistic_address.transformations.prepare_final_model import prepare_final_model
@@ -20,11 +22,13 @@ __all__ = [
     'normalize_text',
     'normalize_special_chars',
     'clean_punctuation',
+    'clean_text',
     'extract_address_components',
     'validate_data_types',
     'validate_address_fields',
     'validate_postal_code',
     'validate_city_names',
+    'materialize_relations',
     'add_missing_fields',
     'apply_patches',
     'prepare_final_model'
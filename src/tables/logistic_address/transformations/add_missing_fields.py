@@ -6,6 +6,8 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def add_missing_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -20,7 +22,7 @@ def add_missing_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, A
         - La liste des informations sur les modifications
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
 
 
     # Liste des champs à ajouter s'ils sont manquants
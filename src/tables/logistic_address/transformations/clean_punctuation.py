@@ -8,6 +8,75 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.factorize import map_unique_values
+from src.utils.copy_on_write import step_copy
+
+
+# Liste des champs textuels à traiter
+TEXT_FIELDS = [
+    "la_house_number",
+    "la_street",
+    "la_additional_address",
+    "la_city"
+]
+
+# Définition des règles de nettoyage par champ
+CLEANING_RULES = {
+    "la_house_number": {
+        "punctuation_to_remove": r'[.,;:!?"()]',
+        "punctuation_to_keep": r'[-\']',  # Conserver les tirets et apostrophes
+        "exceptions": []
+    },
+    "la_street": {
+        "punctuation_to_remove": r'[;:!?"()]',
+        "punctuation_to_keep": r'[-\',.]',  # Conserver les tirets, apostrophes, virgules et points
+        "exceptions": ["ST.", "STE.", "AV.", "BD.", "ALL."]
+    },
+    "la_additional_address": {
+        "punctuation_to_remove": r'[;:!?"()]',
+        "punctuation_to_keep": r'[-\',.]',
+        "exceptions": []
+    },
+    "la_city": {
+        "punctuation_to_remove": r'[.,;:!?"()]',
+        "punctuation_to_keep": r'[-\']',
+        "exceptions": ["ST.", "STE."]
+    }
+}
+
+
+def clean_punctuation_string(value: Any, field: str) -> Any:
+    """Nettoie la ponctuation d'une valeur textuelle selon les règles du champ."""
+    if pd.isna(value) or not isinstance(value, str):
+        return value
+        
+    # Récupérer les règles spécifiques au champ
+    rules = CLEANING_RULES.get(field, {
+        "punctuation_to_remove": r'[.,;:!?"()]',
+        "punctuation_to_keep": r'[-\']',
+        "exceptions": []
+    })
+    
+    # Vérifier si la valeur contient des exceptions à préserver
+    for exception in rules["exceptions"]:
+        if exception in value:
+            # Remplacer temporairement l'exception par un marqueur unique
+            placeholder = f"__EXCEPTION_{hash(exception)}__"
+            value = value.replace(exception, placeholder)
+    
+    # Appliquer la règle de suppression de ponctuation
+    value = re.sub(rules["punctuation_to_remove"], '', value)
+    
+    # Restaurer les exceptions
+    for exception in rules["exceptions"]:
+        placeholder = f"__EXCEPTION_{hash(exception)}__"
+        value = value.replace(placeholder, exception)
+    
+    # Normaliser les espaces (à nouveau, car la suppression de ponctuation peut créer des espaces multiples)
+    value = re.sub(r'\s+', ' ', value).strip()
+    
+    return value
+
 
 def clean_punctuation(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -27,86 +96,21 @@ def clean_punctuation(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, An
         - La liste des erreurs ou modifications détectées
     """
     errors = []
-    result_df = df.copy()
-    
-    # Liste des champs textuels à traiter
-    text_fields = [
-        "la_house_number",
-        "la_street",
-        "la_additional_address",
-        "la_city"
-    ]
-    
-    # Définition des règles de nettoyage par champ
-    cleaning_rules = {
-        "la_house_number": {
-            "punctuation_to_remove": r'[.,;:!?"()]',
-            "punctuation_to_keep": r'[-\']',  # Conserver les tirets et apostrophes
-            "exceptions": []
-        },
-        "la_street": {
-            "punctuation_to_remove": r'[;:!?"()]',
-            "punctuation_to_keep": r'[-\',.]',  # Conserver les tirets, apostrophes, virgules et points
-            "exceptions": ["ST.", "STE.", "AV.", "BD.", "ALL."]
-        },
-        "la_additional_address": {
-            "punctuation_to_remove": r'[;:!?"()]',
-            "punctuation_to_keep": r'[-\',.]',
-            "exceptions": []
-        },
-        "la_city": {
-            "punctuation_to_remove": r'[.,;:!?"()]',
-            "punctuation_to_keep": r'[-\']',
-            "exceptions": ["ST.", "STE."]
-        }
-    }
-    
-    # Fonction pour nettoyer la ponctuation dans une chaîne
-    def clean_punctuation_string(value, field):
-        if pd.isna(value) or not isinstance(value, str):
-            return value
-            
-        # Récupérer les règles spécifiques au champ
-        rules = cleaning_rules.get(field, {
-            "punctuation_to_remove": r'[.,;:!?"()]',
-            "punctuation_to_keep": r'[-\']',
-            "exceptions": []
-        })
-        
-        # Vérifier si la valeur contient des exceptions à préserver
-        for exception in rules["exceptions"]:
-            if exception in value:
-                # Remplacer temporairement l'exception par un marqueur unique
-                placeholder = f"__EXCEPTION_{hash(exception)}__"
-                value = value.replace(exception, placeholder)
-        
-        # Appliquer la règle de suppression de ponctuation
-        value = re.sub(rules["punctuation_to_remove"], '', value)
-        
-        # Restaurer les exceptions
-        for exception in rules["exceptions"]:
-            placeholder = f"__EXCEPTION_{hash(exception)}__"
-            value = value.replace(placeholder, exception)
-        
-        # Normaliser les espaces (à nouveau, car la suppression de ponctuation peut créer des espaces multiples)
-        value = re.sub(r'\s+', ' ', value).strip()
-        
-        return value
+    result_df = step_copy(df)
     
     # Appliquer le nettoyage sur chaque champ textuel
-    for field in text_fields:
+    for field in TEXT_FIELDS:
         if field in result_df.columns:
             try:
                 # Sauvegarde des valeurs originales pour comparaison
                 original_values = result_df[field].copy()
                 
-                # Application du nettoyage avec les règles spécifiques au champ
-                result_df[field] = result_df[field].apply(
-                    lambda x: clean_punctuation_string(x, field)
+                # Application du nettoyage avec les règles spécifiques au champ, une fois par valeur distincte
+                result_df[field], modified_mask = map_unique_values(
+                    result_df[field], lambda x: clean_punctuation_string(x, field)
                 )
                 
-                # Détection des lignes modifiées pour logging
-                modified_mask = (original_values != result_df[field]) & (~pd.isna(original_values))
+                # Lignes modifiées pour logging
                 modified_indices = result_df.index[modified_mask].tolist()
                 
                 # Enregistrement des modifications pour suivi
@@ -0,0 +1,79 @@
+"""
+Module de détection des quasi-doublons des données logistic_address.
+Repère les entrepôts saisis plusieurs fois avec des orthographes voisines
+("CENTRE VAUBAN 199-201", "199/201 RUE COLBERT").
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.utils.near_duplicates import address_tokens, near_duplicate_groups
+
+
+# Champs comparés
+ADDRESS_FIELDS = ['la_house_number', 'la_street', 'la_additional_address']
+
+# Colonnes lues par l'étape (résumé constitué en mode par lots)
+NEAR_DUPLICATE_COLUMNS = ['la_id', *ADDRESS_FIELDS, 'la_postal_code']
+
+
+def _column_values(df: pd.DataFrame, column: str) -> List[Any]:
+    # Valeurs d'une colonne (None si la colonne est absente)
+    return df[column].tolist() if column in df.columns else [None] * len(df)
+
+
+def detect_near_duplicates(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Signale les groupes d'adresses en quasi-doublon.
+
+    Les adresses ne sont comparées qu'à l'intérieur de blocs (code postal et
+    mot significatif communs), puis notées sur leurs mots significatifs ;
+    chaque adresse d'un groupe est signalée avec les identifiants des autres
+    adresses du groupe. Étape globale en lecture seule.
+
+    Args:
+        df: DataFrame contenant les données logistic_address
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame inchangé
+        - La liste des quasi-doublons détectés
+    """
+    errors = []
+    if 'la_id' not in df.columns:
+        return df, errors
+
+    fields = [_column_values(df, column) for column in ADDRESS_FIELDS]
+    tokens = [address_tokens(*parts) for parts in zip(*fields)]
+    prefixes = [
+        postal_code.strip() if isinstance(postal_code, str) else ""
+        for postal_code in _column_values(df, 'la_postal_code')
+    ]
+    groups, similarities = near_duplicate_groups(tokens, prefixes)
+    grouped = np.flatnonzero(groups >= 0)
+    if not len(grouped):
+        return df, errors
+
+    la_ids = df['la_id'].to_numpy(dtype=object)
+    indices = df.index.tolist()
+    streets = _column_values(df, 'la_street')
+    members: Dict[int, List[Any]] = {}
+    for position in grouped:
+        members.setdefault(int(groups[position]), []).append(la_ids[position])
+    for position in grouped:
+        group = int(groups[position])
+        errors.append({
+            "type": "near_duplicate_address",
+            "severity": "warning",
+            "la_id": la_ids[position],
+            "index": indices[position],
+            "group": group,
+            "value": streets[position],
+            "duplicates": [la_id for la_id in members[group] if la_id != la_ids[position]],
+            "similarity": round(float(similarities[position]), 2),
+            "reason": "Adresse proche d'autres adresses de même code postal (doublon probable)"
+        })
+
+    return df, errors
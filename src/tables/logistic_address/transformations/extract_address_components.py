@@ -10,13 +10,45 @@ Ce module gère de nombreux cas complexes d'adresses:
 - Zones industrielles sans numéro (ZI-DES VAUGUILLETTES RUE DES CHAMPS PLUVIERS)
 """
 
-import re
 from typing import Dict, List, Tuple, Any, Optional, Union
 
 import pandas as pd
 
+from src.utils.address_parser import (
+    BUSINESS_ZONE_PATTERN, COMPANY_PATTERN, POSTAL_CODE_PATTERN, clean_redundant_address_info,
+    extract_components_from_address, is_company_prefix, normalize_postal_code, parse_street_with_number,
+    parse_values
+)
+from src.utils.copy_on_write import step_copy
 
-def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+
+# Fonction de nettoyage des valeurs à remplacer par des chaînes vides
+def clean_empty_values(value: Any) -> str:
+    """
+    Remplace les valeurs NULL, "0", ".", "/" par des chaînes vides.
+    
+    Args:
+        value: Valeur à nettoyer
+        
+    Returns:
+        Valeur nettoyée ou chaîne vide
+    """
+    if pd.isna(value):
+        return ""
+    
+    if not isinstance(value, str):
+        value = str(value)
+        
+    if value in ["0", ".", "/", "-"]:
+        return ""
+        
+    return value
+
+
+def extract_address_components(
+    df: pd.DataFrame,
+    memo_store: Optional[Dict[str, Any]] = None
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
     Analyse et décompose les adresses pour en extraire les composants.
     
@@ -29,6 +61,7 @@ def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dic
     
     Args:
         df: DataFrame contenant les données logistic_address
+        memo_store: Cache persistant des adresses déjà décomposées (optionnel)
         
     Returns:
         Tuple contenant:
@@ -36,288 +69,21 @@ def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dic
         - La liste des erreurs/informations de traitement
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Liste des champs textuels d'adresse à normaliser
     address_fields = ["la_house_number", "la_street", "la_additional_address", "la_postal_code", "la_city"]
     
-    # Patterns pour extraction des composants d'adresse
-    # Code postal standard ou avec espace (ex: "59500" ou "38 170")
-    postal_code_pattern = re.compile(r'(\d{2,3})\s*(\d{2,3})')
-    
-    # Pattern pour extraire numéro de rue et rue
-    street_number_pattern = re.compile(r'^(\d+[\s]?[a-zA-Z]?)\s+(.+)$')
-    
-    # Pattern pour reconnaissance des types de voies courantes
-    street_type_pattern = re.compile(
-        r'\b(rue|avenue|boulevard|all[ée]e|place|cours|chemin|impasse|quai|square|route|sentier|passage)\b',
-        re.IGNORECASE
-    )
-    
-    # Pattern pour les zones d'activité et zones industrielles
-    business_zone_pattern = re.compile(
-        r'^(ZA|ZAC|ZI|ZONE\s+[A-Za-z\'\s-]+|PARC\s+[A-Za-z\'\s-]+)[\s-]*(.*?)(?:(\d+[\s]?[a-zA-Z]?)\s+)?(.+)$',
-        re.IGNORECASE
-    )
-    
-    # Pattern pour les entreprises suivies d'une adresse
-    company_pattern = re.compile(
-        r'^([^,]+),\s*(.+)$'
-    )
-    
-    # Fonction de nettoyage des valeurs à remplacer par des chaînes vides
-    def clean_empty_values(value: Any) -> str:
-        """
-        Remplace les valeurs NULL, "0", ".", "/" par des chaînes vides.
-        
-        Args:
-            value: Valeur à nettoyer
-            
-        Returns:
-            Valeur nettoyée ou chaîne vide
-        """
-        if pd.isna(value):
-            return ""
-        
-        if not isinstance(value, str):
-            value = str(value)
-            
-        if value in ["0", ".", "/", "-"]:
-            return ""
-            
-        return value
-    
-    def normalize_postal_code(postal_code: str) -> str:
-        """
-        Normalise un code postal qui peut être espacé.
-        
-        Args:
-            postal_code: Code postal à normaliser (ex: "38 170")
-            
-        Returns:
-            Code postal normalisé (ex: "38170")
-        """
-        if not postal_code or pd.isna(postal_code):
-            return ""
-            
-        # Vérifier si c'est un code postal espacé
-        match = postal_code_pattern.search(postal_code)
-        if match:
-            # Reconstituer le code postal sans espaces
-            return f"{match.group(1)}{match.group(2)}"
-            
-        # Retirer tous les espaces du code postal
-        return re.sub(r'\s+', '', postal_code)
-    
-    def parse_street_with_number(street_value: str) -> Tuple[Optional[str], Optional[str]]:
-        """
-        Extrait le numéro de rue et le nom de rue d'une chaîne.
-        
-        Args:
-            street_value: Texte pouvant contenir un numéro suivi d'un nom de rue
-            
-        Returns:
-            Tuple (numéro, rue) ou (None, None) si non détecté
-        """
-        if pd.isna(street_value) or not isinstance(street_value, str):
-            return None, None
-            
-        street_value = street_value.strip()
-        match = street_number_pattern.match(street_value)
-        
-        if match:
-            number, street = match.groups()
-            return number.strip(), street.strip()
-        
-        # Tenter d'extraire un numéro suivi d'un type de voie connu
-        number_match = re.search(r'^(\d+[a-zA-Z]?)', street_value)
-        if number_match:
-            number = number_match.group(1)
-            street_type_match = street_type_pattern.search(street_value)
-            if street_type_match:
-                # Numéro trouvé et type de voie détecté
-                street = street_value[len(number):].strip()
-                return number.strip(), street
-                
-        return None, street_value
-    
-    def extract_components_from_address(address: str) -> Dict[str, Optional[str]]:
-        """
-        Extrait tous les composants possibles d'une adresse complète.
-        
-        Args:
-            address: Adresse complète à décomposer
-            
-        Returns:
-            Dictionnaire des composants (house_number, street, postal_code, city, additional_address)
-        """
-        components = {
-            "house_number": None,
-            "street": None, 
-            "postal_code": None,
-            "city": None,
-            "additional_address": None
-        }
-        
-        if pd.isna(address) or not isinstance(address, str):
-            return components
-            
-        address = address.strip()
-        
-        # Cas 1: Entreprise suivie d'une adresse (LOGISTICS OPERATIONS, 41 RUE MERCIER)
-        company_match = company_pattern.match(address)
-        if company_match:
-            company_name, address_part = company_match.groups()
-            
-            # Vérifier que la partie entreprise ne ressemble pas à une adresse
-            if not re.search(r'\b\d+\b', company_name) and not street_type_pattern.search(company_name.lower()):
-                components["additional_address"] = company_name.strip()
-                
-                # Traiter le reste de l'adresse récursivement
-                remaining_components = extract_components_from_address(address_part)
-                for key, value in remaining_components.items():
-                    if key != "additional_address" or not components["additional_address"]:
-                        components[key] = value
-                
-                return components
-                
-        # Cas 2: Zone d'activité suivie d'une adresse (ZAC DES MURONS 466 RUE JACQUELINE AURIOL)
-        business_zone_match = business_zone_pattern.match(address)
-        if business_zone_match:
-            zone_prefix, zone_details, house_number, street = business_zone_match.groups()
-            
-            # Nettoyer les composants
-            zone_prefix = zone_prefix.strip()
-            zone_details = zone_details.strip() if zone_details else ""
-            house_number = house_number.strip() if house_number else None
-            street = street.strip()
-            
-            # Former l'information additionnelle depuis la zone d'activité
-            additional_info = zone_prefix
-            if zone_details and zone_details != '-':
-                additional_info = f"{zone_prefix} {zone_details}".strip()
-            
-            components["house_number"] = house_number
-            components["street"] = street
-            components["additional_address"] = additional_info
-            
-            # Extraire éventuellement ville et code postal de la partie rue
-            postal_match = postal_code_pattern.search(street)
-            if postal_match:
-                parts = re.split(postal_code_pattern, street)
-                if len(parts) >= 3:
-                    street = parts[0].strip()
-                    postal_code = f"{postal_match.group(1)}{postal_match.group(2)}"
-                    city = parts[-1].strip()
-                    
-                    components["street"] = street
-                    components["postal_code"] = postal_code
-                    components["city"] = city
-            
-            return components
-        
-        # Cas 3: Extraire code postal et ville s'ils sont présents
-        postal_match = postal_code_pattern.search(address)
-        if postal_match:
-            postal_code = f"{postal_match.group(1)}{postal_match.group(2)}"
-            
-            # Séparer l'adresse en parties avant/après le code postal
-            parts = re.split(postal_code_pattern, address)
-            if len(parts) >= 3:
-                before_postal = parts[0].strip()
-                after_postal = parts[-1].strip()
-                
-                # Nettoyer les séparateurs
-                before_postal = re.sub(r'[,;.\s]+$', '', before_postal).strip()
-                after_postal = re.sub(r'^[,;.\s]+', '', after_postal).strip()
-                
-                # La partie après est probablement la ville
-                components["postal_code"] = postal_code
-                components["city"] = after_postal if after_postal else None
-                
-                # Analyser la partie avant pour extraire numéro et rue
-                house_number, street = parse_street_with_number(before_postal)
-                components["house_number"] = house_number
-                components["street"] = street
-                
-                return components
-        
-        # Cas 4: Si on arrive ici, c'est une adresse simple sans code postal/ville
-        # Tentons d'extraire au moins le numéro et la rue
-        house_number, street = parse_street_with_number(address)
-        components["house_number"] = house_number
-        components["street"] = street
-        
-        return components
-    
-    def clean_redundant_address_info(house_number: str, additional_address: str) -> str:
-        """
-        Nettoie les informations redondantes dans le champ additional_address.
-        
-        Args:
-            house_number: Le numéro de rue déjà identifié
-            additional_address: Le complément d'adresse à nettoyer
-            
-        Returns:
-            Le complément d'adresse nettoyé
-        """
-        if pd.isna(additional_address) or not isinstance(additional_address, str) or not house_number:
-            return additional_address
-            
-        # Chercher des mentions du numéro dans le complément d'adresse
-        if house_number in additional_address:
-            # Patterns courants à supprimer
-            patterns = [
-                f"{house_number}[/-]\\d+",  # Ex: "199-201"
-                f"{house_number}/\\d+",      # Ex: "199/201"
-                f"{house_number} ?[-/] ?\\d+",  # Ex: "199 - 201"
-                f"{house_number}"           # Le numéro lui-même
-            ]
-            
-            cleaned_address = additional_address
-            for pattern in patterns:
-                cleaned_address = re.sub(pattern, "", cleaned_address)
-            
-            # Nettoyer les espaces multiples résultants
-            cleaned_address = re.sub(r'\s+', ' ', cleaned_address).strip()
-            
-            if cleaned_address != additional_address:
-                return cleaned_address
-        
-        # Rechercher des motifs de type "numéro + type de voie"
-        street_type_match = street_type_pattern.search(additional_address.lower())
-        if street_type_match:
-            # Trouver si un numéro précède le type de voie
-            street_type_pos = street_type_match.start()
-            before_type = additional_address[:street_type_pos].strip()
-            
-            number_match = re.search(r'(\d+[a-zA-Z]?)\s*$', before_type)
-            if number_match:
-                # Trouver la fin de ce segment (jusqu'au prochain point, virgule ou fin de chaîne)
-                segment_start = additional_address.find(number_match.group(1))
-                
-                end_markers = [',', '.', ';']
-                segment_end = len(additional_address)
-                
-                for marker in end_markers:
-                    marker_pos = additional_address.find(marker, street_type_pos)
-                    if marker_pos > 0 and marker_pos < segment_end:
-                        segment_end = marker_pos
-                
-                # Segment à supprimer (numéro + type de voie + suite)
-                if segment_end > segment_start:
-                    segment_to_remove = additional_address[segment_start:segment_end]
-                    cleaned_address = additional_address.replace(segment_to_remove, '')
-                    cleaned_address = re.sub(r'\s+', ' ', cleaned_address).strip()
-                    cleaned_address = re.sub(r'^[,;.\s]+|[,;.\s]+$', '', cleaned_address).strip()
-                    
-                    if cleaned_address != additional_address and cleaned_address != '':
-                        return cleaned_address
-                
-        return additional_address
-    
+    # Décomposition par lot (analyseur commun): rues, et adresses suivant un nom d'entreprise
+    streets = (result_df['la_street'] if 'la_street' in result_df.columns
+               else pd.Series(None, index=result_df.index, dtype=object))
+    company_matches = [COMPANY_PATTERN.match(street) if isinstance(street, str) else None for street in streets]
+    address_parts = [match.group(2) if match else None for match in company_matches]
+    street_components = parse_values(streets, extract_components_from_address, memo_store)
+    part_components = parse_values(address_parts, extract_components_from_address, memo_store)
+
     # Traitement principal: parcourir chaque ligne du DataFrame
-    for idx, row in result_df.iterrows():
+    for position, (idx, row) in enumerate(result_df.iterrows()):
         la_id = row['la_id']
         
         # Étape 1: Vérifier si certains champs d'adresse sont vides
@@ -331,17 +97,17 @@ def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dic
             street_value = row['la_street']
             
             # Vérifier si la_street contient un code postal (adresse complète potentielle)
-            contains_postal_code = postal_code_pattern.search(street_value) is not None
+            contains_postal_code = POSTAL_CODE_PATTERN.search(street_value) is not None
             
             # Vérifier d'abord si c'est une entreprise avec adresse (ex: LOGISTICS OPERATIONS, ...)
-            company_match = company_pattern.match(street_value)
+            company_match = COMPANY_PATTERN.match(street_value)
             if company_match:
                 company_name, address_part = company_match.groups()
                 
                 # Vérifier que la partie entreprise ne ressemble pas à une adresse
-                if not re.search(r'\b\d+\b', company_name) and not street_type_pattern.search(company_name.lower()):
+                if is_company_prefix(company_name):
                     # Extraire les composants de la partie adresse
-                    components = extract_components_from_address(address_part)
+                    components = part_components[position]
                     
                     # Mettre à jour la rue et le numéro
                     if components["house_number"] and not has_house_number:
@@ -377,9 +143,9 @@ def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dic
                     continue  # Passer à l'entrée suivante
             
             # Vérifier si c'est une zone d'activité avec adresse (ZAC, ZA, ZI)
-            business_zone_match = business_zone_pattern.match(street_value)
+            business_zone_match = BUSINESS_ZONE_PATTERN.match(street_value)
             if business_zone_match:
-                components = extract_components_from_address(street_value)
+                components = street_components[position]
                 
                 # Mise à jour de la rue et du numéro
                 if components["house_number"] and not has_house_number:
@@ -418,7 +184,7 @@ def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dic
             # nous devons extraire uniquement la partie rue
             if has_house_number and has_postal_code and has_city and contains_postal_code:
                 # Extraire la partie rue de l'adresse complète sans modifier les autres champs
-                components = extract_components_from_address(street_value)
+                components = street_components[position]
                 if components["street"]:
                     result_df.at[idx, 'la_street'] = components["street"]
                     errors.append({
@@ -433,7 +199,7 @@ def extract_address_components(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dic
             # Si la rue contient potentiellement une adresse complète et que certains 
             # champs sont vides, extraire tous les composants
             elif contains_postal_code and (not has_postal_code or not has_city):
-                components = extract_components_from_address(street_value)
+                components = street_components[position]
                 
                 # Mise à jour conditionnelle: n'écraser que les champs vides
                 if components["house_number"] and not has_house_number:
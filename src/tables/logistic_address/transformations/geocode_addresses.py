@@ -0,0 +1,182 @@
+"""
+Module de géocodage hors ligne des données logistic_address.
+Renseigne les coordonnées des adresses à partir de l'index local de la Base
+Adresse Nationale et signale les adresses géographiquement confondues.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import step_copy
+from src.utils.geocoding_index import PRECISION_HOUSENUMBER, lookup_addresses, proximity_groups
+
+
+# Distance en dessous de laquelle deux adresses sont signalées comme doublons probables (mètres)
+PROXIMITY_RADIUS = 30.0
+
+# Colonne de travail: précision du géocodage de chaque adresse (None pour les coordonnées des données sources)
+PRECISION_COLUMN = "la_geocoding_precision"
+
+
+def _coordinates(df: pd.DataFrame, column: str) -> np.ndarray:
+    # Coordonnées d'une colonne, NaN pour les valeurs absentes ou non numériques
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float, copy=True)
+
+
+def _missing_coordinates(longitudes: np.ndarray, latitudes: np.ndarray) -> np.ndarray:
+    # Coordonnées absentes: valeurs nulles ou point (0, 0) des données sources
+    return np.isnan(longitudes) | np.isnan(latitudes) | ((longitudes == 0) & (latitudes == 0))
+
+
+def geocode_addresses(
+    df: pd.DataFrame,
+    geocoding_index: Dict[str, Any]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Géocode les adresses dont les coordonnées sont absentes.
+
+    Chaque adresse décomposée (numéro, rue, code postal, ville) est recherchée
+    par lot dans l'index BAN : au numéro, à défaut au centre de la voie, à
+    défaut au centre de la commune. Les coordonnées déjà renseignées sont
+    conservées. La précision obtenue est notée dans la colonne de travail
+    PRECISION_COLUMN, lue par detect_proximity_duplicates.
+
+    Args:
+        df: DataFrame contenant les données logistic_address
+        geocoding_index: Index chargé par open_geocoding_index
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les coordonnées renseignées
+        - La liste des adresses non géocodées et le résumé du géocodage
+    """
+    errors = []
+    result_df = step_copy(df)
+
+    for column in ('la_street', 'la_postal_code'):
+        if column not in result_df.columns:
+            errors.append({
+                "type": "missing_column",
+                "severity": "error",
+                "message": f"La colonne '{column}' est absente du DataFrame"
+            })
+            return result_df, errors
+
+    longitudes = _coordinates(result_df, 'la_longitude')
+    latitudes = _coordinates(result_df, 'la_latitude')
+    missing = _missing_coordinates(longitudes, latitudes)
+    if not missing.any():
+        return result_df, errors
+
+    empty = pd.Series("", index=result_df.index)
+    rows = np.flatnonzero(missing)
+    located = lookup_addresses(
+        geocoding_index,
+        result_df['la_house_number'].iloc[rows] if 'la_house_number' in result_df.columns else empty.iloc[rows],
+        result_df['la_street'].iloc[rows],
+        result_df['la_postal_code'].iloc[rows],
+        result_df['la_city'].iloc[rows] if 'la_city' in result_df.columns else empty.iloc[rows]
+    )
+
+    # Coordonnées trouvées, écrites en une fois
+    found = pd.notna(located["precision"])
+    longitudes[rows[found]] = located["longitude"][found]
+    latitudes[rows[found]] = located["latitude"][found]
+    result_df['la_longitude'] = longitudes
+    result_df['la_latitude'] = latitudes
+    precision = np.full(len(result_df), None, dtype=object)
+    precision[rows] = located["precision"]
+    result_df[PRECISION_COLUMN] = precision
+
+    # Adresses non géocodées (code postal renseigné), dans l'ordre de la table
+    indices = result_df.index.tolist()
+    la_ids = result_df['la_id'].to_numpy(dtype=object)
+    postal_codes = result_df['la_postal_code'].to_numpy(dtype=object)
+    streets = result_df['la_street'].to_numpy(dtype=object)
+    for position in rows[~found]:
+        if not isinstance(postal_codes[position], str) or not postal_codes[position].strip():
+            continue
+        errors.append({
+            "type": "address_not_geocoded",
+            "severity": "info",
+            "la_id": la_ids[position],
+            "index": indices[position],
+            "la_street": streets[position],
+            "la_postal_code": postal_codes[position],
+            "reason": "Adresse absente de la Base Adresse Nationale locale"
+        })
+
+    precisions = pd.Series(located["precision"][found]).value_counts()
+    errors.append({
+        "type": "geocoding_summary",
+        "severity": "info",
+        "message": f"Adresses géocodées: {precisions.get('housenumber', 0)} au numéro, "
+                   f"{precisions.get('street', 0)} à la voie, {precisions.get('municipality', 0)} à la commune, "
+                   f"{int((~found).sum())} non trouvées"
+    })
+
+    return result_df, errors
+
+
+def detect_proximity_duplicates(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Signale les adresses situées à moins de PROXIMITY_RADIUS mètres les unes des autres.
+
+    Seules les coordonnées des données sources et celles géocodées au numéro
+    sont comparées : les adresses géocodées au centre d'une voie ou d'une
+    commune partagent les mêmes coordonnées sans être confondues. Les paires
+    proches sont recherchées dans un arbre cKDTree des coordonnées, puis
+    regroupées ; chaque adresse d'un groupe est signalée avec les
+    identifiants des autres adresses du groupe. Étape globale en lecture
+    seule.
+
+    Args:
+        df: DataFrame contenant les données logistic_address (la_id, la_longitude, la_latitude,
+            PRECISION_COLUMN)
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame inchangé
+        - La liste des doublons géographiques probables
+    """
+    errors = []
+    if 'la_id' not in df.columns:
+        return df, errors
+
+    longitudes = _coordinates(df, 'la_longitude')
+    latitudes = _coordinates(df, 'la_latitude')
+    missing = _missing_coordinates(longitudes, latitudes)
+    if PRECISION_COLUMN in df.columns:
+        # Centres de voie ou de commune écartés
+        precision = df[PRECISION_COLUMN].to_numpy(dtype=object)
+        missing |= pd.notna(precision) & (precision != PRECISION_HOUSENUMBER)
+    longitudes[missing] = np.nan
+    latitudes[missing] = np.nan
+
+    groups = proximity_groups(longitudes, latitudes, PROXIMITY_RADIUS)
+    grouped = np.flatnonzero(groups >= 0)
+    if not len(grouped):
+        return df, errors
+
+    la_ids = df['la_id'].to_numpy(dtype=object)
+    indices = df.index.tolist()
+    members: Dict[int, List[Any]] = {}
+    for position in grouped:
+        members.setdefault(int(groups[position]), []).append(la_ids[position])
+    for position in grouped:
+        group = int(groups[position])
+        errors.append({
+            "type": "proximity_duplicate",
+            "severity": "warning",
+            "la_id": la_ids[position],
+            "index": indices[position],
+            "group": group,
+            "duplicates": [la_id for la_id in members[group] if la_id != la_ids[position]],
+            "reason": f"Adresse située à moins de {PROXIMITY_RADIUS:.0f} m d'autres adresses (doublon probable)"
+        })
+
+    return df, errors
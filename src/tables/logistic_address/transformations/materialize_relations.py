@@ -0,0 +1,152 @@
+"""
+Module de matérialisation des relations pour les données logistic_address.
+Remplit les tableaux stock_import et positioning de chaque adresse à partir
+des tables nettoyées stock_import (si_io -> si_id) et positioning
+(fk_la -> po_id).
+
+La relation adresse - import de stock est plusieurs-à-plusieurs : un import
+est listé par l'adresse de l'entreprise où il est positionné (si_id déjà
+présents) et par l'adresse de l'organisation qui le reçoit (codes
+d'opération). Elle n'a donc pas de clé inverse dans TABLE_REGISTRY, à la
+différence de positioning, dont fk_la désigne une seule adresse.
+"""
+
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils import ragged
+from src.utils.copy_on_write import step_copy
+from src.utils.referential_integrity import group_reference_values, lookup_groups, lookup_keys
+
+
+# Colonne des codes d'opération (si_io) portés par les adresses brutes
+OPERATION_IDS_COLUMN = "grp_id_ope_org.1"
+
+# Colonnes à lire dans chaque table référencée (open_reference_table)
+REFERENCE_KEYS = {
+    "stock_import": (["si_io"], ["si_id"]),
+    "positioning": (["po_id"], ["fk_la"])
+}
+
+
+def open_relation_groups(references: Dict[str, Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Regroupe une seule fois les positionnements de chaque adresse (fk_la -> po_id).
+
+    Args:
+        references: Tables référencées ouvertes, par nom de table
+
+    Returns:
+        Regroupement construit par group_reference_values, None si positioning n'a pas de sortie
+    """
+    positioning = references.get("positioning")
+    return group_reference_values(positioning, "fk_la", "po_id") if positioning is not None else None
+
+
+def materialize_relations(
+    df: pd.DataFrame,
+    stock_import: Optional[Dict[str, Any]],
+    positioning_groups: Optional[Dict[str, Any]]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Matérialise les tableaux stock_import et positioning de chaque adresse.
+
+    Opérations effectuées:
+    - Les codes d'opération de l'adresse (grp_id_ope_org.1 et codes si_io
+      laissés sous forme de chaîne dans stock_import) sont recherchés dans
+      stock_import ; les si_id trouvés complètent les identifiants entiers
+      déjà présents, sans doublon (un même si_id peut figurer dans
+      plusieurs adresses)
+    - Les codes introuvables sont signalés, une entrée par adresse
+    - positioning reçoit les po_id des positionnements dont fk_la désigne
+      l'adresse
+
+    Les codes sont traités au format ragged (src/utils/ragged.py) et résolus
+    par une seule recherche vectorisée dans l'index de si_io ; seules les
+    lignes modifiées reçoivent une nouvelle liste. Une table référencée sans
+    sortie nettoyée (None) laisse le tableau correspondant inchangé.
+
+    Args:
+        df: DataFrame contenant les données logistic_address
+        stock_import: Table stock_import ouverte par open_reference_table
+        positioning_groups: Positionnements regroupés par adresse (open_relation_groups)
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les tableaux stock_import et positioning remplis
+        - La liste des erreurs/modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    la_ids = result_df['la_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+
+    if stock_import is not None:
+        cells = result_df['stock_import'].to_numpy(dtype=object) if 'stock_import' in result_df.columns \
+            else np.full(len(result_df), None, dtype=object)
+        current = ragged.from_lists(cells)
+        is_code = ragged.value_types(current["values"]) == str
+
+        # Codes d'opération de chaque adresse, dans l'ordre: groupe d'origine puis chaînes de stock_import
+        parts = [ragged.select(current, is_code)]
+        if OPERATION_IDS_COLUMN in result_df.columns:
+            parts.insert(0, ragged.from_lists(result_df[OPERATION_IDS_COLUMN].to_numpy(dtype=object)))
+        codes = ragged.concat_rows(*parts)
+        codes = ragged.select(codes, pd.notna(codes["values"]) & (codes["values"] != ""))
+
+        # Jointure des codes sur l'index si_io -> si_id
+        rows = lookup_keys(stock_import, "si_io", pd.Series(codes["values"], dtype=object))
+        found = rows >= 0
+        resolved = ragged.select(codes, found)
+        resolved["values"] = stock_import["frame"]["si_id"].to_numpy(dtype=object)[rows[found]]
+
+        materialized = ragged.dedup_rows(ragged.concat_rows(ragged.select(current, ~is_code), resolved))
+        changed = ragged.changed_rows(current, materialized) | (ragged.cell_lengths(cells) < 0)
+
+        values = cells.copy()
+        changed_rows = np.flatnonzero(changed)
+        for position, stock_imports in zip(changed_rows, ragged.to_lists(materialized, changed_rows)):
+            values[position] = stock_imports
+            errors.append({
+                "type": "stock_import_materialized",
+                "severity": "info",
+                "la_id": la_ids[position],
+                "index": indices[position],
+                "original": cells[position],
+                "materialized": stock_imports,
+                "message": "Le tableau stock_import a été rempli à partir des codes d'opération"
+            })
+        result_df['stock_import'] = values
+
+        # Codes d'opération introuvables dans stock_import
+        unresolved = ragged.select(codes, ~found)
+        unresolved_rows = np.flatnonzero(ragged.lengths(unresolved))
+        for position, operation_ids in zip(unresolved_rows, ragged.to_lists(unresolved, unresolved_rows)):
+            errors.append({
+                "type": "unresolved_operation_id",
+                "severity": "warning",
+                "la_id": la_ids[position],
+                "index": indices[position],
+                "field": "stock_import",
+                "values": operation_ids,
+                "count": len(operation_ids),
+                "target_table": "stock_import",
+                "message": f"{len(operation_ids)} code(s) d'opération introuvable(s) dans stock_import.si_io: {operation_ids}"
+            })
+
+    if positioning_groups is not None:
+        # Jointure des adresses sur le regroupement fk_la -> po_id (les tableaux d'origine sont remplacés)
+        grouped = lookup_groups(positioning_groups, result_df['la_id'])
+        result_df['positioning'] = ragged.to_lists(grouped)
+        filled = int(np.count_nonzero(ragged.lengths(grouped)))
+        errors.append({
+            "type": "positioning_materialized",
+            "severity": "info",
+            "field": "positioning",
+            "count": filled,
+            "message": f"Tableau positioning rempli pour {filled} adresse(s) sur {len(result_df)}"
+        })
+
+    return result_df, errors
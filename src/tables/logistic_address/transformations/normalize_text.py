@@ -8,6 +8,36 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.factorize import map_unique_values
+from src.utils.copy_on_write import step_copy
+
+
+# Liste des champs textuels à normaliser
+TEXT_FIELDS = [
+    "la_house_number",
+    "la_street",
+    "la_additional_address",
+    "la_postal_code",
+    "la_city"
+]
+
+
+def normalize_string(value: Any) -> Any:
+    """Normalise une valeur textuelle: trim, normalisation des espaces, majuscules."""
+    if pd.isna(value) or not isinstance(value, str):
+        return value
+    
+    # Trim: suppression des espaces en début et fin
+    value = value.strip()
+    
+    # Normalisation des espaces: remplacer les multiples espaces par un seul
+    value = re.sub(r'\s+', ' ', value)
+    
+    # Conversion en majuscules
+    value = value.upper()
+    
+    return value
+
 
 def normalize_text(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -27,45 +57,19 @@ def normalize_text(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
         - La liste des erreurs de normalisation détectées
     """
     errors = []
-    result_df = df.copy()
-    
-    # Liste des champs textuels à normaliser
-    text_fields = [
-        "la_house_number",
-        "la_street",
-        "la_additional_address",
-        "la_postal_code",
-        "la_city"
-    ]
+    result_df = step_copy(df)
     
-    # Fonction de normalisation à appliquer sur chaque champ
-    def normalize_string(value):
-        if pd.isna(value) or not isinstance(value, str):
-            return value
-        
-        # Trim: suppression des espaces en début et fin
-        value = value.strip()
-        
-        # Normalisation des espaces: remplacer les multiples espaces par un seul
-        value = re.sub(r'\s+', ' ', value)
-        
-        # Conversion en majuscules
-        value = value.upper()
-        
-        return value
-
     # Appliquer la normalisation sur chaque champ textuel
-    for field in text_fields:
+    for field in TEXT_FIELDS:
         if field in result_df.columns:
             try:
                 # Sauvegarde des valeurs originales pour comparaison
                 original_values = result_df[field].copy()
                 
-                # Application de la normalisation
-                result_df[field] = result_df[field].apply(normalize_string)
+                # Application de la normalisation, une fois par valeur distincte
+                result_df[field], modified_mask = map_unique_values(result_df[field], normalize_string)
                 
-                # Détection des lignes modifiées pour logging
-                modified_mask = (original_values != result_df[field]) & (~pd.isna(original_values))
+                # Lignes modifiées pour logging
                 modified_indices = result_df.index[modified_mask].tolist()
                 
                 # Enregistrement des modifications pour suivi
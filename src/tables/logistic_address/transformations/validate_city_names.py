@@ -6,8 +6,12 @@ Nettoie et valide les noms de ville selon les règles françaises.
 import re
 from typing import Dict, List, Tuple, Any, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.utils.factorize import factorize_strings, map_unique_values
+from src.utils.copy_on_write import step_copy
+
 
 def validate_city_names(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -27,7 +31,7 @@ def validate_city_names(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des modifications et erreurs détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne de ville existe
     if 'la_city' not in result_df.columns:
@@ -54,6 +58,110 @@ def validate_city_names(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
     # Liste des préfixes courants à préserver
     prefix_list = ["SAINT", "SAINTE", "MONT", "VAL"]
     
+    # Fonction pour nettoyer et normaliser un nom de ville
+    def clean_city_name(city_name: Optional[str]) -> Optional[str]:
+        if pd.isna(city_name) or city_name == '':
+            return city_name
+        
+        if not isinstance(city_name, str):
+            city_name = str(city_name)
+        
+        # Convertir en majuscules
+        city_name = city_name.upper().strip()
+        
+        # Normaliser les espaces
+        city_name = re.sub(r'\s+', ' ', city_name)
+        
+        # Supprimer les mentions d'arrondissement
+        original_name = city_name
+        for pattern, replacement in arrondissement_patterns:
+            city_name = re.sub(pattern, replacement, city_name)
+        
+        # Vérifier si un préfixe doit être préservé avec son tiret
+        for prefix in prefix_list:
+            # Convertir "SAINT PIERRE" en "SAINT-PIERRE"
+            pattern = f"{prefix}\\s+([A-Z])"
+            city_name = re.sub(pattern, f"{prefix}-\\1", city_name)
+        
+        return city_name.strip()
+    
+    # Nettoyage des noms de ville, une fois par valeur distincte
+    original_cities = result_df['la_city'].to_numpy(dtype=object)
+    cleaned_cities, modified_mask = map_unique_values(result_df['la_city'], clean_city_name)
+    result_df['la_city'] = cleaned_cities
+    
+    # Validation du format et de la longueur, une fois par nom de ville distinct
+    codes, uniques = factorize_strings(cleaned_cities)
+    invalid_format = np.fromiter((not city_name_pattern.match(city) for city in uniques), dtype=bool, count=len(uniques))
+    too_short = np.fromiter((len(city) < 2 for city in uniques), dtype=bool, count=len(uniques))
+    
+    # Les valeurs nulles/vides sont ignorées
+    checked = ~pd.isna(original_cities) & (original_cities != '')
+    row_invalid = np.zeros(len(codes), dtype=bool)
+    row_short = np.zeros(len(codes), dtype=bool)
+    row_invalid[checked] = invalid_format[codes[checked]]
+    row_short[checked] = too_short[codes[checked]]
+    
+    # Enregistrement des modifications et erreurs, ligne par ligne dans l'ordre de la table
+    indices = result_df.index.tolist()
+    la_ids = result_df['la_id'].to_numpy(dtype=object)
+    cities = cleaned_cities.to_numpy(dtype=object)
+    for position in np.flatnonzero(checked & (modified_mask | row_invalid | row_short)):
+        idx = indices[position]
+        la_id = la_ids[position]
+        city_name = cities[position]
+        
+        # Si le nettoyage a modifié la valeur, enregistrer la modification
+        if modified_mask[position]:
+            errors.append({
+                "type": "city_name_cleaning",
+                "severity": "info",
+                "la_id": la_id,
+                "index": idx,
+                "original": original_cities[position],
+                "cleaned": city_name
+            })
+        
+        # Validation du format
+        if row_invalid[position]:
+            errors.append({
+                "type": "invalid_city_name_format",
+                "severity": "warning",
+                "la_id": la_id,
+                "index": idx,
+                "value": city_name,
+                "reason": "Le nom de ville doit contenir uniquement des lettres majuscules, espaces, tirets et apostrophes"
+            })
+        
+        # Vérification de la longueur minimale
+        if row_short[position]:
+            errors.append({
+                "type": "city_name_too_short",
+                "severity": "warning",
+                "la_id": la_id,
+                "index": idx,
+                "value": city_name,
+                "reason": "Le nom de ville est trop court"
+            })
+    
+    return result_df, errors
+    
+    # Expression régulière pour valider les noms de ville
+    city_name_pattern = re.compile(r'^[A-Z\s\-\']+$')
+    
+    # Patterns pour nettoyer les noms de ville avec arrondissements
+    arrondissement_patterns = [
+        (r'\s+\d+E\s+ARRONDISSEMENT$', ''),  # ex: "LYON 8E ARRONDISSEMENT" -> "LYON"
+        (r'\s+\d+EME\s+ARRONDISSEMENT$', ''),  # ex: "LYON 8EME ARRONDISSEMENT" -> "LYON"
+        (r'\s+\d+E$', ''),  # ex: "PARIS 14E" -> "PARIS"
+        (r'\s+\d+ER$', ''),  # ex: "PARIS 1ER" -> "PARIS"
+        (r'\s+\d+EME$', ''),  # ex: "PARIS 14EME" -> "PARIS"
+        (r'\s+CEDEX.*$', '')  # ex: "RENNES CEDEX 9" -> "RENNES"
+    ]
+    
+    # Liste des préfixes courants à préserver
+    prefix_list = ["SAINT", "SAINTE", "MONT", "VAL"]
+    
     # Fonction pour nettoyer et normaliser un nom de ville
     def clean_city_name(city_name: Optional[str]) -> Optional[str]:
         if pd.isna(city_name) or city_name == '':
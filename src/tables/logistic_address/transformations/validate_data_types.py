@@ -209,6 +209,8 @@ from typing import Dict, List, Tuple, Any, Optional
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 def validate_data_types(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
     Valide et corrige les types de données dans le DataFrame.
@@ -226,7 +228,7 @@ def validate_data_types(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs/modifications
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
 
     boolean_fields = [
         "la_truck_access",
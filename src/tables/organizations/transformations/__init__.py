@@ -6,6 +6,7 @@ Ce package contient les modules de transformation spécifiques aux données d'or
 from src.tables.organizations.transformations.normalize_text import normalize_text
 from src.tables.organizations.transformations.normalize_special_chars import normalize_special_chars
 from src.tables.organizations.transformations.clean_punctuation import clean_punctuation
+from src.tables.organizations.transformations.clean_text import clean_text
 from src.tables.organizations.transformations.validate_rna import validate_rna
 from src.tables.organizations.transformations.validate_address_fields import validate_address_fields
 from src.tables.organizations.transformations.add_missing_fields import add_missing_fields
@@ -17,6 +18,7 @@ __all__ = [
     'normalize_text',
     'normalize_special_chars',
     'clean_punctuation',
+    'clean_text',
     'validate_rna',
     'validate_address_fields',
     'add_missing_fields',
@@ -0,0 +1,58 @@
+"""
+Module de nettoyage fusionné du texte pour les données Organizations.
+Enchaîne en une seule passe par colonne la normalisation du texte, la
+normalisation des caractères spéciaux et le nettoyage de la ponctuation.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import pandas as pd
+
+from src.tables.organizations.transformations.normalize_text import TEXT_FIELDS as NORMALIZATION_FIELDS, normalize_string
+from src.tables.organizations.transformations.normalize_special_chars import (
+    TEXT_FIELDS as SPECIAL_CHARS_FIELDS,
+    EXCLUDED_FIELDS as SPECIAL_CHARS_EXCLUDED_FIELDS
+)
+from src.tables.organizations.transformations.clean_punctuation import TEXT_FIELDS as PUNCTUATION_FIELDS, clean_punctuation_string
+from src.utils.special_chars import DEFAULT_CHAR_MAP, compile_char_map, normalize_strings
+from src.utils.text_cleaning import clean_text_fields, element_transform, text_stage
+
+
+# Opérations de substitution des caractères spéciaux, compilées une fois
+_CHAR_OPERATIONS = compile_char_map(DEFAULT_CHAR_MAP)
+
+# Sous-étapes, dans l'ordre des étapes séparées qu'elles remplacent
+TEXT_STAGES = [
+    text_stage(
+        "text_normalization", "normalized", NORMALIZATION_FIELDS,
+        element_transform(lambda value, field: normalize_string(value))
+    ),
+    text_stage(
+        "special_chars_normalization", "normalized", SPECIAL_CHARS_FIELDS,
+        lambda values, field: normalize_strings(values, _CHAR_OPERATIONS),
+        SPECIAL_CHARS_EXCLUDED_FIELDS
+    ),
+    text_stage(
+        "punctuation_cleaning", "cleaned", PUNCTUATION_FIELDS,
+        element_transform(clean_punctuation_string)
+    )
+]
+
+
+def clean_text(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Nettoie les champs textuels en une seule passe.
+    
+    Équivaut à normalize_text, normalize_special_chars puis clean_punctuation,
+    avec une seule copie du DataFrame et un seul instantané avant/après par
+    colonne ; chaque modification est reportée sous le type de sa sous-étape.
+    
+    Args:
+        df: DataFrame contenant les données Organizations
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les champs textuels nettoyés
+        - La liste des modifications et erreurs détectées
+    """
+    return clean_text_fields(df, TEXT_STAGES, "or_id")
\ No newline at end of file
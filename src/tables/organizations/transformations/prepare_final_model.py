@@ -8,6 +8,7 @@ from typing import Dict, List, Tuple, Any, Optional
 import pandas as pd
 
 from src.tables.organizations.output_structure import FIELD_LENGTH_CONSTRAINTS
+from src.utils.copy_on_write import step_copy
 
 
 def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
@@ -23,7 +24,7 @@ def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs/informations sur la préparation du modèle
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier et appliquer les contraintes de longueur
     for field, max_length in FIELD_LENGTH_CONSTRAINTS.items():
@@ -3,11 +3,15 @@ Module de validation des champs d'adresse pour les données Organizations.
 Vérifie la validité des composants d'adresse.
 """
 
-import re
-from typing import Dict, List, Tuple, Any, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from src.utils.address_parser import clean_city_label, collapse_spaces, fix_postal_code, parse_values
+from src.utils.copy_on_write import step_copy
+
 
 def validate_address_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -22,7 +26,7 @@ def validate_address_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[s
         - La liste des erreurs de validation détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Liste des champs d'adresse à vérifier
     address_fields = [
@@ -44,147 +48,164 @@ def validate_address_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[s
                 "message": f"La colonne '{field}' est absente du DataFrame"
             })
     
-    # Expression régulière pour valider le format du code postal français
-    postal_code_pattern = re.compile(r'^\d{5}$')
-    
-    # Expression régulière pour valider les villes et pays (lettres, tirets, apostrophes et espaces simples)
-    name_pattern = re.compile(r"^[A-Za-zÀ-ÿ]+(-[A-Za-zÀ-ÿ]+)*([ ][A-Za-zÀ-ÿ]+(-[A-Za-zÀ-ÿ]+)*)*([''][A-Za-zÀ-ÿ]+)*$")
-    
-    # Patterns pour nettoyer les noms de ville avec arrondissements
-    arrondissement_patterns = [
-        (r'\s+\d+E\s+ARRONDISSEMENT$', ''),  # ex: "LYON 8E ARRONDISSEMENT" -> "LYON"
-        (r'\s+\d+EME\s+ARRONDISSEMENT$', ''),  # ex: "LYON 8EME ARRONDISSEMENT" -> "LYON"
-        (r'\s+\d+E$', ''),  # ex: "PARIS 14E" -> "PARIS"
-        (r'\s+\d+ER$', ''),  # ex: "PARIS 1ER" -> "PARIS"
-        (r'\s+\d+EME$', ''),  # ex: "PARIS 14EME" -> "PARIS"
-        (r'\s+CEDEX.*$', '')  # ex: "RENNES CEDEX 9" -> "RENNES"
-    ]
-    
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        or_id = row['or_id']
-        
+    n = len(result_df)
+    ids = result_df['or_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+
+    # Nettoyage de chaque colonne, une fois par valeur distincte (analyseur d'adresse commun)
+    postal = _clean_column(result_df, 'or_postal_code', fix_postal_code)
+    house_numbers = _clean_column(result_df, 'or_house_number', lambda value: str(value).strip())
+    streets = _clean_column(result_df, 'or_street', collapse_spaces)
+    cities = _clean_column(result_df, 'or_city', clean_city_label)
+    states = _clean_column(result_df, 'or_state', partial(collapse_spaces, upper=True))
+
+    empty = np.zeros(n, dtype=bool)
+    postal_fixed = postal_invalid = house_changed = street_changed = empty
+    city_arrondissement = city_changed = state_changed = empty
+    if postal is not None:
+        values, present, results = postal
+        postal_fixed = present & np.fromiter((bool(result and result[1]) for result in results), dtype=bool, count=n)
+        postal_invalid = present & np.fromiter((bool(result and not result[2]) for result in results), dtype=bool, count=n)
+    if house_numbers is not None:
+        house_changed = _changed(*house_numbers)
+    if streets is not None:
+        street_changed = _changed(*streets)
+    if cities is not None:
+        values, present, results = cities
+        city_arrondissement = present & np.fromiter(
+            (bool(result and result[0] != result[1]) for result in results), dtype=bool, count=n
+        )
+        city_changed = _changed(values, present, np.array([result and result[1] for result in results], dtype=object))
+    if states is not None:
+        state_changed = _changed(*states)
+
+    # Entrées du rapport, dans l'ordre des lignes puis des contrôles
+    flagged = (postal_fixed | postal_invalid | house_changed | street_changed
+               | city_arrondissement | city_changed | state_changed)
+    for row in np.flatnonzero(flagged):
+        or_id = ids[row]
+        idx = indices[row]
+
         # Vérification du code postal
-        if 'or_postal_code' in result_df.columns:
-            postal_code = row['or_postal_code']
-            if not pd.isna(postal_code) and postal_code != '':
-                # Nettoyage du code postal
-                postal_code = str(postal_code).strip()
-                
-                # Si le code postal a 4 chiffres, ajouter un 0 au début
-                if postal_code.isdigit() and len(postal_code) == 4:
-                    result_df.at[idx, 'or_postal_code'] = '0' + postal_code
-                    errors.append({
-                        "type": "postal_code_fixed",
-                        "severity": "info",
-                        "or_id": or_id,
-                        "index": idx,
-                        "original": postal_code,
-                        "fixed": '0' + postal_code
-                    })
-                    postal_code = '0' + postal_code
-                
-                # Validation du format
-                if not postal_code_pattern.match(postal_code):
-                    errors.append({
-                        "type": "invalid_postal_code",
-                        "severity": "error",
-                        "or_id": or_id,
-                        "index": idx,
-                        "value": postal_code,
-                        "reason": "Le code postal doit contenir exactement 5 chiffres"
-                    })
-        
+        if postal_fixed[row] or postal_invalid[row]:
+            fixed_code = postal[2][row][0]
+            if postal_fixed[row]:
+                errors.append({
+                    "type": "postal_code_fixed",
+                    "severity": "info",
+                    "or_id": or_id,
+                    "index": idx,
+                    "original": fixed_code[1:],
+                    "fixed": fixed_code
+                })
+            if postal_invalid[row]:
+                errors.append({
+                    "type": "invalid_postal_code",
+                    "severity": "error",
+                    "or_id": or_id,
+                    "index": idx,
+                    "value": fixed_code,
+                    "reason": "Le code postal doit contenir exactement 5 chiffres"
+                })
+
         # Vérification de or_house_number
-        if 'or_house_number' in result_df.columns:
-            house_number = row['or_house_number']
-            if not pd.isna(house_number) and house_number != '':
-                # Nettoyage du numéro
-                cleaned_number = str(house_number).strip()
-                if cleaned_number != house_number:
-                    result_df.at[idx, 'or_house_number'] = cleaned_number
-                    errors.append({
-                        "type": "house_number_cleaned",
-                        "severity": "info",
-                        "or_id": or_id,
-                        "index": idx,
-                        "original": house_number,
-                        "cleaned": cleaned_number
-                    })
-        
+        if house_changed[row]:
+            errors.append({
+                "type": "house_number_cleaned",
+                "severity": "info",
+                "or_id": or_id,
+                "index": idx,
+                "original": house_numbers[0][row],
+                "cleaned": house_numbers[2][row]
+            })
+
         # Vérification de or_street
-        if 'or_street' in result_df.columns:
-            street = row['or_street']
-            if not pd.isna(street) and street != '':
-                # Suppression des espaces en début et fin
-                cleaned_street = str(street).strip()
-                # Normalisation des espaces multiples en un seul espace
-                cleaned_street = re.sub(r'\s+', ' ', cleaned_street)
-                if cleaned_street != street:
-                    result_df.at[idx, 'or_street'] = cleaned_street
-                    errors.append({
-                        "type": "street_cleaned",
-                        "severity": "info",
-                        "or_id": or_id,
-                        "index": idx,
-                        "original": street,
-                        "cleaned": cleaned_street
-                    })
-        
-        # Vérification de or_city (validation et nettoyage)
-        if 'or_city' in result_df.columns:
-            city = row['or_city']
-            if not pd.isna(city) and city != '':
-                # Suppression des espaces en début et fin
-                cleaned_city = str(city).strip().upper()
-                # Normalisation des espaces multiples en un seul espace
-                cleaned_city = re.sub(r'\s+', ' ', cleaned_city)
-                
-                # Suppression des informations d'arrondissement
-                original_cleaned = cleaned_city
-                for pattern, replacement in arrondissement_patterns:
-                    cleaned_city = re.sub(pattern, replacement, cleaned_city)
-                
-                # Si changement dû à la suppression d'arrondissement, enregistrer
-                if original_cleaned != cleaned_city:
-                    errors.append({
-                        "type": "city_arrondissement_removed",
-                        "severity": "info",
-                        "or_id": or_id,
-                        "index": idx,
-                        "original": original_cleaned,
-                        "cleaned": cleaned_city
-                    })
-                
-                if cleaned_city != city:
-                    result_df.at[idx, 'or_city'] = cleaned_city
-                    errors.append({
-                        "type": "city_cleaned",
-                        "severity": "info",
-                        "or_id": or_id,
-                        "index": idx,
-                        "original": city,
-                        "cleaned": cleaned_city
-                    })
-        
-        # Vérification de or_state (validation lettres et format)
-        if 'or_state' in result_df.columns:
-            state = row['or_state']
-            if not pd.isna(state) and state != '':
-                # Suppression des espaces en début et fin
-                cleaned_state = str(state).strip().upper()
-                # Normalisation des espaces multiples en un seul espace
-                cleaned_state = re.sub(r'\s+', ' ', cleaned_state)
-                
-                if cleaned_state != state:
-                    result_df.at[idx, 'or_state'] = cleaned_state
-                    errors.append({
-                        "type": "state_cleaned",
-                        "severity": "info",
-                        "or_id": or_id,
-                        "index": idx,
-                        "original": state,
-                        "cleaned": cleaned_state
-                    })
-    
-    return result_df, errors
\ No newline at end of file
+        if street_changed[row]:
+            errors.append({
+                "type": "street_cleaned",
+                "severity": "info",
+                "or_id": or_id,
+                "index": idx,
+                "original": streets[0][row],
+                "cleaned": streets[2][row]
+            })
+
+        # Vérification de or_city (suppression de l'arrondissement, puis nettoyage)
+        if city_arrondissement[row]:
+            errors.append({
+                "type": "city_arrondissement_removed",
+                "severity": "info",
+                "or_id": or_id,
+                "index": idx,
+                "original": cities[2][row][0],
+                "cleaned": cities[2][row][1]
+            })
+        if city_changed[row]:
+            errors.append({
+                "type": "city_cleaned",
+                "severity": "info",
+                "or_id": or_id,
+                "index": idx,
+                "original": cities[0][row],
+                "cleaned": cities[2][row][1]
+            })
+
+        # Vérification de or_state
+        if state_changed[row]:
+            errors.append({
+                "type": "state_cleaned",
+                "severity": "info",
+                "or_id": or_id,
+                "index": idx,
+                "original": states[0][row],
+                "cleaned": states[2][row]
+            })
+
+    # Écriture des colonnes modifiées
+    if postal_fixed.any():
+        _write_column(result_df, 'or_postal_code', postal_fixed,
+                      np.array([result and result[0] for result in postal[2]], dtype=object))
+    if house_changed.any():
+        _write_column(result_df, 'or_house_number', house_changed, house_numbers[2])
+    if street_changed.any():
+        _write_column(result_df, 'or_street', street_changed, streets[2])
+    if city_changed.any():
+        _write_column(result_df, 'or_city', city_changed,
+                      np.array([result and result[1] for result in cities[2]], dtype=object))
+    if state_changed.any():
+        _write_column(result_df, 'or_state', state_changed, states[2])
+
+    return result_df, errors
+
+
+def _clean_column(
+    df: pd.DataFrame,
+    column: str,
+    cleaner: Callable[[Any], Any]
+) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    # Valeurs, masque des valeurs renseignées et résultats du nettoyage (None si colonne absente)
+    if column not in df.columns:
+        return None
+    values = df[column].to_numpy(dtype=object)
+    present = ~(pd.isna(values) | (values == ''))
+    results = parse_values(values, cleaner)
+    # Valeurs renseignées non textuelles (nombres), rares: nettoyage ligne à ligne
+    for position in np.flatnonzero(present):
+        if not isinstance(values[position], str):
+            results[position] = cleaner(values[position])
+    results[~present] = None
+    return values, present, results
+
+
+def _changed(values: np.ndarray, present: np.ndarray, cleaned: np.ndarray) -> np.ndarray:
+    # Valeurs renseignées modifiées par le nettoyage
+    return present & np.fromiter(
+        (bool(new != old) for new, old in zip(cleaned, values)), dtype=bool, count=len(values)
+    )
+
+
+def _write_column(df: pd.DataFrame, column: str, mask: np.ndarray, cleaned: np.ndarray) -> None:
+    # Remplace les valeurs modifiées d'une colonne
+    values = df[column].to_numpy(dtype=object, copy=True)
+    values[mask] = cleaned[mask]
+    df[column] = pd.Series(values, index=df.index, dtype=object)
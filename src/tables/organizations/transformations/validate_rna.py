@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple, Any, Optional
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def validate_rna(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -27,7 +29,7 @@ def validate_rna(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
         - La liste des erreurs de validation détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne RNA existe
     if 'or_rna' not in result_df.columns:
@@ -0,0 +1,7 @@
+"""
+Package de transformation des données positioning.
+"""
+
+from src.tables.positioning.clean_positioning import clean_positioning_data
+
+__all__ = ['clean_positioning_data']
@@ -0,0 +1,123 @@
+"""
+Module principal pour le traitement des données positioning.
+Responsable de l'orchestration complète du processus de transformation.
+"""
+
+import logging
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Any
+
+from src.tables.positioning.transformations.validate_input_structure import validate_input_structure
+from src.tables.positioning.transformations.validate_po_id import validate_po_id
+from src.tables.positioning.transformations.validate_data_types import validate_data_types
+from src.tables.positioning.transformations.resolve_references import resolve_references, REFERENCE_KEYS
+from src.tables.positioning.transformations.prepare_final_model import prepare_final_model
+from src.tables.positioning.error_reporting.generate_error_report import generate_error_report
+from src.utils.pipeline_steps import pipeline_step, TABLE_SCOPE
+from src.utils.referential_integrity import CLEAN_DIR, open_reference_tables
+from src.utils.table_runner import table_pipeline, run_table_pipeline
+
+
+def build_steps(patches_dir: str, logger: logging.Logger, clean_dir: str = CLEAN_DIR) -> List[Dict[str, Any]]:
+    """
+    Construit la liste ordonnée des étapes de transformation des données positioning.
+    
+    Les tables référencées (stock_import, stocks) sont lues et indexées une
+    seule fois, avant le traitement ; la résolution des références est
+    ensuite une étape ligne à ligne. fk_la n'est pas résolue par cette étape :
+    logistic_address, qui lit la sortie de positioning, est traitée après
+    elle ; fk_la n'est vérifiée qu'après le traitement, par le contrôle
+    d'intégrité. Le contrôle d'unicité des po_id est une étape globale qui,
+    en mode par lots, ne lit que po_id.
+    
+    Args:
+        patches_dir: Répertoire contenant les fichiers de correctifs (non utilisé pour cette table)
+        logger: Logger du traitement
+        clean_dir: Répertoire des sorties nettoyées des tables référencées
+        
+    Returns:
+        Liste des étapes décrites par pipeline_step
+    """
+    references = open_reference_tables(REFERENCE_KEYS, logger, clean_dir)
+    
+    return [
+        pipeline_step("Étape 2: Validation des identifiants po_id", validate_po_id, "identifiers",
+                      "Détection de {count} erreurs d'identifiants", logging.WARNING,
+                      scope=TABLE_SCOPE, columns=["po_id"]),
+        pipeline_step("Étape 3: Validation des types de données", validate_data_types, "data_types",
+                      "Détection de {count} erreurs de types de données", logging.WARNING),
+        pipeline_step("Étape 4: Résolution des références", partial(resolve_references, references=references),
+                      "references", "Détection de {count} erreurs/résolutions de références", logging.WARNING),
+        pipeline_step("Étape 5: Préparation du modèle final", prepare_final_model, "general"),
+    ]
+
+
+# Pipeline de la table, exécuté par run_table_pipeline
+PIPELINE = table_pipeline(
+    name="positioning",
+    id_column="po_id",
+    error_categories=[
+        "structure",
+        "identifiers",
+        "data_types",
+        "references",
+        "general"
+    ],
+    validate_fn=validate_input_structure,
+    build_steps=build_steps,
+    report_fn=generate_error_report,
+    nan_to_none=True,
+    # Étapes conformes au contrat du mode sans copie (src/utils/copy_on_write.py)
+    copy_free=True,
+    resolves_references=True
+)
+
+
+def clean_positioning_data(
+    input_file_path: str, 
+    output_file_path: str,
+    patches_dir: str = "data/patches",
+    error_report_dir: str = "data/error_report",
+    log_dir: str = "logs",
+    chunk_size: Optional[int] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Fonction principale pour nettoyer et transformer les données positioning.
+    
+    Args:
+        input_file_path: Chemin vers le fichier JSON d'entrée
+        output_file_path: Chemin vers le fichier JSON de sortie
+        patches_dir: Répertoire contenant les fichiers de correctifs
+        error_report_dir: Répertoire pour les rapports d'erreurs
+        log_dir: Répertoire pour les fichiers de log
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        
+    Returns:
+        Tuple[bool, Optional[str]]: (Succès, Chemin du rapport d'erreurs si généré)
+    """
+    return run_table_pipeline(
+        PIPELINE,
+        input_file_path,
+        output_file_path,
+        patches_dir,
+        error_report_dir,
+        log_dir,
+        chunk_size
+    )
+
+
+if __name__ == "__main__":
+    # Exemple d'utilisation
+    success, report_path = clean_positioning_data(
+        input_file_path="data/raw/positioning.json",
+        output_file_path="data/clean/positioning.json"
+    )
+    
+    if success:
+        print("Transformation réussie!")
+        if report_path:
+            print(f"Un rapport d'erreurs a été généré: {report_path}")
+    else:
+        print("Erreur lors de la transformation")
+        if report_path:
+            print(f"Consultez le rapport d'erreurs: {report_path}")
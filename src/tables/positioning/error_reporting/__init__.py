@@ -0,0 +1,7 @@
+"""
+Modules de génération de rapports d'erreurs pour les données positioning.
+"""
+
+from src.tables.positioning.error_reporting.generate_error_report import generate_error_report
+
+__all__ = ['generate_error_report']
\ No newline at end of file
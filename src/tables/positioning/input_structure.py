@@ -0,0 +1,73 @@
+"""
+Définition de la structure d'entrée pour les données 'positioning'.
+Ce module contient le schéma de validation JSON pour les données brutes.
+"""
+
+from typing import Dict, Any, List
+
+# Schéma de validation pour les données d'entrée
+INPUT_SCHEMA: Dict[str, Any] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "po_id": {"type": "integer"},
+            "si_io": {"type": ["string", "null"]},
+            "po_validated": {"type": ["boolean", "null"]},
+            "po_nb_items": {"type": ["integer", "null"]},
+            "po_nb_proposed": {"type": ["integer", "null"]},
+            "fk_st": {"type": ["integer", "null"]},
+            "fk_ca": {"type": ["integer", "null"]},
+            "fk_si": {"type": ["integer", "null"]},
+            "fk_la": {"type": ["integer", "null"]}
+        },
+        "required": ["po_id"],
+        "additionalProperties": True
+    }
+}
+
+# Définition des champs obligatoires et optionnels
+REQUIRED_FIELDS = ["po_id"]
+OPTIONAL_FIELDS = [
+    "si_io",
+    "po_validated",
+    "po_nb_items",
+    "po_nb_proposed",
+    "fk_st",
+    "fk_ca",
+    "fk_si",
+    "fk_la"
+]
+
+# Structure des types de données attendus pour la validation
+FIELD_TYPES = {
+    "po_id": int,
+    "si_io": str,
+    "po_validated": bool,
+    "po_nb_items": int,
+    "po_nb_proposed": int,
+    "fk_st": int,
+    "fk_ca": int,
+    "fk_si": int,
+    "fk_la": int
+}
+
+# Documentation des champs pour référence
+FIELD_DESCRIPTIONS = {
+    "po_id": "Identifiant unique du positionnement",
+    "si_io": "Code d'opération de l'import de stock positionné",
+    "po_validated": "Positionnement validé",
+    "po_nb_items": "Nombre d'éléments à positionner",
+    "po_nb_proposed": "Nombre d'éléments proposés",
+    "fk_st": "Clé étrangère vers la table stocks",
+    "fk_ca": "Clé étrangère vers la catégorie",
+    "fk_si": "Clé étrangère vers la table stock_import",
+    "fk_la": "Clé étrangère vers la table logistic_address"
+}
+
+# Répertoire des erreurs communes pour uniformisation des messages
+COMMON_ERRORS = {
+    "missing_required": "Champ obligatoire manquant",
+    "invalid_type": "Type de données incorrect",
+    "duplicate_entries": "Valeurs en double détectées"
+}
@@ -0,0 +1,59 @@
+"""
+Définition de la structure de sortie pour les données 'positioning'.
+Ce module décrit la structure finale attendue après transformation.
+"""
+
+from typing import Dict, Any, List
+
+# Schéma de validation pour les données de sortie
+OUTPUT_SCHEMA: Dict[str, Any] = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "po_id": {"type": "integer"},
+            "si_io": {"type": ["string", "null"], "maxLength": 255},
+            "po_validated": {"type": "boolean"},
+            "po_nb_items": {"type": ["integer", "null"], "minimum": 0},
+            "po_nb_proposed": {"type": ["integer", "null"], "minimum": 0},
+            "fk_st": {"type": ["integer", "null"]},
+            "fk_ca": {"type": ["integer", "null"]},
+            "fk_si": {"type": ["integer", "null"]},
+            "fk_la": {"type": ["integer", "null"]},
+            "po_validation_status": {"type": "object"}
+        },
+        "required": [
+            "po_id",
+            "si_io",
+            "po_validated",
+            "fk_si"
+        ],
+        "additionalProperties": False
+    }
+}
+
+# Champs obligatoires du modèle final
+REQUIRED_OUTPUT_FIELDS = ["po_id", "si_io", "fk_si"]
+
+# Champs entiers (identifiants et quantités) et booléens
+INTEGER_FIELDS = ["po_nb_items", "po_nb_proposed", "fk_st", "fk_ca", "fk_si", "fk_la"]
+BOOLEAN_FIELDS = ["po_validated"]
+
+# Informations sur les contraintes de longueur des champs
+FIELD_LENGTH_CONSTRAINTS = {
+    "si_io": 255
+}
+
+# Documentation des champs de sortie pour référence
+OUTPUT_FIELD_DESCRIPTIONS = {
+    "po_id": "Identifiant unique du positionnement",
+    "si_io": "Code d'opération de l'import de stock positionné",
+    "po_validated": "Positionnement validé (faux si non renseigné)",
+    "po_nb_items": "Nombre d'éléments à positionner",
+    "po_nb_proposed": "Nombre d'éléments proposés",
+    "fk_st": "Clé étrangère vers la table stocks (vérifiée)",
+    "fk_ca": "Clé étrangère vers la catégorie",
+    "fk_si": "Clé étrangère vers la table stock_import (vérifiée, complétée depuis si_io)",
+    "fk_la": "Clé étrangère vers la table logistic_address (vérifiée)",
+    "po_validation_status": "Statut détaillé de validation de l'enregistrement"
+}
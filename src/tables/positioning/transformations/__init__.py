@@ -0,0 +1,17 @@
+"""
+Modules de transformation pour les données positioning.
+"""
+
+from src.tables.positioning.transformations.validate_input_structure import validate_input_structure
+from src.tables.positioning.transformations.validate_po_id import validate_po_id
+from src.tables.positioning.transformations.validate_data_types import validate_data_types
+from src.tables.positioning.transformations.resolve_references import resolve_references
+from src.tables.positioning.transformations.prepare_final_model import prepare_final_model
+
+__all__ = [
+    'validate_input_structure',
+    'validate_po_id',
+    'validate_data_types',
+    'resolve_references',
+    'prepare_final_model'
+]
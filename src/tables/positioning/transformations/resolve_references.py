@@ -0,0 +1,164 @@
+"""
+Module de résolution des références pour les données positioning.
+Vérifie les clés étrangères dans les tables nettoyées référencées et
+complète fk_si à partir du code d'opération si_io. fk_la n'est pas résolue
+ici (logistic_address est traitée après positioning) : elle est contrôlée
+après le traitement par le contrôle d'intégrité.
+"""
+
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import step_copy
+from src.utils.referential_integrity import lookup_keys
+from src.utils.relation_index import normalize_keys
+
+
+# Clés étrangères vérifiées: colonne -> (table référencée, clé)
+FOREIGN_KEYS = {
+    "fk_si": ("stock_import", "si_id"),
+    "fk_st": ("stocks", "st_id")
+}
+
+# Clés étrangères comparées à celles de l'import de stock référencé
+STOCK_IMPORT_CONSISTENCY = ["fk_st", "fk_la"]
+
+# Colonnes à lire dans chaque table référencée (open_reference_table)
+REFERENCE_KEYS = {
+    "stock_import": (["si_id", "si_io"], STOCK_IMPORT_CONSISTENCY),
+    "stocks": (["st_id"], None)
+}
+
+
+def _reference_error(
+    error_type: str,
+    severity: str,
+    po_id: Any,
+    index: Any,
+    field: str,
+    value: Any,
+    message: str,
+    **details: Any
+) -> Dict[str, Any]:
+    """Construit une entrée du rapport pour une référence."""
+    return {
+        "type": error_type,
+        "severity": severity,
+        "po_id": po_id,
+        "index": index,
+        "field": field,
+        "value": value,
+        **details,
+        "message": message
+    }
+
+
+def resolve_references(
+    df: pd.DataFrame,
+    references: Dict[str, Optional[Dict[str, Any]]]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Résout et vérifie les références des positionnements.
+    
+    Opérations effectuées:
+    - Recherche de si_io dans stock_import: fk_si est complété s'il est
+      absent, signalé s'il désigne un autre import
+    - Vérification de l'existence de fk_si et fk_st (fk_la, dont
+      logistic_address dépend, est contrôlée après le traitement)
+    - Comparaison de fk_st et fk_la avec ceux de l'import de stock référencé
+    
+    Les clés de chaque table référencée sont indexées une seule fois
+    (open_reference_table) ; chaque colonne est résolue par une recherche
+    vectorisée dans l'index. Une table référencée sans sortie nettoyée
+    (None) n'est pas contrôlée.
+    
+    Args:
+        df: DataFrame contenant les données positioning
+        references: Tables référencées ouvertes, par nom de table
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec fk_si complété
+        - La liste des erreurs/modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    po_ids = result_df['po_id'].to_numpy(dtype=object)
+    indices = result_df.index.to_numpy()
+    stock_import = references.get("stock_import")
+    
+    # Résolution de si_io vers si_id
+    if stock_import is not None and 'si_io' in result_df.columns:
+        si_io = result_df['si_io'].to_numpy(dtype=object)
+        rows = lookup_keys(stock_import, "si_io", result_df['si_io'])
+        found = rows >= 0
+        resolved = np.full(len(rows), None, dtype=object)
+        resolved[found] = stock_import["frame"]["si_id"].to_numpy(dtype=object)[rows[found]]
+        
+        fk_si = normalize_keys(result_df['fk_si']).to_numpy(dtype=object) if 'fk_si' in result_df.columns \
+            else np.full(len(rows), None, dtype=object)
+        missing = pd.isna(fk_si)
+        filled = found & missing
+        mismatched = found & ~missing & (fk_si != resolved)
+        
+        for position in np.flatnonzero(pd.notna(si_io) & ~found):
+            errors.append(_reference_error(
+                "unknown_reference", "warning", po_ids[position], indices[position], "si_io", si_io[position],
+                f"si_io '{si_io[position]}' introuvable dans stock_import",
+                target_table="stock_import"
+            ))
+        for position in np.flatnonzero(filled):
+            errors.append(_reference_error(
+                "reference_resolved", "info", po_ids[position], indices[position], "fk_si", resolved[position],
+                f"fk_si complété depuis si_io '{si_io[position]}'",
+                target_table="stock_import"
+            ))
+        for position in np.flatnonzero(mismatched):
+            errors.append(_reference_error(
+                "reference_mismatch", "warning", po_ids[position], indices[position], "fk_si", fk_si[position],
+                f"fk_si={fk_si[position]} ne correspond pas à si_io '{si_io[position]}' (si_id={resolved[position]})",
+                target_table="stock_import", expected=resolved[position]
+            ))
+        
+        if filled.any():
+            values = result_df['fk_si'].to_numpy(dtype=object, copy=True) if 'fk_si' in result_df.columns \
+                else np.full(len(rows), None, dtype=object)
+            values[filled] = resolved[filled]
+            result_df['fk_si'] = values
+    
+    # Existence des clés étrangères
+    positions = {}
+    for column, (table_name, key) in FOREIGN_KEYS.items():
+        reference = references.get(table_name)
+        if reference is None or column not in result_df.columns:
+            continue
+        values = result_df[column].to_numpy(dtype=object)
+        positions[column] = lookup_keys(reference, key, result_df[column])
+        for position in np.flatnonzero(pd.notna(values) & (positions[column] < 0)):
+            errors.append(_reference_error(
+                "unknown_reference", "warning", po_ids[position], indices[position], column, values[position],
+                f"{column}={values[position]} introuvable dans {table_name}.{key}",
+                target_table=table_name
+            ))
+    
+    # Cohérence avec l'import de stock référencé
+    if "fk_si" in positions:
+        rows = positions["fk_si"]
+        found = rows >= 0
+        for column in STOCK_IMPORT_CONSISTENCY:
+            if column not in result_df.columns:
+                continue
+            values = normalize_keys(result_df[column]).to_numpy(dtype=object)
+            expected = np.full(len(rows), None, dtype=object)
+            expected[found] = stock_import["frame"][column].to_numpy(dtype=object)[rows[found]]
+            differs = pd.notna(values) & pd.notna(expected) & (values != expected)
+            for position in np.flatnonzero(differs):
+                errors.append(_reference_error(
+                    "reference_mismatch", "warning", po_ids[position], indices[position], column, values[position],
+                    f"{column}={values[position]} diffère de celui de l'import de stock fk_si={result_df['fk_si'].iat[position]}",
+                    target_table="stock_import", expected=expected[position]
+                ))
+    
+    return result_df, errors
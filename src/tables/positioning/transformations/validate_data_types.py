@@ -0,0 +1,104 @@
+"""
+Module de validation des types de données pour les données positioning.
+Vérifie et convertit les types de données selon le modèle de sortie.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.tables.positioning.output_structure import INTEGER_FIELDS, BOOLEAN_FIELDS
+from src.utils.copy_on_write import step_copy
+from src.utils.ragged import integer_values, value_types
+
+
+def validate_data_types(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valide et convertit les types de données du DataFrame.
+    
+    Opérations effectuées, colonne par colonne:
+    - Conversion des identifiants et quantités en entiers (valeur invalide remplacée par None)
+    - Signalement des quantités négatives
+    - Conversion de po_validated en booléen (faux si non renseigné)
+    
+    Args:
+        df: DataFrame contenant les données positioning
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les types de données validés
+        - La liste des erreurs/modifications détectées
+    """
+    errors = []
+    result_df = step_copy(df)
+    po_ids = result_df['po_id'].to_numpy(dtype=object) if 'po_id' in result_df.columns else np.full(len(result_df), None)
+    indices = result_df.index.to_numpy()
+    
+    # Champs entiers
+    for field in INTEGER_FIELDS:
+        if field not in result_df.columns:
+            continue
+        values = result_df[field].to_numpy(dtype=object)
+        present = pd.notna(values)
+        integral = integer_values(values)
+        
+        converted = np.full(len(values), None, dtype=object)
+        converted[integral] = pd.to_numeric(pd.Series(values[integral], dtype=object)).astype(np.int64).tolist()
+        
+        for position in np.flatnonzero(present & ~integral):
+            errors.append({
+                "type": "invalid_data_type",
+                "severity": "warning",
+                "po_id": po_ids[position],
+                "index": indices[position],
+                "field": field,
+                "original": values[position],
+                "converted": None,
+                "message": f"Valeur non entière pour '{field}', remplacée par None"
+            })
+        
+        # Les quantités ne peuvent pas être négatives
+        if field.startswith("po_nb_"):
+            negative = np.zeros(len(values), dtype=bool)
+            negative[integral] = np.asarray(converted[integral].tolist(), dtype=np.int64) < 0
+            for position in np.flatnonzero(negative):
+                errors.append({
+                    "type": "negative_value",
+                    "severity": "warning",
+                    "po_id": po_ids[position],
+                    "index": indices[position],
+                    "field": field,
+                    "original": values[position],
+                    "message": f"Valeur négative pour '{field}'"
+                })
+        
+        result_df[field] = converted
+    
+    # Champs booléens
+    for field in BOOLEAN_FIELDS:
+        if field not in result_df.columns:
+            result_df[field] = False
+            continue
+        values = result_df[field].to_numpy(dtype=object)
+        present = pd.notna(values)
+        is_bool = pd.Series(value_types(values), dtype=object).isin([bool, np.bool_]).to_numpy()
+        
+        converted = np.full(len(values), False, dtype=object)
+        converted[is_bool] = [bool(value) for value in values[is_bool]]
+        
+        for position in np.flatnonzero(present & ~is_bool):
+            errors.append({
+                "type": "invalid_data_type",
+                "severity": "warning",
+                "po_id": po_ids[position],
+                "index": indices[position],
+                "field": field,
+                "original": values[position],
+                "converted": False,
+                "message": f"Valeur non booléenne pour '{field}', remplacée par False"
+            })
+        
+        result_df[field] = converted
+    
+    return result_df, errors
@@ -0,0 +1,142 @@
+"""
+Module de validation de la structure d'entrée pour les données positioning.
+Vérifie la conformité des données par rapport au schéma défini.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import jsonschema
+import numpy as np
+import pandas as pd
+
+from src.tables.positioning.input_structure import (
+    INPUT_SCHEMA,
+    REQUIRED_FIELDS,
+    FIELD_TYPES
+)
+from src.utils.ragged import value_types
+
+
+# Valeurs textuelles acceptées pour les booléens
+BOOLEAN_STRINGS = {"true": True, "vrai": True, "1": True, "false": False, "faux": False, "0": False}
+
+
+def _convert(value: Any, expected_type: type) -> Any:
+    """
+    Convertit une valeur vers le type attendu.
+
+    Raises:
+        ValueError: Si la valeur n'est pas convertible
+    """
+    if expected_type == str:
+        return str(value).strip()
+    if expected_type == bool:
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in BOOLEAN_STRINGS:
+            return BOOLEAN_STRINGS[value.strip().lower()]
+        raise ValueError(value)
+    # Entier: nombres entiers et chaînes d'un entier
+    if isinstance(value, bool):
+        raise ValueError(value)
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(value)
+    return int(number)
+
+
+def validate_input_structure(data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Valide la structure des données d'entrée selon le schéma défini.
+    
+    Les contrôles sont menés colonne par colonne : seules les valeurs dont
+    le type diffère du type attendu sont examinées une à une.
+    
+    Args:
+        data: Liste de dictionnaires représentant les positionnements
+        
+    Returns:
+        Tuple contenant:
+        - Les données après validation de base (conversion de types)
+        - La liste des erreurs de structure détectées
+    """
+    structure_errors = []
+    
+    # Vérification que data est bien une liste
+    if not isinstance(data, list):
+        structure_errors.append({
+            "error_type": "invalid_structure",
+            "description": "Les données d'entrée doivent être une liste d'objets",
+            "details": f"Type trouvé: {type(data).__name__}"
+        })
+        return [], structure_errors
+    
+    # Validation globale avec jsonschema
+    try:
+        jsonschema.validate(instance=data, schema=INPUT_SCHEMA)
+    except jsonschema.exceptions.ValidationError as e:
+        structure_errors.append({
+            "error_type": "schema_validation",
+            "description": "Les données ne respectent pas le schéma défini",
+            "details": str(e),
+            "path": list(e.path) if hasattr(e, 'path') else []
+        })
+        # Nous continuons malgré l'erreur pour collecter toutes les erreurs spécifiques
+    
+    # Conserver tous les champs, même inconnus
+    validated_data = [dict(item) for item in data]
+    item_errors: Dict[int, List[Dict[str, Any]]] = {}
+    
+    # Vérification des champs obligatoires
+    for field in REQUIRED_FIELDS:
+        for index, item in enumerate(data):
+            if field not in item:
+                item_errors.setdefault(index, []).append({
+                    "field": field,
+                    "error_type": "missing_required_field",
+                    "description": f"Le champ obligatoire '{field}' est manquant"
+                })
+            elif item[field] is None:
+                item_errors.setdefault(index, []).append({
+                    "field": field,
+                    "error_type": "null_required_field",
+                    "description": f"Le champ obligatoire '{field}' ne peut pas être null"
+                })
+    
+    # Validation des types, colonne par colonne
+    for field, expected_type in FIELD_TYPES.items():
+        values = np.empty(len(data), dtype=object)
+        values[:] = [item.get(field) for item in data]
+        types = value_types(values)
+        present = pd.notna(values)
+        mismatched = present & (types != expected_type)
+        
+        for index in np.flatnonzero(mismatched):
+            try:
+                validated_data[index][field] = _convert(values[index], expected_type)
+            except (ValueError, TypeError):
+                item_errors.setdefault(int(index), []).append({
+                    "field": field,
+                    "error_type": "type_conversion_error",
+                    "description": f"Impossible de convertir '{field}' en {expected_type.__name__}",
+                    "value": values[index]
+                })
+        
+        # Vérification des chaînes vides
+        if expected_type == str:
+            for index in np.flatnonzero(present & ~mismatched & (values == "")):
+                item_errors.setdefault(int(index), []).append({
+                    "field": field,
+                    "error_type": "empty_string",
+                    "description": f"Le champ '{field}' est une chaîne vide"
+                })
+    
+    # Erreurs regroupées par entrée, dans l'ordre des données
+    for index in sorted(item_errors):
+        structure_errors.append({
+            "index": index,
+            "po_id": data[index].get("po_id", "unknown"),
+            "errors": item_errors[index]
+        })
+    
+    return validated_data, structure_errors
@@ -0,0 +1,76 @@
+"""
+Module de validation spécifique pour les identifiants po_id.
+Vérifie que les po_id sont des entiers positifs et uniques.
+"""
+
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from src.utils.ragged import integer_values
+
+
+def validate_po_id(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Valide que les po_id sont des entiers positifs et uniques.
+    
+    Étape globale en lecture seule : en mode par lots, elle ne reçoit que la
+    colonne po_id de toute la table.
+    
+    Args:
+        df: DataFrame contenant les données positioning
+        
+    Returns:
+        Tuple contenant:
+        - Le DataFrame original (non modifié)
+        - La liste des erreurs détectées
+    """
+    errors = []
+    
+    if 'po_id' not in df.columns:
+        errors.append({
+            "type": "missing_po_id",
+            "severity": "error",
+            "message": "Le champ obligatoire 'po_id' est absent du DataFrame"
+        })
+        return df, errors
+    
+    values = df['po_id'].to_numpy(dtype=object)
+    indices = df.index.to_numpy()
+    present = pd.notna(values)
+    integral = integer_values(values)
+    
+    # Identifiants absents, non entiers ou négatifs
+    invalid = present & ~integral
+    negative = np.zeros(len(values), dtype=bool)
+    negative[integral] = pd.to_numeric(pd.Series(values[integral], dtype=object)).to_numpy() < 0
+    
+    for position in np.flatnonzero(~present | invalid | negative):
+        value = values[position]
+        if not present[position]:
+            error_type, message = "invalid_po_id", "po_id ne peut pas être null"
+        elif invalid[position]:
+            error_type, message = "invalid_po_id_type", f"po_id doit être un entier, trouvé: {type(value).__name__}"
+        else:
+            error_type, message = "negative_po_id", "po_id ne peut pas être négatif"
+        errors.append({
+            "type": error_type,
+            "severity": "error",
+            "index": indices[position],
+            "po_id": None if not present[position] else value,
+            "message": message
+        })
+    
+    # Unicité: chaque répétition d'un identifiant déjà vu
+    duplicated = present & pd.Series(values, dtype=object).duplicated().to_numpy()
+    for position in np.flatnonzero(duplicated):
+        errors.append({
+            "type": "duplicate_po_id",
+            "severity": "error",
+            "index": indices[position],
+            "po_id": values[position],
+            "message": f"La clé primaire po_id={values[position]} est dupliquée"
+        })
+    
+    return df, errors
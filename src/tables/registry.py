@@ -0,0 +1,169 @@
+"""
+Registre des tables traitées.
+Associe chaque table au module qui déclare son pipeline et aux tables dont
+elle référence les clés, et ordonne les tables selon ces dépendances. Le
+module d'une table n'est importé que lorsque cette table est effectivement
+traitée.
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+
+# Tables connues, dans l'ordre de traitement séquentiel par défaut.
+# "depends_on": une table n'est lancée qu'une fois terminées toutes les tables
+# dont elle référence les clés (fk_co, fk_or, fk_st) ; positioning, deliveries
+# et logistic_address résolvent en outre leurs références pendant le
+# traitement, dans les sorties de ces tables (logistic_address matérialise ses
+# tableaux stock_import et positioning, d'où sa déclaration après elles ;
+# positioning.fk_la n'est donc contrôlée qu'après le traitement).
+# "key": clé primaire de la table ; "references": colonne (clé étrangère ou
+# liste de clés) -> table référencée, contrôlées après le traitement
+# (src/utils/referential_integrity.py) ; "inverse": colonne de liste -> clé
+# étrangère simple de la table référencée qui désigne en retour le propriétaire
+# de chaque élément (liens contrôlés dans les deux sens). Une liste n'a
+# d'inverse que si cette clé est effectivement renseignée : stock_import.fk_la
+# ne l'est pas, et un import de stock figure à la fois dans l'adresse de
+# l'entreprise et dans celle de l'organisation (relation plusieurs-à-plusieurs) :
+# la liste stock_import de logistic_address n'a donc pas d'inverse.
+TABLE_REGISTRY: Dict[str, Dict[str, Any]] = {
+    "companies": {
+        "module": "src.tables.companies.clean_companies",
+        "depends_on": [],
+        "key": "co_id",
+        "references": {}
+    },
+    "organizations": {
+        "module": "src.tables.organizations.clean_organizations",
+        "depends_on": [],
+        "key": "or_id",
+        "references": {
+            "logistic_address": "logistic_address"
+        }
+    },
+    "transports": {
+        "module": "src.tables.transports.clean_transports",
+        "depends_on": [],
+        "key": "tra_id",
+        "references": {
+            "stock_import": "stock_import"
+        },
+        "inverse": {
+            "stock_import": "fk_tra"
+        }
+    },
+    "stocks": {
+        "module": "src.tables.stocks.clean_stocks",
+        "depends_on": ["companies"],
+        "key": "st_id",
+        "references": {
+            "fk_co": "companies",
+            "stock_import": "stock_import"
+        },
+        "inverse": {
+            "stock_import": "fk_st"
+        }
+    },
+    "stock_import": {
+        "module": "src.tables.stock_import.clean_stock_import",
+        "depends_on": ["companies", "stocks"],
+        "key": "si_id",
+        "references": {
+            "fk_co": "companies",
+            "fk_st": "stocks",
+            "fk_la": "logistic_address",
+            "fk_tra": "transports"
+        }
+    },
+    "positioning": {
+        "module": "src.tables.positioning.clean_positioning",
+        "depends_on": ["stock_import", "stocks"],
+        "key": "po_id",
+        "references": {
+            "fk_si": "stock_import",
+            "fk_st": "stocks",
+            "fk_la": "logistic_address"
+        }
+    },
+    "logistic_address": {
+        "module": "src.tables.logistic_address.clean_logistic_address",
+        "depends_on": ["companies", "organizations", "stock_import", "positioning"],
+        "key": "la_id",
+        "references": {
+            "fk_co": "companies",
+            "fk_or": "organizations",
+            "stock_import": "stock_import",
+            "positioning": "positioning"
+        },
+        "inverse": {
+            "positioning": "fk_la"
+        }
+    },
+    "deliveries": {
+        "module": "src.tables.deliveries.clean_deliveries",
+        "depends_on": ["positioning", "stock_import"],
+        "key": "fk_po",
+        "references": {
+            "fk_po": "positioning"
+        }
+    },
+}
+
+# Graphe des dépendances entre tables, dérivé du registre
+TABLE_DEPENDENCIES: Dict[str, List[str]] = {
+    table_name: entry["depends_on"] for table_name, entry in TABLE_REGISTRY.items()
+}
+
+
+def load_table_pipeline(table_name: str) -> Dict[str, Any]:
+    """
+    Importe le module d'une table et renvoie son pipeline.
+
+    Args:
+        table_name: Nom de la table
+
+    Returns:
+        Pipeline de la table (décrit par table_pipeline)
+
+    Raises:
+        KeyError: Si la table n'est pas déclarée dans le registre
+    """
+    entry = TABLE_REGISTRY[table_name]
+    module = importlib.import_module(entry["module"])
+    return module.PIPELINE
+
+
+def order_tables(tables: List[str], dependencies: Dict[str, List[str]]) -> List[str]:
+    """
+    Trie les tables selon le graphe de dépendances (tri topologique stable).
+
+    Les dépendances vers des tables non sélectionnées sont ignorées.
+
+    Args:
+        tables: Tables à traiter, dans l'ordre souhaité
+        dependencies: Dictionnaire table -> tables dont elle dépend
+    
+    Returns:
+        Liste des tables ordonnées de sorte que chaque table suive ses dépendances
+    
+    Raises:
+        ValueError: Si le graphe contient un cycle
+    """
+    selected = set(tables)
+    ordered = []
+    done = set()
+
+    while len(ordered) < len(tables):
+        ready = [
+            table for table in tables
+            if table not in done
+            and all(dep in done for dep in dependencies.get(table, []) if dep in selected)
+        ]
+        if not ready:
+            remaining = [table for table in tables if table not in done]
+            raise ValueError(f"Dépendance circulaire entre les tables: {remaining}")
+        # Une seule table à la fois pour conserver l'ordre de déclaration
+        ordered.append(ready[0])
+        done.add(ready[0])
+
+    return ordered
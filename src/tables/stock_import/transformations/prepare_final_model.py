@@ -8,6 +8,7 @@ import numpy as np
 import pandas as pd
 
 from src.tables.stock_import.output_structure import FIELD_LENGTH_CONSTRAINTS
+from src.utils.copy_on_write import step_copy
 
 # def convert_nan_to_none(df: pd.DataFrame) -> pd.DataFrame:
 #     """Convertit tous les NaN du DataFrame en None pour la sortie JSON."""
@@ -39,7 +40,7 @@ from src.tables.stock_import.output_structure import FIELD_LENGTH_CONSTRAINTS
 
 def convert_nan_to_none(df: pd.DataFrame) -> pd.DataFrame:
     """Convertit tous les NaN du DataFrame en None pour la sortie JSON."""
-    result = df.copy()
+    result = step_copy(df)
     
     # Parcourir toutes les colonnes
     for col in result.columns:
@@ -71,7 +72,7 @@ def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs/informations sur la préparation du modèle
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier la présence des champs obligatoires
     required_fields = ["si_id", "si_total_price"]
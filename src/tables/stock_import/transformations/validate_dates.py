@@ -9,6 +9,8 @@ from typing import Dict, List, Tuple, Any, Optional
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def validate_dates(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -23,7 +25,7 @@ def validate_dates(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]
         - La liste des erreurs et modifications détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Liste des champs de date à valider
     date_fields = [
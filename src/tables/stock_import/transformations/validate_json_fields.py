@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple, Any, Optional
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def validate_json_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -22,7 +24,7 @@ def validate_json_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs et modifications détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Liste des champs JSON à valider
     json_fields = [
@@ -7,6 +7,7 @@ from typing import Dict, List, Tuple, Any
 import pandas as pd
 
 from src.tables.stocks.output_structure import DEFAULT_FIELDS, ARRAY_FIELDS
+from src.utils.copy_on_write import step_copy
 
 
 def add_missing_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
@@ -22,7 +23,7 @@ def add_missing_fields(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, A
         - La liste des informations sur les modifications
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Ajout des champs manquants
     for field, default_value in DEFAULT_FIELDS.items():
@@ -4,8 +4,12 @@ Identifie les enregistrements ayant une liste stock_import vide.
 """
 
 from typing import Dict, List, Tuple, Any
+
+import numpy as np
 import pandas as pd
 
+from src.utils.ragged import cell_lengths
+
 
 def check_empty_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -30,26 +34,26 @@ def check_empty_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[
         })
         return df, errors
     
-    # Identifier les entrées avec stock_import vide
-    empty_imports = df[df['stock_import'].apply(lambda x: isinstance(x, list) and len(x) == 0)]
+    # Identifier les entrées avec stock_import vide (longueurs des listes, sans parcourir leurs éléments)
+    empty_positions = np.flatnonzero(cell_lengths(df['stock_import'].to_numpy(dtype=object)) == 0)
     
-    if len(empty_imports) > 0:
+    if len(empty_positions) > 0:
         # Collecter les IDs et autres informations pertinentes
-        empty_records = []
-        for idx, row in empty_imports.iterrows():
-            empty_records.append({
-                "st_id": row['st_id'],
-                "st_io": row.get('st_io', 'N/A'),
-                "index": idx
-            })
+        st_ids = df['st_id'].to_numpy(dtype=object)[empty_positions]
+        st_ios = df['st_io'].to_numpy(dtype=object)[empty_positions] if 'st_io' in df.columns else ['N/A'] * len(empty_positions)
+        indices = df.index[empty_positions]
+        empty_records = [
+            {"st_id": st_id, "st_io": st_io, "index": idx}
+            for st_id, st_io, idx in zip(st_ids, st_ios, indices)
+        ]
         
         # Ajouter l'erreur pour les stock_import vides
         errors.append({
             "type": "empty_stock_import",
             "severity": "warning",
-            "count": len(empty_imports),
+            "count": len(empty_positions),
             "affected_records": empty_records,
-            "message": f"Détection de {len(empty_imports)} enregistrements avec stock_import vide"
+            "message": f"Détection de {len(empty_positions)} enregistrements avec stock_import vide"
         })
     
     return df, errors
\ No newline at end of file
@@ -6,6 +6,8 @@ Remplace les valeurs "0" par des chaînes vides.
 from typing import Dict, List, Tuple, Any
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def clean_commentary(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -20,7 +22,7 @@ def clean_commentary(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any
         - La liste des modifications effectuées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne existe
     if 'st_commentary' not in result_df.columns:
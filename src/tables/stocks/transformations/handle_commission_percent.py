@@ -9,6 +9,7 @@ from typing import Dict, List, Tuple, Any
 import pandas as pd
 
 from src.tables.stocks.input_structure import FIELDS_TO_RENAME
+from src.utils.copy_on_write import step_copy
 
 
 # def handle_commission_percent(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
@@ -125,7 +126,7 @@ def handle_commission_percent(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict
         - La liste des modifications effectuées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Identifier si le champ problématique est présent
     problematic_field = None
@@ -8,10 +8,11 @@ from typing import Dict, List, Tuple, Any, Optional
 import pandas as pd
 import numpy as np
 from src.tables.stocks.output_structure import STEP_PLANNING_VALUES
+from src.utils.copy_on_write import step_copy
 
 def convert_nan_to_none(df: pd.DataFrame) -> pd.DataFrame:
     """Convertit tous les NaN du DataFrame en None pour la sortie JSON."""
-    result = df.copy()
+    result = step_copy(df)
     
     # Parcourir toutes les colonnes
     for col in result.columns:
@@ -42,7 +43,7 @@ def prepare_final_model(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs/informations sur la préparation du modèle
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier la présence des champs obligatoires
     required_fields = ["st_id", "st_io"]
@@ -3,10 +3,41 @@ Module de validation des stock_import pour les données stocks.
 Vérifie et nettoie le tableau des stock_import.
 """
 
-from typing import Dict, List, Tuple, Any, Optional, Union
+import json
+from typing import Dict, List, Tuple, Any
 
+import numpy as np
 import pandas as pd
 
+from src.utils import ragged
+from src.utils.copy_on_write import step_copy
+
+
+def _scalar_items(value: Any) -> List[Any]:
+    """
+    Éléments d'une valeur stock_import qui n'est pas une liste.
+
+    Args:
+        value: Valeur actuelle du champ stock_import
+
+    Returns:
+        Liste des éléments à convertir (vide si la valeur est nulle ou illisible)
+    """
+    if isinstance(value, (tuple, np.ndarray)):
+        return list(value)
+    if value is None or pd.isna(value):
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('[') and text.endswith(']'):
+            try:
+                parsed = json.loads(text)
+            except json.JSONDecodeError:
+                return []
+            return parsed if isinstance(parsed, list) else []
+        return [text] if text else []
+    return [value]
+
 
 def validate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -17,6 +48,9 @@ def validate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str
     - Élimination des doublons dans chaque tableau
     - Vérification de la validité des références
     
+    Les tableaux sont traités au format ragged (src/utils/ragged.py) : seules
+    les lignes modifiées reçoivent une nouvelle liste.
+    
     Args:
         df: DataFrame contenant les données stocks
         
@@ -26,7 +60,7 @@ def validate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str
         - La liste des erreurs/modifications détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si le champ stock_import existe
     if 'stock_import' not in result_df.columns:
@@ -37,109 +71,55 @@ def validate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str
         })
         return result_df, errors
     
-    def clean_stock_import(imports: Any) -> List[int]:
-        """
-        Nettoie et valide une liste de stock_import.
-        
-        Args:
-            imports: Valeur actuelle du champ stock_import
-            
-        Returns:
-            Liste nettoyée d'identifiants entiers
-        """
-        # Si la valeur est NaN ou None, retourner une liste vide
-        if pd.isna(imports) or imports is None:
-            return []
-        
-        # Si ce n'est pas une liste, tenter de la convertir
-        if not isinstance(imports, list):
-            try:
-                # Cas où c'est une chaîne représentant une liste
-                if isinstance(imports, str):
-                    if imports.strip().startswith('[') and imports.strip().endswith(']'):
-                        import json
-                        imports = json.loads(imports)
-                    else:
-                        # Cas d'une valeur simple non-liste
-                        return [int(imports)] if str(imports).strip() else []
-                else:
-                    # Cas d'une valeur simple non-liste
-                    return [int(imports)]
-            except (ValueError, TypeError, json.JSONDecodeError):
-                return []
-        
-        # Convertir chaque élément en entier si possible
-        clean_list = []
-        for item in imports:
-            try:
-                if isinstance(item, str) and not item.strip():
-                    continue  # Ignorer les chaînes vides
-                clean_list.append(int(item))
-            except (ValueError, TypeError):
-                pass  # Ignorer les éléments non convertibles
-        
-        # Éliminer les doublons tout en préservant l'ordre
-        seen = set()
-        return [x for x in clean_list if not (x in seen or seen.add(x))]
+    cells = result_df['stock_import'].to_numpy(dtype=object)
+    is_list = ragged.cell_lengths(cells) >= 0
     
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        st_id = row['st_id']
-        original_imports = row['stock_import']
+    # Les valeurs qui ne sont pas des listes (chaîne JSON, valeur simple, null) sont lues une à une
+    items = cells.copy()
+    for position in np.flatnonzero(~is_list):
+        items[position] = _scalar_items(cells[position])
+    
+    # Conversion en entiers et dédoublonnage sur les tableaux plats
+    original = ragged.from_lists(items)
+    cleaned = ragged.dedup_rows(ragged.coerce_int(original))
+    changed = ragged.changed_rows(original, cleaned) | ~is_list
+    if not changed.any():
+        return result_df, errors
+    
+    rows = np.flatnonzero(changed)
+    cleaned_lists = ragged.to_lists(cleaned, rows)
+    cleaned_lengths = ragged.lengths(cleaned)
+    original_lengths = ragged.lengths(original)
+    
+    values = cells.copy()
+    st_ids = result_df['st_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+    for position, cleaned_imports in zip(rows, cleaned_lists):
+        values[position] = cleaned_imports
         
-        try:
-            # Nettoyage et validation
-            cleaned_imports = clean_stock_import(original_imports)
-            
-            # Vérifier si des modifications ont été apportées
-            import json
-            original_str = json.dumps(original_imports) if isinstance(original_imports, list) else str(original_imports)
-            cleaned_str = json.dumps(cleaned_imports)
-            
-            if original_str != cleaned_str:
-                # Mise à jour de la valeur
-                result_df.at[idx, 'stock_import'] = cleaned_imports
-                
-                # Journalisation des modifications
-                errors.append({
-                    "type": "stock_import_cleaned",
-                    "severity": "info",
-                    "st_id": st_id,
-                    "index": idx,
-                    "original": original_imports,
-                    "cleaned": cleaned_imports,
-                    "message": f"Le tableau stock_import a été nettoyé et dédupliqué"
-                })
-                
-                # Vérification de la déduplication
-                if isinstance(original_imports, list) and len(original_imports) != len(cleaned_imports):
-                    errors.append({
-                        "type": "stock_import_deduplicated",
-                        "severity": "info",
-                        "st_id": st_id,
-                        "index": idx,
-                        "original_count": len(original_imports) if isinstance(original_imports, list) else 1,
-                        "cleaned_count": len(cleaned_imports),
-                        "message": f"Des doublons ont été éliminés du tableau stock_import"
-                    })
+        # Journalisation des modifications
+        errors.append({
+            "type": "stock_import_cleaned",
+            "severity": "info",
+            "st_id": st_ids[position],
+            "index": indices[position],
+            "original": cells[position],
+            "cleaned": cleaned_imports,
+            "message": f"Le tableau stock_import a été nettoyé et dédupliqué"
+        })
         
-        except Exception as e:
-            # Enregistrer l'erreur si le nettoyage échoue
+        # Vérification de la déduplication
+        if is_list[position] and original_lengths[position] != cleaned_lengths[position]:
             errors.append({
-                "type": "stock_import_cleaning_error",
-                "severity": "error",
-                "st_id": st_id,
-                "index": idx,
-                "original": original_imports,
-                "message": f"Erreur lors du nettoyage du tableau stock_import: {str(e)}"
+                "type": "stock_import_deduplicated",
+                "severity": "info",
+                "st_id": st_ids[position],
+                "index": indices[position],
+                "original_count": int(original_lengths[position]),
+                "cleaned_count": int(cleaned_lengths[position]),
+                "message": f"Des doublons ont été éliminés du tableau stock_import"
             })
-            
-            # Initialiser à une liste vide en cas d'erreur
-            result_df.at[idx, 'stock_import'] = []
     
-    # Vérifier une dernière fois que toutes les valeurs stock_import sont des listes
-    for idx in df.index:
-        if not isinstance(df.at[idx, 'stock_import'], list):
-            df.at[idx, 'stock_import'] = []
+    result_df['stock_import'] = values
     
-    return result_df, errors
\ No newline at end of file
+    return result_df, errors
@@ -7,6 +7,8 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def validate_uniqueness(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -24,7 +26,7 @@ def validate_uniqueness(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs d'unicité détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérification de l'unicité du champ st_io
     if 'st_io' in result_df.columns:
@@ -3,14 +3,11 @@ Module principal pour le traitement des données transports.
 Responsable de l'orchestration complète du processus de transformation.
 """
 
-import json
 import logging
 import os
-from datetime import datetime
+from functools import partial
 from typing import Dict, List, Optional, Tuple, Any, Union
 
-import pandas as pd
-
 from src.tables.transports.transformations.validate_input_structure import validate_input_structure
 from src.tables.transports.transformations.normalize_text import normalize_text
 from src.tables.transports.transformations.normalize_special_chars import normalize_special_chars
@@ -21,7 +18,76 @@ from src.tables.transports.transformations.add_missing_fields import add_missing
 from src.tables.transports.transformations.patch_data import apply_patches
 from src.tables.transports.transformations.prepare_final_model import prepare_final_model
 from src.tables.transports.error_reporting.generate_error_report import generate_error_report
-from src.utils.logging_manager import setup_logger
+from src.utils.patch_engine import table_patch_files, unused_patch_files
+from src.utils.pipeline_steps import pipeline_step, TABLE_SCOPE
+from src.utils.table_runner import table_pipeline, run_table_pipeline
+
+
+def build_steps(patches_dir: str, logger: logging.Logger) -> List[Dict[str, Any]]:
+    """
+    Construit la liste ordonnée des étapes de transformation des données transports.
+    
+    La validation des dénominations détecte les doublons sur toute la table :
+    c'est une étape globale qui, en mode par lots, ne lit que tra_id et
+    tra_denomination.
+    
+    Args:
+        patches_dir: Répertoire contenant les fichiers de correctifs
+        logger: Logger du traitement
+        
+    Returns:
+        Liste des étapes décrites par pipeline_step
+    """
+    steps = [
+        pipeline_step("Étape 2: Normalisation du texte", normalize_text, "general"),
+        pipeline_step("Étape 3: Normalisation des caractères spéciaux", normalize_special_chars, "general"),
+        pipeline_step("Étape 4: Déduplication des identifiants stock_import", deduplicate_stock_import, "stock_import",
+                      "Détection de {count} erreurs/modifications de stock_import", logging.WARNING),
+        pipeline_step("Étape 5: Validation des dénominations", validate_denomination, "denomination",
+                      "Détection de {count} erreurs/modifications de dénomination", logging.WARNING,
+                      scope=TABLE_SCOPE, columns=["tra_id", "tra_denomination"]),
+        pipeline_step("Étape 6: Validation des types de données", validate_data_types, "data_types",
+                      "Détection de {count} erreurs de types de données", logging.WARNING),
+        pipeline_step("Étape 7: Ajout des champs manquants", add_missing_fields, "general",
+                      "{count} champs ajoutés ou modifiés"),
+    ]
+    
+    # Étape 8: Application des correctifs spécifiques
+    patches_files = table_patch_files(patches_dir, "transports", "patches*")
+    if patches_files:
+        steps.append(pipeline_step(
+            "Étape 8: Application des correctifs spécifiques",
+            partial(apply_patches, patches_file_paths=patches_files),
+            "general",
+            "{count} correctifs appliqués"
+        ))
+    else:
+        logger.info(f"Aucun fichier de correctifs trouvé: {os.path.join(patches_dir, 'transports_patches*.json')}")
+    for unused_file in unused_patch_files(patches_dir, "transports", patches_files):
+        logger.info(f"Fichier de correctifs sans règle d'application, ignoré: {unused_file}")
+    
+    steps.append(pipeline_step("Étape 9: Préparation du modèle final", prepare_final_model, "general"))
+    
+    return steps
+
+
+# Pipeline de la table, exécuté par run_table_pipeline
+PIPELINE = table_pipeline(
+    name="transports",
+    id_column="tra_id",
+    error_categories=[
+        "structure",
+        "denomination",
+        "data_types",
+        "stock_import",
+        "general"
+    ],
+    validate_fn=validate_input_structure,
+    build_steps=build_steps,
+    report_fn=generate_error_report,
+    # Étapes conformes au contrat du mode sans copie (src/utils/copy_on_write.py)
+    copy_free=True
+)
 
 
 def clean_transports_data(
@@ -29,7 +95,8 @@ def clean_transports_data(
     output_file_path: str,
     patches_dir: str = "data/patches",
     error_report_dir: str = "data/error_report",
-    log_dir: str = "logs"
+    log_dir: str = "logs",
+    chunk_size: Optional[int] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Fonction principale pour nettoyer et transformer les données transports.
@@ -40,149 +107,20 @@ def clean_transports_data(
         patches_dir: Répertoire contenant les fichiers de correctifs
         error_report_dir: Répertoire pour les rapports d'erreurs
         log_dir: Répertoire pour les fichiers de log
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
         
     Returns:
         Tuple[bool, Optional[str]]: (Succès, Chemin du rapport d'erreurs si généré)
     """
-    # Configuration du logger                                        
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(log_dir, f"transports_transformation_{timestamp}.log")
-    logger = setup_logger("transports_transformation", log_file)
-    
-    logger.info(f"Démarrage du traitement des données transports: {input_file_path}")
-    
-    # Dictionnaire pour collecter les erreurs
-    errors = {
-        "structure": [],
-        "denomination": [],
-        "data_types": [],
-        "stock_import": [],
-        "general": []
-    }
-    
-    # Lecture du fichier d'entrée
-    try:
-        with open(input_file_path, 'r', encoding='utf-8') as file:
-            input_data = json.load(file)
-        logger.info(f"Fichier chargé avec succès: {len(input_data)} entrées")
-    except Exception as e:
-        logger.error(f"Erreur lors de la lecture du fichier d'entrée: {str(e)}")
-        errors["general"].append({"error": f"Erreur de lecture du fichier: {str(e)}"})
-        return False, None
-    
-    # Étape 1: Validation de la structure d'entrée
-    logger.info("Étape 1: Validation de la structure d'entrée")
-    input_data, structure_errors = validate_input_structure(input_data)
-    if structure_errors:
-        errors["structure"].extend(structure_errors)
-        logger.warning(f"Détection de {len(structure_errors)} erreurs de structure")
-    
-    # Conversion en DataFrame pour faciliter le traitement
-    df = pd.DataFrame(input_data)
-    original_count = len(df)
-    logger.info(f"Conversion en DataFrame: {original_count} lignes")
-    
-    # Étape 2: Normalisation du texte
-    logger.info("Étape 2: Normalisation du texte")
-    df, text_errors = normalize_text(df)
-    if text_errors:
-        errors["general"].extend(text_errors)
-    
-    # Étape 3: Normalisation des caractères spéciaux
-    logger.info("Étape 3: Normalisation des caractères spéciaux")
-    df, special_chars_errors = normalize_special_chars(df)
-    if special_chars_errors:
-        errors["general"].extend(special_chars_errors)
-    
-    # Étape 4: Déduplication des identifiants stock_import
-    logger.info("Étape 4: Déduplication des identifiants stock_import")
-    df, stock_import_errors = deduplicate_stock_import(df)
-    if stock_import_errors:
-        errors["stock_import"].extend(stock_import_errors)
-        logger.warning(f"Détection de {len(stock_import_errors)} erreurs/modifications de stock_import")
-    
-    # Étape 5: Validation des dénominations
-    logger.info("Étape 5: Validation des dénominations")
-    df, denomination_errors = validate_denomination(df)
-    if denomination_errors:
-        errors["denomination"].extend(denomination_errors)
-        logger.warning(f"Détection de {len(denomination_errors)} erreurs/modifications de dénomination")
-    
-    # Étape 6: Validation des types de données
-    logger.info("Étape 6: Validation des types de données")
-    df, data_type_errors = validate_data_types(df)
-    if data_type_errors:
-        errors["data_types"].extend(data_type_errors)
-        logger.warning(f"Détection de {len(data_type_errors)} erreurs de types de données")
-    
-    # Étape 7: Ajout des champs manquants
-    logger.info("Étape 7: Ajout des champs manquants")
-    df, missing_fields_errors = add_missing_fields(df)
-    if missing_fields_errors:
-        errors["general"].extend(missing_fields_errors)
-        logger.info(f"{len(missing_fields_errors)} champs ajoutés ou modifiés")
-    
-    # Étape 8: Application des correctifs spécifiques
-    logger.info("Étape 8: Application des correctifs spécifiques")
-    patches_file = os.path.join(patches_dir, "transports_patches.json")
-    if os.path.exists(patches_file):
-        df, patch_errors = apply_patches(df, patches_file)
-        if patch_errors:
-            errors["general"].extend(patch_errors)
-            logger.info(f"{len(patch_errors)} correctifs appliqués")
-    else:
-        logger.info(f"Aucun fichier de correctifs trouvé: {patches_file}")
-    
-    # Étape 9: Préparation du modèle final
-    logger.info("Étape 9: Préparation du modèle final")
-    df, final_errors = prepare_final_model(df)
-    if final_errors:
-        errors["general"].extend(final_errors)
-    
-    # Vérification de la préservation des données
-    final_count = len(df)
-    if final_count != original_count:
-        message = f"ALERTE: Différence de nombre d'entrées - Original: {original_count}, Final: {final_count}"
-        logger.error(message)
-        errors["general"].append({"error": message})
-    
-    # Conversion du DataFrame en liste de dictionnaires
-    output_data = df.to_dict(orient='records')
-    
-    # Suppression du champ tra_validation_status pour chaque enregistrement
-    for record in output_data:
-        if 'tra_validation_status' in record:
-            del record['tra_validation_status']
-    
-    # Sauvegarde du fichier de sortie
-    try:
-        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-        with open(output_file_path, 'w', encoding='utf-8') as file:
-            json.dump(output_data, file, ensure_ascii=False, indent=2)
-        logger.info(f"Fichier de sortie sauvegardé avec succès: {output_file_path}")
-    except Exception as e:
-        logger.error(f"Erreur lors de la sauvegarde du fichier de sortie: {str(e)}")
-        errors["general"].append({"error": f"Erreur de sauvegarde: {str(e)}"})
-        return False, None
-    
-    # Génération du rapport d'erreurs si nécessaire
-    has_errors = any(error_list for error_list in errors.values())
-    error_report_path = None
-    
-    if has_errors:
-        os.makedirs(error_report_dir, exist_ok=True)
-        error_report_path = os.path.join(
-            error_report_dir, 
-            f"transports_errors_{timestamp}.xlsx"
-        )
-        generate_error_report(errors, error_report_path, input_data)
-        logger.info(f"Rapport d'erreurs généré: {error_report_path}")
-    else:
-        logger.info("Aucune erreur détectée, pas de rapport généré")
-    
-    logger.info("Traitement des données transports terminé")
-    
-    return True, error_report_path
+    return run_table_pipeline(
+        PIPELINE,
+        input_file_path,
+        output_file_path,
+        patches_dir,
+        error_report_dir,
+        log_dir,
+        chunk_size
+    )
 
 
 if __name__ == "__main__":
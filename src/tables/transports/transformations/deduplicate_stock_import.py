@@ -5,13 +5,22 @@ Module de déduplication des identifiants stock_import pour les données transpo
 
 from typing import Dict, List, Tuple, Any
 
+import numpy as np
 import pandas as pd
 
+from src.utils import ragged
+from src.utils.copy_on_write import step_copy
+
 
 def deduplicate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
     Déduplique les identifiants dans les tableaux stock_import.
     
+    Les tableaux sont traités au format ragged (src/utils/ragged.py) :
+    conversion des chaînes numériques et dédoublonnage se font sur le tableau
+    plat de tous les identifiants, et seules les lignes modifiées reçoivent
+    une nouvelle liste.
+    
     Args:
         df: DataFrame contenant les données transports
         
@@ -21,7 +30,7 @@ def deduplicate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[
         - La liste des modifications effectuées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne stock_import existe
     if 'stock_import' not in result_df.columns:
@@ -31,76 +40,65 @@ def deduplicate_stock_import(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[
             "message": "La colonne 'stock_import' est absente du DataFrame"
         })
         return result_df, errors
-            
-    # Traitement de chaque ligne
-    for idx, row in result_df.iterrows():
-        tra_id = row['tra_id']
-        
-        # Récupérer la valeur de stock_import pour cette ligne spécifique
-        stock_import = row.get('stock_import')
-        
-        # Vérifier si stock_import est null ou vide ou pas une liste
-        if stock_import is None or not isinstance(stock_import, list):
-            # Initialiser comme liste vide
-            result_df.at[idx, 'stock_import'] = []
-            continue
+    
+    cells = result_df['stock_import'].to_numpy(dtype=object)
+    is_list = ragged.cell_lengths(cells) >= 0
+    original = ragged.from_lists(cells)
+    items = pd.Series(original["values"], dtype=object)
+    
+    # Convertir en entiers les chaînes numériques (seules les chaînes sont examinées)
+    strings = np.flatnonzero(ragged.value_types(original["values"]) == str)
+    digits = np.zeros(len(items), dtype=bool)
+    digits[strings] = [item.isdigit() for item in original["values"][strings]]
+    numbers = pd.to_numeric(items[digits], errors='coerce')
+    digits[np.flatnonzero(digits)[numbers.isna().to_numpy()]] = False
+    converted = original["values"].copy()
+    converted[digits] = numbers.dropna().astype(np.int64).tolist()
+    
+    # Dédupliquer tout en préservant l'ordre
+    deduplicated = ragged.dedup_rows({"values": converted, "offsets": original["offsets"]})
+    changed = ragged.changed_rows(original, deduplicated) & is_list
+    
+    # Doublons présents dans les tableaux d'origine
+    repeated = pd.DataFrame({"row": ragged.row_ids(original), "value": items}).duplicated(keep=False).to_numpy()
+    
+    values = cells.copy()
+    # Initialiser comme liste vide les valeurs nulles ou qui ne sont pas des listes
+    for position in np.flatnonzero(~is_list):
+        values[position] = []
+    
+    rows = np.flatnonzero(changed)
+    tra_ids = result_df['tra_id'].to_numpy(dtype=object)
+    indices = result_df.index.tolist()
+    offsets = original["offsets"]
+    for position, deduplicated_list in zip(rows, ragged.to_lists(deduplicated, rows)):
+        values[position] = deduplicated_list
         
-        stock_import = row['stock_import']
+        # Identifier les doublons supprimés
+        start, end = offsets[position], offsets[position + 1]
+        duplicates_set = set(original["values"][start:end][repeated[start:end]].tolist())
         
-        # Convertir tous les éléments en entiers si possible
-        try:
-            # Enregistrer les éléments originaux pour comparaison
-            original_stock_import = stock_import.copy()
-            
-            # Convertir en entiers (si chaînes numériques)
-            stock_import = [int(item) if isinstance(item, str) and item.isdigit() else item for item in stock_import]
-            
-            # Dédupliquer tout en préservant l'ordre
-            seen = set()
-            deduplicated = []
-            
-            for item in stock_import:
-                if item not in seen:
-                    seen.add(item)
-                    deduplicated.append(item)
-            
-            # Si des modifications ont été effectuées, les enregistrer
-            if deduplicated != original_stock_import:
-                result_df.at[idx, 'stock_import'] = deduplicated
-                
-                # Identifier les doublons supprimés
-                duplicates = [item for item in original_stock_import if original_stock_import.count(item) > 1]
-                duplicates_set = set(duplicates)
-                
-                if duplicates_set:
-                    errors.append({
-                        "type": "stock_import_deduplication",
-                        "severity": "info",
-                        "tra_id": tra_id,
-                        "index": idx,
-                        "original_count": len(original_stock_import),
-                        "deduplicated_count": len(deduplicated),
-                        "duplicates_removed": list(duplicates_set),
-                        "message": f"Doublons supprimés dans stock_import: {list(duplicates_set)}"
-                    })
-                else:
-                    # Si seuls des cas de conversion de type ont été effectués
-                    errors.append({
-                        "type": "stock_import_type_conversion",
-                        "severity": "info",
-                        "tra_id": tra_id,
-                        "index": idx,
-                        "message": "Types de données normalisés dans stock_import"
-                    })
-        except Exception as e:
-            # En cas d'erreur lors de la conversion
+        if duplicates_set:
             errors.append({
-                "type": "stock_import_processing_error",
-                "severity": "error",
-                "tra_id": tra_id,
-                "index": idx,
-                "error": str(e),
-                "message": f"Erreur lors du traitement de stock_import: {str(e)}"
+                "type": "stock_import_deduplication",
+                "severity": "info",
+                "tra_id": tra_ids[position],
+                "index": indices[position],
+                "original_count": int(end - start),
+                "deduplicated_count": len(deduplicated_list),
+                "duplicates_removed": list(duplicates_set),
+                "message": f"Doublons supprimés dans stock_import: {list(duplicates_set)}"
             })
+        else:
+            # Si seuls des cas de conversion de type ont été effectués
+            errors.append({
+                "type": "stock_import_type_conversion",
+                "severity": "info",
+                "tra_id": tra_ids[position],
+                "index": indices[position],
+                "message": "Types de données normalisés dans stock_import"
+            })
+    
+    result_df['stock_import'] = values
     
-    return result_df, errors
\ No newline at end of file
+    return result_df, errors
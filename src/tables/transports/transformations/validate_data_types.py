@@ -7,6 +7,8 @@ from typing import Dict, List, Tuple, Any, Optional, Union
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def validate_data_types(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -25,7 +27,7 @@ def validate_data_types(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str,
         - La liste des erreurs/modifications détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Liste des champs numériques (integer)
     integer_fields = [
@@ -8,6 +8,8 @@ from typing import Dict, List, Tuple, Any
 
 import pandas as pd
 
+from src.utils.copy_on_write import step_copy
+
 
 def validate_denomination(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
     """
@@ -22,7 +24,7 @@ def validate_denomination(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str
         - La liste des erreurs et modifications détectées
     """
     errors = []
-    result_df = df.copy()
+    result_df = step_copy(df)
     
     # Vérifier si la colonne tra_denomination existe
     if 'tra_denomination' not in result_df.columns:
@@ -0,0 +1,584 @@
+"""
+Module commun d'analyse des adresses (companies, logistic_address, organizations).
+Regroupe en un seul endroit les règles de décomposition des adresses, le
+découpage en unités lexicales et le lexique compilé des types de voie
+(abréviations: BD -> BOULEVARD, CHE -> CHEMIN...).
+
+Les règles s'appliquent à une valeur (fonctions pures, mémoïsables) ; les
+fonctions par lot (parse_values, parse_addresses) les appliquent une seule
+fois par adresse distincte d'une colonne, en passant par le cache persistant
+lorsqu'il est fourni.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.factorize import factorize_strings
+from src.utils.memo_store import memo_map
+
+
+# Composants structurés d'une adresse
+ADDRESS_COMPONENTS = ["house_number", "street", "postal_code", "city", "additional_address"]
+
+# Lexique des types de voie: forme canonique -> abréviations usuelles
+STREET_TYPE_LEXICON = {
+    "RUE": ["R"],
+    "AVENUE": ["AV", "AVE", "AVN"],
+    "BOULEVARD": ["BD", "BLD", "BLVD", "BVD"],
+    "ALLEE": ["ALL", "ALLÉE"],
+    "PLACE": ["PL"],
+    "COURS": ["CRS"],
+    "CHEMIN": ["CHE", "CHEM", "CHM"],
+    "IMPASSE": ["IMP"],
+    "QUAI": ["QU"],
+    "SQUARE": ["SQ"],
+    "ROUTE": ["RTE"],
+    "SENTIER": ["SEN", "SENT"],
+    "PASSAGE": ["PAS", "PASS"],
+    "FAUBOURG": ["FG", "FBG"],
+    "LOTISSEMENT": ["LOT"],
+    "RESIDENCE": ["RES", "RÉSIDENCE"],
+    "HAMEAU": ["HAM"],
+    "PROMENADE": ["PROM"],
+    "ROND-POINT": ["RPT"],
+    "LIEU-DIT": ["LD"],
+    "VOIE": [],
+}
+
+# Types de voie (formes complètes) reconnus par les règles de décomposition
+RULE_STREET_TYPES = ["RUE", "AVENUE", "BOULEVARD", "ALLEE", "ALLÉE", "PLACE", "COURS", "CHEMIN",
+                     "IMPASSE", "QUAI", "SQUARE", "ROUTE", "SENTIER", "PASSAGE"]
+
+# Suffixes de numéro de voie
+NUMBER_SUFFIXES = {"BIS", "TER", "QUATER"}
+
+
+def compile_street_type_lexicon(lexicon: Dict[str, List[str]]) -> Dict[str, str]:
+    """
+    Compile le lexique des types de voie en table forme écrite -> forme canonique.
+
+    Args:
+        lexicon: Forme canonique -> abréviations
+
+    Returns:
+        Dictionnaire (formes canoniques et abréviations, en majuscules) -> forme canonique
+    """
+    variants = {}
+    for canonical, abbreviations in lexicon.items():
+        for variant in [canonical, *abbreviations]:
+            variants[variant.upper()] = canonical
+    return variants
+
+
+STREET_TYPE_VARIANTS = compile_street_type_lexicon(STREET_TYPE_LEXICON)
+
+# Découpage en unités lexicales: code postal, numéro (lettre accolée comprise), mot, séparateur
+TOKEN_PATTERN = re.compile(
+    r"(?P<postal_code>\b\d{5}\b)|(?P<number>\d+[A-Za-z]?\b)|(?P<word>[^\W\d_]+(?:['’-][^\W\d_]+)*)|(?P<separator>[,;/])"
+)
+
+# Patterns de décomposition
+# Code postal standard ou avec espace (ex: "59500" ou "38 170")
+POSTAL_CODE_PATTERN = re.compile(r'(\d{2,3})\s*(\d{2,3})')
+
+# Numéro de rue suivi de la rue
+STREET_NUMBER_PATTERN = re.compile(r'^(\d+[\s]?[a-zA-Z]?)\s+(.+)$')
+
+# Types de voie courants (générés depuis le lexique)
+STREET_TYPE_PATTERN = re.compile(
+    r'\b(' + '|'.join(street_type.lower() for street_type in RULE_STREET_TYPES) + r')\b',
+    re.IGNORECASE
+)
+
+# Zones d'activité et zones industrielles
+BUSINESS_ZONE_PATTERN = re.compile(
+    r'^(ZA|ZAC|ZI|ZONE\s+[A-Za-z\'\s-]+|PARC\s+[A-Za-z\'\s-]+)[\s-]*(.*?)(?:(\d+[\s]?[a-zA-Z]?)\s+)?(.+)$',
+    re.IGNORECASE
+)
+
+# Entreprise suivie d'une adresse
+COMPANY_PATTERN = re.compile(r'^([^,]+),\s*(.+)$')
+
+# Adresses spéciales: BP, CS, TSA, CEDEX
+SPECIAL_ADDRESS_PATTERN = re.compile(
+    r'^(BP|CS|TSA|CEDEX)[\s,.-]*(\d+)[\s,.-]*(.*)$',
+    re.IGNORECASE
+)
+
+# Numéro en tête d'adresse - capture les formats comme:
+# "11A" (numéro+lettre directement accolée)
+# "11 A" (numéro+espace+lettre+espace)
+# "11 Arue" (numéro+espace+lettre suivie de texte sans espace)
+LEADING_NUMBER_PATTERN = re.compile(
+    r'^(\d+)(?:([A-Za-z])(?=\s|$)|\s+([A-Za-z])\s+|\s+)(.*)$'
+)
+
+# Arrondissements et CEDEX en fin de nom de ville
+CITY_SUFFIX_PATTERNS = [
+    (re.compile(r'\s+\d+E\s+ARRONDISSEMENT$'), ''),  # ex: "LYON 8E ARRONDISSEMENT" -> "LYON"
+    (re.compile(r'\s+\d+EME\s+ARRONDISSEMENT$'), ''),  # ex: "LYON 8EME ARRONDISSEMENT" -> "LYON"
+    (re.compile(r'\s+\d+E$'), ''),  # ex: "PARIS 14E" -> "PARIS"
+    (re.compile(r'\s+\d+ER$'), ''),  # ex: "PARIS 1ER" -> "PARIS"
+    (re.compile(r'\s+\d+EME$'), ''),  # ex: "PARIS 14EME" -> "PARIS"
+    (re.compile(r'\s+CEDEX.*$'), '')  # ex: "RENNES CEDEX 9" -> "RENNES"
+]
+
+FRENCH_POSTAL_CODE_PATTERN = re.compile(r'^\d{5}$')
+
+
+def tokenize_address(address: str) -> List[Tuple[str, str]]:
+    """
+    Découpe une adresse en unités lexicales.
+
+    Args:
+        address: Adresse à découper
+
+    Returns:
+        Liste de (nature, texte), nature parmi postal_code, number, suffix,
+        street_type, word et separator
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(address):
+        kind, text = match.lastgroup, match.group()
+        if kind == "word":
+            upper = text.upper()
+            if upper in NUMBER_SUFFIXES:
+                kind = "suffix"
+            elif upper in STREET_TYPE_VARIANTS:
+                kind = "street_type"
+        tokens.append((kind, text))
+    return tokens
+
+
+def street_type_of(street: Any) -> Optional[str]:
+    """
+    Renvoie le type de voie canonique d'une rue (premier mot après le numéro).
+
+    Args:
+        street: Nom de rue, éventuellement précédé du numéro (ex: "12 BD GAMBETTA")
+
+    Returns:
+        Forme canonique du type de voie (ex: "BOULEVARD"), None si non reconnu
+    """
+    if not isinstance(street, str):
+        return None
+    for kind, text in tokenize_address(street):
+        if kind in ("number", "suffix", "separator"):
+            continue
+        return STREET_TYPE_VARIANTS[text.upper()] if kind == "street_type" else None
+    return None
+
+
+def split_street_number(address: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extrait le numéro et le nom de rue d'une adresse (règles companies).
+
+    Règles spécifiques:
+    - Adresses spéciales (BP, CS, TSA, CEDEX): le préfixe et son numéro forment le numéro
+    - Si une lettre suit directement un nombre (ex: "11A"), elle fait partie du numéro
+    - Si une lettre est séparée du nombre par un espace, mais suivie d'un autre espace (ex: "11 A "),
+    elle fait partie du numéro
+    - Si une lettre est séparée du nombre par un espace et suivie directement d'un texte (ex: "11 Arue"),
+    elle fait partie du nom de rue
+
+    Args:
+        address: L'adresse complète
+
+    Returns:
+        Tuple contenant le numéro de rue et le nom de rue
+    """
+    if not address:
+        return None, None
+
+    # Vérifier si c'est une adresse spéciale (BP, CEDEX, etc.)
+    special_match = SPECIAL_ADDRESS_PATTERN.match(address)
+    if special_match:
+        prefix, number, rest = special_match.groups()
+        street_number = f"{prefix} {number}".strip()
+        street_name = rest.strip() if rest else None
+        return street_number, street_name
+
+    match = LEADING_NUMBER_PATTERN.match(address)
+    if match:
+        number, letter_attached, letter_with_spaces, street = match.groups()
+
+        # Construction du numéro de rue
+        if letter_attached:  # Cas "11A"
+            street_number = f"{number}{letter_attached}"
+        elif letter_with_spaces:  # Cas "11 A "
+            street_number = f"{number}{letter_with_spaces}"
+        else:  # Cas "11" ou "11 Arue"
+            street_number = number
+
+        # Construction du nom de rue (la lettre éventuelle est déjà dans le numéro)
+        street_name = street.strip() if street else None
+
+        return street_number.strip(), street_name
+
+    # Si le format ne correspond à aucun pattern, tout est considéré comme nom de rue
+    return None, address.strip()
+
+
+def parse_street_number(address: str) -> Dict[str, Optional[str]]:
+    """
+    Décompose une adresse en numéro et rue (règles companies), sous forme de composants.
+
+    Args:
+        address: L'adresse complète
+
+    Returns:
+        Dictionnaire des composants (house_number, street)
+    """
+    house_number, street = split_street_number(address)
+    return {"house_number": house_number, "street": street}
+
+
+def normalize_postal_code(postal_code: str) -> str:
+    """
+    Normalise un code postal qui peut être espacé.
+
+    Args:
+        postal_code: Code postal à normaliser (ex: "38 170")
+
+    Returns:
+        Code postal normalisé (ex: "38170")
+    """
+    if not postal_code or pd.isna(postal_code):
+        return ""
+
+    # Vérifier si c'est un code postal espacé
+    match = POSTAL_CODE_PATTERN.search(postal_code)
+    if match:
+        # Reconstituer le code postal sans espaces
+        return f"{match.group(1)}{match.group(2)}"
+
+    # Retirer tous les espaces du code postal
+    return re.sub(r'\s+', '', postal_code)
+
+
+def parse_street_with_number(street_value: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extrait le numéro de rue et le nom de rue d'une chaîne.
+
+    Args:
+        street_value: Texte pouvant contenir un numéro suivi d'un nom de rue
+
+    Returns:
+        Tuple (numéro, rue) ou (None, None) si non détecté
+    """
+    if pd.isna(street_value) or not isinstance(street_value, str):
+        return None, None
+
+    street_value = street_value.strip()
+    match = STREET_NUMBER_PATTERN.match(street_value)
+
+    if match:
+        number, street = match.groups()
+        return number.strip(), street.strip()
+
+    # Tenter d'extraire un numéro suivi d'un type de voie connu
+    number_match = re.search(r'^(\d+[a-zA-Z]?)', street_value)
+    if number_match:
+        number = number_match.group(1)
+        street_type_match = STREET_TYPE_PATTERN.search(street_value)
+        if street_type_match:
+            # Numéro trouvé et type de voie détecté
+            street = street_value[len(number):].strip()
+            return number.strip(), street
+
+    return None, street_value
+
+
+def is_company_prefix(company_name: str) -> bool:
+    """
+    Indique si le texte précédant la virgule est un nom d'entreprise et non une adresse.
+
+    Args:
+        company_name: Texte avant la première virgule
+
+    Returns:
+        True si le texte ne contient ni nombre isolé ni type de voie
+    """
+    return not re.search(r'\b\d+\b', company_name) and not STREET_TYPE_PATTERN.search(company_name.lower())
+
+
+def extract_components_from_address(address: str) -> Dict[str, Optional[str]]:
+    """
+    Extrait tous les composants possibles d'une adresse complète (règles logistic_address).
+
+    Cas traités, dans l'ordre:
+    - Entreprise suivie d'une adresse (LOGISTICS OPERATIONS, 41 RUE MERCIER)
+    - Zone d'activité suivie d'une adresse (ZAC DES MURONS 466 RUE JACQUELINE AURIOL)
+    - Adresse avec code postal, éventuellement espacé (RUE DE LA LEAVDE 38 170 SEYSSINET)
+    - Adresse simple: numéro et rue
+
+    Args:
+        address: Adresse complète à décomposer
+
+    Returns:
+        Dictionnaire des composants (house_number, street, postal_code, city, additional_address)
+    """
+    components = {component: None for component in ADDRESS_COMPONENTS}
+
+    if pd.isna(address) or not isinstance(address, str):
+        return components
+
+    address = address.strip()
+
+    # Cas 1: Entreprise suivie d'une adresse
+    company_match = COMPANY_PATTERN.match(address)
+    if company_match:
+        company_name, address_part = company_match.groups()
+
+        # Vérifier que la partie entreprise ne ressemble pas à une adresse
+        if is_company_prefix(company_name):
+            components["additional_address"] = company_name.strip()
+
+            # Traiter le reste de l'adresse récursivement
+            remaining_components = extract_components_from_address(address_part)
+            for key, value in remaining_components.items():
+                if key != "additional_address" or not components["additional_address"]:
+                    components[key] = value
+
+            return components
+
+    # Cas 2: Zone d'activité suivie d'une adresse
+    business_zone_match = BUSINESS_ZONE_PATTERN.match(address)
+    if business_zone_match:
+        zone_prefix, zone_details, house_number, street = business_zone_match.groups()
+
+        # Nettoyer les composants
+        zone_prefix = zone_prefix.strip()
+        zone_details = zone_details.strip() if zone_details else ""
+        house_number = house_number.strip() if house_number else None
+        street = street.strip()
+
+        # Former l'information additionnelle depuis la zone d'activité
+        additional_info = zone_prefix
+        if zone_details and zone_details != '-':
+            additional_info = f"{zone_prefix} {zone_details}".strip()
+
+        components["house_number"] = house_number
+        components["street"] = street
+        components["additional_address"] = additional_info
+
+        # Extraire éventuellement ville et code postal de la partie rue
+        postal_match = POSTAL_CODE_PATTERN.search(street)
+        if postal_match:
+            parts = re.split(POSTAL_CODE_PATTERN, street)
+            if len(parts) >= 3:
+                components["street"] = parts[0].strip()
+                components["postal_code"] = f"{postal_match.group(1)}{postal_match.group(2)}"
+                components["city"] = parts[-1].strip()
+
+        return components
+
+    # Cas 3: Extraire code postal et ville s'ils sont présents
+    postal_match = POSTAL_CODE_PATTERN.search(address)
+    if postal_match:
+        postal_code = f"{postal_match.group(1)}{postal_match.group(2)}"
+
+        # Séparer l'adresse en parties avant/après le code postal
+        parts = re.split(POSTAL_CODE_PATTERN, address)
+        if len(parts) >= 3:
+            before_postal = parts[0].strip()
+            after_postal = parts[-1].strip()
+
+            # Nettoyer les séparateurs
+            before_postal = re.sub(r'[,;.\s]+$', '', before_postal).strip()
+            after_postal = re.sub(r'^[,;.\s]+', '', after_postal).strip()
+
+            # La partie après est probablement la ville
+            components["postal_code"] = postal_code
+            components["city"] = after_postal if after_postal else None
+
+            # Analyser la partie avant pour extraire numéro et rue
+            components["house_number"], components["street"] = parse_street_with_number(before_postal)
+
+            return components
+
+    # Cas 4: Adresse simple sans code postal/ville: numéro et rue
+    components["house_number"], components["street"] = parse_street_with_number(address)
+
+    return components
+
+
+def clean_redundant_address_info(house_number: str, additional_address: str) -> str:
+    """
+    Nettoie les informations redondantes (numéro, numéro + voie) dans le complément d'adresse.
+
+    Args:
+        house_number: Le numéro de rue déjà identifié
+        additional_address: Le complément d'adresse à nettoyer
+
+    Returns:
+        Le complément d'adresse nettoyé
+    """
+    if pd.isna(additional_address) or not isinstance(additional_address, str) or not house_number:
+        return additional_address
+
+    # Chercher des mentions du numéro dans le complément d'adresse
+    if house_number in additional_address:
+        # Patterns courants à supprimer
+        patterns = [
+            f"{house_number}[/-]\\d+",  # Ex: "199-201"
+            f"{house_number}/\\d+",      # Ex: "199/201"
+            f"{house_number} ?[-/] ?\\d+",  # Ex: "199 - 201"
+            f"{house_number}"           # Le numéro lui-même
+        ]
+
+        cleaned_address = additional_address
+        for pattern in patterns:
+            cleaned_address = re.sub(pattern, "", cleaned_address)
+
+        # Nettoyer les espaces multiples résultants
+        cleaned_address = re.sub(r'\s+', ' ', cleaned_address).strip()
+
+        if cleaned_address != additional_address:
+            return cleaned_address
+
+    # Rechercher des motifs de type "numéro + type de voie"
+    street_type_match = STREET_TYPE_PATTERN.search(additional_address.lower())
+    if street_type_match:
+        # Trouver si un numéro précède le type de voie
+        street_type_pos = street_type_match.start()
+        before_type = additional_address[:street_type_pos].strip()
+
+        number_match = re.search(r'(\d+[a-zA-Z]?)\s*$', before_type)
+        if number_match:
+            # Trouver la fin de ce segment (jusqu'au prochain point, virgule ou fin de chaîne)
+            segment_start = additional_address.find(number_match.group(1))
+
+            segment_end = len(additional_address)
+            for marker in [',', '.', ';']:
+                marker_pos = additional_address.find(marker, street_type_pos)
+                if marker_pos > 0 and marker_pos < segment_end:
+                    segment_end = marker_pos
+
+            # Segment à supprimer (numéro + type de voie + suite)
+            if segment_end > segment_start:
+                segment_to_remove = additional_address[segment_start:segment_end]
+                cleaned_address = additional_address.replace(segment_to_remove, '')
+                cleaned_address = re.sub(r'\s+', ' ', cleaned_address).strip()
+                cleaned_address = re.sub(r'^[,;.\s]+|[,;.\s]+$', '', cleaned_address).strip()
+
+                if cleaned_address != additional_address and cleaned_address != '':
+                    return cleaned_address
+
+    return additional_address
+
+
+def collapse_spaces(value: Any, upper: bool = False) -> str:
+    """
+    Supprime les espaces en début et fin et réduit les espaces multiples.
+
+    Args:
+        value: Valeur à nettoyer (convertie en chaîne)
+        upper: Mettre en majuscules
+
+    Returns:
+        La valeur nettoyée
+    """
+    text = str(value).strip()
+    if upper:
+        text = text.upper()
+    return re.sub(r'\s+', ' ', text)
+
+
+def clean_city_label(city: Any) -> Tuple[str, str]:
+    """
+    Normalise un nom de ville et retire arrondissement et CEDEX.
+
+    Args:
+        city: Nom de ville
+
+    Returns:
+        Tuple contenant:
+        - Le nom normalisé (majuscules, espaces réduits)
+        - Le nom sans arrondissement ni CEDEX
+    """
+    normalized = collapse_spaces(city, upper=True)
+    cleaned = normalized
+    for pattern, replacement in CITY_SUFFIX_PATTERNS:
+        cleaned = pattern.sub(replacement, cleaned)
+    return normalized, cleaned
+
+
+def fix_postal_code(postal_code: Any) -> Tuple[str, bool, bool]:
+    """
+    Complète un code postal français à 4 chiffres et vérifie son format.
+
+    Args:
+        postal_code: Code postal
+
+    Returns:
+        Tuple contenant:
+        - Le code postal nettoyé (zéro initial ajouté si 4 chiffres)
+        - True si le zéro initial a été ajouté
+        - True si le code postal contient exactement 5 chiffres
+    """
+    postal_code = str(postal_code).strip()
+    fixed = postal_code.isdigit() and len(postal_code) == 4
+    if fixed:
+        postal_code = '0' + postal_code
+    return postal_code, fixed, FRENCH_POSTAL_CODE_PATTERN.match(postal_code) is not None
+
+
+def parse_values(
+    values: Any,
+    parser: Callable[[str], Any],
+    memo_store: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Applique une règle d'analyse à une colonne, une fois par chaîne distincte.
+
+    Args:
+        values: Colonne (Series ou tableau)
+        parser: Règle d'analyse d'une chaîne (fonction pure)
+        memo_store: Cache persistant (optionnel)
+
+    Returns:
+        Tableau d'objets des résultats par ligne (None pour les valeurs non textuelles)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object), dtype=object)
+    codes, uniques = factorize_strings(series)
+    unique_results = np.empty(len(uniques), dtype=object)
+    for position, result in enumerate(memo_map(memo_store, parser, uniques)):
+        unique_results[position] = result
+
+    results = np.full(len(codes), None, dtype=object)
+    text_positions = np.flatnonzero(codes >= 0)
+    results[text_positions] = unique_results[codes[text_positions]]
+    return results
+
+
+def parse_addresses(
+    addresses: pd.Series,
+    parser: Callable[[str], Dict[str, Optional[str]]] = extract_components_from_address,
+    memo_store: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    """
+    Décompose une colonne d'adresses en composants structurés.
+
+    Args:
+        addresses: Colonne d'adresses
+        parser: Règle de décomposition (extract_components_from_address ou parse_street_number)
+        memo_store: Cache persistant (optionnel)
+
+    Returns:
+        DataFrame (même index) des composants ADDRESS_COMPONENTS et du type de voie
+        canonique (street_type) ; composants à None pour les valeurs non textuelles
+    """
+    results = parse_values(addresses, parser, memo_store)
+    parsed = [result if result is not None else {} for result in results]
+    components = pd.DataFrame(
+        {component: np.array([result.get(component) for result in parsed], dtype=object)
+         for component in ADDRESS_COMPONENTS},
+        index=addresses.index
+    )
+    street_types = parse_values(components["street"], street_type_of)
+    components["street_type"] = street_types
+    return components
@@ -0,0 +1,129 @@
+"""
+Module du mode d'exécution sans copie des étapes de transformation.
+
+Contrat du mode sans copie (activé par table via table_pipeline(copy_free=True)):
+- le traitement de la table s'exécute avec le copy-on-write de pandas;
+- chaque étape obtient son DataFrame de travail par step_copy(df) : une copie
+  paresseuse qui partage les colonnes de l'entrée tant qu'elles ne sont pas
+  modifiées, seule une colonne écrite est réellement copiée;
+- une étape n'écrit que dans son DataFrame de travail (jamais dans df) et ne
+  modifie pas en place les objets contenus dans les cellules (listes,
+  dictionnaires), que le copy-on-write ne protège pas : elle les remplace.
+
+Hors de ce mode, step_copy fait une copie complète comme auparavant. Le
+contrôle optionnel des entrées (option --check-step-inputs) compare l'entrée
+de chaque étape avant et après son exécution et signale toute modification.
+"""
+
+import copy
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+
+def copy_free_enabled() -> bool:
+    """Indique si le mode sans copie (copy-on-write de pandas) est actif."""
+    return pd.options.mode.copy_on_write is True
+
+
+@contextmanager
+def copy_free_mode(enabled: bool = True) -> Iterator[None]:
+    """
+    Active le mode sans copie le temps d'un traitement.
+
+    Args:
+        enabled: False pour conserver les copies complètes
+    """
+    if not enabled:
+        yield
+        return
+    with pd.option_context("mode.copy_on_write", True):
+        yield
+
+
+def step_copy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Renvoie le DataFrame de travail d'une étape.
+
+    Args:
+        df: DataFrame d'entrée de l'étape
+
+    Returns:
+        Une copie paresseuse en mode sans copie, une copie complète sinon
+    """
+    return df.copy(deep=not copy_free_enabled())
+
+
+def snapshot_frame(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Fige le contenu d'un DataFrame, y compris les objets contenus dans les cellules.
+
+    Args:
+        df: DataFrame à figer
+
+    Returns:
+        Instantané comparable par mutated_columns
+    """
+    columns = []
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if column.dtype == object:
+            column = pd.Series(
+                [copy.deepcopy(value) for value in column], index=column.index, name=column.name, dtype=object
+            )
+        else:
+            column = column.copy(deep=True)
+        columns.append(column)
+    return {"columns": list(df.columns), "index": df.index.copy(deep=True), "values": columns}
+
+
+def mutated_columns(df: pd.DataFrame, snapshot: Dict[str, Any]) -> List[str]:
+    """
+    Liste les différences entre un DataFrame et son instantané.
+
+    Args:
+        df: DataFrame à contrôler
+        snapshot: Instantané pris par snapshot_frame
+
+    Returns:
+        Colonnes modifiées ("<colonnes>" ou "<index>" si la structure a changé)
+    """
+    if list(df.columns) != snapshot["columns"]:
+        return ["<colonnes>"]
+    if not df.index.equals(snapshot["index"]):
+        return ["<index>"]
+    return [
+        str(name) for position, name in enumerate(snapshot["columns"])
+        if not df.iloc[:, position].equals(snapshot["values"][position])
+    ]
+
+
+def shared_bytes(df: pd.DataFrame, result_df: pd.DataFrame) -> int:
+    """
+    Mesure la mémoire des colonnes de l'entrée réutilisées sans copie par le résultat.
+
+    Args:
+        df: DataFrame d'entrée d'une étape
+        result_df: DataFrame renvoyé par l'étape
+
+    Returns:
+        Nombre d'octets partagés (0 si l'étape renvoie son entrée)
+    """
+    if result_df is df:
+        return 0
+
+    inputs = {}
+    for position, name in enumerate(df.columns):
+        inputs.setdefault(name, df.iloc[:, position].to_numpy())
+
+    total = 0
+    for position, name in enumerate(result_df.columns):
+        source = inputs.get(name)
+        if source is None:
+            continue
+        values = result_df.iloc[:, position].to_numpy()
+        if np.may_share_memory(values, source):
+            total += values.nbytes
+    return total
@@ -0,0 +1,79 @@
+"""
+Module de factorisation des colonnes textuelles.
+Les champs textuels ont peu de valeurs distinctes (villes, formes juridiques,
+transporteurs) : les fonctions de nettoyage sont appliquées une seule fois
+par valeur distincte, puis les résultats sont redistribués sur les lignes
+au moyen des codes de factorisation.
+"""
+
+from typing import Any, Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def factorize_strings(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factorise les chaînes d'une colonne.
+
+    Args:
+        series: Colonne à factoriser
+
+    Returns:
+        Tuple contenant:
+        - Les codes par ligne (position dans uniques, -1 pour les valeurs non textuelles)
+        - Les chaînes distinctes, dans l'ordre de première apparition
+    """
+    values = series.to_numpy(dtype=object)
+    text_mask = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    codes = np.full(len(values), -1, dtype=np.intp)
+
+    if not text_mask.any():
+        return codes, np.empty(0, dtype=object)
+
+    text_codes, uniques = pd.factorize(values[text_mask])
+    codes[text_mask] = text_codes
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def map_unique_values(series: pd.Series, func: Callable[[Any], Any]) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Applique une fonction de nettoyage une seule fois par chaîne distincte.
+
+    Les valeurs nulles sont conservées sans appel ; les autres valeurs non
+    textuelles (nombres, booléens), rares, sont traitées ligne à ligne.
+    Le résultat est identique à series.apply(func).
+
+    Args:
+        series: Colonne à nettoyer
+        func: Fonction valeur -> valeur nettoyée
+
+    Returns:
+        Tuple contenant:
+        - La colonne nettoyée (nouvelle Series, même index)
+        - Le masque des lignes modifiées (valeur non nulle différente de l'originale)
+    """
+    codes, uniques = factorize_strings(series)
+    values = series.to_numpy(dtype=object)
+    others = np.flatnonzero((codes < 0) & ~pd.isna(values))
+
+    inputs = np.concatenate([uniques, values[others]])
+    outputs = np.empty(len(inputs), dtype=object)
+    for position, value in enumerate(inputs):
+        outputs[position] = func(value)
+    changed_outputs = np.fromiter(
+        (output != value for output, value in zip(outputs, inputs)), dtype=bool, count=len(inputs)
+    )
+
+    changed = np.zeros(len(values), dtype=bool)
+    text_positions = np.flatnonzero(codes >= 0)
+    changed[text_positions] = changed_outputs[codes[text_positions]]
+    changed[others] = changed_outputs[len(uniques):]
+
+    if not changed.any():
+        return series.copy(), changed
+
+    result = values.copy()
+    result[text_positions] = outputs[codes[text_positions]]
+    result[others] = outputs[len(uniques):]
+    return pd.Series(result, index=series.index, name=series.name).infer_objects(), changed
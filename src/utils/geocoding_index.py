@@ -0,0 +1,490 @@
+"""
+Module de géocodage hors ligne à partir de la Base Adresse Nationale (BAN).
+Compile une seule fois les extraits BAN (CSV adresses-*.csv, éventuellement
+compressés en gzip, un fichier par département) déposés dans data/reference/
+en un index compact: empreintes 64 bits triées des adresses (code postal,
+voie, numéro), des voies et des communes, avec leurs coordonnées, stockées
+en tableaux numpy lus par projection mémoire.
+
+Le géocodage se fait par lots (empreintes calculées en une passe, recherche
+dichotomique vectorisée) ; la recherche inverse et la détection de points
+proches s'appuient sur un arbre scipy.spatial.cKDTree.
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import unidecode
+from scipy.spatial import cKDTree
+
+from src.utils.address_parser import STREET_TYPE_VARIANTS
+from src.utils.near_duplicates import cluster_pairs
+from src.utils.postal_reference import KEY_ABBREVIATIONS, city_key
+from src.utils.sirene_index import REFERENCE_DIR
+
+
+# Motifs des extraits BAN reconnus
+BAN_EXTRACT_PATTERNS = ("adresses*.csv", "adresses*.csv.gz", "ban*.csv", "ban*.csv.gz")
+
+# Sous-répertoire de l'index compilé
+INDEX_DIRNAME = "geocoding_index"
+
+# Version du format de l'index (recompilation si elle change)
+INDEX_VERSION = 1
+
+# Nombre de lignes des extraits lues à la fois lors de la compilation
+COMPILE_CHUNK_SIZE = 500_000
+
+# Rayon terrestre moyen (mètres)
+EARTH_RADIUS = 6_371_008.8
+
+# Noms de colonnes acceptés dans les extraits (format BAN « adresses-XX.csv »)
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "id": ("id", "cle_interop"),
+    "house_number": ("numero",),
+    "suffix": ("rep", "suffixe"),
+    "street": ("nom_voie", "voie_nom"),
+    "postal_code": ("code_postal",),
+    "city": ("nom_commune", "commune_nom"),
+    "longitude": ("lon", "long"),
+    "latitude": ("lat",),
+}
+
+# Précision du géocodage, de la plus fine à la plus grossière
+PRECISION_HOUSENUMBER = "housenumber"
+PRECISION_STREET = "street"
+PRECISION_MUNICIPALITY = "municipality"
+
+# Fichiers de l'index compilé: nom -> type des valeurs
+INDEX_ARRAYS: Dict[str, str] = {
+    "address_key": "uint64",      # Empreintes des adresses triées (code postal, voie, numéro)
+    "address_lon": "float64",
+    "address_lat": "float64",
+    "address_id": "S32",          # Identifiant BAN de l'adresse (recherche inverse)
+    "street_key": "uint64",       # Empreintes des voies triées (code postal, voie)
+    "street_lon": "float64",      # Centre des adresses de la voie
+    "street_lat": "float64",
+    "locality_key": "uint64",     # Empreintes des communes triées (code postal, commune)
+    "locality_lon": "float64",    # Centre des adresses de la commune
+    "locality_lat": "float64",
+}
+
+# Numéro de voie: chiffres et suffixe éventuel ("12", "12B", "12 BIS", "199-201" -> 199)
+HOUSE_NUMBER_PATTERN = re.compile(r'^\s*0*(\d+)\s*(BIS|TER|QUATER|[A-Z])?\b')
+
+
+def find_ban_extracts(reference_dir: str = REFERENCE_DIR) -> List[str]:
+    """
+    Recherche les extraits BAN du répertoire des référentiels.
+
+    Args:
+        reference_dir: Répertoire des référentiels
+
+    Returns:
+        Chemins des extraits, triés (liste vide si aucun extrait n'est présent)
+    """
+    return sorted({
+        path for pattern in BAN_EXTRACT_PATTERNS
+        for path in glob.glob(os.path.join(reference_dir, pattern))
+    })
+
+
+def street_key(street: str) -> str:
+    """
+    Clé de comparaison d'un nom de voie.
+
+    Majuscules sans accents, ponctuation remplacée par des espaces, type de
+    voie ramené à sa forme canonique et abréviations ST/STE développées
+    ("Bd St-Michel" -> "BOULEVARD SAINT MICHEL").
+
+    Args:
+        street: Nom de voie (sans numéro)
+
+    Returns:
+        La clé normalisée
+    """
+    tokens = re.sub(r'[^A-Z0-9]+', ' ', unidecode.unidecode(street).upper()).split()
+    if tokens:
+        tokens[0] = STREET_TYPE_VARIANTS.get(tokens[0], tokens[0])
+    return ' '.join(KEY_ABBREVIATIONS.get(token, token) for token in tokens)
+
+
+def house_number_key(house_number: str, suffix: str = "") -> str:
+    """
+    Clé de comparaison d'un numéro de voie.
+
+    Args:
+        house_number: Numéro, éventuellement suivi de son suffixe ("12 BIS")
+        suffix: Suffixe séparé (colonne rep de la BAN)
+
+    Returns:
+        Numéro sans zéros initiaux suivi de son suffixe en majuscules, chaîne vide si aucun numéro
+    """
+    match = HOUSE_NUMBER_PATTERN.match(unidecode.unidecode(f"{house_number} {suffix}").upper())
+    if not match:
+        return ""
+    return f"{match.group(1)}{match.group(2) or ''}"
+
+
+def _hash_keys(keys: List[str]) -> np.ndarray:
+    # Empreintes 64 bits stables d'une exécution à l'autre (clé de hachage fixe de pandas)
+    return pd.util.hash_array(np.array(keys, dtype=object))
+
+
+def _normalized_values(series: pd.Series, normalize: Callable[[str], str]) -> List[str]:
+    # Valeurs normalisées une fois par chaîne distincte (chaîne vide pour les valeurs non textuelles)
+    values = [value if isinstance(value, str) else "" for value in series.to_numpy(dtype=object)]
+    normalized = {value: normalize(value) for value in set(values)}
+    return [normalized[value] for value in values]
+
+
+def _key_hashes(postal_codes: List[str], cities: List[str], streets: List[str], numbers: List[str]) -> Dict[str, np.ndarray]:
+    # Empreintes des trois niveaux de clés pour des composants déjà normalisés
+    locality = [f"{postal_code}|{city}" for postal_code, city in zip(postal_codes, cities)]
+    street = [f"{postal_code}|{name}" for postal_code, name in zip(postal_codes, streets)]
+    address = [f"{key}|{number}" for key, number in zip(street, numbers)]
+    return {"address": _hash_keys(address), "street": _hash_keys(street), "locality": _hash_keys(locality)}
+
+
+def _source_signature(extract_paths: List[str]) -> Dict[str, Any]:
+    return {
+        "version": INDEX_VERSION,
+        "sources": [
+            [os.path.basename(path), os.stat(path).st_size, os.stat(path).st_mtime]
+            for path in extract_paths
+        ]
+    }
+
+
+def _detect_separator(extract_path: str) -> str:
+    opener = gzip.open if extract_path.endswith(".gz") else open
+    with opener(extract_path, 'rt', encoding='utf-8') as file:
+        header = file.readline()
+    return ';' if header.count(';') > header.count(',') else ','
+
+
+def _resolve_columns(extract_path: str, separator: str) -> Dict[str, str]:
+    header = pd.read_csv(extract_path, sep=separator, nrows=0, compression='infer').columns
+    columns = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in header:
+                columns[key] = alias
+                break
+    missing = [key for key in ("house_number", "street", "postal_code", "city", "longitude", "latitude") if key not in columns]
+    if missing:
+        raise ValueError(f"L'extrait BAN ne contient pas les colonnes {', '.join(missing)}: {extract_path}")
+    return columns
+
+
+def _grouped_centers(keys: np.ndarray, lons: np.ndarray, lats: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Clés distinctes triées et centre (moyenne des coordonnées) de chaque groupe
+    unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    lon = np.bincount(inverse, weights=lons, minlength=len(unique_keys)) / counts
+    lat = np.bincount(inverse, weights=lats, minlength=len(unique_keys)) / counts
+    return unique_keys, lon, lat
+
+
+def compile_geocoding_index(extract_paths: List[str], index_dir: str) -> Dict[str, Any]:
+    """
+    Compile les extraits BAN en index trié.
+
+    Les extraits sont lus par blocs ; seules les adresses dotées de
+    coordonnées sont retenues (première en cas de doublon de clé). Chaque
+    voie et chaque commune reçoit le centre de ses adresses.
+
+    Args:
+        extract_paths: Chemins des extraits (CSV, .csv.gz)
+        index_dir: Répertoire de l'index compilé
+
+    Returns:
+        Métadonnées de l'index (sources, nombres d'adresses, de voies et de communes)
+    """
+    parts: Dict[str, List[np.ndarray]] = {
+        name: [] for name in ("address_key", "street_key", "locality_key", "lon", "lat", "id")
+    }
+    for extract_path in extract_paths:
+        separator = _detect_separator(extract_path)
+        columns = _resolve_columns(extract_path, separator)
+        reader = pd.read_csv(
+            extract_path,
+            sep=separator,
+            usecols=list(columns.values()),
+            dtype=str,
+            keep_default_na=False,
+            chunksize=COMPILE_CHUNK_SIZE,
+            compression='infer'
+        )
+        for chunk in reader:
+            chunk = chunk.rename(columns={alias: key for key, alias in columns.items()})
+            lons = pd.to_numeric(chunk["longitude"], errors='coerce').to_numpy(dtype=float)
+            lats = pd.to_numeric(chunk["latitude"], errors='coerce').to_numpy(dtype=float)
+            valid = ~(np.isnan(lons) | np.isnan(lats))
+            chunk = chunk[valid]
+
+            numbers = chunk["house_number"] + " " + chunk["suffix"] if "suffix" in chunk else chunk["house_number"]
+            hashes = _key_hashes(
+                chunk["postal_code"].str.strip().str.zfill(5).tolist(),
+                _normalized_values(chunk["city"], city_key),
+                _normalized_values(chunk["street"], street_key),
+                _normalized_values(numbers, house_number_key)
+            )
+            parts["address_key"].append(hashes["address"])
+            parts["street_key"].append(hashes["street"])
+            parts["locality_key"].append(hashes["locality"])
+            parts["lon"].append(lons[valid])
+            parts["lat"].append(lats[valid])
+            ids = chunk["id"] if "id" in chunk else pd.Series("", index=chunk.index)
+            parts["id"].append(ids.str.encode('ascii', errors='ignore').to_numpy(dtype='S32'))
+
+    data = {
+        name: np.concatenate(values) if values else np.empty(0, dtype=dtype)
+        for (name, values), dtype in zip(parts.items(), ("uint64", "uint64", "uint64", "float64", "float64", "S32"))
+    }
+
+    # Adresses triées par empreinte (première adresse conservée en cas de doublon)
+    order = np.argsort(data["address_key"], kind="stable")
+    address_keys, first = np.unique(data["address_key"][order], return_index=True)
+    addresses = order[first]
+
+    street_keys, street_lon, street_lat = _grouped_centers(data["street_key"], data["lon"], data["lat"])
+    locality_keys, locality_lon, locality_lat = _grouped_centers(data["locality_key"], data["lon"], data["lat"])
+
+    arrays = {
+        "address_key": address_keys,
+        "address_lon": data["lon"][addresses],
+        "address_lat": data["lat"][addresses],
+        "address_id": data["id"][addresses],
+        "street_key": street_keys,
+        "street_lon": street_lon,
+        "street_lat": street_lat,
+        "locality_key": locality_keys,
+        "locality_lon": locality_lon,
+        "locality_lat": locality_lat,
+    }
+
+    os.makedirs(index_dir, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(index_dir, f"{name}.npy"), values.astype(INDEX_ARRAYS[name]))
+
+    meta = {
+        **_source_signature(extract_paths),
+        "addresses": int(len(address_keys)),
+        "streets": int(len(street_keys)),
+        "localities": int(len(locality_keys))
+    }
+    # Métadonnées écrites en dernier: un index incomplet n'est jamais considéré à jour
+    with open(os.path.join(index_dir, "meta.json"), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, ensure_ascii=False, indent=2)
+    return meta
+
+
+def load_geocoding_index(index_dir: str) -> Dict[str, Any]:
+    """
+    Charge un index compilé par projection mémoire (aucune lecture complète).
+
+    Args:
+        index_dir: Répertoire de l'index compilé
+
+    Returns:
+        Dictionnaire de l'index: tableaux triés et métadonnées
+    """
+    with open(os.path.join(index_dir, "meta.json"), 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+    index = {name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode='r') for name in INDEX_ARRAYS}
+    index["meta"] = meta
+    # Arbre des adresses, construit à la première recherche inverse
+    index["tree"] = None
+    return index
+
+
+def open_geocoding_index(reference_dir: str = REFERENCE_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Ouvre l'index des extraits BAN du répertoire des référentiels.
+
+    L'index n'est (re)compilé que si les extraits ont changé depuis la
+    dernière compilation (noms, tailles ou dates de modification).
+
+    Args:
+        reference_dir: Répertoire des référentiels
+
+    Returns:
+        L'index chargé, None si aucun extrait n'est présent
+    """
+    extract_paths = find_ban_extracts(reference_dir)
+    if not extract_paths:
+        return None
+
+    index_dir = os.path.join(reference_dir, INDEX_DIRNAME)
+    meta_path = os.path.join(index_dir, "meta.json")
+    up_to_date = False
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        signature = _source_signature(extract_paths)
+        up_to_date = all(meta.get(key) == value for key, value in signature.items())
+
+    if not up_to_date:
+        compile_geocoding_index(extract_paths, index_dir)
+    return load_geocoding_index(index_dir)
+
+
+def _search(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    # Positions des clés dans le tableau trié, -1 si absentes
+    if not len(sorted_keys):
+        return np.full(len(keys), -1, dtype=np.intp)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    found = np.asarray(sorted_keys[positions]) == keys
+    return np.where(found, positions, -1)
+
+
+def lookup_addresses(
+    index: Dict[str, Any],
+    house_numbers: pd.Series,
+    streets: pd.Series,
+    postal_codes: pd.Series,
+    cities: pd.Series
+) -> Dict[str, np.ndarray]:
+    """
+    Géocode un lot d'adresses décomposées.
+
+    Chaque adresse est recherchée au numéro, à défaut à la voie (centre de
+    ses adresses), à défaut à la commune. Les clés ne sont normalisées
+    qu'une fois par valeur distincte.
+
+    Args:
+        index: Index chargé par open_geocoding_index
+        house_numbers: Numéros de voie
+        streets: Noms de voie (sans numéro)
+        postal_codes: Codes postaux
+        cities: Villes
+
+    Returns:
+        Dictionnaire de tableaux alignés sur les adresses:
+        - "longitude", "latitude": coordonnées (NaN si l'adresse n'est pas trouvée)
+        - "precision": PRECISION_HOUSENUMBER, PRECISION_STREET, PRECISION_MUNICIPALITY ou None
+    """
+    n = len(streets)
+    normalized_numbers = _normalized_values(house_numbers, house_number_key)
+    normalized_streets = _normalized_values(streets, street_key)
+    normalized_cities = _normalized_values(cities, city_key)
+    normalized_postal_codes = _normalized_values(postal_codes, str.strip)
+
+    hashes = _key_hashes(normalized_postal_codes, normalized_cities, normalized_streets, normalized_numbers)
+    has_postal_code = np.array([bool(value) for value in normalized_postal_codes], dtype=bool)
+    has_number = np.array([bool(value) for value in normalized_numbers], dtype=bool) & has_postal_code
+    has_street = np.array([bool(value) for value in normalized_streets], dtype=bool) & has_postal_code
+    has_city = np.array([bool(value) for value in normalized_cities], dtype=bool) & has_postal_code
+
+    longitude = np.full(n, np.nan)
+    latitude = np.full(n, np.nan)
+    precision = np.full(n, None, dtype=object)
+    unresolved = np.ones(n, dtype=bool)
+    for level, eligible, label in (
+        ("address", has_number & has_street, PRECISION_HOUSENUMBER),
+        ("street", has_street, PRECISION_STREET),
+        ("locality", has_city, PRECISION_MUNICIPALITY),
+    ):
+        candidates = np.flatnonzero(unresolved & eligible)
+        if not len(candidates):
+            continue
+        positions = _search(index[f"{level}_key"], hashes[level][candidates])
+        found = positions >= 0
+        rows = candidates[found]
+        longitude[rows] = np.asarray(index[f"{level}_lon"][positions[found]])
+        latitude[rows] = np.asarray(index[f"{level}_lat"][positions[found]])
+        precision[rows] = label
+        unresolved[rows] = False
+
+    return {"longitude": longitude, "latitude": latitude, "precision": precision}
+
+
+def _unit_vectors(longitudes: np.ndarray, latitudes: np.ndarray) -> np.ndarray:
+    # Coordonnées cartésiennes sur la sphère unité (distances euclidiennes = cordes)
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def _chord(distance: float) -> float:
+    # Corde de la sphère unité correspondant à une distance au sol (mètres)
+    return 2 * np.sin(min(distance / EARTH_RADIUS, np.pi) / 2)
+
+
+def _ground_distance(chords: np.ndarray) -> np.ndarray:
+    # Distance au sol (mètres) correspondant à des cordes de la sphère unité
+    return 2 * EARTH_RADIUS * np.arcsin(np.minimum(chords, 2) / 2)
+
+
+def reverse_geocode(
+    index: Dict[str, Any],
+    longitudes: np.ndarray,
+    latitudes: np.ndarray,
+    max_distance: float = 100.0
+) -> Dict[str, np.ndarray]:
+    """
+    Recherche l'adresse BAN la plus proche de chaque point.
+
+    L'arbre des adresses de l'index est construit à la première recherche
+    puis conservé dans l'index.
+
+    Args:
+        index: Index chargé par open_geocoding_index
+        longitudes: Longitudes des points
+        latitudes: Latitudes des points
+        max_distance: Distance maximale (mètres)
+
+    Returns:
+        Dictionnaire de tableaux alignés sur les points:
+        - "id": identifiant BAN de l'adresse la plus proche (None au-delà de max_distance)
+        - "distance": distance à cette adresse en mètres (NaN au-delà de max_distance)
+    """
+    n = len(longitudes)
+    ids = np.full(n, None, dtype=object)
+    distances = np.full(n, np.nan)
+    if not len(index["address_key"]) or not n:
+        return {"id": ids, "distance": distances}
+
+    if index["tree"] is None:
+        index["tree"] = cKDTree(_unit_vectors(index["address_lon"], index["address_lat"]))
+    points = _unit_vectors(longitudes, latitudes)
+    valid = np.isfinite(points).all(axis=1)
+    chords, positions = index["tree"].query(points[valid], distance_upper_bound=_chord(max_distance))
+    found = np.isfinite(chords)
+    rows = np.flatnonzero(valid)[found]
+    ids[rows] = [value.decode('ascii') or None for value in np.asarray(index["address_id"][positions[found]])]
+    distances[rows] = _ground_distance(chords[found])
+    return {"id": ids, "distance": distances}
+
+
+def proximity_groups(longitudes: np.ndarray, latitudes: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Regroupe les points situés à moins d'une distance les uns des autres.
+
+    Les paires proches sont obtenues par un arbre cKDTree (query_pairs),
+    puis regroupées en composantes connexes (cluster_pairs).
+
+    Args:
+        longitudes: Longitudes des points (NaN pour les points absents)
+        latitudes: Latitudes des points
+        radius: Distance maximale entre deux points voisins (mètres)
+
+    Returns:
+        Numéro de groupe de chaque point (-1 pour les points isolés ou absents)
+    """
+    n = len(longitudes)
+    groups = np.full(n, -1, dtype=np.int64)
+    points = _unit_vectors(longitudes, latitudes)
+    valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+    if len(valid) < 2:
+        return groups
+
+    pairs = cKDTree(points[valid]).query_pairs(_chord(radius), output_type='ndarray')
+    groups[valid] = cluster_pairs(len(valid), pairs)
+    return groups
@@ -0,0 +1,375 @@
+"""
+Module de lecture et d'écriture incrémentales des fichiers JSON.
+Parcourt un tableau JSON enregistrement par enregistrement, sans charger
+le document complet en mémoire, construit les DataFrames par lots validés
+et écrit les fichiers de sortie lot par lot.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Taille par défaut des lots d'enregistrements transmis à la validation
+DEFAULT_BATCH_SIZE = 5000
+
+# Nombre de caractères lus à chaque accès au fichier
+READ_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_records(file_path: str, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """
+    Itère sur les éléments d'un tableau JSON sans charger tout le fichier.
+
+    Seul l'enregistrement en cours de décodage est conservé en mémoire
+    (à la taille d'un bloc de lecture près).
+
+    Args:
+        file_path: Chemin vers le fichier JSON (tableau à la racine)
+        read_size: Nombre de caractères lus à chaque accès au fichier
+
+    Yields:
+        Les éléments du tableau, dans l'ordre du fichier
+
+    Raises:
+        ValueError: Si le document n'est pas un tableau JSON valide
+    """
+    decoder = json.JSONDecoder()
+
+    with open(file_path, 'r', encoding='utf-8') as file:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            # Ajoute un bloc au tampon en abandonnant la partie déjà consommée
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            chunk = file.read(read_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def next_char() -> str:
+            # Renvoie le prochain caractère significatif sans le consommer
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ""
+
+        if next_char() != "[":
+            raise ValueError("Le document JSON doit être un tableau d'objets")
+        pos += 1
+
+        expect_separator = False
+        while True:
+            char = next_char()
+            if char == "]":
+                return
+            if char == "":
+                raise ValueError("Fin de fichier inattendue: tableau JSON non terminé")
+
+            if expect_separator:
+                if char != ",":
+                    raise ValueError(f"Séparateur ',' attendu, trouvé '{char}'")
+                pos += 1
+                next_char()
+
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Enregistrement incomplet: lire la suite du fichier
+                    if fill():
+                        continue
+                    raise
+                # Un nombre en fin de tampon peut être tronqué
+                if end == len(buffer) and fill():
+                    continue
+                break
+
+            pos = end
+            expect_separator = True
+            yield value
+
+
+def iter_json_batches(
+    file_path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[Any]]:
+    """
+    Regroupe les éléments d'un tableau JSON en lots de taille fixe.
+
+    Args:
+        file_path: Chemin vers le fichier JSON (tableau à la racine)
+        batch_size: Nombre maximal d'enregistrements par lot
+
+    Yields:
+        Listes d'au plus batch_size enregistrements
+    """
+    batch = []
+    for record in iter_json_records(file_path):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+ValidateFn = Callable[[List[Dict[str, Any]]], Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+
+
+def _iter_validated_batches(
+    file_path: str,
+    validate_fn: ValidateFn,
+    batch_size: int,
+    structure_errors: Optional[List[Dict[str, Any]]] = None
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Lit un fichier JSON par lots et valide chaque lot.
+
+    Les index des erreurs de structure sont recalés sur leur position dans
+    le fichier ; seule la première erreur de schéma global est conservée,
+    comme lors d'une validation du tableau complet.
+
+    Args:
+        file_path: Chemin vers le fichier JSON d'entrée
+        validate_fn: Fonction validate_input_structure de la table
+        batch_size: Nombre maximal d'enregistrements par lot
+        structure_errors: Liste complétée avec les erreurs de structure (None pour les ignorer)
+
+    Yields:
+        Tuples (position du premier enregistrement du lot, lot validé)
+    """
+    schema_error_found = False
+    count = 0
+
+    for batch in iter_json_batches(file_path, batch_size):
+        validated_batch, batch_errors = validate_fn(batch)
+
+        if structure_errors is not None:
+            for error in batch_errors:
+                if error.get("error_type") == "schema_validation":
+                    if schema_error_found:
+                        continue
+                    schema_error_found = True
+                    path = error.get("path")
+                    if path and isinstance(path[0], int):
+                        error["path"] = [path[0] + count] + path[1:]
+                elif isinstance(error.get("index"), int):
+                    error["index"] += count
+                structure_errors.append(error)
+
+        yield count, validated_batch
+        count += len(batch)
+
+
+def _append_records(
+    columns: Dict[str, List[Any]],
+    records: List[Dict[str, Any]],
+    start: int
+) -> None:
+    """
+    Verse des enregistrements colonne par colonne dans un dictionnaire de listes.
+
+    Args:
+        columns: Colonnes en cours de construction (modifiées sur place)
+        records: Enregistrements à ajouter
+        start: Numéro de ligne du premier enregistrement
+    """
+    for offset, item in enumerate(records):
+        row = start + offset
+        for field, value in item.items():
+            column = columns.setdefault(field, [])
+            # Champ absent des enregistrements précédents: NaN, comme pd.DataFrame(records)
+            if len(column) < row:
+                column.extend([np.nan] * (row - len(column)))
+            column.append(value)
+
+
+def _pad_columns(columns: Dict[str, List[Any]], count: int) -> None:
+    """Complète avec NaN les colonnes plus courtes que count."""
+    for column in columns.values():
+        if len(column) < count:
+            column.extend([np.nan] * (count - len(column)))
+
+
+def read_validated_frame(
+    file_path: str,
+    validate_fn: ValidateFn,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Lit un fichier JSON par lots, valide chaque lot et construit le DataFrame.
+
+    Chaque lot validé est versé colonne par colonne dans des listes, de sorte
+    que ni le document brut ni la liste complète des dictionnaires ne sont
+    conservés. Les index des erreurs de structure sont recalés sur leur
+    position dans le fichier ; seule la première erreur de schéma global est
+    conservée, comme lors d'une validation du tableau complet.
+
+    Args:
+        file_path: Chemin vers le fichier JSON d'entrée
+        validate_fn: Fonction validate_input_structure de la table
+        batch_size: Nombre maximal d'enregistrements par lot
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame des données validées
+        - La liste des erreurs de structure détectées
+    """
+    columns: Dict[str, List[Any]] = {}
+    structure_errors = []
+    count = 0
+
+    for start, validated_batch in _iter_validated_batches(file_path, validate_fn, batch_size, structure_errors):
+        _append_records(columns, validated_batch, start)
+        count = start + len(validated_batch)
+
+    _pad_columns(columns, count)
+
+    return pd.DataFrame(columns), structure_errors
+
+
+def _infer_column_dtypes(
+    value_kinds: Dict[str, Dict[str, int]],
+    count: int
+) -> Dict[str, Optional[str]]:
+    """
+    Déduit le type que pandas donnerait à chaque colonne de la table complète.
+
+    Reproduit l'inférence de pd.DataFrame sur des listes Python : une colonne
+    numérique contenant des flottants ou des valeurs manquantes devient float64,
+    une colonne mixte reste object. None signifie que le type naturel de
+    chaque lot coïncide déjà avec celui de la table (entiers ou booléens complets).
+
+    Args:
+        value_kinds: Nombre de valeurs par nature ("none", "int", "float", "bool", "other") et par colonne
+        count: Nombre total d'enregistrements
+
+    Returns:
+        Dictionnaire colonne -> type à imposer ("float64", "object" ou None)
+    """
+    dtypes = {}
+    for field, kinds in value_kinds.items():
+        # Champ absent d'un enregistrement: NaN, donc un flottant pour pandas
+        floats = kinds["float"] + count - sum(kinds.values())
+        numbers = kinds["int"] + floats
+        if numbers and not kinds["bool"] and not kinds["other"]:
+            dtypes[field] = "float64" if floats or kinds["none"] else None
+        elif kinds["bool"] and not (kinds["none"] or numbers or kinds["other"]):
+            dtypes[field] = None
+        else:
+            dtypes[field] = "object"
+    return dtypes
+
+
+def _value_kind(value: Any) -> str:
+    """Classe une valeur pour l'inférence du type de sa colonne."""
+    if value is None:
+        return "none"
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    return "other"
+
+
+def read_validated_chunks(
+    file_path: str,
+    validate_fn: ValidateFn,
+    chunk_size: int
+) -> Tuple[Iterator[pd.DataFrame], List[Dict[str, Any]], int]:
+    """
+    Prépare la lecture d'un fichier JSON sous forme de DataFrames successifs.
+
+    Un premier parcours valide le fichier sans conserver les données pour
+    relever les erreurs de structure, le nombre d'enregistrements, l'ordre
+    et le type des colonnes. Les lots sont ensuite relus à la demande :
+    chaque DataFrame (index 0..n-1) porte toutes les colonnes du fichier,
+    dans le même ordre et avec le même type que read_validated_frame, même
+    lorsqu'une colonne est entièrement vide dans un lot.
+
+    Args:
+        file_path: Chemin vers le fichier JSON d'entrée
+        validate_fn: Fonction validate_input_structure de la table
+        chunk_size: Nombre maximal d'enregistrements par DataFrame
+
+    Returns:
+        Tuple contenant:
+        - L'itérateur des DataFrames, dans l'ordre du fichier
+        - La liste des erreurs de structure détectées
+        - Le nombre total d'enregistrements
+    """
+    value_kinds: Dict[str, Dict[str, int]] = {}
+    structure_errors = []
+    count = 0
+
+    # Premier parcours par lots de taille standard: mêmes erreurs de structure
+    # que read_validated_frame, quelle que soit la taille des lots de traitement
+    for start, validated_batch in _iter_validated_batches(
+        file_path, validate_fn, DEFAULT_BATCH_SIZE, structure_errors
+    ):
+        for item in validated_batch:
+            for field, value in item.items():
+                kinds = value_kinds.setdefault(field, dict.fromkeys(("none", "int", "float", "bool", "other"), 0))
+                kinds[_value_kind(value)] += 1
+        count = start + len(validated_batch)
+
+    dtypes = _infer_column_dtypes(value_kinds, count)
+
+    def chunks() -> Iterator[pd.DataFrame]:
+        for _, validated_batch in _iter_validated_batches(file_path, validate_fn, chunk_size):
+            columns: Dict[str, List[Any]] = {field: [] for field in dtypes}
+            _append_records(columns, validated_batch, 0)
+            _pad_columns(columns, len(validated_batch))
+            yield pd.DataFrame({
+                field: pd.Series(values, dtype=dtypes[field]) if dtypes[field] else values
+                for field, values in columns.items()
+            })
+
+    return chunks(), structure_errors, count
+
+
+def write_json_array(file_path: str, record_batches: Iterable[List[Dict[str, Any]]]) -> int:
+    """
+    Écrit un tableau JSON lot par lot, au fur et à mesure de leur production.
+
+    Le fichier obtenu est identique à json.dump(records, ensure_ascii=False, indent=2)
+    sur la liste complète des enregistrements.
+
+    Args:
+        file_path: Chemin du fichier JSON de sortie
+        record_batches: Lots successifs d'enregistrements
+
+    Returns:
+        Nombre d'enregistrements écrits
+    """
+    count = 0
+
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write("[")
+        for records in record_batches:
+            for record in records:
+                text = json.dumps(record, ensure_ascii=False, indent=2)
+                file.write(",\n  " if count else "\n  ")
+                file.write(text.replace("\n", "\n  "))
+                count += 1
+        file.write("\n]" if count else "]")
+
+    return count
@@ -0,0 +1,240 @@
+"""
+Module de mémoïsation persistante des fonctions pures de nettoyage.
+Les résultats des fonctions appliquées valeur par valeur (analyse d'adresse,
+nettoyage de ville, d'identifiant...) sont conservés d'un traitement à
+l'autre dans une base SQLite (data/cache/memo.sqlite) : d'un jour sur
+l'autre, la quasi-totalité des valeurs est identique et n'est plus
+recalculée.
+
+Chaque fonction dispose de son espace de noms (module.fonction), invalidé
+automatiquement lorsque le source du module qui la définit change : une
+modification de la fonction, de ses motifs ou de ses fonctions auxiliaires
+vide son cache. Les lectures et écritures sont groupées par lot.
+
+Usage dans une étape:
+    session = open_memo_session(memo_store, parse_address, adresses_distinctes)
+    composants = memo_call(session, adresse)   # lecture du cache ou calcul
+    close_memo_session(session)                # écriture groupée des nouveaux résultats
+
+Les résultats renvoyés sont partagés entre les lignes de même valeur et ne
+doivent pas être modifiés.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+CACHE_DIR = "data/cache"
+MEMO_FILENAME = "memo.sqlite"
+
+# Nombre de clés par requête groupée (limite des paramètres SQLite)
+BATCH_SIZE = 500
+
+
+def open_memo_store(cache_dir: str = CACHE_DIR) -> Dict[str, Any]:
+    """
+    Ouvre (ou crée) la base de mémoïsation.
+
+    Args:
+        cache_dir: Répertoire du cache
+
+    Returns:
+        Le cache ouvert (connexion et espaces de noms déjà vérifiés)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, MEMO_FILENAME)
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS memo_namespaces (namespace TEXT PRIMARY KEY, source_hash TEXT NOT NULL)"
+    )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS memo_entries ("
+        "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+        "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+    )
+    connection.commit()
+    return {"path": path, "connection": connection, "namespaces": {}}
+
+
+def close_memo_store(store: Optional[Dict[str, Any]]) -> None:
+    """
+    Ferme la base de mémoïsation.
+
+    Args:
+        store: Cache ouvert par open_memo_store (None accepté)
+    """
+    if store is not None:
+        store["connection"].close()
+
+
+def _source_hash(func: Callable) -> str:
+    # Source du module de définition (fonction, motifs et fonctions auxiliaires)
+    module = inspect.getmodule(func)
+    try:
+        source = inspect.getsource(module if module is not None else func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def memo_namespace(store: Dict[str, Any], func: Callable) -> str:
+    """
+    Renvoie l'espace de noms d'une fonction, vidé si son source a changé.
+
+    Args:
+        store: Cache ouvert par open_memo_store
+        func: Fonction mémoïsée
+
+    Returns:
+        Nom de l'espace (module.fonction)
+    """
+    namespace = f"{func.__module__}.{func.__qualname__}"
+    if namespace in store["namespaces"]:
+        return namespace
+
+    source_hash = _source_hash(func)
+    connection = store["connection"]
+    row = connection.execute(
+        "SELECT source_hash FROM memo_namespaces WHERE namespace = ?", (namespace,)
+    ).fetchone()
+    if row is None or row[0] != source_hash:
+        connection.execute("DELETE FROM memo_entries WHERE namespace = ?", (namespace,))
+        connection.execute(
+            "INSERT OR REPLACE INTO memo_namespaces (namespace, source_hash) VALUES (?, ?)",
+            (namespace, source_hash)
+        )
+        connection.commit()
+    store["namespaces"][namespace] = source_hash
+    return namespace
+
+
+def memo_get_many(store: Dict[str, Any], namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Lit par lots les résultats mémoïsés de plusieurs clés.
+
+    Args:
+        store: Cache ouvert par open_memo_store
+        namespace: Espace de noms (memo_namespace)
+        keys: Clés recherchées
+
+    Returns:
+        Dictionnaire clé -> résultat, limité aux clés présentes
+    """
+    keys = list(keys)
+    found = {}
+    connection = store["connection"]
+    for start in range(0, len(keys), BATCH_SIZE):
+        batch = keys[start:start + BATCH_SIZE]
+        placeholders = ",".join("?" * len(batch))
+        rows = connection.execute(
+            f"SELECT key, value FROM memo_entries WHERE namespace = ? AND key IN ({placeholders})",
+            [namespace, *batch]
+        )
+        for key, value in rows:
+            found[key] = pickle.loads(value)
+    return found
+
+
+def memo_put_many(store: Dict[str, Any], namespace: str, items: Dict[str, Any]) -> None:
+    """
+    Enregistre par lots des résultats calculés.
+
+    Args:
+        store: Cache ouvert par open_memo_store
+        namespace: Espace de noms (memo_namespace)
+        items: Dictionnaire clé -> résultat
+    """
+    if not items:
+        return
+    connection = store["connection"]
+    connection.executemany(
+        "INSERT OR REPLACE INTO memo_entries (namespace, key, value) VALUES (?, ?, ?)",
+        ((namespace, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) for key, value in items.items())
+    )
+    connection.commit()
+
+
+def open_memo_session(
+    store: Optional[Dict[str, Any]],
+    func: Callable[[str], Any],
+    keys: Iterable[Any]
+) -> Dict[str, Any]:
+    """
+    Prépare les appels mémoïsés d'une fonction pour une étape.
+
+    Les résultats déjà connus des clés annoncées sont chargés en une lecture
+    groupée ; les autres sont calculés à la demande par memo_call. Sans
+    cache (store None), la session se limite à la mémoïsation en mémoire.
+
+    Args:
+        store: Cache ouvert par open_memo_store, ou None
+        func: Fonction pure d'une chaîne
+        keys: Valeurs qui seront probablement demandées (les non-chaînes sont ignorées)
+
+    Returns:
+        La session (à fermer par close_memo_session)
+    """
+    keys = {key for key in keys if isinstance(key, str)}
+    session = {"store": store, "func": func, "namespace": None, "values": {}, "computed": {}}
+    if store is not None:
+        session["namespace"] = memo_namespace(store, func)
+        session["values"] = memo_get_many(store, session["namespace"], keys)
+    return session
+
+
+def memo_call(session: Dict[str, Any], key: Any) -> Any:
+    """
+    Renvoie le résultat de la fonction de la session pour une valeur.
+
+    Args:
+        session: Session ouverte par open_memo_session
+        key: Valeur d'entrée (seules les chaînes sont mémoïsées)
+
+    Returns:
+        Le résultat mémoïsé ou calculé
+    """
+    if not isinstance(key, str):
+        return session["func"](key)
+    values = session["values"]
+    if key not in values:
+        values[key] = session["computed"][key] = session["func"](key)
+    return values[key]
+
+
+def close_memo_session(session: Dict[str, Any]) -> int:
+    """
+    Enregistre les résultats calculés pendant la session.
+
+    Args:
+        session: Session ouverte par open_memo_session
+
+    Returns:
+        Nombre de résultats calculés (absents du cache)
+    """
+    computed = session["computed"]
+    if session["store"] is not None:
+        memo_put_many(session["store"], session["namespace"], computed)
+    session["computed"] = {}
+    return len(computed)
+
+
+def memo_map(store: Optional[Dict[str, Any]], func: Callable[[str], Any], values: Iterable[Any]) -> List[Any]:
+    """
+    Applique une fonction pure à des valeurs en passant par le cache.
+
+    Args:
+        store: Cache ouvert par open_memo_store, ou None
+        func: Fonction pure d'une chaîne
+        values: Valeurs d'entrée
+
+    Returns:
+        Les résultats, dans l'ordre des valeurs
+    """
+    values = list(values)
+    session = open_memo_session(store, func, values)
+    results = [memo_call(session, value) for value in values]
+    close_memo_session(session)
+    return results
@@ -0,0 +1,183 @@
+"""
+Module de détection des quasi-doublons d'adresses.
+Les paires candidates ne sont pas obtenues en comparant toutes les lignes
+deux à deux : chaque adresse est rangée dans des blocs (code postal
+normalisé + mot significatif de l'adresse) et seules les adresses d'un même
+bloc sont comparées. Les blocs trop grands (mot trop courant) sont ignorés,
+ce qui borne le nombre de paires : le coût reste à peu près linéaire en
+nombre de lignes.
+
+Les paires candidates sont notées sur leurs ensembles de mots, puis
+regroupées en composantes connexes (groupes de doublons).
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import unidecode
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from src.utils.address_parser import STREET_TYPE_VARIANTS
+
+
+# Mots ignorés: articles, prépositions et désignations de zone trop courantes
+STOPWORDS = {
+    "A", "AU", "AUX", "D", "DE", "DES", "DU", "EN", "ET", "L", "LA", "LE", "LES", "SUR", "SOUS",
+    "ZA", "ZAC", "ZI", "ZONE", "BP", "CS", "CEDEX",
+}
+
+# Taille maximale d'un bloc (au-delà, le mot n'est pas discriminant et le bloc est ignoré)
+MAX_BLOCK_SIZE = 100
+
+# Similarité minimale (coefficient de recouvrement des mots) d'une paire de doublons
+DUPLICATE_THRESHOLD = 0.65
+
+# Nombre minimal de mots communs d'une paire de doublons
+MIN_SHARED_TOKENS = 2
+
+WORD_PATTERN = re.compile(r'[A-Z0-9]+')
+
+
+def address_tokens(*parts: Any) -> FrozenSet[str]:
+    """
+    Mots significatifs d'une adresse.
+
+    Majuscules sans accents ; les types de voie, articles, prépositions et
+    lettres isolées sont ignorés, les numéros sont conservés
+    ("199/201 rue Colbert" -> {"199", "201", "COLBERT"}).
+
+    Args:
+        parts: Champs de l'adresse (numéro, rue, complément...) ; les valeurs non textuelles sont ignorées
+
+    Returns:
+        L'ensemble des mots significatifs
+    """
+    text = " ".join(part for part in parts if isinstance(part, str))
+    words = WORD_PATTERN.findall(unidecode.unidecode(text).upper())
+    return frozenset(
+        word for word in words
+        if word not in STOPWORDS and word not in STREET_TYPE_VARIANTS and (len(word) > 1 or word.isdigit())
+    )
+
+
+def token_similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """
+    Similarité de deux adresses d'après leurs mots.
+
+    Coefficient de recouvrement (mots communs / taille du plus petit
+    ensemble), tolérant aux informations ajoutées d'un côté seulement ; deux
+    adresses aux numéros tous différents ne sont pas similaires.
+
+    Args:
+        left: Mots de la première adresse (address_tokens)
+        right: Mots de la seconde adresse
+
+    Returns:
+        La similarité, entre 0 et 1
+    """
+    shared = left & right
+    if len(shared) < MIN_SHARED_TOKENS:
+        return 0.0
+    left_numbers = {word for word in left if word.isdigit()}
+    right_numbers = {word for word in right if word.isdigit()}
+    if left_numbers and right_numbers and not left_numbers & right_numbers:
+        return 0.0
+    return len(shared) / min(len(left), len(right))
+
+
+def candidate_pairs(tokens: Sequence[FrozenSet[str]], prefixes: Sequence[str]) -> np.ndarray:
+    """
+    Paires candidates obtenues par blocage.
+
+    Chaque ligne est rangée dans un bloc par mot significatif, préfixé de sa
+    clé de blocage (code postal) ; les paires sont formées à l'intérieur des
+    blocs d'au plus MAX_BLOCK_SIZE lignes, puis dédoublonnées.
+
+    Args:
+        tokens: Mots significatifs de chaque ligne
+        prefixes: Clé de blocage de chaque ligne (ex: code postal normalisé, chaîne vide si inconnu)
+
+    Returns:
+        Tableau (k, 2) des positions des paires (gauche < droite), triées
+    """
+    blocks: Dict[Tuple[str, str], List[int]] = {}
+    for position, (words, prefix) in enumerate(zip(tokens, prefixes)):
+        for word in words:
+            blocks.setdefault((prefix, word), []).append(position)
+
+    lefts, rights = [], []
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        members = np.asarray(members)
+        left, right = np.triu_indices(len(members), k=1)
+        lefts.append(members[left])
+        rights.append(members[right])
+    if not lefts:
+        return np.empty((0, 2), dtype=np.int64)
+
+    codes = np.unique(np.concatenate(lefts).astype(np.int64) * len(tokens) + np.concatenate(rights))
+    return np.column_stack((codes // len(tokens), codes % len(tokens)))
+
+
+def cluster_pairs(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Regroupe des paires de positions en composantes connexes.
+
+    Args:
+        n: Nombre de lignes
+        pairs: Tableau (k, 2) des positions liées
+
+    Returns:
+        Numéro de groupe de chaque ligne (-1 pour les lignes isolées), les
+        groupes étant numérotés dans l'ordre de leur première ligne
+    """
+    groups = np.full(n, -1, dtype=np.int64)
+    if not len(pairs):
+        return groups
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+
+    # Seuls les groupes d'au moins deux lignes sont numérotés, dans l'ordre de leur première ligne
+    grouped = np.bincount(labels)[labels] > 1
+    _, numbering = np.unique(labels[grouped], return_inverse=True)
+    first_rows = np.full(numbering.max() + 1, n)
+    np.minimum.at(first_rows, numbering, np.flatnonzero(grouped))
+    rank = np.empty_like(first_rows)
+    rank[np.argsort(first_rows, kind="stable")] = np.arange(len(first_rows))
+    groups[grouped] = rank[numbering]
+    return groups
+
+
+def near_duplicate_groups(
+    tokens: Sequence[FrozenSet[str]],
+    prefixes: Sequence[str],
+    threshold: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Détecte les groupes de quasi-doublons.
+
+    Args:
+        tokens: Mots significatifs de chaque ligne (address_tokens)
+        prefixes: Clé de blocage de chaque ligne (code postal normalisé)
+        threshold: Similarité minimale d'une paire (DUPLICATE_THRESHOLD par défaut)
+
+    Returns:
+        Tuple contenant:
+        - Le numéro de groupe de chaque ligne (-1 si la ligne n'a pas de doublon)
+        - La meilleure similarité de chaque ligne avec une autre ligne de son groupe
+    """
+    threshold = DUPLICATE_THRESHOLD if threshold is None else threshold
+    pairs = candidate_pairs(tokens, prefixes)
+    scores = np.fromiter(
+        (token_similarity(tokens[left], tokens[right]) for left, right in pairs),
+        dtype=float, count=len(pairs)
+    )
+    duplicates = pairs[scores >= threshold]
+    best = np.zeros(len(tokens))
+    if len(duplicates):
+        np.maximum.at(best, duplicates[:, 0], scores[scores >= threshold])
+        np.maximum.at(best, duplicates[:, 1], scores[scores >= threshold])
+    return cluster_pairs(len(tokens), duplicates), best
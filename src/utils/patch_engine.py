@@ -0,0 +1,535 @@
+"""
+Module du moteur commun d'application des correctifs (patches).
+Les fichiers data/patches/<table>_*.json sont chargés en une table de
+correctifs indexée par clé (identifiant de la table, SIREN, SIRET...), puis
+appliqués par jointure sur la colonne clé, champ par champ, sans parcourir
+les lignes : le coût est celui d'une jointure, quel que soit le nombre de
+correctifs. Les modifications sont restituées sous forme de journal
+tabulaire (une ligne par cellule modifiée).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import step_copy
+
+
+# Politiques d'application d'un champ corrigé
+PATCH_ALWAYS = "always"                        # Valeur toujours remplacée
+PATCH_IF_DIFFERENT = "if_different"            # Remplacée si elle diffère de la valeur corrigée
+PATCH_IF_MISSING = "if_missing"                # Complétée si nulle ou vide
+PATCH_IF_MISSING_OR_KEY = "if_missing_or_key"  # Complétée si nulle, vide ou égale à la clé
+
+# Colonnes du journal des modifications
+LOG_COLUMNS = ["patch", "position", "field", "old", "new"]
+
+# Formes compilées des fichiers de correctifs (sous-répertoire du répertoire des correctifs)
+COMPILED_DIRNAME = "compiled"
+COMPILED_VERSION = 1
+
+# Correctifs déjà chargés dans le processus, par signature de fichier
+_loaded_patches: Dict[Tuple[Any, ...], List[Any]] = {}
+
+
+def table_patch_files(patches_dir: str, table: str, pattern: str = "*") -> List[str]:
+    """
+    Liste les fichiers de correctifs d'une table (<table>_<pattern>.json).
+
+    Args:
+        patches_dir: Répertoire des correctifs
+        table: Nom de la table
+        pattern: Motif du nom après le préfixe de la table
+
+    Returns:
+        Chemins des fichiers, par ordre alphabétique
+    """
+    return sorted(glob.glob(os.path.join(patches_dir, f"{table}_{pattern}.json")))
+
+
+def unused_patch_files(patches_dir: str, table: str, used: Iterable[str]) -> List[str]:
+    """
+    Liste les fichiers de correctifs d'une table qu'aucune étape n'applique.
+
+    Args:
+        patches_dir: Répertoire des correctifs
+        table: Nom de la table
+        used: Fichiers appliqués par les étapes de la table
+
+    Returns:
+        Chemins des fichiers non appliqués
+    """
+    used = {os.path.normpath(path) for path in used}
+    return [path for path in table_patch_files(patches_dir, table) if os.path.normpath(path) not in used]
+
+
+def patch_field(
+    column: str,
+    label: Optional[str] = None,
+    policy: str = PATCH_ALWAYS,
+    null_value: Any = None
+) -> Dict[str, Any]:
+    """
+    Décrit un champ corrigé par un jeu de correctifs indexé par clé.
+
+    Args:
+        column: Colonne corrigée (même nom dans les correctifs et dans la table)
+        label: Nom du champ dans le journal (nom de la colonne par défaut)
+        policy: Politique d'application (PATCH_ALWAYS, PATCH_IF_DIFFERENT...)
+        null_value: Valeur substituée à une valeur corrigée nulle ou vide (None: conservée)
+
+    Returns:
+        Dictionnaire décrivant le champ
+    """
+    return {"column": column, "label": label or column, "policy": policy, "null_value": null_value}
+
+
+def _patch_signature(path: str) -> Dict[str, Any]:
+    stat = os.stat(path)
+    return {
+        "version": COMPILED_VERSION,
+        "source": os.path.abspath(path),
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime_ns
+    }
+
+
+def _parse_patches(content: bytes) -> List[Any]:
+    patches = json.loads(content.decode('utf-8'))
+    if not isinstance(patches, list):
+        raise ValueError("Le fichier de correctifs doit contenir une liste d'objets")
+    return patches
+
+
+def _read_compiled(compiled_path: str) -> Optional[Dict[str, Any]]:
+    # Forme compilée illisible ou absente: recompilation
+    try:
+        with open(compiled_path, 'rb') as file:
+            compiled = pickle.load(file)
+    except Exception:
+        return None
+    return compiled if isinstance(compiled, dict) else None
+
+
+def _write_compiled(compiled_path: str, compiled: Dict[str, Any]) -> None:
+    # Écriture atomique ; un répertoire non inscriptible désactive simplement le cache
+    try:
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        temp_path = f"{compiled_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(compiled, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, compiled_path)
+    except OSError:
+        pass
+
+
+def read_patch_file(path: str) -> List[Any]:
+    """
+    Lit un fichier de correctifs (liste JSON) depuis sa forme compilée.
+
+    Le fichier est analysé et validé une seule fois, puis enregistré sous
+    forme binaire dans <répertoire des correctifs>/compiled/, avec sa
+    signature (chemin, taille, date de modification, empreinte SHA-256).
+    Les lectures suivantes chargent la forme compilée tant que la signature
+    est inchangée ; un fichier seulement touché (même contenu) n'est pas
+    réanalysé. Dans un même processus (traitement par lots), la forme
+    chargée est conservée en mémoire : les correctifs renvoyés sont partagés
+    et ne doivent pas être modifiés.
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Les correctifs du fichier
+
+    Raises:
+        ValueError: Si le fichier ne contient pas une liste
+    """
+    signature = _patch_signature(path)
+    memo_key = tuple(signature.values())
+    if memo_key in _loaded_patches:
+        return _loaded_patches[memo_key]
+
+    compiled_path = os.path.join(os.path.dirname(path), COMPILED_DIRNAME, os.path.basename(path) + ".pickle")
+    compiled = _read_compiled(compiled_path)
+    up_to_date = compiled is not None and all(compiled.get(key) == value for key, value in signature.items())
+
+    if not up_to_date:
+        with open(path, 'rb') as file:
+            content = file.read()
+        digest = hashlib.sha256(content).hexdigest()
+        same_content = (compiled is not None and compiled.get("version") == COMPILED_VERSION
+                        and compiled.get("sha256") == digest and "patches" in compiled)
+        compiled = {
+            **signature,
+            "sha256": digest,
+            "patches": compiled["patches"] if same_content else _parse_patches(content)
+        }
+        _write_compiled(compiled_path, compiled)
+
+    _loaded_patches[memo_key] = compiled["patches"]
+    return compiled["patches"]
+
+
+def _is_missing(values: np.ndarray) -> np.ndarray:
+    # Valeur nulle ou chaîne vide
+    return pd.isna(values) | (values == "")
+
+
+def _policy_mask(policy: str, current: np.ndarray, new: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    if policy == PATCH_ALWAYS:
+        return np.ones(len(current), dtype=bool)
+    if policy == PATCH_IF_DIFFERENT:
+        return np.asarray(current != new, dtype=bool)
+    if policy == PATCH_IF_MISSING:
+        return _is_missing(current)
+    if policy == PATCH_IF_MISSING_OR_KEY:
+        return _is_missing(current) | np.asarray(current == keys, dtype=bool)
+    raise ValueError(f"Politique de correctif inconnue: {policy}")
+
+
+def write_cells(df: pd.DataFrame, column: str, positions: np.ndarray, values: np.ndarray) -> None:
+    """
+    Écrit des valeurs dans une colonne aux positions données (équivalent de .at en série).
+
+    La colonne est remplacée par une nouvelle colonne ; une colonne absente
+    est créée (valeurs NaN ailleurs).
+
+    Args:
+        df: DataFrame de travail d'une étape
+        column: Colonne à écrire
+        positions: Positions des lignes
+        values: Valeurs à écrire, alignées sur positions
+    """
+    if column in df.columns:
+        data = df[column].to_numpy(dtype=object, copy=True)
+    else:
+        data = np.full(len(df), np.nan, dtype=object)
+    data[positions] = values
+    df[column] = pd.Series(data, index=df.index, name=column).infer_objects()
+
+
+def keyed_patch_frame(
+    records: List[Any],
+    key: str,
+    fields: List[Dict[str, Any]]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Construit la table des correctifs indexée par clé.
+
+    Chaque correctif est un objet plat {clé, champ: valeur...}. Les correctifs
+    sans clé sont ignorés ; pour une même clé, le dernier correctif l'emporte.
+
+    Args:
+        records: Correctifs lus dans les fichiers
+        key: Champ clé des correctifs (ex: "co_siren")
+        fields: Champs corrigés décrits par patch_field
+
+    Returns:
+        Tuple contenant:
+        - Les valeurs corrigées (index: clé, une colonne par champ)
+        - Le masque des champs présents dans chaque correctif (même forme)
+    """
+    kept = [record for record in records if isinstance(record, dict) and record.get(key)]
+    index = pd.Index([record[key] for record in kept], dtype=object, name=key)
+    values = pd.DataFrame({
+        field["column"]: pd.Series([record.get(field["column"]) for record in kept], index=index, dtype=object)
+        for field in fields
+    }, index=index)
+    present = pd.DataFrame({
+        field["column"]: np.array([field["column"] in record for record in kept], dtype=bool)
+        for field in fields
+    }, index=index)
+
+    last = ~index.duplicated(keep='last')
+    return values[last], present[last]
+
+
+def apply_keyed_patches(
+    df: pd.DataFrame,
+    values: pd.DataFrame,
+    present: pd.DataFrame,
+    key: str,
+    fields: List[Dict[str, Any]]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Applique une table de correctifs indexée par clé, par jointure sur la colonne clé.
+
+    Toutes les lignes dont la clé figure dans les correctifs sont corrigées,
+    champ par champ selon la politique de chaque champ (valeurs d'origine de
+    la ligne).
+
+    Args:
+        df: DataFrame à corriger
+        values: Valeurs corrigées (keyed_patch_frame)
+        present: Masque des champs présents (keyed_patch_frame)
+        key: Colonne clé de la table
+        fields: Champs corrigés décrits par patch_field
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame corrigé
+        - Le journal des modifications (LOG_COLUMNS), dans l'ordre des lignes puis des champs
+    """
+    result_df = step_copy(df)
+    n = len(result_df)
+    keys = result_df[key].to_numpy(dtype=object) if key in result_df.columns else np.full(n, None, dtype=object)
+
+    # Jointure: position du correctif de chaque ligne (-1 sans correctif)
+    patch_positions = values.index.get_indexer(keys) if len(values) else np.full(n, -1, dtype=np.intp)
+    patch_positions[pd.isna(keys)] = -1
+    rows = np.flatnonzero(patch_positions >= 0)
+    patches = patch_positions[rows]
+
+    logs = []
+    for field in fields:
+        column = field["column"]
+        has_value = present[column].to_numpy(dtype=bool)[patches]
+        field_rows, field_patches = rows[has_value], patches[has_value]
+
+        new = values[column].to_numpy(dtype=object)[field_patches]
+        if field["null_value"] is not None:
+            new[_is_missing(new)] = field["null_value"]
+        current = (result_df[column].to_numpy(dtype=object)[field_rows] if column in result_df.columns
+                   else np.full(len(field_rows), None, dtype=object))
+
+        applied = _policy_mask(field["policy"], current, new, keys[field_rows])
+        if applied.any():
+            write_cells(result_df, column, field_rows[applied], new[applied])
+        logs.append(pd.DataFrame({
+            "patch": field_patches[applied],
+            "position": field_rows[applied],
+            "field": field["label"],
+            "old": pd.Series(current[applied], dtype=object),
+            "new": pd.Series(new[applied], dtype=object)
+        }, columns=LOG_COLUMNS))
+
+    log = pd.concat(logs, ignore_index=True) if logs else pd.DataFrame(columns=LOG_COLUMNS)
+    return result_df, log.sort_values("position", kind="stable", ignore_index=True)
+
+
+def log_changes(log: pd.DataFrame) -> Iterator[Tuple[int, Dict[str, Dict[str, Any]]]]:
+    """
+    Regroupe le journal des modifications par ligne.
+
+    Args:
+        log: Journal renvoyé par apply_keyed_patches
+
+    Yields:
+        (position, {champ: {'old': ..., 'new': ...}}) pour chaque ligne modifiée
+    """
+    position, changes = None, {}
+    for row, field, old, new in zip(log["position"], log["field"], log["old"], log["new"]):
+        if row != position and changes:
+            yield position, changes
+            changes = {}
+        position = row
+        changes[field] = {'old': old, 'new': new}
+    if changes:
+        yield position, changes
+
+
+def apply_id_patches(
+    df: pd.DataFrame,
+    patches_file_paths: List[str],
+    id_column: str,
+    not_found_message: str,
+    multiple_message: str
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Applique des correctifs {<id_column>: ..., "patches": {champ: valeur}} par identifiant.
+
+    Les fichiers sont concaténés dans l'ordre en une table de correctifs
+    (un correctif de champ par ligne), jointe aux lignes de la table sur la
+    première occurrence de chaque identifiant. Les correctifs successifs
+    d'une même cellule s'appliquent dans l'ordre des fichiers.
+
+    Args:
+        df: DataFrame à corriger
+        patches_file_paths: Fichiers de correctifs
+        id_column: Colonne identifiant de la table
+        not_found_message: Message d'un identifiant absent ({id_column} et {id} remplacés)
+        multiple_message: Message d'un identifiant présent sur plusieurs lignes
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les correctifs appliqués
+        - La liste des informations sur les modifications
+    """
+    errors = []
+    result_df = step_copy(df)
+
+    # Chargement des fichiers de correctifs
+    records = []
+    for path in patches_file_paths:
+        if not os.path.exists(path):
+            errors.append({
+                "type": "patches_file_missing",
+                "severity": "warning",
+                "message": f"Le fichier de correctifs n'existe pas: {path}"
+            })
+            continue
+        try:
+            records.extend(read_patch_file(path))
+        except json.JSONDecodeError as e:
+            errors.append({
+                "type": "patches_file_parse_error",
+                "severity": "error",
+                "message": f"Erreur de parsing du fichier de correctifs: {str(e)}"
+            })
+        except ValueError as e:
+            errors.append({
+                "type": "invalid_patches_format",
+                "severity": "error",
+                "message": str(e)
+            })
+        except Exception as e:
+            errors.append({
+                "type": "patches_application_error",
+                "severity": "error",
+                "message": f"Erreur lors de l'application des correctifs: {str(e)}"
+            })
+
+    try:
+        entries = _id_patch_entries(result_df, records, id_column, not_found_message, multiple_message)
+    except Exception as e:
+        errors.append({
+            "type": "patches_application_error",
+            "severity": "error",
+            "message": f"Erreur lors de l'application des correctifs: {str(e)}"
+        })
+        return result_df, errors
+
+    errors.extend(entry for _, entry in sorted(entries, key=lambda item: item[0]))
+    return result_df, errors
+
+
+def _id_patch_entries(
+    result_df: pd.DataFrame,
+    records: List[Any],
+    id_column: str,
+    not_found_message: str,
+    multiple_message: str
+) -> List[Tuple[Tuple[int, int], Dict[str, Any]]]:
+    # Applique les correctifs par identifiant sur result_df ; renvoie les entrées
+    # du rapport avec leur rang (correctif, position dans le correctif)
+    entries = []
+    patch_ids, patch_seqs = [], []
+    field_rows = []
+    invalid_fields = {}
+    for seq, patch in enumerate(records):
+        # Vérification de la structure de chaque correctif
+        if not isinstance(patch, dict) or id_column not in patch or 'patches' not in patch:
+            entries.append(((seq, 0), {
+                "type": "invalid_patch_structure",
+                "severity": "error",
+                "patch": patch,
+                "message": f"Chaque correctif doit contenir un '{id_column}' et un objet 'patches'"
+            }))
+            continue
+        patch_ids.append(patch[id_column])
+        patch_seqs.append(seq)
+        if not isinstance(patch['patches'], dict):
+            # Signalé seulement si l'identifiant est trouvé
+            invalid_fields[seq] = {
+                "type": "patch_application_error",
+                "severity": "error",
+                id_column: patch[id_column],
+                "message": f"Erreur lors de l'application du correctif: "
+                           f"'{type(patch['patches']).__name__}' object has no attribute 'items'"
+            }
+            continue
+        for order, (field, value) in enumerate(patch['patches'].items()):
+            field_rows.append((seq, order, patch[id_column], field, value))
+
+    # Première ligne et nombre de lignes de chaque identifiant
+    ids = pd.Series(result_df[id_column].to_numpy(dtype=object)) if id_column in result_df.columns \
+        else pd.Series([], dtype=object)
+    first = ids.dropna().drop_duplicates(keep='first')
+    counts = ids.value_counts()
+    lookup = pd.Index(first.to_numpy(dtype=object))
+    patch_ids = np.array(patch_ids, dtype=object)
+    matched = lookup.get_indexer(patch_ids) if len(lookup) else np.full(len(patch_ids), -1, dtype=np.intp)
+    matched[pd.isna(patch_ids)] = -1
+    positions = np.full(len(patch_ids), -1, dtype=np.intp)
+    positions[matched >= 0] = first.index.to_numpy()[matched[matched >= 0]]
+    row_counts = counts.reindex(pd.Index(patch_ids, dtype=object)).fillna(0).to_numpy() \
+        if len(patch_ids) else np.empty(0)
+
+    target = {}
+    for seq, patch_id, position, count in zip(patch_seqs, patch_ids, positions, row_counts):
+        if position < 0:
+            entries.append(((seq, 0), {
+                "type": "patch_target_not_found",
+                "severity": "warning",
+                id_column: patch_id,
+                "message": not_found_message.format(id_column=id_column, id=patch_id)
+            }))
+            continue
+        if count > 1:
+            entries.append(((seq, 0), {
+                "type": "multiple_patch_targets",
+                "severity": "warning",
+                id_column: patch_id,
+                "message": multiple_message.format(id_column=id_column, id=patch_id)
+            }))
+        if seq in invalid_fields:
+            entries.append(((seq, 1), invalid_fields[seq]))
+            continue
+        target[seq] = position
+
+    # Table des correctifs de champ, jointe aux lignes ciblées
+    fields = pd.DataFrame(field_rows, columns=["seq", "order", "id", "field", "value"])
+    fields["value"] = pd.Series([row[4] for row in field_rows], dtype=object)
+    fields["position"] = fields["seq"].map(target)
+    fields = fields[fields["position"].notna()].astype({"position": np.int64})
+    known = fields["field"].isin(result_df.columns).to_numpy(dtype=bool)
+
+    for seq, order, patch_id, field in fields.loc[~known, ["seq", "order", "id", "field"]].itertuples(index=False):
+        entries.append(((seq, 2 + order), {
+            "type": "patch_field_not_found",
+            "severity": "warning",
+            id_column: patch_id,
+            "field": field,
+            "message": f"Le champ '{field}' n'existe pas dans le DataFrame"
+        }))
+
+    applied = fields[known].reset_index(drop=True)
+    if applied.empty:
+        return entries
+
+    # Valeur précédente de chaque cellule: valeur d'origine, puis valeur du correctif précédent
+    cell = ["position", "field"]
+    old = applied.groupby(cell, sort=False)["value"].shift(1).astype(object)
+    first_in_cell = ~applied.duplicated(cell, keep='first').to_numpy()
+    last_in_cell = ~applied.duplicated(cell, keep='last').to_numpy()
+    positions = applied["position"].to_numpy()
+    old = old.to_numpy(dtype=object, copy=True)
+
+    for field in applied["field"].unique():
+        in_field = (applied["field"] == field).to_numpy()
+        original = result_df[field].to_numpy(dtype=object)[positions[in_field & first_in_cell]]
+        old[in_field & first_in_cell] = original
+        written = in_field & last_in_cell
+        write_cells(result_df, field, positions[written], applied["value"].to_numpy(dtype=object)[written])
+
+    index = result_df.index.tolist()
+    for seq, order, patch_id, field, value, position, old_value in zip(
+        applied["seq"], applied["order"], applied["id"], applied["field"], applied["value"], positions, old
+    ):
+        entries.append(((seq, 2 + order), {
+            "type": "patch_applied",
+            "severity": "info",
+            id_column: patch_id,
+            "index": index[position],
+            "field": field,
+            "old_value": old_value,
+            "new_value": value
+        }))
+    return entries
@@ -0,0 +1,277 @@
+"""
+Module d'exécution des étapes de transformation.
+Enchaîne les étapes d'une table sur le DataFrame complet ou par lots successifs
+(mode à mémoire bornée), en collectant les erreurs par catégorie.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import mutated_columns, snapshot_frame
+from src.utils.step_metrics import measure_step, step_name
+
+
+# Étape ligne à ligne: le résultat d'une ligne ne dépend que de cette ligne
+ROW_SCOPE = "row"
+
+# Étape globale: contrôle en lecture seule qui a besoin de toute la table
+TABLE_SCOPE = "table"
+
+# Erreurs signalées par chaque lot lorsqu'une cible est absente de ce lot
+# (ex: correctif visant un identifiant): conservées si aucun lot ne contient la cible
+CHUNK_MISS_TYPES = {"patch_target_not_found"}
+
+StepFn = Callable[[pd.DataFrame], Tuple[pd.DataFrame, List[Dict[str, Any]]]]
+
+
+def pipeline_step(
+    label: Optional[str],
+    func: StepFn,
+    category: Optional[str] = None,
+    message: Optional[str] = None,
+    level: int = logging.INFO,
+    scope: str = ROW_SCOPE,
+    columns: Optional[List[str]] = None,
+    cleanup: Optional[Callable[[], None]] = None
+) -> Dict[str, Any]:
+    """
+    Décrit une étape de transformation.
+
+    Args:
+        label: Libellé journalisé au lancement de l'étape (None pour ne rien journaliser)
+        func: Fonction df -> (df, erreurs)
+        category: Catégorie d'erreurs alimentée (None pour ne pas les conserver)
+        message: Message journalisé si l'étape renvoie des erreurs ({count} = nombre d'erreurs)
+        level: Niveau de journalisation du message
+        scope: ROW_SCOPE ou TABLE_SCOPE
+        columns: Colonnes clés lues par une étape globale (résumé constitué en mode par lots)
+        cleanup: Fermeture des ressources ouvertes pour l'étape par build_steps,
+            appelée une fois le traitement terminé (close_steps)
+
+    Returns:
+        Dictionnaire décrivant l'étape
+    """
+    if scope == TABLE_SCOPE and not columns:
+        raise ValueError(f"L'étape globale '{label}' doit déclarer ses colonnes clés")
+
+    return {
+        "label": label,
+        "func": func,
+        "category": category,
+        "message": message,
+        "level": level,
+        "scope": scope,
+        "columns": columns or [],
+        "cleanup": cleanup
+    }
+
+
+def close_steps(steps: List[Dict[str, Any]]) -> None:
+    """
+    Ferme les ressources des étapes (fonctions cleanup de pipeline_step).
+
+    Args:
+        steps: Étapes décrites par pipeline_step
+    """
+    for step in steps:
+        if step["cleanup"] is not None:
+            step["cleanup"]()
+
+
+def _record_step_errors(
+    step: Dict[str, Any],
+    step_errors: List[Dict[str, Any]],
+    errors: Dict[str, List[Dict[str, Any]]],
+    logger: logging.Logger
+) -> None:
+    """Verse les erreurs d'une étape dans sa catégorie et journalise leur nombre."""
+    if not step_errors:
+        return
+    if step["category"] is not None:
+        errors[step["category"]].extend(step_errors)
+    if step["message"]:
+        logger.log(step["level"], step["message"].format(count=len(step_errors)))
+
+
+def _call_step(
+    step: Dict[str, Any],
+    df: pd.DataFrame,
+    metrics: Optional[Dict[str, Any]],
+    input_errors: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Exécute une étape, mesurée si ses compteurs sont fournis.
+
+    Si input_errors est fourni, l'entrée de l'étape est figée avant son
+    exécution puis comparée : toute modification y est signalée.
+    """
+    snapshot = snapshot_frame(df) if input_errors is not None else None
+
+    if metrics is None:
+        result = step["func"](df)
+    else:
+        result = measure_step(step["func"], df, metrics)
+
+    if snapshot is not None:
+        columns = mutated_columns(df, snapshot)
+        if columns:
+            input_errors.append({
+                "type": "step_input_mutation",
+                "severity": "error",
+                "step": step_name(step),
+                "field": ", ".join(columns),
+                "message": f"L'étape '{step_name(step)}' a modifié son DataFrame d'entrée ({', '.join(columns)})"
+            })
+
+    return result
+
+
+def _record_input_errors(
+    input_errors: Optional[List[Dict[str, Any]]],
+    errors: Dict[str, List[Dict[str, Any]]],
+    logger: logging.Logger
+) -> None:
+    """Verse les modifications d'entrée détectées dans la catégorie 'general' (une fois par étape et colonnes)."""
+    if not input_errors:
+        return
+    unique_errors = list({(error["step"], error["field"]): error for error in input_errors}.values())
+    for error in unique_errors:
+        logger.error(error["message"])
+    errors["general"].extend(unique_errors)
+
+
+def run_steps(
+    df: pd.DataFrame,
+    steps: List[Dict[str, Any]],
+    errors: Dict[str, List[Dict[str, Any]]],
+    logger: logging.Logger,
+    step_metrics: Optional[List[Dict[str, Any]]] = None,
+    check_inputs: bool = False
+) -> pd.DataFrame:
+    """
+    Exécute les étapes dans l'ordre sur le DataFrame complet.
+
+    Args:
+        df: DataFrame à transformer
+        steps: Étapes décrites par pipeline_step
+        errors: Dictionnaire des erreurs par catégorie (complété sur place)
+        logger: Logger de la table
+        step_metrics: Mesures par étape (init_step_metrics), complétées sur place (None pour ne pas mesurer)
+        check_inputs: Contrôle que chaque étape laisse son entrée intacte (débogage du mode sans copie)
+
+    Returns:
+        Le DataFrame transformé
+    """
+    input_errors = [] if check_inputs else None
+
+    for position, step in enumerate(steps):
+        if step["label"]:
+            logger.info(step["label"])
+        df, step_errors = _call_step(step, df, step_metrics[position] if step_metrics else None, input_errors)
+        _record_step_errors(step, step_errors, errors, logger)
+
+    _record_input_errors(input_errors, errors, logger)
+    return df
+
+
+def run_steps_in_chunks(
+    chunks: Iterable[pd.DataFrame],
+    steps: List[Dict[str, Any]],
+    errors: Dict[str, List[Dict[str, Any]]],
+    logger: logging.Logger,
+    id_column: str,
+    step_metrics: Optional[List[Dict[str, Any]]] = None,
+    check_inputs: bool = False
+) -> Iterator[pd.DataFrame]:
+    """
+    Exécute les étapes lot par lot et renvoie chaque lot dès qu'il est transformé.
+
+    Les étapes ligne à ligne s'appliquent à chaque lot (index 0..n-1) et les
+    index de leurs erreurs sont recalés sur la position dans la table. Les
+    étapes globales ne lisent que leurs colonnes clés : celles-ci sont
+    relevées à la position de l'étape dans chaque lot, puis l'étape est
+    exécutée une seule fois sur le résumé complet, après le dernier lot.
+
+    Les erreurs sont versées dans leurs catégories une fois tous les lots
+    consommés, étape par étape, dans le même ordre qu'avec run_steps. Les
+    messages de niveau table (sans index ni identifiant), répétés par chaque
+    lot, ne sont conservés qu'une fois.
+
+    Args:
+        chunks: DataFrames successifs (index 0..n-1), dans l'ordre de la table
+        steps: Étapes décrites par pipeline_step
+        errors: Dictionnaire des erreurs par catégorie (complété en fin d'itération)
+        logger: Logger de la table
+        id_column: Colonne identifiant de la table
+        step_metrics: Mesures par étape (init_step_metrics), cumulées sur les lots (None pour ne pas mesurer)
+        check_inputs: Contrôle que chaque étape laisse son entrée intacte (débogage du mode sans copie)
+
+    Yields:
+        Les lots transformés, dans l'ordre
+    """
+    step_errors: List[List[Dict[str, Any]]] = [[] for _ in steps]
+    summaries: Dict[int, List[pd.DataFrame]] = {
+        position: [] for position, step in enumerate(steps) if step["scope"] == TABLE_SCOPE
+    }
+    notices: List[Dict[str, Tuple[Dict[str, Any], int]]] = [{} for _ in steps]
+    input_errors = [] if check_inputs else None
+    offset = 0
+    chunk_count = 0
+
+    for chunk in chunks:
+        chunk_count += 1
+        chunk_length = len(chunk)
+        logger.info(f"Lot {chunk_count}: lignes {offset} à {offset + chunk_length - 1}")
+
+        for position, step in enumerate(steps):
+            if step["scope"] == TABLE_SCOPE:
+                key_columns = [column for column in step["columns"] if column in chunk.columns]
+                summaries[position].append(chunk[key_columns].copy())
+                continue
+
+            chunk, chunk_errors = _call_step(
+                step, chunk, step_metrics[position] if step_metrics else None, input_errors
+            )
+
+            for error in chunk_errors:
+                index = error.get("index")
+                if isinstance(index, (int, np.integer)) and not isinstance(index, bool):
+                    error["index"] = int(index) + offset
+                elif id_column not in error or error.get("type") in CHUNK_MISS_TYPES:
+                    # Message de niveau table: une seule occurrence, comptée par lot
+                    key = repr(sorted(error.items(), key=lambda item: item[0]))
+                    first, seen = notices[position].get(key, (error, 0))
+                    notices[position][key] = (first, seen + 1)
+                    if seen:
+                        continue
+                step_errors[position].append(error)
+
+        offset += chunk_length
+        yield chunk
+
+    # Étapes globales: une exécution sur le résumé des colonnes clés
+    for position, frames in summaries.items():
+        summary = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        _, step_errors[position] = _call_step(
+            steps[position], summary, step_metrics[position] if step_metrics else None, input_errors
+        )
+
+    for position, step in enumerate(steps):
+        # Cible absente d'au moins un lot mais trouvée dans un autre: pas d'erreur
+        found_elsewhere = {
+            id(first) for first, seen in notices[position].values()
+            if first.get("type") in CHUNK_MISS_TYPES and seen < chunk_count
+        }
+        if found_elsewhere:
+            step_errors[position] = [
+                error for error in step_errors[position] if id(error) not in found_elsewhere
+            ]
+
+        if step["label"]:
+            logger.info(step["label"])
+        _record_step_errors(step, step_errors[position], errors, logger)
+
+    _record_input_errors(input_errors, errors, logger)
@@ -0,0 +1,320 @@
+"""
+Module du référentiel local des codes postaux et des communes.
+Compile une seule fois la base officielle des codes postaux de La Poste
+(CSV laposte_hexasmal, éventuellement compressé en gzip) déposée dans
+data/reference/ en un index: code postal -> libellés acceptés (commune,
+libellé d'acheminement, ligne 5), avec les trigrammes de chaque libellé
+précalculés.
+
+La correction des villes se fait par lots: chaque couple (code postal,
+ville) distinct n'est résolu qu'une fois, par comparaison de trigrammes
+avec les seules communes de son code postal.
+"""
+
+import glob
+import gzip
+import os
+import pickle
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import unidecode
+
+from src.utils.factorize import factorize_strings
+from src.utils.sirene_index import REFERENCE_DIR
+
+
+# Motifs des fichiers de référence reconnus
+POSTAL_REFERENCE_PATTERNS = (
+    "laposte_hexasmal*.csv", "laposte_hexasmal*.csv.gz",
+    "codes_postaux*.csv", "codes_postaux*.csv.gz"
+)
+
+# Index compilé
+INDEX_FILENAME = "postal_index.pickle"
+
+# Version du format de l'index (recompilation si elle change)
+INDEX_VERSION = 1
+
+# Similarité minimale (coefficient de Dice sur les trigrammes) pour corriger une ville
+CITY_MATCH_THRESHOLD = 0.6
+
+# Noms de colonnes acceptés (en minuscules, sans accents ni '#'), par ordre de préférence des libellés
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "postal_code": ("code_postal", "postal_code"),
+    "delivery_label": ("libelle_d_acheminement", "libelle_acheminement"),
+    "commune": ("nom_de_la_commune", "nom_commune", "commune", "city"),
+    "line_5": ("ligne_5",),
+}
+
+# Statuts renvoyés par correct_cities
+CITY_MATCHED = "matched"
+CITY_CORRECTED = "corrected"
+CITY_UNMATCHED = "unmatched"
+POSTAL_CODE_UNKNOWN = "unknown_postal_code"
+
+# Abréviations développées avant comparaison
+KEY_ABBREVIATIONS = {"ST": "SAINT", "STE": "SAINTE"}
+
+# Mentions retirées avant comparaison (arrondissement, CEDEX)
+KEY_SUFFIX_PATTERN = re.compile(r'(\s+(\d+\s*(ER|EME|E)?|ARRONDISSEMENT|CEDEX))+$')
+
+
+def find_postal_reference(reference_dir: str = REFERENCE_DIR) -> Optional[str]:
+    """
+    Recherche le fichier des codes postaux le plus récent du répertoire des référentiels.
+
+    Args:
+        reference_dir: Répertoire des référentiels
+
+    Returns:
+        Chemin du fichier, None si aucun fichier n'est présent
+    """
+    candidates = [
+        path for pattern in POSTAL_REFERENCE_PATTERNS
+        for path in glob.glob(os.path.join(reference_dir, pattern))
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def city_key(name: str) -> str:
+    """
+    Clé de comparaison d'un nom de ville.
+
+    Majuscules sans accents, ponctuation remplacée par des espaces,
+    abréviations ST/STE développées, arrondissement et CEDEX retirés
+    ("ST-ÉTIENNE CEDEX 2" -> "SAINT ETIENNE").
+
+    Args:
+        name: Nom de ville
+
+    Returns:
+        La clé normalisée
+    """
+    text = re.sub(r'[^A-Z0-9]+', ' ', unidecode.unidecode(name).upper()).strip()
+    text = KEY_SUFFIX_PATTERN.sub('', text)
+    return ' '.join(KEY_ABBREVIATIONS.get(token, token) for token in text.split())
+
+
+def city_trigrams(key: str) -> FrozenSet[str]:
+    """
+    Trigrammes d'une clé de ville (bornes de début et de fin incluses).
+
+    Args:
+        key: Clé normalisée (city_key)
+
+    Returns:
+        L'ensemble des trigrammes
+    """
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _source_signature(reference_path: str) -> Dict[str, Any]:
+    stat = os.stat(reference_path)
+    return {
+        "version": INDEX_VERSION,
+        "source": os.path.basename(reference_path),
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime
+    }
+
+
+def _read_reference(reference_path: str) -> pd.DataFrame:
+    # Fichier La Poste en UTF-8 (data.gouv.fr) ou en Latin-1 (anciennes versions)
+    for encoding in ('utf-8', 'latin-1'):
+        try:
+            opener = gzip.open if reference_path.endswith(".gz") else open
+            with opener(reference_path, 'rt', encoding=encoding) as file:
+                header = file.readline()
+            separator = ';' if header.count(';') > header.count(',') else ','
+            return pd.read_csv(reference_path, sep=separator, dtype=str, keep_default_na=False,
+                               encoding=encoding, compression='infer')
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Encodage du fichier des codes postaux non reconnu: {reference_path}")
+
+
+def _resolve_columns(reference_path: str, header: List[str]) -> Dict[str, str]:
+    normalized = {unidecode.unidecode(column).strip().lstrip('#').lower(): column for column in header}
+    columns = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[key] = normalized[alias]
+                break
+    if "postal_code" not in columns or "commune" not in columns:
+        raise ValueError(f"Le fichier des codes postaux ne contient pas de colonnes code postal et commune: {reference_path}")
+    return columns
+
+
+def compile_postal_reference(reference_path: str, index_path: str) -> Dict[str, Any]:
+    """
+    Compile le fichier des codes postaux en index.
+
+    Chaque code postal reçoit ses libellés acceptés (libellé d'acheminement,
+    nom de la commune, ligne 5), dédoublonnés par clé de comparaison ; les
+    trigrammes de chaque libellé sont calculés une fois pour toutes.
+
+    Args:
+        reference_path: Chemin du fichier (CSV, .csv.gz)
+        index_path: Chemin de l'index compilé
+
+    Returns:
+        L'index compilé
+    """
+    data = _read_reference(reference_path)
+    columns = _resolve_columns(reference_path, list(data.columns))
+
+    labels: List[str] = []
+    label_ids: Dict[str, int] = {}
+    postal_keys: Dict[str, Dict[str, int]] = {}
+    postal_codes = data[columns["postal_code"]].str.strip().str.zfill(5)
+    for field in ("delivery_label", "commune", "line_5"):
+        if field not in columns:
+            continue
+        names = data[columns[field]].str.strip().str.upper()
+        for postal_code, name in zip(postal_codes, names):
+            if not name or not postal_code:
+                continue
+            key = city_key(name)
+            if not key:
+                continue
+            label_id = label_ids.setdefault(name, len(labels))
+            if label_id == len(labels):
+                labels.append(name)
+            postal_keys.setdefault(postal_code, {}).setdefault(key, label_id)
+
+    keys = [city_key(label) for label in labels]
+    index = {
+        "labels": labels,
+        "keys": keys,
+        "trigrams": [city_trigrams(key) for key in keys],
+        "postal_keys": postal_keys,
+        "meta": {
+            **_source_signature(reference_path),
+            "postal_codes": len(postal_keys),
+            "labels": len(labels)
+        }
+    }
+
+    # Écriture atomique: un index incomplet n'est jamais lu
+    temporary_path = f"{index_path}.tmp"
+    with open(temporary_path, 'wb') as file:
+        pickle.dump(index, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, index_path)
+    return index
+
+
+def open_postal_reference(reference_dir: str = REFERENCE_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Ouvre l'index du fichier des codes postaux du répertoire des référentiels.
+
+    L'index n'est (re)compilé que si le fichier a changé depuis la dernière
+    compilation (nom, taille ou date de modification).
+
+    Args:
+        reference_dir: Répertoire des référentiels
+
+    Returns:
+        L'index chargé, None si aucun fichier n'est présent
+    """
+    reference_path = find_postal_reference(reference_dir)
+    if reference_path is None:
+        return None
+
+    index_path = os.path.join(reference_dir, INDEX_FILENAME)
+    if os.path.exists(index_path):
+        with open(index_path, 'rb') as file:
+            index = pickle.load(file)
+        signature = _source_signature(reference_path)
+        if all(index["meta"].get(key) == value for key, value in signature.items()):
+            return index
+    return compile_postal_reference(reference_path, index_path)
+
+
+def match_city(index: Dict[str, Any], postal_code: str, city: str) -> Tuple[str, Optional[str], float]:
+    """
+    Rapproche une ville des communes de son code postal.
+
+    Args:
+        index: Index chargé par open_postal_reference
+        postal_code: Code postal
+        city: Nom de ville
+
+    Returns:
+        Tuple contenant:
+        - Le statut (CITY_MATCHED, CITY_CORRECTED, CITY_UNMATCHED ou POSTAL_CODE_UNKNOWN)
+        - Le libellé de référence retenu (None si aucun)
+        - La similarité avec ce libellé (1.0 pour une correspondance exacte)
+    """
+    candidates = index["postal_keys"].get(postal_code)
+    if candidates is None:
+        return POSTAL_CODE_UNKNOWN, None, 0.0
+
+    key = city_key(city)
+    if key in candidates:
+        return CITY_MATCHED, index["labels"][candidates[key]], 1.0
+
+    trigrams = city_trigrams(key)
+    best_id, best_score = None, 0.0
+    for label_id in candidates.values():
+        reference = index["trigrams"][label_id]
+        score = 2 * len(trigrams & reference) / (len(trigrams) + len(reference))
+        if score > best_score:
+            best_id, best_score = label_id, score
+    if best_id is not None and best_score >= CITY_MATCH_THRESHOLD:
+        return CITY_CORRECTED, index["labels"][best_id], best_score
+    return CITY_UNMATCHED, None, best_score
+
+
+def correct_cities(index: Dict[str, Any], postal_codes: pd.Series, cities: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Contrôle et corrige un lot de villes d'après leur code postal.
+
+    Chaque couple (code postal, ville) distinct n'est rapproché qu'une fois ;
+    les lignes dont le code postal ou la ville n'est pas une chaîne non vide
+    sont ignorées (statut None).
+
+    Args:
+        index: Index chargé par open_postal_reference
+        postal_codes: Codes postaux
+        cities: Noms de ville (alignés sur postal_codes)
+
+    Returns:
+        Dictionnaire de tableaux alignés sur les lignes:
+        - "status": statut du rapprochement (None si la ligne est ignorée)
+        - "city": libellé de référence retenu (None si aucun)
+        - "score": similarité avec ce libellé
+    """
+    n = len(cities)
+    status = np.full(n, None, dtype=object)
+    reference_cities = np.full(n, None, dtype=object)
+    scores = np.zeros(n, dtype=float)
+
+    postal_code_codes, postal_code_uniques = factorize_strings(postal_codes)
+    city_codes, city_uniques = factorize_strings(cities)
+    checked = (postal_code_codes >= 0) & (city_codes >= 0)
+    if not checked.any():
+        return {"status": status, "city": reference_cities, "score": scores}
+
+    # Couples distincts (code postal, ville)
+    pair_codes = postal_code_codes[checked].astype(np.int64) * len(city_uniques) + city_codes[checked]
+    pairs, inverse = np.unique(pair_codes, return_inverse=True)
+    results = []
+    for pair in pairs:
+        postal_code = postal_code_uniques[pair // len(city_uniques)].strip()
+        city = city_uniques[pair % len(city_uniques)]
+        results.append(match_city(index, postal_code, city) if postal_code and city.strip() else (None, None, 0.0))
+
+    pair_status = np.array([result[0] for result in results], dtype=object)
+    pair_cities = np.array([result[1] for result in results], dtype=object)
+    pair_scores = np.array([result[2] for result in results], dtype=float)
+    status[checked] = pair_status[inverse]
+    reference_cities[checked] = pair_cities[inverse]
+    scores[checked] = pair_scores[inverse]
+    return {"status": status, "city": reference_cities, "score": scores}
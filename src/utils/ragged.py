@@ -0,0 +1,279 @@
+"""
+Module des colonnes de listes au format « ragged ».
+Une colonne de listes (ex: stock_import) est représentée par un tableau plat
+de tous les éléments et un tableau de décalages : les éléments de la ligne i
+sont values[offsets[i]:offsets[i + 1]]. Conversion des éléments en entiers,
+dédoublonnage à l'intérieur des lignes, détection des listes vides et
+dépliage se font alors sur les tableaux plats, sans parcourir chaque liste
+en Python.
+
+Les listes Python ne sont reconstruites (to_lists) que pour les lignes
+effectivement modifiées : les autres cellules conservent leur liste
+d'origine.
+"""
+
+from itertools import chain
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def cell_lengths(cells: Sequence[Any]) -> np.ndarray:
+    """
+    Longueur de chaque cellule d'une colonne de listes.
+
+    Args:
+        cells: Cellules de la colonne
+
+    Returns:
+        Longueur de chaque liste, -1 pour les cellules qui ne sont pas des listes
+    """
+    return np.fromiter(
+        (len(cell) if isinstance(cell, list) else -1 for cell in cells),
+        dtype=np.int64, count=len(cells)
+    )
+
+
+def from_lists(cells: Sequence[Any]) -> Dict[str, np.ndarray]:
+    """
+    Construit la représentation ragged d'une colonne de listes.
+
+    Args:
+        cells: Cellules de la colonne (les cellules qui ne sont pas des listes comptent pour vides)
+
+    Returns:
+        Dictionnaire contenant:
+        - values: Éléments de toutes les listes, à la suite (dtype object)
+        - offsets: Décalages (n + 1 valeurs) du début de chaque ligne dans values
+    """
+    cells = np.asarray(cells, dtype=object) if not isinstance(cells, np.ndarray) else cells
+    lengths = np.maximum(cell_lengths(cells), 0)
+    offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    values = np.empty(int(offsets[-1]), dtype=object)
+    values[:] = list(chain.from_iterable(cells[lengths > 0]))
+    return {"values": values, "offsets": offsets}
+
+
+def lengths(ragged: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Nombre d'éléments de chaque ligne.
+
+    Args:
+        ragged: Colonne ragged
+
+    Returns:
+        Tableau des longueurs
+    """
+    return np.diff(ragged["offsets"])
+
+
+def row_ids(ragged: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Ligne de chaque élément du tableau plat.
+
+    Args:
+        ragged: Colonne ragged
+
+    Returns:
+        Numéro de ligne (position) de chaque élément
+    """
+    return np.repeat(np.arange(len(ragged["offsets"]) - 1), lengths(ragged))
+
+
+def implode(rows: np.ndarray, values: np.ndarray, n: int) -> Dict[str, np.ndarray]:
+    """
+    Reconstitue une colonne ragged à partir d'éléments dépliés.
+
+    Args:
+        rows: Ligne de chaque élément, croissante
+        values: Éléments
+        n: Nombre de lignes
+
+    Returns:
+        La colonne ragged
+    """
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+    return {"values": values, "offsets": offsets}
+
+
+def select(ragged: Dict[str, np.ndarray], keep: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Conserve une partie des éléments, dans l'ordre.
+
+    Args:
+        ragged: Colonne ragged
+        keep: Masque booléen des éléments à conserver (taille du tableau plat)
+
+    Returns:
+        La colonne ragged réduite (même nombre de lignes)
+    """
+    return implode(row_ids(ragged)[keep], ragged["values"][keep], len(ragged["offsets"]) - 1)
+
+
+def take(ragged: Dict[str, np.ndarray], rows: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Sélectionne des lignes, éventuellement répétées, sans parcourir les listes.
+
+    Args:
+        ragged: Colonne ragged
+        rows: Position de la ligne reprise pour chaque ligne du résultat (-1: ligne vide)
+
+    Returns:
+        La colonne ragged des lignes sélectionnées
+    """
+    offsets = ragged["offsets"]
+    found = rows >= 0
+    starts = np.zeros(len(rows), dtype=np.int64)
+    counts = np.zeros(len(rows), dtype=np.int64)
+    starts[found] = offsets[rows[found]]
+    counts[found] = np.diff(offsets)[rows[found]]
+
+    result_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(counts, out=result_offsets[1:])
+    # Position de chaque élément repris: début de sa ligne source + rang dans la ligne
+    within = np.arange(result_offsets[-1]) - np.repeat(result_offsets[:-1], counts)
+    return {"values": ragged["values"][np.repeat(starts, counts) + within], "offsets": result_offsets}
+
+
+def concat_rows(*columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Concatène ligne à ligne plusieurs colonnes ragged de même nombre de lignes.
+
+    Args:
+        columns: Colonnes ragged, dans l'ordre de concaténation
+
+    Returns:
+        La colonne ragged dont chaque ligne enchaîne les éléments de chaque colonne
+    """
+    n = len(columns[0]["offsets"]) - 1
+    rows = np.concatenate([row_ids(column) for column in columns])
+    values = np.concatenate([column["values"].astype(object) for column in columns])
+    order = np.argsort(rows, kind="stable")
+    return implode(rows[order], values[order], n)
+
+
+def value_types(values: np.ndarray) -> np.ndarray:
+    """
+    Type Python de chaque élément.
+
+    Args:
+        values: Éléments (dtype object)
+
+    Returns:
+        Tableau (dtype object) des types
+    """
+    types = np.empty(len(values), dtype=object)
+    types[:] = list(map(type, values))
+    return types
+
+
+def integer_values(values: np.ndarray) -> np.ndarray:
+    """
+    Éléments convertibles en entiers.
+
+    Sont convertibles les nombres entiers (3, 3.0) et les chaînes d'un
+    entier ("3", " 3 ") ; les booléens, décimaux non entiers, chaînes vides
+    ou non numériques ne le sont pas.
+
+    Args:
+        values: Éléments (dtype object)
+
+    Returns:
+        Masque des éléments convertibles
+    """
+    if not len(values):
+        return np.zeros(0, dtype=bool)
+    numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+    types = value_types(values)
+    is_bool = pd.Series(types, dtype=object).isin([bool, np.bool_]).to_numpy()
+    return np.isfinite(numeric) & (numeric == np.floor(numeric)) & ~is_bool
+
+
+def coerce_int(ragged: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Convertit les éléments en entiers, en écartant les éléments non convertibles.
+
+    Args:
+        ragged: Colonne ragged
+
+    Returns:
+        Colonne ragged d'éléments int64
+    """
+    keep = integer_values(ragged["values"])
+    kept = select(ragged, keep)
+    numeric = pd.to_numeric(pd.Series(kept["values"], dtype=object)).astype(np.int64)
+    return {"values": numeric.to_numpy(), "offsets": kept["offsets"]}
+
+
+def first_occurrences(ragged: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Premières occurrences de chaque élément à l'intérieur de sa ligne.
+
+    Args:
+        ragged: Colonne ragged
+
+    Returns:
+        Masque des éléments qui ne répètent pas un élément précédent de la même ligne
+    """
+    pairs = pd.DataFrame({"row": row_ids(ragged), "value": ragged["values"]})
+    return ~pairs.duplicated().to_numpy()
+
+
+def dedup_rows(ragged: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Supprime les doublons à l'intérieur de chaque ligne, en conservant l'ordre.
+
+    Args:
+        ragged: Colonne ragged
+
+    Returns:
+        La colonne ragged dédoublonnée
+    """
+    return select(ragged, first_occurrences(ragged))
+
+
+def changed_rows(ragged: Dict[str, np.ndarray], other: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Lignes dont les éléments diffèrent entre deux colonnes ragged.
+
+    Args:
+        ragged: Première colonne
+        other: Seconde colonne (même nombre de lignes)
+
+    Returns:
+        Masque des lignes de longueurs ou d'éléments différents
+    """
+    left_lengths = lengths(ragged)
+    changed = left_lengths != lengths(other)
+    same = np.repeat(~changed, left_lengths)
+    left = ragged["values"][same]
+    right = other["values"][np.repeat(~changed, lengths(other))]
+    if left.dtype == object or right.dtype == object:
+        # Comparaison des valeurs et des types (3 et "3" ou 3.0 diffèrent, comme dans le JSON de sortie)
+        left, right = left.astype(object), right.astype(object)
+        differs = np.asarray(left != right, dtype=bool) | (value_types(left) != value_types(right))
+    else:
+        differs = left != right
+    changed[row_ids(ragged)[same][differs]] = True
+    return changed
+
+
+def to_lists(ragged: Dict[str, np.ndarray], rows: Optional[np.ndarray] = None) -> List[List[Any]]:
+    """
+    Reconstruit des listes Python.
+
+    Args:
+        ragged: Colonne ragged
+        rows: Positions des lignes à reconstruire (toutes par défaut)
+
+    Returns:
+        Une liste Python (éléments natifs) par ligne demandée
+    """
+    offsets = ragged["offsets"]
+    rows = np.arange(len(offsets) - 1) if rows is None else rows
+    values = ragged["values"]
+    return [values[offsets[row]:offsets[row + 1]].tolist() for row in rows]
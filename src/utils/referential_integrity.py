@@ -0,0 +1,430 @@
+"""
+Module de contrôle de l'intégrité référentielle entre les tables nettoyées.
+Après le traitement, vérifie que chaque clé étrangère (fk_co, fk_or, fk_st...)
+et chaque liste de clés (stock_import, logistic_address) des fichiers de
+sortie existe dans la table référencée, afin que le chargement en base
+n'échoue pas sur une contrainte en cours de route.
+
+Les index de clés de chaque table sont construits une seule fois ; les
+colonnes de listes sont dépliées et toutes les relations sont contrôlées par
+tests d'appartenance vectorisés (tables de hachage pandas). Les relations
+plusieurs-à-plusieurs déclarées avec leur clé inverse sont en outre
+contrôlées dans les deux sens (src/utils/relation_index.py).
+"""
+
+import glob
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils import ragged
+from src.utils.relation_index import (
+    asymmetric_links,
+    build_inverse_index,
+    inverse_relations,
+    multi_owner_conflicts,
+    normalize_keys,
+)
+
+
+CLEAN_DIR = "data/clean"
+
+# Colonnes du rapport des références orphelines
+ORPHAN_COLUMNS = ["table", "id", "column", "value", "target_table", "target_key", "reason"]
+
+
+def latest_clean_output(table_name: str, clean_dir: str = CLEAN_DIR) -> Optional[str]:
+    """
+    Recherche le fichier de sortie le plus récent d'une table.
+
+    Args:
+        table_name: Nom de la table
+        clean_dir: Répertoire des fichiers nettoyés
+
+    Returns:
+        Chemin du fichier, None si la table n'a pas de sortie
+    """
+    candidates = glob.glob(os.path.join(clean_dir, f"{table_name}_*.json"))
+    # "stock_import_*" ne doit pas être pris pour une sortie d'une table "stock"
+    candidates = [path for path in candidates if os.path.basename(path)[len(table_name) + 1:][:1].isdigit()]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def load_table_columns(output_path: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Charge les colonnes utiles d'un fichier de sortie.
+
+    Args:
+        output_path: Fichier JSON nettoyé (liste d'objets)
+        columns: Colonnes à conserver (absentes: colonnes de None)
+
+    Returns:
+        DataFrame limité aux colonnes demandées
+    """
+    with open(output_path, 'r', encoding='utf-8') as file:
+        records = json.load(file)
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def build_key_index(df: pd.DataFrame, key: str) -> pd.Index:
+    """
+    Construit l'index des clés d'une table.
+
+    Args:
+        df: Données de la table
+        key: Colonne de clé primaire
+
+    Returns:
+        Index (table de hachage) des clés distinctes non nulles
+    """
+    return pd.Index(normalize_keys(df[key]).dropna().unique())
+
+
+def open_reference_table(
+    table_name: str,
+    key_columns: List[str],
+    columns: Optional[List[str]] = None,
+    clean_dir: str = CLEAN_DIR
+) -> Optional[Dict[str, Any]]:
+    """
+    Ouvre la dernière sortie nettoyée d'une table référencée et indexe ses clés.
+
+    Utilisé par les pipelines qui résolvent leurs clés étrangères pendant le
+    traitement (ex: positioning vers stock_import) : l'index de chaque
+    colonne de clé est construit une seule fois, puis interrogé par lots
+    avec lookup_keys.
+
+    Args:
+        table_name: Table référencée
+        key_columns: Colonnes interrogées (clé primaire ou clé secondaire comme si_io)
+        columns: Autres colonnes lues, renvoyées par position (lookup_keys)
+            (toutes les colonnes sont normalisées par normalize_keys)
+        clean_dir: Répertoire des fichiers nettoyés
+
+    Returns:
+        Dictionnaire (table, fichier, données, index par colonne de clé),
+        None si la table n'a pas de sortie
+    """
+    output_path = latest_clean_output(table_name, clean_dir)
+    if output_path is None:
+        return None
+
+    frame = load_table_columns(output_path, list(dict.fromkeys([*key_columns, *(columns or [])])))
+    # Colonnes normalisées une seule fois: les lots ne relisent que des positions
+    frame = pd.DataFrame({column: normalize_keys(frame[column]) for column in frame.columns})
+    indexes = {}
+    for column in key_columns:
+        keys = frame[column]
+        # Première ligne de chaque clé non nulle
+        first = (keys.notna() & ~keys.duplicated()).to_numpy()
+        indexes[column] = {"index": pd.Index(keys[first]), "rows": np.flatnonzero(first)}
+
+    return {"table": table_name, "path": output_path, "frame": frame, "indexes": indexes}
+
+
+def open_reference_tables(
+    reference_keys: Dict[str, Tuple[List[str], Optional[List[str]]]],
+    logger: logging.Logger,
+    clean_dir: str = CLEAN_DIR
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Ouvre les tables référencées par un pipeline (open_reference_table).
+
+    Args:
+        reference_keys: Table -> (colonnes de clé, autres colonnes lues)
+        logger: Logger du traitement
+        clean_dir: Répertoire des fichiers nettoyés
+
+    Returns:
+        Tables ouvertes, par nom (None si la table n'a pas de sortie)
+    """
+    references = {}
+    for table_name, (key_columns, columns) in reference_keys.items():
+        references[table_name] = open_reference_table(table_name, key_columns, columns, clean_dir)
+        if references[table_name] is None:
+            logger.info(f"Aucune sortie nettoyée pour {table_name}: références non vérifiées")
+        else:
+            logger.info(f"Références {table_name} chargées: {references[table_name]['path']}")
+    return references
+
+
+def lookup_keys(reference: Dict[str, Any], column: str, values: pd.Series) -> np.ndarray:
+    """
+    Recherche des clés dans une table référencée.
+
+    Args:
+        reference: Table ouverte par open_reference_table
+        column: Colonne de clé interrogée
+        values: Clés recherchées (normalisées comme les clés de la table)
+
+    Returns:
+        Position de la ligne référencée dans reference["frame"] pour chaque
+        valeur, -1 si la valeur est nulle ou absente
+    """
+    index = reference["indexes"][column]
+    positions = index["index"].get_indexer(normalize_keys(values))
+    return np.where(positions >= 0, index["rows"][positions], -1)
+
+
+def group_reference_values(reference: Dict[str, Any], column: str, value_column: str) -> Dict[str, Any]:
+    """
+    Regroupe les valeurs d'une table référencée par clé (ex: po_id de positioning par fk_la).
+
+    Le regroupement est construit une seule fois (factorisation puis tri
+    stable) ; chaque lot le consulte avec lookup_groups.
+
+    Args:
+        reference: Table ouverte par open_reference_table
+        column: Colonne de regroupement
+        value_column: Colonne des valeurs regroupées
+
+    Returns:
+        Dictionnaire contenant:
+        - index: Clés distinctes non nulles
+        - groups: Colonne ragged des valeurs de chaque clé, dans l'ordre des lignes
+    """
+    keys = reference["frame"][column]
+    present = keys.notna().to_numpy()
+    codes, uniques = pd.factorize(keys[present])
+    order = np.argsort(codes, kind="stable")
+    values = reference["frame"][value_column].to_numpy(dtype=object)[present][order]
+    return {"index": pd.Index(uniques), "groups": ragged.implode(codes[order], values, len(uniques))}
+
+
+def lookup_groups(grouping: Dict[str, Any], values: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Recherche les valeurs regroupées sous chaque clé.
+
+    Args:
+        grouping: Regroupement construit par group_reference_values
+        values: Clés recherchées
+
+    Returns:
+        Colonne ragged des valeurs de chaque clé (vide si la clé est nulle ou absente)
+    """
+    return ragged.take(grouping["groups"], grouping["index"].get_indexer(normalize_keys(values)))
+
+
+def check_relation(
+    df: pd.DataFrame,
+    table_name: str,
+    key: str,
+    column: str,
+    target_table: str,
+    target_key: str,
+    target_index: pd.Index
+) -> pd.DataFrame:
+    """
+    Contrôle une relation: chaque valeur non nulle de la colonne doit exister dans la table cible.
+
+    Les colonnes de listes sont dépliées (une ligne par élément).
+
+    Args:
+        df: Données de la table source
+        table_name: Table source
+        key: Clé primaire de la table source (identifiant des lignes signalées)
+        column: Clé étrangère ou liste de clés
+        target_table: Table référencée
+        target_key: Clé primaire de la table référencée
+        target_index: Index des clés de la table référencée (build_key_index)
+
+    Returns:
+        DataFrame des références orphelines (colonnes ORPHAN_COLUMNS)
+    """
+    # La clé étrangère peut être la clé de la table elle-même (deliveries.fk_po)
+    references = df[list(dict.fromkeys([key, column]))].explode(column, ignore_index=True)
+    values = normalize_keys(references[column])
+    present = values.notna().to_numpy()
+    orphan = present & ~values.isin(target_index).to_numpy()
+    orphans = references[orphan]
+    return pd.DataFrame({
+        "table": table_name,
+        "id": orphans[key].to_numpy(dtype=object),
+        "column": column,
+        "value": orphans[column].to_numpy(dtype=object),
+        "target_table": target_table,
+        "target_key": target_key,
+        "reason": f"Valeur absente de {target_table}.{target_key}"
+    }, columns=ORPHAN_COLUMNS)
+
+
+def load_relation_tables(outputs: Dict[str, str], registry: Dict[str, Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
+    """
+    Charge les colonnes de relations des fichiers de sortie.
+
+    Seules les relations dont la table source et la table cible ont un
+    fichier de sortie sont retenues.
+
+    Args:
+        outputs: Table -> fichier de sortie nettoyé
+        registry: Registre des tables (clé "key" et relations "references")
+
+    Returns:
+        Table -> DataFrame (clé primaire et colonnes des relations retenues)
+    """
+    needed: Dict[str, List[str]] = {}
+    for table_name, entry in registry.items():
+        for column, target_table in entry.get("references", {}).items():
+            if table_name in outputs and target_table in outputs:
+                needed.setdefault(table_name, [entry["key"]]).append(column)
+                needed.setdefault(target_table, [registry[target_table]["key"]])
+
+    return {
+        table_name: load_table_columns(outputs[table_name], list(dict.fromkeys(columns)))
+        for table_name, columns in needed.items()
+    }
+
+
+def check_referential_integrity(
+    tables: Dict[str, pd.DataFrame],
+    registry: Dict[str, Dict[str, Any]]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Contrôle toutes les relations déclarées dans le registre des tables.
+
+    Args:
+        tables: Données chargées par load_relation_tables
+        registry: Registre des tables (clé "key" et relations "references")
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame des références orphelines
+        - Le résumé par relation (références contrôlées et orphelines)
+    """
+    key_indexes: Dict[str, pd.Index] = {}
+
+    orphans = []
+    summary = []
+    for table_name, df in tables.items():
+        entry = registry[table_name]
+        for column, target_table in entry.get("references", {}).items():
+            if column not in df.columns:
+                continue
+            target_key = registry[target_table]["key"]
+            if target_table not in key_indexes:
+                key_indexes[target_table] = build_key_index(tables[target_table], target_key)
+            relation_orphans = check_relation(
+                df, table_name, entry["key"], column, target_table, target_key, key_indexes[target_table]
+            )
+            orphans.append(relation_orphans)
+            summary.append({
+                "Relation": f"{table_name}.{column} -> {target_table}.{target_key}",
+                "Références": int(normalize_keys(df[column].explode()).notna().sum()),
+                "Orphelines": len(relation_orphans)
+            })
+
+    orphans_df = pd.concat(orphans, ignore_index=True) if orphans else pd.DataFrame(columns=ORPHAN_COLUMNS)
+    return orphans_df, pd.DataFrame(summary, columns=["Relation", "Références", "Orphelines"])
+
+
+def check_inverse_relations(
+    tables: Dict[str, pd.DataFrame],
+    registry: Dict[str, Dict[str, Any]]
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Contrôle les relations plusieurs-à-plusieurs dans les deux sens.
+
+    Args:
+        tables: Données chargées par load_relation_tables
+        registry: Registre des tables (relations inverses "inverse")
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame des liens asymétriques
+        - Le DataFrame des identifiants revendiqués par plusieurs lignes
+        - Le résumé par relation
+    """
+    inverse = build_inverse_index(tables, registry)
+    asymmetric = asymmetric_links(inverse, tables, registry)
+    conflicts = multi_owner_conflicts(inverse)
+
+    summary = []
+    for (table_name, column), (target_table, back_column) in inverse_relations(registry).items():
+        if table_name not in tables or target_table not in tables:
+            continue
+        summary.append({
+            "Relation": f"{table_name}.{column} <-> {target_table}.{back_column}",
+            "Références": int(((inverse["table"] == table_name) & (inverse["column"] == column)).sum()),
+            "Asymétriques": int(((asymmetric["table"] == table_name) & (asymmetric["column"] == column)).sum()),
+            "Multi-propriétaires": int(((conflicts["table"] == table_name) & (conflicts["column"] == column)).sum())
+        })
+    return asymmetric, conflicts, pd.DataFrame(
+        summary, columns=["Relation", "Références", "Asymétriques", "Multi-propriétaires"]
+    )
+
+
+def generate_integrity_report(sheets: Dict[str, pd.DataFrame], output_path: str) -> None:
+    """
+    Génère le rapport d'intégrité référentielle au format Excel.
+
+    Le rapport contient un onglet de résumé par relation, puis un onglet par
+    type d'anomalie (références orphelines, liens asymétriques,
+    identifiants revendiqués par plusieurs lignes).
+
+    Args:
+        sheets: Nom d'onglet -> données, dans l'ordre des onglets
+        output_path: Chemin de sortie pour le fichier Excel
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
+        header_format = writer.book.add_format({'bold': True, 'bg_color': '#D9D9D9', 'border': 1})
+        for sheet_name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=sheet_name, index=False)
+            sheet = writer.sheets[sheet_name]
+            for col_num, column in enumerate(frame.columns):
+                sheet.write(0, col_num, column, header_format)
+                width = max([len(str(column))] + [len(str(value)) for value in frame[column].head(1000)])
+                sheet.set_column(col_num, col_num, min(width + 2, 50))
+
+
+def run_integrity_check(
+    outputs: Dict[str, str],
+    registry: Dict[str, Dict[str, Any]],
+    report_dir: str,
+    logger: logging.Logger
+) -> Optional[str]:
+    """
+    Contrôle l'intégrité référentielle des sorties et génère le rapport des orphelines.
+
+    Args:
+        outputs: Table -> fichier de sortie nettoyé
+        registry: Registre des tables
+        report_dir: Répertoire des rapports d'erreurs
+        logger: Logger principal
+
+    Returns:
+        Chemin du rapport, None si aucune anomalie n'a été trouvée
+    """
+    tables = load_relation_tables(outputs, registry)
+    orphans, summary = check_referential_integrity(tables, registry)
+    asymmetric, conflicts, inverse_summary = check_inverse_relations(tables, registry)
+    for relation in summary.itertuples(index=False):
+        level = logging.WARNING if relation[2] else logging.INFO
+        logger.log(level, f"Intégrité {relation[0]}: {relation[2]} orphelines sur {relation[1]} références")
+    for relation in inverse_summary.itertuples(index=False):
+        level = logging.WARNING if relation[2] or relation[3] else logging.INFO
+        logger.log(level, f"Intégrité {relation[0]}: {relation[2]} liens asymétriques, "
+                          f"{relation[3]} identifiants à plusieurs propriétaires sur {relation[1]} références")
+    if orphans.empty and asymmetric.empty and conflicts.empty:
+        return None
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = os.path.join(report_dir, f"integrity_errors_{timestamp}.xlsx")
+    overview = pd.concat([summary, inverse_summary], ignore_index=True)
+    overview = overview.astype({column: "Int64" for column in overview.columns[1:]})
+    generate_integrity_report({
+        "Résumé": overview,
+        "Orphelines": orphans,
+        "Asymétriques": asymmetric,
+        "Multi-propriétaires": conflicts
+    }, report_path)
+    logger.warning(f"{len(orphans)} références orphelines, {len(asymmetric)} liens asymétriques, "
+                   f"{len(conflicts)} identifiants à plusieurs propriétaires, rapport d'intégrité généré: {report_path}")
+    return report_path
@@ -0,0 +1,232 @@
+"""
+Module d'index inverse des relations plusieurs-à-plusieurs.
+Les listes d'identifiants stock_import sont portées par stocks et
+transports, tandis que chaque ligne de stock_import renvoie à son
+propriétaire par une clé étrangère simple (fk_st, fk_tra) ; de même, la
+liste positioning de logistic_address a pour inverse positioning.fk_la.
+
+L'index inverse associe chaque identifiant référencé aux lignes qui le
+listent ; il est construit en une passe sur les listes aplaties. Les deux
+contrôles qui en découlent (liens asymétriques et identifiants revendiqués
+par plusieurs propriétaires) sont des jointures et regroupements par
+hachage, en temps linéaire.
+"""
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils import ragged
+
+
+# Colonnes de l'index inverse: identifiant référencé, table et identifiant de la ligne qui le liste
+INVERSE_COLUMNS = ["key", "table", "column", "owner"]
+
+# Colonnes des rapports
+ASYMMETRY_COLUMNS = ["table", "id", "column", "value", "back_table", "back_column", "back_value", "reason"]
+CONFLICT_COLUMNS = ["table", "column", "value", "owners", "count", "reason"]
+
+
+def normalize_keys(values: pd.Series) -> pd.Series:
+    """
+    Ramène des clés à une forme comparable.
+
+    Les valeurs numériques entières (110, 110.0, "110") deviennent des
+    entiers, les autres valeurs des chaînes ; les valeurs nulles et les
+    chaînes vides deviennent None.
+
+    Args:
+        values: Clés
+
+    Returns:
+        Les clés normalisées (même index)
+    """
+    if values.dtype.kind in "iu":
+        # Colonne entière: clés déjà normalisées
+        return pd.Series(values.to_numpy(dtype=object), index=values.index, dtype=object)
+    if values.dtype.kind == "f":
+        # Colonne décimale: pas de conversion des valeurs une à une
+        numeric = values.to_numpy(dtype=float)
+        values = values.astype(object)
+        missing = np.isnan(numeric)
+    else:
+        values = values.astype(object)
+        missing = values.isna().to_numpy() | (values == "").to_numpy()
+        numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    integral = ~missing & np.isfinite(numeric) & (numeric == np.floor(numeric))
+
+    keys = values.to_numpy(dtype=object, copy=True)
+    keys[integral] = numeric[integral].astype(np.int64)
+    textual = ~missing & ~integral
+    keys[textual] = values[textual].astype(str).to_numpy(dtype=object)
+    keys[missing] = None
+    return pd.Series(keys, index=values.index, dtype=object)
+
+
+def flatten_lists(owners: pd.Series, lists: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aplatit une colonne de listes.
+
+    Args:
+        owners: Identifiant de chaque ligne
+        lists: Listes de chaque ligne (les valeurs qui ne sont pas des listes comptent pour vides)
+
+    Returns:
+        Tuple contenant:
+        - Le propriétaire de chaque élément
+        - Les éléments, dans l'ordre des lignes puis des listes
+    """
+    column = ragged.from_lists(lists.to_numpy(dtype=object))
+    return owners.to_numpy(dtype=object)[ragged.row_ids(column)], column["values"]
+
+
+def inverse_relations(registry: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, str], Tuple[str, str]]:
+    """
+    Relations inverses déclarées dans le registre des tables.
+
+    Args:
+        registry: Registre des tables (clé "inverse": colonne de liste -> clé étrangère inverse)
+
+    Returns:
+        (table, colonne de liste) -> (table référencée, clé étrangère inverse)
+    """
+    return {
+        (table_name, column): (entry["references"][column], back_column)
+        for table_name, entry in registry.items()
+        for column, back_column in entry.get("inverse", {}).items()
+    }
+
+
+def build_inverse_index(tables: Dict[str, pd.DataFrame], registry: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Construit l'index inverse des listes d'identifiants.
+
+    Args:
+        tables: Données chargées de chaque table (clé primaire et colonnes de relations)
+        registry: Registre des tables
+
+    Returns:
+        DataFrame (colonnes INVERSE_COLUMNS) indexé par l'identifiant
+        référencé normalisé: une ligne par élément non nul d'une liste
+    """
+    parts = []
+    for (table_name, column), _ in inverse_relations(registry).items():
+        if table_name not in tables or column not in tables[table_name].columns:
+            continue
+        df = tables[table_name]
+        owners, members = flatten_lists(df[registry[table_name]["key"]], df[column])
+        part = pd.DataFrame({
+            "key": normalize_keys(pd.Series(members, dtype=object)).to_numpy(dtype=object),
+            "table": table_name,
+            "column": column,
+            "owner": normalize_keys(pd.Series(owners, dtype=object)).to_numpy(dtype=object)
+        }, columns=INVERSE_COLUMNS)
+        parts.append(part[part["key"].notna()])
+
+    inverse = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=INVERSE_COLUMNS)
+    return inverse.set_index("key", drop=False)
+
+
+def multi_owner_conflicts(inverse: pd.DataFrame) -> pd.DataFrame:
+    """
+    Identifiants listés par plusieurs lignes d'une même table.
+
+    La clé étrangère inverse étant simple, un identifiant ne peut appartenir
+    qu'à une ligne de chaque table qui le liste.
+
+    Args:
+        inverse: Index inverse (build_inverse_index)
+
+    Returns:
+        DataFrame des conflits (colonnes CONFLICT_COLUMNS)
+    """
+    links = inverse.reset_index(drop=True).drop_duplicates()
+    counts = links.groupby(["table", "column", "key"], sort=False)["owner"].transform("size")
+    conflicting = links[(counts > 1).to_numpy()]
+    if conflicting.empty:
+        return pd.DataFrame(columns=CONFLICT_COLUMNS)
+
+    # Listes des propriétaires constituées pour les seuls identifiants en conflit
+    owners = conflicting.groupby(["table", "column", "key"], sort=False)["owner"].agg(list)
+
+    tables = owners.index.get_level_values("table")
+    return pd.DataFrame({
+        "table": tables,
+        "column": owners.index.get_level_values("column"),
+        "value": owners.index.get_level_values("key"),
+        "owners": owners.to_numpy(dtype=object),
+        "count": owners.str.len().to_numpy(),
+        "reason": [f"Identifiant revendiqué par plusieurs lignes de {table}" for table in tables]
+    }, columns=CONFLICT_COLUMNS)
+
+
+def asymmetric_links(
+    inverse: pd.DataFrame,
+    tables: Dict[str, pd.DataFrame],
+    registry: Dict[str, Dict[str, Any]]
+) -> pd.DataFrame:
+    """
+    Liens qui ne concordent pas dans les deux sens.
+
+    Un lien est asymétrique lorsque la liste d'une ligne contient un
+    identifiant dont la clé étrangère inverse désigne une autre ligne, ou
+    lorsque la clé étrangère inverse désigne une ligne existante qui ne liste
+    pas l'identifiant. Les clés étrangères inverses non renseignées ne sont
+    pas signalées (relation pas encore remplie), ni les lignes absentes
+    (références orphelines, signalées par le contrôle d'intégrité).
+
+    Args:
+        inverse: Index inverse (build_inverse_index)
+        tables: Données chargées de chaque table
+        registry: Registre des tables
+
+    Returns:
+        DataFrame des liens asymétriques (colonnes ASYMMETRY_COLUMNS)
+    """
+    reports = []
+    for (table_name, column), (target_table, back_column) in inverse_relations(registry).items():
+        if table_name not in tables or target_table not in tables:
+            continue
+        target = tables[target_table]
+        back = pd.DataFrame({
+            "key": normalize_keys(target[registry[target_table]["key"]]).to_numpy(dtype=object),
+            "owner": normalize_keys(target[back_column]).to_numpy(dtype=object)
+        }).dropna().drop_duplicates()
+        relation = (inverse["table"] == table_name).to_numpy() & (inverse["column"] == column).to_numpy()
+        forward = inverse.loc[relation, ["key", "owner"]]
+        forward = forward.reset_index(drop=True).drop_duplicates()
+
+        links = forward.merge(back, on=["key", "owner"], how="outer", indicator=True)
+        back_owners = back.drop_duplicates("key").set_index("key")["owner"]
+        known_owners = pd.Index(normalize_keys(tables[table_name][registry[table_name]["key"]]).dropna().unique())
+
+        # Listé d'un côté, mais la clé inverse désigne une autre ligne
+        listed = links[(links["_merge"] == "left_only").to_numpy() & links["key"].isin(back_owners.index).to_numpy()]
+        listed_back = back_owners.reindex(listed["key"]).to_numpy(dtype=object)
+        reports.append(pd.DataFrame({
+            "table": table_name,
+            "id": listed["owner"].to_numpy(dtype=object),
+            "column": column,
+            "value": listed["key"].to_numpy(dtype=object),
+            "back_table": target_table,
+            "back_column": back_column,
+            "back_value": listed_back,
+            "reason": f"Identifiant listé, mais {target_table}.{back_column} désigne une autre ligne"
+        }, columns=ASYMMETRY_COLUMNS))
+
+        # Désigné par la clé inverse, mais absent de la liste de la ligne désignée
+        unlisted = links[(links["_merge"] == "right_only").to_numpy() & links["owner"].isin(known_owners).to_numpy()]
+        reports.append(pd.DataFrame({
+            "table": table_name,
+            "id": unlisted["owner"].to_numpy(dtype=object),
+            "column": column,
+            "value": unlisted["key"].to_numpy(dtype=object),
+            "back_table": target_table,
+            "back_column": back_column,
+            "back_value": unlisted["owner"].to_numpy(dtype=object),
+            "reason": f"{target_table}.{back_column} désigne cette ligne, qui ne liste pas l'identifiant"
+        }, columns=ASYMMETRY_COLUMNS))
+
+    reports = [report for report in reports if not report.empty]
+    return pd.concat(reports, ignore_index=True) if reports else pd.DataFrame(columns=ASYMMETRY_COLUMNS)
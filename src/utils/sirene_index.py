@@ -0,0 +1,352 @@
+"""
+Module d'index local du répertoire SIRENE.
+Compile une seule fois un extrait SIRENE (CSV, éventuellement compressé en
+gzip) déposé dans data/reference/ en un index compact : clés SIREN et SIRET
+triées, stockées en tableaux numpy lus par projection mémoire. Les
+recherches se font par lots (recherche dichotomique vectorisée), sans
+parcourir l'extrait à chaque exécution.
+"""
+
+import glob
+import gzip
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Répertoire des référentiels et motifs des extraits SIRENE reconnus
+REFERENCE_DIR = "data/reference"
+SIRENE_EXTRACT_PATTERNS = ("sirene*.csv", "sirene*.csv.gz")
+
+# Sous-répertoire de l'index compilé
+INDEX_DIRNAME = "sirene_index"
+
+# Version du format de l'index (recompilation si elle change)
+INDEX_VERSION = 1
+
+# Nombre de lignes de l'extrait lues à la fois lors de la compilation
+COMPILE_CHUNK_SIZE = 500_000
+
+# Noms de colonnes acceptés dans l'extrait (fichiers INSEE ou extraits simplifiés)
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "siret": ("siret",),
+    "siren": ("siren",),
+    "postal_code": ("codePostalEtablissement", "code_postal", "postal_code"),
+    "legal_form": ("categorieJuridiqueUniteLegale", "forme_juridique", "legal_form"),
+    "head_office": ("etablissementSiege", "siege", "head_office"),
+    "state": ("etatAdministratifEtablissement", "etat_administratif"),
+}
+
+# Libellés des catégories juridiques INSEE, dans la forme utilisée par les données sources
+LEGAL_FORM_LABELS: Dict[str, str] = {
+    "1000": "Entrepreneur individuel",
+    "3120": "Société commerciale étrangère immatriculée au RCS",
+    "3290": "Autre personne morale de droit étranger",
+    "5308": "Société en commandite par actions",
+    "5485": "SERL, société d'exercice libéral à responsabilité limitée",
+    "5498": "EURL, entreprise unipersonnelle à responsabilité limitée",
+    "5499": "SARL, société à responsabilité limitée",
+    "5599": "SA à conseil d'administration (s.a.i.)",
+    "5699": "SA à directoire (s.a.i.)",
+    "5710": "SAS, société par actions simplifiée",
+    "5785": "Société d'exercice libéral par action simplifiée",
+    "6540": "SCI, société civile immobilière",
+    "9900": "Autre personne morale de droit privé",
+}
+
+# Fichiers de l'index compilé: nom -> type des valeurs
+INDEX_ARRAYS: Dict[str, str] = {
+    "siret": "int64",             # SIRET triés
+    "siret_postal_code": "S5",    # Code postal de chaque établissement
+    "siren": "int64",             # SIREN triés (unités légales)
+    "siren_siret": "int64",       # SIRET de référence de l'unité légale (siège actif de préférence)
+    "siren_legal_form": "int16",  # Position du libellé de forme juridique (-1 si inconnue)
+}
+
+
+def find_sirene_extract(reference_dir: str = REFERENCE_DIR) -> Optional[str]:
+    """
+    Recherche l'extrait SIRENE le plus récent du répertoire des référentiels.
+
+    Args:
+        reference_dir: Répertoire des référentiels
+
+    Returns:
+        Chemin de l'extrait, None si aucun extrait n'est présent
+    """
+    candidates = [
+        path for pattern in SIRENE_EXTRACT_PATTERNS
+        for path in glob.glob(os.path.join(reference_dir, pattern))
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def _source_signature(extract_path: str) -> Dict[str, Any]:
+    stat = os.stat(extract_path)
+    return {
+        "version": INDEX_VERSION,
+        "source": os.path.basename(extract_path),
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime
+    }
+
+
+def _detect_separator(extract_path: str) -> str:
+    opener = gzip.open if extract_path.endswith(".gz") else open
+    with opener(extract_path, 'rt', encoding='utf-8') as file:
+        header = file.readline()
+    return ';' if header.count(';') > header.count(',') else ','
+
+
+def _resolve_columns(extract_path: str, separator: str) -> Dict[str, str]:
+    header = pd.read_csv(extract_path, sep=separator, nrows=0, compression='infer').columns
+    columns = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in header:
+                columns[key] = alias
+                break
+    if "siret" not in columns:
+        raise ValueError(f"L'extrait SIRENE ne contient pas de colonne SIRET: {extract_path}")
+    return columns
+
+
+def compile_sirene_index(extract_path: str, index_dir: str) -> Dict[str, Any]:
+    """
+    Compile un extrait SIRENE en index trié.
+
+    L'extrait est lu par blocs ; seuls les établissements dont le SIRET est
+    valide sont retenus (premier en cas de doublon). Pour chaque SIREN, le
+    SIRET de référence est celui du siège, de préférence actif.
+
+    Args:
+        extract_path: Chemin de l'extrait (CSV, .csv.gz)
+        index_dir: Répertoire de l'index compilé
+
+    Returns:
+        Métadonnées de l'index (source, nombres d'établissements et d'unités légales)
+    """
+    separator = _detect_separator(extract_path)
+    columns = _resolve_columns(extract_path, separator)
+    legal_forms: Dict[str, int] = {}
+    parts: Dict[str, List[np.ndarray]] = {name: [] for name in ("siret", "siren", "postal_code", "legal_form", "rank")}
+
+    reader = pd.read_csv(
+        extract_path,
+        sep=separator,
+        usecols=list(columns.values()),
+        dtype=str,
+        keep_default_na=False,
+        chunksize=COMPILE_CHUNK_SIZE,
+        compression='infer'
+    )
+    for chunk in reader:
+        chunk = chunk.rename(columns={alias: key for key, alias in columns.items()})
+        sirets = identifier_keys(chunk["siret"].str.strip().to_numpy(dtype=object), 14)
+        valid = sirets >= 0
+        chunk = chunk[valid]
+        sirets = sirets[valid]
+
+        # SIREN déclaré, à défaut les 9 premiers chiffres du SIRET
+        sirens = sirets // 100_000
+        if "siren" in chunk:
+            declared = identifier_keys(chunk["siren"].str.strip().to_numpy(dtype=object), 9)
+            sirens = np.where(declared >= 0, declared, sirens)
+
+        postal_codes = (
+            chunk["postal_code"].str.strip().str.encode('ascii', errors='ignore').to_numpy(dtype='S5')
+            if "postal_code" in chunk else np.zeros(len(chunk), dtype='S5')
+        )
+
+        legal_form = np.full(len(chunk), -1, dtype=np.int16)
+        if "legal_form" in chunk:
+            codes, labels = pd.factorize(chunk["legal_form"].str.strip())
+            mapping = np.array([
+                legal_forms.setdefault(LEGAL_FORM_LABELS.get(label, label), len(legal_forms)) if label else -1
+                for label in labels
+            ], dtype=np.int16)
+            legal_form[codes >= 0] = mapping[codes[codes >= 0]]
+
+        # Rang de préférence du SIRET de référence: siège actif, siège, établissement actif, autre
+        head_office = (
+            chunk["head_office"].str.strip().str.lower().isin(("true", "1", "oui", "o")).to_numpy()
+            if "head_office" in chunk else np.zeros(len(chunk), dtype=bool)
+        )
+        active = (
+            chunk["state"].str.strip().str.upper().eq("A").to_numpy()
+            if "state" in chunk else np.ones(len(chunk), dtype=bool)
+        )
+        rank = (~head_office).astype(np.int8) * 2 + (~active).astype(np.int8)
+
+        for name, values in zip(parts, (sirets, sirens, postal_codes, legal_form, rank)):
+            parts[name].append(values)
+
+    data = {
+        name: np.concatenate(values) if values else np.empty(0, dtype=dtype)
+        for (name, values), dtype in zip(parts.items(), ("int64", "int64", "S5", "int16", "int8"))
+    }
+
+    # Table des établissements, triée par SIRET (premier établissement conservé en cas de doublon)
+    order = np.argsort(data["siret"], kind="stable")
+    sirets, first = np.unique(data["siret"][order], return_index=True)
+    establishments = order[first]
+
+    # Table des unités légales, triée par SIREN, avec leur SIRET de référence
+    order = np.lexsort((data["rank"], data["siren"]))
+    sirens, first = np.unique(data["siren"][order], return_index=True)
+    companies = order[first]
+
+    arrays = {
+        "siret": sirets,
+        "siret_postal_code": data["postal_code"][establishments],
+        "siren": sirens,
+        "siren_siret": data["siret"][companies],
+        "siren_legal_form": data["legal_form"][companies],
+    }
+
+    os.makedirs(index_dir, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(index_dir, f"{name}.npy"), values.astype(INDEX_ARRAYS[name]))
+
+    meta = {
+        **_source_signature(extract_path),
+        "legal_forms": sorted(legal_forms, key=legal_forms.get),
+        "establishments": int(len(sirets)),
+        "companies": int(len(sirens))
+    }
+    # Métadonnées écrites en dernier: un index incomplet n'est jamais considéré à jour
+    with open(os.path.join(index_dir, "meta.json"), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, ensure_ascii=False, indent=2)
+    return meta
+
+
+def load_sirene_index(index_dir: str) -> Dict[str, Any]:
+    """
+    Charge un index compilé par projection mémoire (aucune lecture complète).
+
+    Args:
+        index_dir: Répertoire de l'index compilé
+
+    Returns:
+        Dictionnaire de l'index: tableaux triés, libellés de formes juridiques et métadonnées
+    """
+    with open(os.path.join(index_dir, "meta.json"), 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+    index = {name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode='r') for name in INDEX_ARRAYS}
+    # Libellés des formes juridiques ; la position -1 (forme inconnue) désigne le None final
+    index["legal_forms"] = np.array(meta["legal_forms"] + [None], dtype=object)
+    index["meta"] = meta
+    return index
+
+
+def open_sirene_index(reference_dir: str = REFERENCE_DIR) -> Optional[Dict[str, Any]]:
+    """
+    Ouvre l'index de l'extrait SIRENE du répertoire des référentiels.
+
+    L'index n'est (re)compilé que si l'extrait a changé depuis la dernière
+    compilation (nom, taille ou date de modification).
+
+    Args:
+        reference_dir: Répertoire des référentiels
+
+    Returns:
+        L'index chargé, None si aucun extrait n'est présent
+    """
+    extract_path = find_sirene_extract(reference_dir)
+    if extract_path is None:
+        return None
+
+    index_dir = os.path.join(reference_dir, INDEX_DIRNAME)
+    meta_path = os.path.join(index_dir, "meta.json")
+    up_to_date = False
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        signature = _source_signature(extract_path)
+        up_to_date = all(meta.get(key) == value for key, value in signature.items())
+
+    if not up_to_date:
+        compile_sirene_index(extract_path, index_dir)
+    return load_sirene_index(index_dir)
+
+
+def _search(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    # Positions des clés dans le tableau trié, -1 si absentes
+    if not len(sorted_keys):
+        return np.full(len(keys), -1, dtype=np.intp)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    found = np.asarray(sorted_keys[positions]) == keys
+    return np.where(found, positions, -1)
+
+
+def identifier_keys(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Convertit des identifiants (SIREN, SIRET) en clés entières de l'index.
+
+    Args:
+        values: Identifiants (tableau d'objets ; valeurs nulles admises)
+        length: Nombre de chiffres de l'identifiant
+
+    Returns:
+        Clés entières, -1 pour les valeurs qui ne sont pas composées de length chiffres
+    """
+    text = pd.Series(values, dtype=object)
+    keys = np.full(len(text), -1, dtype=np.int64)
+    valid = text.str.fullmatch(rf'[0-9]{{{length}}}', na=False).to_numpy(dtype=bool)
+    if valid.any():
+        keys[valid] = text[valid].astype(np.int64).to_numpy()
+    return keys
+
+
+def lookup_sirets(index: Dict[str, Any], sirets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recherche un lot de SIRET dans l'index.
+
+    Args:
+        index: Index chargé par open_sirene_index
+        sirets: SIRET recherchés (tableau d'objets)
+
+    Returns:
+        Tuple contenant:
+        - Le masque des SIRET présents dans l'index
+        - Le code postal de chaque établissement trouvé (None sinon)
+    """
+    keys = identifier_keys(sirets, 14)
+    positions = np.where(keys >= 0, _search(index["siret"], keys), -1)
+    found = positions >= 0
+    postal_codes = np.full(len(keys), None, dtype=object)
+    if found.any():
+        codes = np.asarray(index["siret_postal_code"][positions[found]])
+        postal_codes[found] = [code.decode('ascii') or None for code in codes]
+    return found, postal_codes
+
+
+def lookup_sirens(index: Dict[str, Any], sirens: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Recherche un lot de SIREN dans l'index.
+
+    Args:
+        index: Index chargé par open_sirene_index
+        sirens: SIREN recherchés (tableau d'objets)
+
+    Returns:
+        Dictionnaire de tableaux alignés sur sirens:
+        - "found": masque des SIREN présents dans l'index
+        - "siret": SIRET de référence (chaîne de 14 chiffres, None si absent)
+        - "legal_form": libellé de la forme juridique (None si inconnu)
+    """
+    keys = identifier_keys(sirens, 9)
+    positions = np.where(keys >= 0, _search(index["siren"], keys), -1)
+    found = positions >= 0
+
+    sirets = np.full(len(keys), None, dtype=object)
+    legal_forms = np.full(len(keys), None, dtype=object)
+    if found.any():
+        sirets[found] = [f"{siret:014d}" for siret in np.asarray(index["siren_siret"][positions[found]])]
+        legal_forms[found] = index["legal_forms"][np.asarray(index["siren_legal_form"][positions[found]])]
+    return {"found": found, "siret": sirets, "legal_form": legal_forms}
@@ -0,0 +1,222 @@
+"""
+Module de normalisation des caractères spéciaux partagé par les tables.
+Compile la table de substitution une seule fois, traite chaque valeur
+distincte une seule fois, ne translittère que les valeurs non ASCII et
+normalise les espaces colonne par colonne.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import unidecode
+
+from src.utils.copy_on_write import step_copy
+from src.utils.factorize import factorize_strings
+
+
+# Dictionnaire de substitution commun aux tables (appliqué dans l'ordre)
+SPECIAL_CHARS_MAP: Dict[str, str] = {
+    # Apostrophes et guillemets
+    "′": "'",
+    # Entrée héritée des anciennes tables de substitution (guillemets typographiques
+    # perdus à l'encodage): conservée pour ne pas modifier les sorties
+    ": '\"',\n        ": '"',
+    "«": '"',
+    "»": '"',
+    # Tirets et espaces
+    "—": "-",
+    "–": "-",
+    "‐": "-",
+    "‑": "-",
+    "\xad": "",  # Suppression des espaces invisibles
+    "\u200b": "",  # Suppression des espaces de largeur nulle
+    "\ufeff": "",  # Suppression du BOM UTF-8
+    # Autres caractères problématiques
+    "�": "",
+    # Symboles mathématiques fréquents
+    "×": "X",
+    "÷": "/",
+}
+
+# Fractions
+FRACTIONS_MAP: Dict[str, str] = {
+    "½": "1/2",
+    "¼": "1/4",
+    "¾": "3/4",
+}
+
+# Symboles monétaires
+CURRENCY_MAP: Dict[str, str] = {
+    "€": "EUR",
+    "$": "USD",
+    "£": "GBP",
+    "¥": "JPY",
+}
+
+# Dictionnaire appliqué par défaut (caractères spéciaux et fractions)
+DEFAULT_CHAR_MAP: Dict[str, str] = {**SPECIAL_CHARS_MAP, **FRACTIONS_MAP}
+
+# Opération compilée: table de translation (caractères isolés) ou couple (motif, remplacement)
+CompiledOp = Union[Dict[int, str], Tuple[str, str]]
+
+
+def compile_char_map(char_map: Dict[str, str]) -> List[CompiledOp]:
+    """
+    Compile un dictionnaire de substitution en opérations équivalentes.
+
+    Les remplacements de caractères isolés consécutifs sont regroupés dans une
+    table str.translate ; un motif de plusieurs caractères, ou un remplacement
+    produisant un caractère à remplacer plus loin, ouvre une nouvelle opération,
+    de sorte que le résultat reste celui des str.replace successifs.
+
+    Args:
+        char_map: Dictionnaire caractère -> remplacement, dans l'ordre d'application
+
+    Returns:
+        Liste ordonnée des opérations
+    """
+    operations: List[CompiledOp] = []
+    group: Dict[str, str] = {}
+
+    def close_group() -> None:
+        if group:
+            operations.append(str.maketrans(dict(group)))
+            group.clear()
+
+    for char, replacement in char_map.items():
+        if len(char) != 1:
+            close_group()
+            operations.append((char, replacement))
+            continue
+        # Un remplacement déjà groupé qui produit ce caractère serait retraité par str.replace
+        if any(char in previous for previous in group.values()):
+            close_group()
+        group[char] = replacement
+
+    close_group()
+    return operations
+
+
+def normalize_strings(text: pd.Series, operations: List[CompiledOp]) -> pd.Series:
+    """
+    Normalise une Series de chaînes (sans valeur nulle).
+
+    Substitutions, translittération (unidecode, uniquement si la chaîne
+    contient des caractères non ASCII), réduction des suites d'espaces à un
+    espace puis suppression des espaces de début et de fin.
+
+    Args:
+        text: Chaînes à normaliser
+        operations: Opérations compilées par compile_char_map
+
+    Returns:
+        Les chaînes normalisées (même index)
+    """
+    for operation in operations:
+        if isinstance(operation, dict):
+            text = text.str.translate(operation)
+        else:
+            text = text.str.replace(operation[0], operation[1], regex=False)
+    non_ascii = ~np.fromiter((value.isascii() for value in text.array), dtype=bool, count=len(text))
+    if non_ascii.any():
+        text = text.copy()
+        text[non_ascii] = text[non_ascii].map(unidecode.unidecode)
+    return text.str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def normalize_chars_series(series: pd.Series, operations: List[CompiledOp]) -> pd.Series:
+    """
+    Normalise les chaînes d'une colonne; les autres valeurs sont conservées.
+
+    Chaque chaîne distincte est normalisée une seule fois (normalize_strings),
+    puis les résultats sont redistribués sur les lignes par les codes de
+    factorisation.
+
+    Args:
+        series: Colonne à normaliser
+        operations: Opérations compilées par compile_char_map
+
+    Returns:
+        La colonne normalisée (nouvelle Series)
+    """
+    result = series.copy()
+    codes, uniques = factorize_strings(series)
+    if not len(uniques):
+        return result
+
+    normalized = normalize_strings(pd.Series(uniques, dtype=object), operations)
+    text_mask = codes >= 0
+    result[text_mask] = normalized.to_numpy(dtype=object)[codes[text_mask]]
+    return result
+
+
+def normalize_special_chars_fields(
+    df: pd.DataFrame,
+    text_fields: Iterable[str],
+    id_column: str,
+    char_map: Optional[Dict[str, str]] = None,
+    excluded_fields: Iterable[str] = ()
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Normalise les caractères spéciaux des champs textuels d'une table.
+
+    Args:
+        df: DataFrame à normaliser
+        text_fields: Champs à normaliser
+        id_column: Colonne identifiant de la table (reportée dans les erreurs)
+        char_map: Dictionnaire de substitution (DEFAULT_CHAR_MAP par défaut)
+        excluded_fields: Champs à ne jamais normaliser (identifiants, codes postaux)
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les caractères spéciaux normalisés
+        - La liste des modifications (info) et des erreurs de normalisation
+    """
+    errors = []
+    result_df = step_copy(df)
+    operations = compile_char_map(char_map if char_map is not None else DEFAULT_CHAR_MAP)
+    excluded = set(excluded_fields)
+
+    for field in text_fields:
+        if field not in result_df.columns or field in excluded:
+            continue
+        try:
+            # Sauvegarde des valeurs originales pour comparaison
+            original_values = result_df[field].copy()
+
+            # Application de la normalisation
+            result_df[field] = normalize_chars_series(result_df[field], operations)
+
+            # Détection des lignes modifiées pour logging
+            modified_mask = (original_values != result_df[field]) & (~pd.isna(original_values))
+            positions = np.flatnonzero(modified_mask.to_numpy())
+            if not len(positions):
+                continue
+
+            indices = result_df.index[positions].tolist()
+            originals = original_values.to_numpy()[positions]
+            normalized = result_df[field].to_numpy()[positions]
+            ids = result_df[id_column].to_numpy()[positions]
+
+            # Enregistrement des modifications pour suivi
+            for idx, record_id, original, value in zip(indices, ids, originals, normalized):
+                errors.append({
+                    "type": "special_chars_normalization",
+                    "severity": "info",
+                    id_column: record_id,
+                    "field": field,
+                    "original": original,
+                    "normalized": value,
+                    "index": idx
+                })
+        except Exception as e:
+            # Enregistrer l'erreur si la normalisation échoue
+            errors.append({
+                "type": "special_chars_normalization_error",
+                "severity": "error",
+                "field": field,
+                "message": str(e)
+            })
+
+    return result_df, errors
@@ -0,0 +1,193 @@
+"""
+Module de mesure des étapes de transformation.
+Relève pour chaque étape le temps écoulé, le temps CPU, le nombre de lignes,
+le débit, la mémoire du DataFrame et la variation de mémoire du processus,
+puis les écrit au format JSON.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import psutil
+
+from src.utils.copy_on_write import copy_free_enabled, shared_bytes
+
+
+def step_name(step: Dict[str, Any]) -> str:
+    """Nom d'une étape: son libellé, à défaut le nom de sa fonction."""
+    if step["label"]:
+        return step["label"]
+    func = getattr(step["func"], "func", step["func"])  # functools.partial
+    return getattr(func, "__name__", repr(func))
+
+
+def init_step_metrics(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Prépare les compteurs de mesure, un par étape.
+
+    Args:
+        steps: Étapes décrites par pipeline_step
+
+    Returns:
+        Liste des mesures, dans l'ordre des étapes
+    """
+    return [
+        {
+            "step": step_name(step),
+            "scope": step["scope"],
+            "calls": 0,
+            "wall_time_s": 0.0,
+            "cpu_time_s": 0.0,
+            "rows_in": 0,
+            "rows_out": 0,
+            "rows_per_s": None,
+            "memory_bytes": 0,
+            "rss_delta_bytes": 0,
+            "rss_max_bytes": 0,
+            "copy_saved_bytes": 0
+        }
+        for step in steps
+    ]
+
+
+def measure_step(
+    func: Callable[[pd.DataFrame], Tuple[pd.DataFrame, List[Dict[str, Any]]]],
+    df: pd.DataFrame,
+    step_metrics: Dict[str, Any]
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Exécute une étape en cumulant ses mesures (une fois par lot en mode par lots).
+
+    La mémoire retenue est celle du plus gros DataFrame produit par l'étape
+    (memory_usage(deep=True)). En mode sans copie, copy_saved_bytes cumule la
+    mémoire des colonnes de l'entrée que le résultat réutilise sans les copier.
+
+    Args:
+        func: Fonction de l'étape
+        df: DataFrame d'entrée
+        step_metrics: Mesures de l'étape (complétées sur place)
+
+    Returns:
+        Le résultat de l'étape
+    """
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    result_df, step_errors = func(df)
+
+    step_metrics["wall_time_s"] += time.perf_counter() - wall_start
+    step_metrics["cpu_time_s"] += time.process_time() - cpu_start
+    rss_after = process.memory_info().rss
+    step_metrics["rss_delta_bytes"] += rss_after - rss_before
+    step_metrics["rss_max_bytes"] = max(step_metrics["rss_max_bytes"], rss_after)
+    step_metrics["calls"] += 1
+    step_metrics["rows_in"] += len(df)
+    step_metrics["rows_out"] += len(result_df)
+    step_metrics["memory_bytes"] = max(
+        step_metrics["memory_bytes"], int(result_df.memory_usage(deep=True).sum())
+    )
+    if copy_free_enabled():
+        step_metrics["copy_saved_bytes"] += shared_bytes(df, result_df)
+
+    return result_df, step_errors
+
+
+def summarize_metrics(
+    table_name: str,
+    step_metrics: List[Dict[str, Any]],
+    wall_time_s: float,
+    cpu_time_s: float,
+    rows: int,
+    chunk_size: Any = None,
+    phases: Optional[Dict[str, float]] = None,
+    copy_free: bool = False
+) -> Dict[str, Any]:
+    """
+    Assemble les mesures d'un traitement de table.
+
+    Args:
+        table_name: Nom de la table
+        step_metrics: Mesures cumulées par étape
+        wall_time_s: Temps écoulé total du traitement
+        cpu_time_s: Temps CPU total du traitement
+        rows: Nombre de lignes traitées
+        chunk_size: Taille des lots (None pour la table complète)
+        phases: Temps écoulé des phases hors étapes (lecture, rapport d'erreurs...)
+        copy_free: Traitement exécuté en mode sans copie
+
+    Returns:
+        Dictionnaire des mesures, sérialisable en JSON
+    """
+    for metrics in step_metrics:
+        metrics["wall_time_s"] = round(metrics["wall_time_s"], 6)
+        metrics["cpu_time_s"] = round(metrics["cpu_time_s"], 6)
+        if metrics["wall_time_s"] > 0:
+            metrics["rows_per_s"] = round(metrics["rows_in"] / metrics["wall_time_s"], 1)
+
+    return {
+        "table": table_name,
+        "rows": rows,
+        "chunk_size": chunk_size,
+        "wall_time_s": round(wall_time_s, 6),
+        "cpu_time_s": round(cpu_time_s, 6),
+        "rows_per_s": round(rows / wall_time_s, 1) if wall_time_s > 0 else None,
+        "phases_wall_time_s": {phase: round(duration, 6) for phase, duration in (phases or {}).items()},
+        "copy_free": copy_free,
+        # Mémoire des copies évitées par le mode sans copie, toutes étapes confondues
+        "copy_saved_bytes": sum(metrics["copy_saved_bytes"] for metrics in step_metrics),
+        # RSS maximale relevée à la fin des étapes et du traitement
+        "peak_rss_bytes": max(
+            [psutil.Process().memory_info().rss] + [metrics["rss_max_bytes"] for metrics in step_metrics]
+        ),
+        "steps": step_metrics
+    }
+
+
+def write_metrics(file_path: str, metrics: Dict[str, Any]) -> None:
+    """
+    Écrit les mesures d'un traitement dans un fichier JSON.
+
+    Args:
+        file_path: Chemin du fichier de mesures
+        metrics: Mesures assemblées par summarize_metrics
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(metrics, file, ensure_ascii=False, indent=2)
+
+
+def format_metrics_table(metrics: Dict[str, Any], width: int = 45) -> List[str]:
+    """
+    Met en forme les mesures par étape pour l'affichage console.
+
+    Args:
+        metrics: Mesures assemblées par summarize_metrics
+        width: Largeur de la colonne des noms d'étapes
+
+    Returns:
+        Lignes du tableau, en-tête compris
+    """
+    lines = [
+        f"  {'Étape':<{width}} {'Temps (s)':>9} {'CPU (s)':>8} {'Lignes':>8} {'Lignes/s':>10} {'Mém. (Mo)':>9} {'RSS (Mo)':>9}"
+    ]
+    for step in metrics["steps"]:
+        name = step["step"] if len(step["step"]) <= width else step["step"][:width - 1] + "…"
+        rows_per_s = f"{step['rows_per_s']:.0f}" if step["rows_per_s"] is not None else "-"
+        lines.append(
+            f"  {name:<{width}} {step['wall_time_s']:>9.3f} {step['cpu_time_s']:>8.3f} "
+            f"{step['rows_out']:>8} {rows_per_s:>10} "
+            f"{step['memory_bytes'] / 1e6:>9.1f} {step['rss_delta_bytes'] / 1e6:>+9.1f}"
+        )
+    lines.append(
+        f"  {'Total (RSS max.)':<{width}} {metrics['wall_time_s']:>9.3f} {metrics['cpu_time_s']:>8.3f} "
+        f"{metrics['rows']:>8} {metrics['rows_per_s'] or 0:>10.0f} "
+        f"{'':>9} {metrics['peak_rss_bytes'] / 1e6:>9.1f}"
+    )
+    if metrics.get("copy_free"):
+        lines.append(f"  Mode sans copie: {metrics['copy_saved_bytes'] / 1e6:.1f} Mo de copies évitées")
+    return lines
@@ -0,0 +1,286 @@
+"""
+Module d'exécution générique du traitement d'une table.
+Chaque table déclare son pipeline (étapes, catégories d'erreurs, colonne
+identifiant, rapport d'erreurs) et un seul moteur enchaîne lecture,
+transformations, sauvegarde et génération du rapport.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.copy_on_write import copy_free_mode
+from src.utils.logging_manager import setup_logger
+from src.utils.json_stream import ValidateFn, read_validated_frame, read_validated_chunks, write_json_array
+from src.utils.pipeline_steps import close_steps, run_steps, run_steps_in_chunks
+from src.utils.step_metrics import init_step_metrics, summarize_metrics, write_metrics
+
+
+BuildStepsFn = Callable[[str, logging.Logger], List[Dict[str, Any]]]
+ReportFn = Callable[[Dict[str, List[Dict[str, Any]]], str, List[Dict[str, Any]]], None]
+
+
+def table_pipeline(
+    name: str,
+    id_column: str,
+    error_categories: List[str],
+    validate_fn: ValidateFn,
+    build_steps: BuildStepsFn,
+    report_fn: ReportFn,
+    nan_to_none: bool = False,
+    copy_free: bool = False,
+    resolves_references: bool = False,
+    technical_columns: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Décrit le pipeline de traitement d'une table.
+
+    Args:
+        name: Nom de la table (préfixe des logs et du rapport d'erreurs)
+        id_column: Colonne identifiant de la table (ex: co_id)
+        error_categories: Catégories d'erreurs, dans l'ordre des onglets du rapport
+        validate_fn: Fonction validate_input_structure de la table
+        build_steps: Fonction (patches_dir, logger) -> étapes décrites par pipeline_step
+        report_fn: Fonction generate_error_report de la table
+        nan_to_none: Convertit les NaN en None (null en JSON) dans le fichier de sortie
+        copy_free: Exécute les étapes en mode sans copie (voir src/utils/copy_on_write.py) ;
+            les étapes doivent respecter le contrat de ce mode
+        resolves_references: Les étapes lisent les sorties des tables référencées ;
+            build_steps reçoit alors en outre clean_dir, répertoire du fichier de sortie
+        technical_columns: Colonnes de travail écrites par les étapes, retirées du fichier de sortie
+
+    Returns:
+        Dictionnaire décrivant le pipeline
+    """
+    if "structure" not in error_categories or "general" not in error_categories:
+        raise ValueError(f"Le pipeline '{name}' doit déclarer les catégories 'structure' et 'general'")
+
+    return {
+        "name": name,
+        "id_column": id_column,
+        "error_categories": list(error_categories),
+        "validate_fn": validate_fn,
+        "build_steps": build_steps,
+        "report_fn": report_fn,
+        "nan_to_none": nan_to_none,
+        "copy_free": copy_free,
+        "resolves_references": resolves_references,
+        # Champ technique ajouté par la validation, retiré du fichier de sortie
+        "status_column": f"{id_column.split('_')[0]}_validation_status",
+        "technical_columns": list(technical_columns or [])
+    }
+
+
+def frame_to_records(pipeline: Dict[str, Any], frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convertit un DataFrame transformé en enregistrements de sortie.
+
+    Args:
+        pipeline: Pipeline de la table (décrit par table_pipeline)
+        frame: DataFrame transformé
+
+    Returns:
+        Liste des enregistrements à écrire
+    """
+    output_data = frame.to_dict(orient='records')
+
+    for record in output_data:
+        if pipeline["nan_to_none"]:
+            # Convertir les NaN en None (qui deviendra null en JSON)
+            for key, value in record.items():
+                # Vérifier si c'est un array/Series ou une valeur scalaire avant d'utiliser pd.isna
+                if isinstance(value, (list, pd.Series, np.ndarray)):
+                    continue
+                elif pd.isna(value):
+                    record[key] = None
+
+        # Suppression du champ de statut de validation et des colonnes de travail
+        record.pop(pipeline["status_column"], None)
+        for column in pipeline["technical_columns"]:
+            record.pop(column, None)
+
+    return output_data
+
+
+def run_table_pipeline(
+    pipeline: Dict[str, Any],
+    input_file_path: str,
+    output_file_path: str,
+    patches_dir: str = "data/patches",
+    error_report_dir: str = "data/error_report",
+    log_dir: str = "logs",
+    chunk_size: Optional[int] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    check_inputs: bool = False
+) -> Tuple[bool, Optional[str]]:
+    """
+    Nettoie et transforme les données d'une table selon son pipeline.
+
+    Args:
+        pipeline: Pipeline de la table (décrit par table_pipeline)
+        input_file_path: Chemin vers le fichier JSON d'entrée
+        output_file_path: Chemin vers le fichier JSON de sortie
+        patches_dir: Répertoire contenant les fichiers de correctifs
+        error_report_dir: Répertoire pour les rapports d'erreurs
+        log_dir: Répertoire pour les fichiers de log
+        chunk_size: Nombre de lignes par lot (None pour traiter la table en une fois)
+        metrics: Dictionnaire complété sur place avec les mesures du traitement
+            (également écrites dans <log_dir>/<table>_<timestamp>.metrics.json)
+        check_inputs: Contrôle que chaque étape laisse son entrée intacte (débogage du mode sans copie)
+
+    Returns:
+        Tuple[bool, Optional[str]]: (Succès, Chemin du rapport d'erreurs si généré)
+    """
+    with copy_free_mode(pipeline["copy_free"]):
+        return _run_table_pipeline(
+            pipeline, input_file_path, output_file_path, patches_dir, error_report_dir,
+            log_dir, chunk_size, metrics, check_inputs
+        )
+
+
+def _run_table_pipeline(
+    pipeline: Dict[str, Any],
+    input_file_path: str,
+    output_file_path: str,
+    patches_dir: str,
+    error_report_dir: str,
+    log_dir: str,
+    chunk_size: Optional[int],
+    metrics: Optional[Dict[str, Any]],
+    check_inputs: bool
+) -> Tuple[bool, Optional[str]]:
+    """Corps de run_table_pipeline, exécuté dans le mode de copie du pipeline."""
+    name = pipeline["name"]
+    validate_fn = pipeline["validate_fn"]
+
+    # Configuration du logger
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file = os.path.join(log_dir, f"{name}_transformation_{timestamp}.log")
+    logger = setup_logger(f"{name}_transformation", log_file)
+
+    logger.info(f"Démarrage du traitement des données {name}: {input_file_path}")
+    if pipeline["copy_free"]:
+        logger.info("Mode sans copie actif (copy-on-write)")
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    # Dictionnaire pour collecter les erreurs
+    errors = {category: [] for category in pipeline["error_categories"]}
+
+    # Étape 1: Lecture du fichier d'entrée par lots et validation de la structure
+    logger.info("Étape 1: Validation de la structure d'entrée")
+    phases = {}
+    phase_start = time.perf_counter()
+    try:
+        if chunk_size:
+            chunks, structure_errors, original_count = read_validated_chunks(
+                input_file_path, validate_fn, chunk_size
+            )
+        else:
+            df, structure_errors = read_validated_frame(input_file_path, validate_fn)
+            original_count = len(df)
+        logger.info(f"Fichier chargé avec succès: {original_count} entrées")
+        phases["read"] = time.perf_counter() - phase_start
+    except Exception as e:
+        logger.error(f"Erreur lors de la lecture du fichier d'entrée: {str(e)}")
+        errors["general"].append({"error": f"Erreur de lecture du fichier: {str(e)}"})
+        return False, None
+
+    if structure_errors:
+        errors["structure"].extend(structure_errors)
+        logger.warning(f"Détection de {len(structure_errors)} erreurs de structure")
+
+    logger.info(f"Conversion en DataFrame: {original_count} lignes")
+
+    if pipeline["resolves_references"]:
+        # Sorties des tables référencées lues à côté du fichier de sortie
+        steps = pipeline["build_steps"](patches_dir, logger, clean_dir=os.path.dirname(output_file_path) or ".")
+    else:
+        steps = pipeline["build_steps"](patches_dir, logger)
+    step_metrics = init_step_metrics(steps)
+
+    # Étapes de transformation puis sauvegarde du fichier de sortie
+    try:
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+        if chunk_size:
+            # Chaque lot est écrit dès qu'il est transformé
+            logger.info(f"Traitement par lots de {chunk_size} lignes")
+            transformed_chunks = run_steps_in_chunks(
+                chunks, steps, errors, logger, pipeline["id_column"], step_metrics, check_inputs
+            )
+            final_count = write_json_array(
+                output_file_path, (frame_to_records(pipeline, chunk) for chunk in transformed_chunks)
+            )
+        else:
+            # Données validées conservées pour le rapport d'erreurs
+            # (les étapes renvoient un nouveau DataFrame sans modifier leur entrée ;
+            # en mode sans copie, le copy-on-write préserve les colonnes partagées)
+            input_df = df
+            df = run_steps(df, steps, errors, logger, step_metrics, check_inputs)
+            phase_start = time.perf_counter()
+            final_count = write_json_array(output_file_path, [frame_to_records(pipeline, df)])
+            phases["write"] = time.perf_counter() - phase_start
+        logger.info(f"Fichier de sortie sauvegardé avec succès: {output_file_path}")
+    except Exception as e:
+        logger.error(f"Erreur lors de la sauvegarde du fichier de sortie: {str(e)}")
+        errors["general"].append({"error": f"Erreur de sauvegarde: {str(e)}"})
+        return False, None
+    finally:
+        # Ressources ouvertes par build_steps (ex: cache de mémoïsation)
+        close_steps(steps)
+
+    # Vérification de la préservation des données
+    if final_count != original_count:
+        message = f"ALERTE: Différence de nombre d'entrées - Original: {original_count}, Final: {final_count}"
+        logger.error(message)
+        errors["general"].append({"error": message})
+
+    # Génération du rapport d'erreurs si nécessaire
+    has_errors = any(error_list for error_list in errors.values())
+    error_report_path = None
+
+    if has_errors:
+        os.makedirs(error_report_dir, exist_ok=True)
+        error_report_path = os.path.join(
+            error_report_dir,
+            f"{name}_errors_{timestamp}.xlsx"
+        )
+        phase_start = time.perf_counter()
+        if chunk_size:
+            # En mode par lots, les données d'entrée ne sont relues que pour le rapport
+            input_df, _ = read_validated_frame(input_file_path, validate_fn)
+        pipeline["report_fn"](errors, error_report_path, input_df.to_dict(orient='records'))
+        phases["error_report"] = time.perf_counter() - phase_start
+        logger.info(f"Rapport d'erreurs généré: {error_report_path}")
+    else:
+        logger.info("Aucune erreur détectée, pas de rapport généré")
+
+    # Mesures du traitement, écrites à côté du fichier de log
+    table_metrics = summarize_metrics(
+        name,
+        step_metrics,
+        time.perf_counter() - wall_start,
+        time.process_time() - cpu_start,
+        original_count,
+        chunk_size,
+        phases,
+        pipeline["copy_free"]
+    )
+    metrics_file = os.path.join(log_dir, f"{name}_{timestamp}.metrics.json")
+    try:
+        write_metrics(metrics_file, table_metrics)
+        table_metrics["metrics_file"] = metrics_file
+        logger.info(f"Mesures des étapes sauvegardées: {metrics_file}")
+    except Exception as e:
+        logger.warning(f"Impossible d'écrire les mesures des étapes: {str(e)}")
+    if metrics is not None:
+        metrics.update(table_metrics)
+
+    logger.info(f"Traitement des données {name} terminé")
+
+    return True, error_report_path
@@ -0,0 +1,148 @@
+"""
+Module de nettoyage fusionné des champs textuels.
+Enchaîne, colonne par colonne et en une seule passe, les sous-étapes de
+nettoyage du texte (normalisation, caractères spéciaux, ponctuation) sur les
+valeurs distinctes, avec un seul instantané avant/après par colonne. Chaque
+modification reste attribuée à sa sous-étape dans le rapport d'erreurs.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.factorize import factorize_strings
+from src.utils.copy_on_write import step_copy
+
+# Transformation d'une sous-étape: (chaînes distinctes, champ) -> chaînes transformées (même index)
+TextTransform = Callable[[pd.Series, str], pd.Series]
+
+
+def element_transform(func: Callable[[Any, str], Any]) -> TextTransform:
+    """
+    Adapte une fonction valeur par valeur (valeur, champ) en transformation de sous-étape.
+
+    Args:
+        func: Fonction (valeur, champ) -> valeur nettoyée
+
+    Returns:
+        Transformation applicable aux chaînes distinctes d'un champ
+    """
+    def transform(values: pd.Series, field: str) -> pd.Series:
+        return pd.Series([func(value, field) for value in values], index=values.index, dtype=object)
+    return transform
+
+
+def text_stage(
+    error_type: str,
+    value_key: str,
+    fields: Iterable[str],
+    transform: TextTransform,
+    excluded_fields: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Décrit une sous-étape du nettoyage fusionné.
+
+    Args:
+        error_type: Type des modifications reportées (ex: "text_normalization");
+            les échecs sont reportés sous "<error_type>_error"
+        value_key: Clé de la valeur transformée dans le rapport ("normalized", "cleaned")
+        fields: Champs traités par la sous-étape, dans l'ordre du rapport
+        transform: Transformation des chaînes distinctes d'un champ
+        excluded_fields: Champs à ne jamais traiter
+
+    Returns:
+        Dictionnaire décrivant la sous-étape
+    """
+    excluded = set(excluded_fields)
+    return {
+        "error_type": error_type,
+        "value_key": value_key,
+        "fields": [field for field in fields if field not in excluded],
+        "transform": transform
+    }
+
+
+def clean_text_fields(
+    df: pd.DataFrame,
+    stages: List[Dict[str, Any]],
+    id_column: str
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Applique les sous-étapes de nettoyage du texte en une seule passe.
+
+    Pour chaque champ, les chaînes distinctes traversent successivement les
+    sous-étapes qui le concernent ; la colonne n'est réécrite qu'une fois.
+    Les valeurs non textuelles sont conservées. Le rapport est identique à
+    celui des sous-étapes exécutées l'une après l'autre : modifications de
+    la première sous-étape (champ par champ, dans l'ordre des lignes), puis
+    de la deuxième, etc.
+
+    Args:
+        df: DataFrame à nettoyer
+        stages: Sous-étapes décrites par text_stage, dans l'ordre d'application
+        id_column: Colonne identifiant de la table (reportée dans les erreurs)
+
+    Returns:
+        Tuple contenant:
+        - Le DataFrame avec les champs textuels nettoyés
+        - La liste des modifications (info) et des erreurs, par sous-étape
+    """
+    result_df = step_copy(df)
+    stage_errors: List[List[Dict[str, Any]]] = [[] for _ in stages]
+    fields = list(dict.fromkeys(field for stage in stages for field in stage["fields"]))
+    indices = result_df.index.tolist()
+    ids = result_df[id_column].to_numpy() if id_column in result_df.columns else None
+
+    for field in fields:
+        if field not in result_df.columns:
+            continue
+
+        codes, uniques = factorize_strings(result_df[field])
+        values = pd.Series(uniques, dtype=object)
+        field_changed = False
+
+        for position, stage in enumerate(stages):
+            if field not in stage["fields"]:
+                continue
+            try:
+                transformed = stage["transform"](values, field)
+            except Exception as e:
+                # Enregistrer l'erreur si la sous-étape échoue (valeurs inchangées)
+                stage_errors[position].append({
+                    "type": f"{stage['error_type']}_error",
+                    "severity": "error",
+                    "field": field,
+                    "message": str(e)
+                })
+                continue
+
+            before = values.to_numpy(dtype=object)
+            after = transformed.to_numpy(dtype=object)
+            changed = np.fromiter(
+                (new != old for new, old in zip(after, before)), dtype=bool, count=len(before)
+            )
+
+            # Enregistrement des modifications pour suivi, dans l'ordre des lignes
+            rows = np.flatnonzero(changed[codes] & (codes >= 0)) if changed.any() else []
+            for row in rows:
+                code = codes[row]
+                stage_errors[position].append({
+                    "type": stage["error_type"],
+                    "severity": "info",
+                    id_column: ids[row] if ids is not None else None,
+                    "field": field,
+                    "original": before[code],
+                    stage["value_key"]: after[code],
+                    "index": indices[row]
+                })
+            values = pd.Series(after, dtype=object)
+            field_changed = field_changed or bool(changed.any())
+
+        text_mask = codes >= 0
+        if field_changed:
+            column = result_df[field].copy()
+            column[text_mask] = values.to_numpy(dtype=object)[codes[text_mask]]
+            result_df[field] = column
+
+    return result_df, [error for errors in stage_errors for error in errors]